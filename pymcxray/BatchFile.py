@@ -40,7 +40,7 @@ class BatchFile(object):
         self._simulationFilenames = []
 
 
-    def addSimulationName(self, simulationFilename):
+    def addSimulationName(self, simulationFilename, estimatedTime_s=None):
         self._simulationFilenames.append(simulationFilename)
 
     def write(self, path):
@@ -10,8 +10,8 @@ MCXRay console batch file creator.
 # Standard library modules.
 import os
 import logging
-import math
 import random
+import heapq
 
 # Third party modules.
 
@@ -40,15 +40,59 @@ class BatchFileConsole(object):
 
         self._extension = ".bat"
         self._simulationFilenames = []
+        self._estimatedTimes_s = {}
 
 
-    def addSimulationName(self, simulationFilename):
+    def addSimulationName(self, simulationFilename, estimatedTime_s=None):
         """
         Add a simulation in the simulation list.
 
         :param str simulationFilename: File path of the simulation added
+        :param float estimatedTime_s: Estimated run time of the simulation, see
+            :py:class:`pymcxray.CostModel.CostModel`, all the simulations without estimated time have the same cost
         """
         self._simulationFilenames.append(simulationFilename)
+        if estimatedTime_s is not None:
+            self._estimatedTimes_s[simulationFilename] = estimatedTime_s
+
+    def getEstimatedTime_s(self, simulationFilename):
+        return self._estimatedTimes_s.get(simulationFilename, 1.0)
+
+    def splitSimulations(self):
+        """
+        Split the simulations in the batch files with the longest processing time first heuristic.
+
+        The simulations are sorted by decreasing estimated time and each one is added to the batch file with the
+        smallest total estimated time. The simulations with the same estimated time are shuffled.
+
+        :return: list of tuple (estimated wall time in s, list of simulation filenames), one per non empty batch file
+        """
+        simulationFilenames = list(self._simulationFilenames)
+        random.shuffle(simulationFilenames)
+        simulationFilenames.sort(key=self.getEstimatedTime_s, reverse=True)
+
+        numberFiles = max(1, min(self._numberFiles, len(simulationFilenames)))
+        batches = [(0.0, indexFile, []) for indexFile in range(numberFiles)]
+        for simulationFilename in simulationFilenames:
+            time_s, indexFile, filenames = heapq.heappop(batches)
+            filenames.append(simulationFilename)
+            heapq.heappush(batches, (time_s + self.getEstimatedTime_s(simulationFilename), indexFile, filenames))
+
+        batches.sort(key=lambda batch: batch[1])
+        return [(time_s, filenames) for time_s, _indexFile, filenames in batches]
+
+    def _writeBatchFile(self, filepath, time_s, simulationFilenames):
+        logging.info("Write batch file: %s (%i simulations, estimated time %.2f h)", filepath,
+                     len(simulationFilenames), time_s/3600.0)
+
+        with open(filepath, 'w') as batchFile:
+            if len(self._estimatedTimes_s) > 0:
+                batchFile.write("REM Estimated wall time: %.2f h for %i simulations\n" %
+                                (time_s/3600.0, len(simulationFilenames)))
+
+            for simulationFilename in simulationFilenames:
+                line = "%s %s\n" % (self._programName, simulationFilename)
+                batchFile.write(line)
 
     def write(self, path):
         """
@@ -60,40 +104,18 @@ class BatchFileConsole(object):
 
         if len(self._simulationFilenames) == 0:
             return
-        random.shuffle(self._simulationFilenames)
 
+        batches = self.splitSimulations()
         if self._numberFiles > 1:
-            number_simulations = len(self._simulationFilenames)
-            indexStep = int(math.ceil(float(number_simulations)/float(self._numberFiles)))
-
-            indexFilenames = 0
-            for indexFile in range(self._numberFiles):
-                if indexFilenames < number_simulations:
-                    filename = self._name + "_%i" % (indexFile+1) + self._extension
-                    filepath = os.path.join(path, filename)
-
-                    logging.info("Write batch file: %s", filepath)
-                    batchFile = open(filepath, 'w')
-
-                    for simulationFilename in self._simulationFilenames[indexFilenames:indexFilenames+indexStep]:
-                        line = "%s %s\n" % (self._programName, simulationFilename)
-                        batchFile.write(line)
-
-                    indexFilenames += indexStep
-
-                    batchFile.close()
+            for indexFile, (time_s, simulationFilenames) in enumerate(batches):
+                filename = self._name + "_%i" % (indexFile+1) + self._extension
+                filepath = os.path.join(path, filename)
+                self._writeBatchFile(filepath, time_s, simulationFilenames)
         else:
             filename = self._name + self._extension
             filepath = os.path.join(path, filename)
-
-            logging.info("Write batch file: %s", filepath)
-            batchFile = open(filepath, 'w')
-
-            for simulationFilename in self._simulationFilenames:
-                line = "%s %s\n" % (self._programName, simulationFilename)
-                batchFile.write(line)
-
-            batchFile.close()
+            time_s, simulationFilenames = batches[0]
+            self._writeBatchFile(filepath, time_s, simulationFilenames)
 
     def _remove_previous_files(self, path):
         for filename in os.listdir(path):
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: pymcxray.CompletionIndex
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+In memory index of the completed simulations.
+
+The names of the files in a results folder are read with one :py:func:`os.scandir` and the names of the simulation
+groups with one read of the HDF5 group. A simulation is done if all its results files are in the index or if its group
+is in the HDF5 file, without a :py:func:`os.path.isfile` call per results file.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import os
+import os.path
+import logging
+
+# Third party modules.
+
+# Local modules.
+
+# Project modules
+
+# Globals and constants variables.
+
+
+class CompletionIndex(object):
+    def __init__(self):
+        """
+        Index of the files of the results folders and of the simulation groups of the HDF5 file.
+
+        A folder is scanned the first time one of its files is looked up. Call :py:meth:`refresh` to update the index,
+        only the folders modified since they were scanned are scanned again.
+
+        The size and modification time of the files are taken from the entries of the scan. A file rewritten in place
+        does not change the modification time of its folder, so the file stats of a folder not scanned again by
+        :py:meth:`refresh` are read again with a new scan the next time they are looked up.
+        """
+        self._folders = {}
+        self._file_stats = {}
+        self._hdf5_group_names = set()
+
+    def _scan_folder(self, folder_path):
+        file_names = set()
+        file_stats = {}
+        try:
+            modification_time_ns = os.stat(folder_path).st_mtime_ns
+            with os.scandir(folder_path) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        file_names.add(entry.name)
+                        try:
+                            entry_stat = entry.stat()
+                            file_stats[entry.name] = (entry_stat.st_size, entry_stat.st_mtime_ns)
+                        except OSError:
+                            pass
+        except OSError:
+            modification_time_ns = None
+
+        logging.debug("Completion index of %s: %i files", folder_path, len(file_names))
+        self._folders[folder_path] = (modification_time_ns, file_names)
+        self._file_stats[folder_path] = file_stats
+
+        return file_names
+
+    def get_file_names(self, folder_path):
+        folder_path = os.path.normpath(folder_path)
+        try:
+            return self._folders[folder_path][1]
+        except KeyError:
+            return self._scan_folder(folder_path)
+
+    def refresh(self):
+        """
+        Scan again the folders modified since they were scanned.
+        """
+        for folder_path, (modification_time_ns, _file_names) in list(self._folders.items()):
+            try:
+                current_modification_time_ns = os.stat(folder_path).st_mtime_ns
+            except OSError:
+                current_modification_time_ns = None
+
+            if current_modification_time_ns is None or current_modification_time_ns != modification_time_ns:
+                self._scan_folder(folder_path)
+            else:
+                self._file_stats.pop(folder_path, None)
+
+    def set_hdf5_group(self, hdf5_group):
+        """
+        Read the names of the simulation groups, None if there is no HDF5 file.
+        """
+        if hdf5_group is None:
+            self._hdf5_group_names = set()
+        else:
+            self._hdf5_group_names = set(hdf5_group.keys())
+
+    def has_hdf5_group(self, name):
+        return name in self._hdf5_group_names
+
+    def is_file(self, file_path):
+        folder_path, file_name = os.path.split(file_path)
+        return file_name in self.get_file_names(folder_path)
+
+    def get_file_stat(self, file_path):
+        """
+        Size and modification time of a file.
+
+        :return: tuple (st_size, st_mtime_ns) or None if the file does not exist
+        """
+        folder_path, file_name = os.path.split(file_path)
+        folder_path = os.path.normpath(folder_path)
+        if folder_path not in self._file_stats:
+            self._scan_folder(folder_path)
+
+        return self._file_stats[folder_path].get(file_name)
+
+    def is_done(self, base_file_path, suffixes):
+        """
+        Check if all the files `base_file_path` + suffix exist.
+        """
+        folder_path, base_file_name = os.path.split(base_file_path)
+        file_names = self.get_file_names(folder_path)
+
+        for suffix in suffixes:
+            if base_file_name + suffix not in file_names:
+                logging.debug("Missing file: %s", base_file_name + suffix)
+                return False
+
+        return True
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+r"""
+.. py:currentmodule:: pymcxray.CostModel
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Estimation of the run time of a MCXRay simulation from its parameters.
+
+The run time is modeled as a power law of the number of electrons, the number of x-ray photons, the incident energy
+and the number of regions of the specimen:
+
+.. math::
+
+    t = \exp(c_0) N_e^{c_1} (1 + N_x)^{c_2} E_0^{c_3} N_r^{c_4}
+
+The coefficients are linear in the logarithm of the run time. The default coefficients only give the relative cost
+of the simulations, e.g. to balance the batch files.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import math
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules
+
+# Globals and constants variables.
+FEATURE_NAMES = ["intercept", "numberElectrons", "numberPhotons", "energy_keV", "numberRegions"]
+
+# Roughly 2 s for 1000 electrons at 15 keV in a bulk specimen, the electron range varies as E0^1.7.
+DEFAULT_COEFFICIENTS = [math.log(2.0e-5), 1.0, 0.2, 1.7, 0.5]
+
+
+def get_features(number_electrons, number_photons, energy_keV, number_regions):
+    """
+    Logarithm of the parameters used by the cost model, the first feature is the intercept.
+
+    The parameters can be scalars or numpy arrays.
+    """
+    number_electrons = np.maximum(np.asarray(number_electrons, dtype=float), 1.0)
+    number_photons = np.maximum(np.asarray(number_photons, dtype=float), 0.0)
+    energy_keV = np.maximum(np.asarray(energy_keV, dtype=float), 1.0e-3)
+    number_regions = np.maximum(np.asarray(number_regions, dtype=float), 1.0)
+
+    number_electrons, number_photons, energy_keV, number_regions = np.broadcast_arrays(number_electrons,
+                                                                                       number_photons, energy_keV,
+                                                                                       number_regions)
+
+    features = [np.ones(number_electrons.shape), np.log(number_electrons), np.log1p(number_photons),
+                np.log(energy_keV), np.log(number_regions)]
+    return np.stack(features, axis=-1)
+
+
+class CostModel(object):
+    def __init__(self, coefficients=None):
+        """
+        Run time model of the simulations.
+
+        :param coefficients: coefficients of the features of :py:func:`get_features`, the default coefficients if
+            None
+        """
+        # The default coefficients only give the relative cost of the simulations, not their actual run time.
+        self.is_default = coefficients is None
+        if coefficients is None:
+            coefficients = DEFAULT_COEFFICIENTS
+
+        self.coefficients = np.array(coefficients, dtype=float)
+        if self.coefficients.shape != (len(FEATURE_NAMES),):
+            raise ValueError("The cost model needs %i coefficients" % (len(FEATURE_NAMES)))
+
+    def estimate_time_s(self, number_electrons, number_photons, energy_keV, number_regions):
+        """
+        Estimated run time in second, a numpy array if the parameters are arrays.
+        """
+        features = get_features(number_electrons, number_photons, energy_keV, number_regions)
+        time_s = np.exp(features.dot(self.coefficients))
+
+        if time_s.ndim == 0:
+            return float(time_s)
+        else:
+            return time_s
+
+    def estimate_simulation_time_s(self, simulation):
+        """
+        Estimated run time of a :py:class:`pymcxray.Simulation.Simulation` or a
+        :py:class:`pymcxray.Simulation.SimulationRecord`.
+        """
+        return self.estimate_time_s(simulation.numberElectrons, simulation.numberPhotons, simulation.energy_keV,
+                                    simulation.numberRegions)
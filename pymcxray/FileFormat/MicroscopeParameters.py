@@ -19,6 +19,7 @@ __svnDate__ = "$Date$"
 __svnId__ = "$Id$"
 
 # Standard library modules.
+import io
 import copy
 
 # Third party modules.
@@ -171,8 +172,18 @@ class MicroscopeParameters(object):
                     self._parameters[key] = extractMethods[key](items[-1])
 
     def write(self, filepath):
-        outputFile = open(filepath, 'w')
-
+        with open(filepath, 'w') as outputFile:
+            self._write(outputFile)
+
+    def createContent(self):
+        """
+        Content of the file written by :py:meth:`write`.
+        """
+        outputFile = io.StringIO()
+        self._write(outputFile)
+        return outputFile.getvalue()
+
+    def _write(self, outputFile):
         self._writeHeader(outputFile)
 
         self.version.writeLine(outputFile)
@@ -17,10 +17,12 @@ __license__ = ""
 import os.path
 
 # Third party modules.
+import numpy as np
 
 # Local modules.
 
 # Project modules
+import pymcxray.FileFormat.Results.EnergyAxis as EnergyAxis
 
 # Globals and constants variables.
 
@@ -51,3 +53,52 @@ class BaseResults(object):
         filename = self._createFilename()
         filepath = os.path.join(self.path, filename)
         return filepath
+
+class BaseSpectrumResults(BaseResults):
+    """
+    Results with spectra sharing the energy axis `energies_keV`.
+
+    The energy axis and the cumulative sums of the spectra are created at the first lookup and recreated when a new
+    array is assigned, not when an array is modified in place.
+    """
+    def __init__(self, path="", basename="MCXRay"):
+        super(BaseSpectrumResults, self).__init__(path, basename)
+
+        self._energy_axis = None
+        self._energy_axis_energies_keV = None
+        self._cumulative_sums = {}
+
+    @property
+    def energy_axis(self):
+        if self._energy_axis is None or self._energy_axis_energies_keV is not self.energies_keV:
+            self._energy_axis = EnergyAxis.EnergyAxis(self.energies_keV)
+            self._energy_axis_energies_keV = self.energies_keV
+            self._cumulative_sums = {}
+
+        return self._energy_axis
+
+    def get_index(self, energy_keV):
+        return self.energy_axis.get_index(energy_keV)
+
+    def get_values(self, values, energies_keV):
+        """
+        Values of the channels of an array of energies.
+        """
+        indexes = self.energy_axis.get_indexes(energies_keV)
+        return np.asarray(values)[indexes]
+
+    def get_window_sums(self, values, lower_energies_keV, upper_energies_keV):
+        """
+        Sums of `values` in the energy windows [lower, upper], see :py:meth:`EnergyAxis.EnergyAxis.get_window_sums`.
+        """
+        energy_axis = self.energy_axis
+
+        try:
+            cached_values, cumulative_sums = self._cumulative_sums[id(values)]
+        except KeyError:
+            cached_values = None
+        if cached_values is not values:
+            cumulative_sums = EnergyAxis.get_cumulative_sums(values)
+            self._cumulative_sums[id(values)] = (values, cumulative_sums)
+
+        return energy_axis.get_window_sums(values, lower_energies_keV, upper_energies_keV, cumulative_sums)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: FileFormat.Results.ColumnarCsv
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Columnar reader of the csv result files used by the results classes.
+
+The header row is parsed once with the :py:mod:`csv` module and the numeric body of the file is parsed in one call of
+:py:func:`numpy.loadtxt`. Each column is returned as a contiguous numpy array.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import csv
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules
+
+# Globals and constants variables.
+DELIMITER = ','
+
+
+class ColumnarCsv(object):
+    def __init__(self, fieldnames, data):
+        """
+        Columns of a csv file.
+
+        Use :py:func:`read_csv` to create it.
+
+        :param fieldnames: list of the column names, not stripped as in :py:class:`csv.DictReader`
+        :param data: 2D array (rows, columns)
+        """
+        self.fieldnames = fieldnames
+        self.data = data
+
+    @property
+    def number_rows(self):
+        return self.data.shape[0]
+
+    def get_column(self, fieldname, dtype=None):
+        """
+        Contiguous array of one numeric column.
+
+        :param fieldname: name or index in :py:attr:`fieldnames` of the column
+        :param dtype: dtype of the array, the dtype of :py:attr:`data` by default
+        """
+        if not isinstance(fieldname, str):
+            fieldname = self.fieldnames[fieldname]
+
+        column_id = self.fieldnames.index(fieldname)
+        column = np.ascontiguousarray(self.data[:, column_id])
+        if dtype is not None:
+            column = column.astype(dtype, copy=False)
+
+        return column
+
+
+def _is_empty_line(line):
+    return len(line.strip()) == 0
+
+
+def read_csv(file_path, fieldnames=None, dtype=np.float64):
+    """
+    Read a csv result file with only numeric columns.
+
+    :param file_path: path of the csv file
+    :param fieldnames: column names used instead of the names in the header row
+    :param dtype: dtype of the columns
+    :return: :py:class:`ColumnarCsv`
+    """
+    with open(file_path, 'r') as csv_file:
+        lines = csv_file.readlines()
+
+    if len(lines) == 0:
+        raise ValueError("No header row in %s" % (file_path))
+
+    header = next(csv.reader(lines[:1]))
+    body_lines = [line for line in lines[1:] if not _is_empty_line(line)]
+
+    if fieldnames is None:
+        # Remove the empty column created by a trailing delimiter.
+        if len(header) > 1 and len(header[-1].strip()) == 0:
+            header = header[:-1]
+        fieldnames = header
+    fieldnames = list(fieldnames)
+    column_ids = list(range(len(fieldnames)))
+
+    if len(body_lines) == 0:
+        data = np.zeros((0, len(column_ids)), dtype=dtype)
+    else:
+        data = np.loadtxt(body_lines, dtype=dtype, delimiter=DELIMITER, usecols=column_ids, ndmin=2)
+
+    return ColumnarCsv(fieldnames, data)
@@ -58,7 +58,7 @@ class ElectronResults(BaseResults.BaseResults):
                         if fieldName in items[0]:
                             self._values[fieldName] = items[-1]
 
-    def write_hdf5(self, hdf5_group):
+    def write_hdf5(self, hdf5_group, storage_policy=None):
         hdf5_group = hdf5_group.require_group(HDF5_ELECTRON_RESULTS)
 
         for field_name in self.fieldNames:
@@ -27,7 +27,6 @@ Read MCXray electron trajectories results file.
 
 # Standard library modules.
 import os.path
-import csv
 import logging
 import math
 
@@ -39,6 +38,7 @@ import numpy as np
 from pymcxray import get_current_module_path
 
 # Project modules
+import pymcxray.FileFormat.Results.Hdf5StoragePolicy as Hdf5StoragePolicy
 
 # Globals and constants variables.
 COLOR_TRAJECTORY_TYPE = "colorTrajectoryType"
@@ -53,17 +53,39 @@ COLLISION_TYPE_EMPTY_REGION = 4
 COLLISION_TYPE_ELASTIC = 5
 
 HDF5_ELECTRON_TRAJECTORIES_RESULTS = "ElectronTrajectoriesResults"
-HDF5_ELECTRON_TRAJECTORIES = "ElectronTrajectories"
-HDF5_ELECTRON_TRAJECTORIES_TRAJECTORY_TYPE = 0
-HDF5_ELECTRON_TRAJECTORIES_X_A = 1
-HDF5_ELECTRON_TRAJECTORIES_Y_A = 2
-HDF5_ELECTRON_TRAJECTORIES_Z_A = 3
-HDF5_ELECTRON_TRAJECTORIES_CORRECTED_X_A = 4
-HDF5_ELECTRON_TRAJECTORIES_CORRECTED_Y_A = 5
-HDF5_ELECTRON_TRAJECTORIES_CORRECTED_Z_A = 6
-HDF5_ELECTRON_TRAJECTORIES_ENERGY_keV = 7
-HDF5_ELECTRON_TRAJECTORIES_INDEX_REGION = 8
-HDF5_ELECTRON_TRAJECTORIES_COLLISION_TYPE = 9
+HDF5_TRAJECTORY_OFFSETS = "Trajectory offsets"
+HDF5_TRAJECTORY_INDEXES = "Trajectory indexes"
+HDF5_TRAJECTORY_TYPES = "Trajectory types"
+HDF5_X_A = "x_A"
+HDF5_Y_A = "y_A"
+HDF5_Z_A = "z_A"
+HDF5_CORRECTED_X_A = "corrected x_A"
+HDF5_CORRECTED_Y_A = "corrected y_A"
+HDF5_CORRECTED_Z_A = "corrected z_A"
+HDF5_ENERGY_keV = "energy_keV"
+HDF5_INDEX_REGION = "index region"
+HDF5_COLLISION_TYPE = "collision type"
+
+# Collision columns saved in the HDF5 file with their dtype and the corresponding attribute of the Collision class.
+HDF5_COLLISION_COLUMNS = [(HDF5_X_A, np.float32, "x_A"),
+                          (HDF5_Y_A, np.float32, "y_A"),
+                          (HDF5_Z_A, np.float32, "z_A"),
+                          (HDF5_CORRECTED_X_A, np.float32, "correctedX_A"),
+                          (HDF5_CORRECTED_Y_A, np.float32, "correctedY_A"),
+                          (HDF5_CORRECTED_Z_A, np.float32, "correctedZ_A"),
+                          (HDF5_ENERGY_keV, np.float32, "energy_keV"),
+                          (HDF5_INDEX_REGION, np.int8, "indexRegion"),
+                          (HDF5_COLLISION_TYPE, np.int8, "collisionType")]
+
+# Collision columns of the results file with 8 and 11 columns, after the trajectory index and type columns.
+CSV_COLUMNS = {8: [(HDF5_X_A, np.float64), (HDF5_Y_A, np.float64), (HDF5_Z_A, np.float64),
+                   (HDF5_ENERGY_keV, np.float64), (HDF5_INDEX_REGION, np.int32), (HDF5_COLLISION_TYPE, np.int32)],
+               11: [(HDF5_X_A, np.float64), (HDF5_Y_A, np.float64), (HDF5_Z_A, np.float64),
+                    (HDF5_CORRECTED_X_A, np.float64), (HDF5_CORRECTED_Y_A, np.float64),
+                    (HDF5_CORRECTED_Z_A, np.float64), (HDF5_ENERGY_keV, np.float64), (HDF5_INDEX_REGION, np.int32),
+                    (HDF5_COLLISION_TYPE, np.int32)]}
+
+READ_CHUNK_SIZE_BYTES = 16*1024*1024
 
 
 class Collision(object):
@@ -162,95 +184,149 @@ class Trajectory(object):
 
 
 class ElectronTrajectoriesResults(object):
-    def __init__(self, filepath):
+    def __init__(self, filepath, chunk_size_bytes=READ_CHUNK_SIZE_BYTES):
         self.number_trajectories = 0
         self.maximum_number_collisions = 0
 
-        self.read(filepath)
-
-    def read(self, filepath):
-        reader = csv.reader(open(filepath, 'r'))
-
-        #Skip header line
-        next(reader)
-
-        self._trajectories = []
-        currentTrajectoryIndex = -1
-        trajectory = None
-        for row in reader:
-            trajectoryIndex = int(row[0])
-            trajectoryType = int(row[1])
-
-            if trajectoryIndex != currentTrajectoryIndex:
-                if trajectory != None:
-                    self._trajectories.append(trajectory)
-                    self.number_trajectories += 1
-                    self.maximum_number_collisions = max(self.maximum_number_collisions, number_collisions)
-
-                trajectory = Trajectory()
-                trajectory.index = trajectoryIndex
-                trajectory.trajectoryType = trajectoryType
-                currentTrajectoryIndex = trajectoryIndex
-                number_collisions = 0
-            if len(row) == 8:
-                collision = Collision()
-                collision.x_A = float(row[2])
-                collision.y_A = float(row[3])
-                collision.z_A = float(row[4])
-
-                collision.energy_keV = float(row[5])
-                collision.indexRegion = int(row[6])
-                collision.collisionType = int(row[7])
-            elif len(row) == 11:
-                collision = Collision()
-                collision.x_A = float(row[2])
-                collision.y_A = float(row[3])
-                collision.z_A = float(row[4])
-                collision.correctedX_A = float(row[5])
-                collision.correctedY_A = float(row[6])
-                collision.correctedZ_A = float(row[7])
-                collision.energy_keV = float(row[8])
-                collision.indexRegion = int(row[9])
-                collision.collisionType = int(row[10])
+        self.read(filepath, chunk_size_bytes)
+
+    def read(self, filepath, chunk_size_bytes=READ_CHUNK_SIZE_BYTES):
+        """
+        Read the trajectories in columnar arrays.
+
+        The file is parsed by blocks of about `chunk_size_bytes` with numpy. The collision values are saved in
+        :py:attr:`columns` with the HDF5 column names as keys, the collisions of trajectory *i* are the rows
+        ``offsets[i]:offsets[i+1]``. The files with 8 columns do not have the corrected positions.
+        """
+        column_values = {}
+        trajectory_index_values = []
+        trajectory_type_values = []
+        csv_columns = None
+
+        with open(filepath, 'r') as results_file:
+            #Skip header line
+            next(results_file)
+
+            while True:
+                lines = results_file.readlines(chunk_size_bytes)
+                if len(lines) == 0:
+                    break
+
+                data = np.loadtxt(lines, delimiter=',', ndmin=2)
+                if data.size == 0:
+                    continue
+
+                number_columns = data.shape[1]
+                if number_columns not in CSV_COLUMNS:
+                    raise ValueError("Unknown number of columns (%i) in %s" % (number_columns, filepath))
+                if csv_columns is None:
+                    csv_columns = CSV_COLUMNS[number_columns]
+                    for column_name, _dtype in csv_columns:
+                        column_values[column_name] = []
+
+                trajectory_index_values.append(data[:, 0].astype(np.int64))
+                trajectory_type_values.append(data[:, 1].astype(np.int32))
+                for column_id, (column_name, dtype) in enumerate(csv_columns, start=2):
+                    column_values[column_name].append(data[:, column_id].astype(dtype))
+
+        if csv_columns is None:
+            csv_columns = CSV_COLUMNS[11]
+            for column_name, _dtype in csv_columns:
+                column_values[column_name] = []
+
+        self.columns = {}
+        for column_name, dtype in csv_columns:
+            self.columns[column_name] = np.concatenate(column_values[column_name] + [np.zeros(0, dtype=dtype)])
+
+        collision_trajectory_indexes = np.concatenate(trajectory_index_values + [np.zeros(0, dtype=np.int64)])
+        collision_trajectory_types = np.concatenate(trajectory_type_values + [np.zeros(0, dtype=np.int32)])
+
+        number_collisions = len(collision_trajectory_indexes)
+        if number_collisions > 0:
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(collision_trajectory_indexes)) + 1))
+        else:
+            starts = np.zeros(0, dtype=np.int64)
+        self.offsets = np.append(starts, number_collisions).astype(np.int64)
+        self.trajectory_indexes = collision_trajectory_indexes[starts]
+        self.trajectory_types = collision_trajectory_types[starts]
+
+        self.number_trajectories = len(starts)
+        if self.number_trajectories > 0:
+            self.maximum_number_collisions = int(np.max(np.diff(self.offsets)))
+        else:
+            self.maximum_number_collisions = 0
 
-            trajectory.addCollision(collision)
-            number_collisions += 1
+        logging.info("Number trajectories: %i", self.number_trajectories)
+
+    @property
+    def number_collisions(self):
+        return int(self.offsets[-1])
 
-        logging.info("Number trajectories: %i", len(self._trajectories))
+    @property
+    def column_names(self):
+        return [column_name for column_name, _dtype, _attribute_name in HDF5_COLLISION_COLUMNS
+                if column_name in self.columns]
+
+    def get_column(self, column_name, trajectory_id=None):
+        """
+        Values of one collision column.
+
+        :param column_name: name of the column, e.g. :py:data:`HDF5_X_A`
+        :param trajectory_id: position of the trajectory in the file, all trajectories if None
+        :return: numpy array
+        """
+        if trajectory_id is None:
+            return self.columns[column_name]
+        else:
+            start, end = self._get_range(trajectory_id)
+            return self.columns[column_name][start:end]
 
-    def write_hdf5(self, hdf5_group):
-        hdf5_group = hdf5_group.require_group(HDF5_ELECTRON_TRAJECTORIES_RESULTS)
+    def get_trajectory(self, trajectory_id):
+        """
+        Create the :py:class:`Trajectory` at position `trajectory_id` in the file.
+        """
+        start, end = self._get_range(trajectory_id)
+        columns = dict((column_name, values[start:end]) for column_name, values in self.columns.items())
 
-        shape = (10, self.number_trajectories, self.maximum_number_collisions)
-        electron_trajectories_data = np.zeros(shape, dtype=float)
+        return create_trajectory(self.trajectory_indexes[trajectory_id], self.trajectory_types[trajectory_id], columns)
 
-        for trajectory_id, trajectory in enumerate(self._trajectories):
-            for collision_id, collision in enumerate(trajectory.collisions):
-                electron_trajectories_data[HDF5_ELECTRON_TRAJECTORIES_TRAJECTORY_TYPE, trajectory_id, collision_id] = trajectory.trajectoryType
-                electron_trajectories_data[HDF5_ELECTRON_TRAJECTORIES_X_A, trajectory_id, collision_id] = collision.x_A
-                electron_trajectories_data[HDF5_ELECTRON_TRAJECTORIES_Y_A, trajectory_id, collision_id] = collision.y_A
-                electron_trajectories_data[HDF5_ELECTRON_TRAJECTORIES_Z_A, trajectory_id, collision_id] = collision.z_A
-                electron_trajectories_data[HDF5_ELECTRON_TRAJECTORIES_CORRECTED_X_A, trajectory_id, collision_id] = collision.correctedX_A
-                electron_trajectories_data[HDF5_ELECTRON_TRAJECTORIES_CORRECTED_Y_A, trajectory_id, collision_id] = collision.correctedY_A
-                electron_trajectories_data[HDF5_ELECTRON_TRAJECTORIES_CORRECTED_Z_A, trajectory_id, collision_id] = collision.correctedZ_A
-                electron_trajectories_data[HDF5_ELECTRON_TRAJECTORIES_ENERGY_keV, trajectory_id, collision_id] = collision.energy_keV
-                electron_trajectories_data[HDF5_ELECTRON_TRAJECTORIES_INDEX_REGION, trajectory_id, collision_id] = collision.indexRegion
-                electron_trajectories_data[HDF5_ELECTRON_TRAJECTORIES_COLLISION_TYPE, trajectory_id, collision_id] = collision.collisionType
+    @property
+    def trajectories(self):
+        return [self.get_trajectory(trajectory_id) for trajectory_id in range(self.number_trajectories)]
 
-        hdf5_group.create_dataset(HDF5_ELECTRON_TRAJECTORIES, data=electron_trajectories_data)
+    def _get_range(self, trajectory_id):
+        if trajectory_id < 0:
+            trajectory_id += self.number_trajectories
+        if trajectory_id < 0 or trajectory_id >= self.number_trajectories:
+            raise IndexError("Trajectory index out of range: %i" % (trajectory_id))
+
+        return int(self.offsets[trajectory_id]), int(self.offsets[trajectory_id + 1])
+
+    def write_hdf5(self, hdf5_group, storage_policy=None):
+        """
+        Write the trajectories in a ragged layout.
+
+        The collisions of all trajectories are saved one after the other in one dataset per column. The collisions of
+        trajectory *i* are the rows ``offsets[i]:offsets[i+1]`` of the columns. Use
+        :py:class:`ElectronTrajectoriesResultsHdf5` to read the trajectories back.
+        """
+        write_trajectories_hdf5(hdf5_group, self.offsets, self.trajectory_indexes, self.trajectory_types, self.columns,
+                                storage_policy)
 
     def getElectronGunPositions_nm(self):
-        positions_nm = []
+        mask = self.columns[HDF5_COLLISION_TYPE] == COLLISION_TYPE_ELECTRON_GUN
+        positions_nm = np.column_stack((self.columns[HDF5_X_A][mask], self.columns[HDF5_Y_A][mask],
+                                        self.columns[HDF5_Z_A][mask]))*0.1
+
+        assert len(positions_nm) == self.number_trajectories
 
-        for trajectory in self._trajectories:
-            for collision in trajectory.collisions:
-                if collision.collisionType == COLLISION_TYPE_ELECTRON_GUN:
-                    position_nm = (collision.x_A*0.1, collision.y_A*0.1, collision.z_A*0.1)
-                    positions_nm.append(position_nm)
+        return [tuple(position_nm) for position_nm in positions_nm.tolist()]
 
-        assert len(positions_nm) == len(self._trajectories)
+    def _get_positions_nm(self, trajectory_id, corrected, column_names, corrected_column_names):
+        if corrected:
+            column_names = corrected_column_names
 
-        return positions_nm
+        return [self.get_column(column_name, trajectory_id)/10.0 for column_name in column_names]
 
     def drawXZ(self, title="", corrected=False, theta_deg=0.0, colorType=COLOR_TRAJECTORY_TYPE, trajectoryIndexes=None,
                x_limit=None, y_limit=None):
@@ -263,51 +339,29 @@ class ElectronTrajectoriesResults(object):
 
         indexUniqueRegionsAllTrajectories = set()
         if trajectoryIndexes is None:
-            trajectoryIndexes = range(1, len(self._trajectories)+1)
+            trajectoryIndexes = range(1, self.number_trajectories+1)
 
         for trajectoryIndex in trajectoryIndexes:
-            trajectory = self._trajectories[trajectoryIndex-1]
-            if colorType == COLOR_TRAJECTORY_TYPE:
-                color = self._getColor(trajectory.trajectoryType)
-
-                x = []
-                z = []
-                for collision in trajectory.collisions:
-                    if corrected:
-                        x.append(collision.correctedX_A/10.0)
-                        z.append(collision.correctedZ_A/10.0)
-                    else:
-                        xx = collision.x_A/10.0
-                        zz = collision.z_A/10.0
-                        x.append(cosTheta*xx + sinTheta*zz)
-                        z.append(-sinTheta*xx + cosTheta*zz)
+            trajectory_id = trajectoryIndex - 1
+            color = self._getColor(self.trajectory_types[trajectory_id])
+
+            xx, zz = self._get_positions_nm(trajectory_id, corrected, (HDF5_X_A, HDF5_Z_A),
+                                            (HDF5_CORRECTED_X_A, HDF5_CORRECTED_Z_A))
+            if corrected:
+                x = xx
+                z = zz
+            else:
+                x = cosTheta*xx + sinTheta*zz
+                z = -sinTheta*xx + cosTheta*zz
 
+            if colorType == COLOR_TRAJECTORY_TYPE:
                 plt.plot(x, z, '-', color=color)
             elif colorType == COLOR_REGION:
-                color = self._getColor(trajectory.trajectoryType)
-
-                x = []
-                z = []
-                indexRegions = []
-                indexUniqueRegions = set()
-                for collision in trajectory.collisions:
-                    indexRegions.append(collision.indexRegion)
-                    indexUniqueRegions.add(collision.indexRegion)
-                    indexUniqueRegionsAllTrajectories.add(collision.indexRegion)
-
-                    if corrected:
-                        x.append(collision.correctedX_A/10.0)
-                        z.append(collision.correctedZ_A/10.0)
-                    else:
-                        xx = collision.x_A/10.0
-                        zz = collision.z_A/10.0
-                        x.append(cosTheta*xx + sinTheta*zz)
-                        z.append(-sinTheta*xx + cosTheta*zz)
-
-                x = np.array(x)
-                z = np.array(z)
-                indexRegions = np.array(indexRegions)
-                for indexRegion in sorted(indexUniqueRegions):
+                indexRegions = self.get_column(HDF5_INDEX_REGION, trajectory_id)
+                indexUniqueRegions = np.unique(indexRegions)
+                indexUniqueRegionsAllTrajectories.update(indexUniqueRegions.tolist())
+
+                for indexRegion in indexUniqueRegions:
                     zz = np.ma.masked_where(indexRegions != indexRegion, z)
                     color = self._getColorRegion(indexRegion)
                     plt.plot(x, zz, '.', color=color)
@@ -330,18 +384,11 @@ class ElectronTrajectoriesResults(object):
         plt.figure()
         plt.title(title)
 
-        for trajectory in self._trajectories:
-            color = self._getColor(trajectory.trajectoryType)
+        for trajectory_id in range(self.number_trajectories):
+            color = self._getColor(self.trajectory_types[trajectory_id])
 
-            x = []
-            y = []
-            for collision in trajectory.collisions:
-                if corrected:
-                    x.append(collision.correctedX_A/10.0)
-                    y.append(collision.correctedY_A/10.0)
-                else:
-                    x.append(collision.x_A/10.0)
-                    y.append(collision.y_A/10.0)
+            x, y = self._get_positions_nm(trajectory_id, corrected, (HDF5_X_A, HDF5_Y_A),
+                                          (HDF5_CORRECTED_X_A, HDF5_CORRECTED_Y_A))
 
             plt.plot(x, y, '-', color=color)
 
@@ -358,18 +405,11 @@ class ElectronTrajectoriesResults(object):
         plt.figure()
         plt.title(title)
 
-        for trajectory in self._trajectories:
-            color = self._getColor(trajectory.trajectoryType)
+        for trajectory_id in range(self.number_trajectories):
+            color = self._getColor(self.trajectory_types[trajectory_id])
 
-            y = []
-            z = []
-            for collision in trajectory.collisions:
-                if corrected:
-                    y.append(collision.correctedY_A/10.0)
-                    z.append(collision.correctedZ_A/10.0)
-                else:
-                    y.append(collision.y_A/10.0)
-                    z.append(collision.z_A/10.0)
+            y, z = self._get_positions_nm(trajectory_id, corrected, (HDF5_Y_A, HDF5_Z_A),
+                                          (HDF5_CORRECTED_Y_A, HDF5_CORRECTED_Z_A))
 
             plt.plot(y, z, '-', color=color)
 
@@ -404,6 +444,132 @@ class ElectronTrajectoriesResults(object):
             color = colors[indexRegion-len(colors)]
         return color
 
+
+class ElectronTrajectoriesResultsHdf5(object):
+    def __init__(self, hdf5_group):
+        """
+        Lazy reader of the trajectories written by :py:meth:`ElectronTrajectoriesResults.write_hdf5`.
+
+        Only the offsets and the trajectory types are read when created, the collisions of one trajectory are read
+        when the trajectory is requested.
+
+        :param hdf5_group: HDF5 group containing the ``ElectronTrajectoriesResults`` group
+        """
+        self._hdf5_group = hdf5_group[HDF5_ELECTRON_TRAJECTORIES_RESULTS]
+
+        self.offsets = self._hdf5_group[HDF5_TRAJECTORY_OFFSETS][...]
+        self.trajectory_indexes = self._hdf5_group[HDF5_TRAJECTORY_INDEXES][...]
+        self.trajectory_types = self._hdf5_group[HDF5_TRAJECTORY_TYPES][...]
+
+    @property
+    def number_trajectories(self):
+        return len(self.offsets) - 1
+
+    @property
+    def number_collisions(self):
+        return int(self.offsets[-1])
+
+    @property
+    def column_names(self):
+        return [column_name for column_name, _dtype, _attribute_name in HDF5_COLLISION_COLUMNS
+                if column_name in self._hdf5_group]
+
+    def get_column(self, column_name, trajectory_id=None):
+        """
+        Values of one collision column.
+
+        :param column_name: name of the column, e.g. :py:data:`HDF5_X_A`
+        :param trajectory_id: position of the trajectory in the file, all trajectories if None
+        :return: numpy array
+        """
+        dataset = self._hdf5_group[column_name]
+        if trajectory_id is None:
+            return dataset[...]
+        else:
+            start, end = self._get_range(trajectory_id)
+            return dataset[start:end]
+
+    def get_trajectory(self, trajectory_id):
+        """
+        Create the :py:class:`Trajectory` at position `trajectory_id` in the file.
+        """
+        start, end = self._get_range(trajectory_id)
+        columns = dict((column_name, self._hdf5_group[column_name][start:end]) for column_name in self.column_names)
+
+        return create_trajectory(self.trajectory_indexes[trajectory_id], self.trajectory_types[trajectory_id], columns)
+
+    def _get_range(self, trajectory_id):
+        if trajectory_id < 0:
+            trajectory_id += self.number_trajectories
+        if trajectory_id < 0 or trajectory_id >= self.number_trajectories:
+            raise IndexError("Trajectory index out of range: %i" % (trajectory_id))
+
+        return int(self.offsets[trajectory_id]), int(self.offsets[trajectory_id + 1])
+
+    def __len__(self):
+        return self.number_trajectories
+
+    def __getitem__(self, trajectory_id):
+        return self.get_trajectory(trajectory_id)
+
+    def __iter__(self):
+        for trajectory_id in range(self.number_trajectories):
+            yield self.get_trajectory(trajectory_id)
+
+
+def create_trajectory(trajectory_index, trajectory_type, columns):
+    """
+    Create a :py:class:`Trajectory` from the collision values of one trajectory.
+
+    :param columns: dict of the collision values with the name of the column as key
+    """
+    attributes = [(attribute_name, columns[column_name].tolist())
+                  for column_name, _dtype, attribute_name in HDF5_COLLISION_COLUMNS if column_name in columns]
+
+    trajectory = Trajectory()
+    trajectory.index = int(trajectory_index)
+    trajectory.trajectoryType = int(trajectory_type)
+    if len(attributes) > 0:
+        for collision_id in range(len(attributes[0][1])):
+            collision = Collision()
+            for attribute_name, values in attributes:
+                setattr(collision, attribute_name, values[collision_id])
+            trajectory.addCollision(collision)
+
+    return trajectory
+
+
+def write_trajectories_hdf5(hdf5_group, offsets, trajectory_indexes, trajectory_types, columns, storage_policy=None):
+    """
+    Write trajectories in the ragged layout.
+
+    :param hdf5_group: parent HDF5 group, the ``ElectronTrajectoriesResults`` group is created in it
+    :param offsets: array of the index of the first collision of each trajectory, with the total number of
+        collisions as last value
+    :param trajectory_indexes: index of each trajectory in the results file
+    :param trajectory_types: type of each trajectory
+    :param columns: dict of the collision values with the name of the column as key
+    :param storage_policy: :py:class:`Hdf5StoragePolicy.Hdf5StoragePolicy` used for the datasets
+    """
+    hdf5_group = hdf5_group.require_group(HDF5_ELECTRON_TRAJECTORIES_RESULTS)
+
+    Hdf5StoragePolicy.create_dataset(hdf5_group, HDF5_TRAJECTORY_OFFSETS, offsets, storage_policy,
+                                     HDF5_ELECTRON_TRAJECTORIES_RESULTS, np.int64)
+    Hdf5StoragePolicy.create_dataset(hdf5_group, HDF5_TRAJECTORY_INDEXES, trajectory_indexes, storage_policy,
+                                     HDF5_ELECTRON_TRAJECTORIES_RESULTS, np.int32)
+    Hdf5StoragePolicy.create_dataset(hdf5_group, HDF5_TRAJECTORY_TYPES, trajectory_types, storage_policy,
+                                     HDF5_ELECTRON_TRAJECTORIES_RESULTS, np.int8)
+
+    for column_name, dtype, _attribute_name in HDF5_COLLISION_COLUMNS:
+        if column_name in columns:
+            values = np.asarray(columns[column_name])
+            if np.issubdtype(dtype, np.integer) and len(values) > 0 and \
+                    (values.min() < np.iinfo(dtype).min or values.max() > np.iinfo(dtype).max):
+                dtype = np.int32
+            Hdf5StoragePolicy.create_dataset(hdf5_group, column_name, values, storage_policy,
+                                             HDF5_ELECTRON_TRAJECTORIES_RESULTS, dtype)
+
+
 def run():
     path = get_current_module_path(__file__, "../../../test_data/version1.2")
     filepath = os.path.join(path, "SimulationsComplexPhiRhoZ_Cr_T5nm_Z0nm_Al_E10d0keV_ElectronTrajectoriesResults.csv")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: FileFormat.Results.EnergyAxis
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Energy axis of a spectrum with binary search lookups of the channels.
+
+The channel of an energy is the first channel with an upper edge larger or equal to the energy.
+The upper edge of a channel is the middle point between the channel energy and the next channel energy.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules
+
+# Globals and constants variables.
+
+
+def get_cumulative_sums(values):
+    """
+    Cumulative sums of `values` with a leading zero, the sum of the channels [start, stop) is
+    ``cumulative_sums[stop] - cumulative_sums[start]``.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    cumulative_sums = np.zeros(len(values) + 1)
+    np.cumsum(values, out=cumulative_sums[1:])
+    return cumulative_sums
+
+
+class EnergyAxis(object):
+    def __init__(self, energies_keV):
+        """
+        Energy axis.
+
+        :param energies_keV: energy of each channel in increasing order
+        """
+        self.energies_keV = np.asarray(energies_keV, dtype=np.float64)
+
+        if self.energies_keV.ndim != 1 or len(self.energies_keV) == 0:
+            raise ValueError("The energy axis needs a 1D array with at least one channel")
+        if np.any(np.diff(self.energies_keV) < 0.0):
+            raise ValueError("The energies of the energy axis are not sorted")
+
+        self.upper_edges_keV = np.empty_like(self.energies_keV)
+        if len(self.energies_keV) == 1:
+            self.upper_edges_keV[0] = 2.0*self.energies_keV[0]
+        else:
+            self.upper_edges_keV[:-1] = (self.energies_keV[:-1] + self.energies_keV[1:])*0.5
+            self.upper_edges_keV[-1] = 1.5*self.energies_keV[-1] - 0.5*self.energies_keV[-2]
+
+    def __len__(self):
+        return len(self.energies_keV)
+
+    def get_index(self, energy_keV):
+        """
+        Channel index of one energy.
+
+        :raise IndexError: if the energy is above the last channel
+        """
+        index = int(np.searchsorted(self.upper_edges_keV, float(energy_keV), side='left'))
+        if index >= len(self.energies_keV):
+            raise IndexError("Energy %s keV above the energy axis" % (energy_keV))
+
+        return index
+
+    def get_indexes(self, energies_keV):
+        """
+        Channel indexes of an array of energies.
+
+        :raise IndexError: if one energy is above the last channel
+        """
+        indexes = np.searchsorted(self.upper_edges_keV, np.asarray(energies_keV, dtype=np.float64), side='left')
+        if np.any(indexes >= len(self.energies_keV)):
+            raise IndexError("Energies above the energy axis")
+
+        return indexes
+
+    def get_window_indexes(self, lower_energies_keV, upper_energies_keV):
+        """
+        Range [start, stop) of the channels with an energy between the lower and upper energies, both included.
+        """
+        starts = np.searchsorted(self.energies_keV, lower_energies_keV, side='left')
+        stops = np.searchsorted(self.energies_keV, upper_energies_keV, side='right')
+        stops = np.maximum(starts, stops)
+
+        return starts, stops
+
+    def get_window_sums(self, values, lower_energies_keV, upper_energies_keV, cumulative_sums=None):
+        """
+        Sum of `values` in the energy windows.
+
+        :param values: value of each channel
+        :param lower_energies_keV: lower energy of the windows, a scalar or an array
+        :param upper_energies_keV: upper energy of the windows, a scalar or an array
+        :param cumulative_sums: cumulative sums of `values` from :py:func:`get_cumulative_sums` to reuse between calls
+        :return: a float or an array with the sum of each window
+        """
+        if cumulative_sums is None:
+            cumulative_sums = get_cumulative_sums(values)
+
+        starts, stops = self.get_window_indexes(lower_energies_keV, upper_energies_keV)
+        window_sums = cumulative_sums[stops] - cumulative_sums[starts]
+
+        if np.ndim(window_sums) == 0:
+            return float(window_sums)
+        else:
+            return window_sums
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: FileFormat.Results.Hdf5StoragePolicy
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Storage policy of the datasets created by the ``write_hdf5`` methods of the results classes.
+
+The policy chooses the chunk shape, the compression filter, the shuffle filter and the dtype of each dataset.
+The result type used to select the dtype is the name of the HDF5 group of the results class,
+e.g. ``"XraySpectraSpecimenEmittedDetected"``.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+from collections import OrderedDict
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules
+
+# Globals and constants variables.
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_LZF = "lzf"
+
+CHUNK_SIZE_BYTES = 1024*1024
+MINIMUM_NUMBER_ELEMENTS = 256
+
+POLICY_CONTIGUOUS = "contiguous"
+POLICY_GZIP = "gzip"
+POLICY_LZF = "lzf"
+POLICY_COMPACT = "compact"
+
+
+class Hdf5StoragePolicy(object):
+    def __init__(self, name=POLICY_CONTIGUOUS, compression=None, compression_opts=None, shuffle=False,
+                 chunk_size_bytes=CHUNK_SIZE_BYTES, minimum_number_elements=MINIMUM_NUMBER_ELEMENTS, dtypes=None):
+        """
+        Storage policy.
+
+        :param name: name of the policy
+        :param compression: compression filter, None, :py:data:`COMPRESSION_GZIP` or :py:data:`COMPRESSION_LZF`
+        :param compression_opts: compression level for gzip
+        :param shuffle: use the shuffle filter with the compression
+        :param chunk_size_bytes: maximum size of one chunk
+        :param minimum_number_elements: datasets with fewer elements are written contiguous without filter
+        :param dtypes: dict of the floating point dtype to use for each result type
+        """
+        self.name = name
+        self.compression = compression
+        self.compression_opts = compression_opts
+        self.shuffle = shuffle
+        self.chunk_size_bytes = chunk_size_bytes
+        self.minimum_number_elements = minimum_number_elements
+
+        if dtypes is None:
+            self.dtypes = {}
+        else:
+            self.dtypes = dict(dtypes)
+
+    def get_dtype(self, result_type, data, dtype=None):
+        if dtype is not None:
+            return np.dtype(dtype)
+
+        if result_type in self.dtypes and np.issubdtype(data.dtype, np.floating):
+            return np.dtype(self.dtypes[result_type])
+
+        return data.dtype
+
+    def get_dataset_options(self, result_type, data, dtype=None):
+        """
+        Options of the h5py ``create_dataset`` method for the data.
+
+        :param result_type: name of the HDF5 group of the results class
+        :param data: numpy array
+        :param dtype: dtype requested by the results class, it has priority over the policy dtype
+        :return: dict of keyword arguments
+        """
+        dtype = self.get_dtype(result_type, data, dtype)
+        options = {"dtype": dtype}
+
+        if self.compression is None or data.ndim == 0 or data.size < self.minimum_number_elements:
+            return options
+
+        options["chunks"] = self.get_chunks(data.shape, dtype.itemsize)
+        options["compression"] = self.compression
+        if self.compression_opts is not None:
+            options["compression_opts"] = self.compression_opts
+        options["shuffle"] = self.shuffle
+
+        return options
+
+    def get_chunks(self, shape, itemsize):
+        """
+        Chunk shape smaller than `chunk_size_bytes`.
+
+        The last axis (spectrum channels, depths, collisions) is kept whole when possible, so reading one spectrum
+        reads only one chunk. The largest leading axis is halved until the chunk fits in `chunk_size_bytes`.
+        """
+        chunks = list(shape)
+
+        while int(np.prod(chunks))*itemsize > self.chunk_size_bytes:
+            leading_chunks = chunks[:-1]
+            if len(leading_chunks) > 0 and max(leading_chunks) > 1:
+                axis = leading_chunks.index(max(leading_chunks))
+            elif chunks[-1] > 1:
+                axis = len(chunks) - 1
+            else:
+                break
+            chunks[axis] = (chunks[axis] + 1)//2
+
+        return tuple(chunks)
+
+    def create_dataset(self, hdf5_group, name, data, result_type=None, dtype=None):
+        data = np.asarray(data)
+        options = self.get_dataset_options(result_type, data, dtype)
+        return hdf5_group.create_dataset(name, data=data, **options)
+
+
+def create_dataset(hdf5_group, name, data, storage_policy=None, result_type=None, dtype=None):
+    """
+    Create a dataset in `hdf5_group` with the `storage_policy`.
+
+    Without storage policy, the dataset is created contiguous and uncompressed as h5py does by default.
+    """
+    if storage_policy is None:
+        return hdf5_group.create_dataset(name, data=data, dtype=dtype)
+    else:
+        return storage_policy.create_dataset(hdf5_group, name, data, result_type, dtype)
+
+
+def create_contiguous_policy():
+    return Hdf5StoragePolicy(POLICY_CONTIGUOUS)
+
+
+def create_gzip_policy(level=4, shuffle=True):
+    return Hdf5StoragePolicy(POLICY_GZIP, compression=COMPRESSION_GZIP, compression_opts=level, shuffle=shuffle)
+
+
+def create_lzf_policy(shuffle=True):
+    return Hdf5StoragePolicy(POLICY_LZF, compression=COMPRESSION_LZF, shuffle=shuffle)
+
+
+def create_compact_policy(level=4):
+    """
+    Gzip policy with the spectra and the phirhoz distributions saved in single precision.
+    """
+    result_types = ["XraySpectraSpecimen", "XraySpectraSpecimenEmittedDetected", "XraySpectraRegionsEmitted",
+                    "PhirhozEmittedCharacteristic", "PhirhozGeneratedCharacteristic"]
+    dtypes = dict((result_type, np.float32) for result_type in result_types)
+    return Hdf5StoragePolicy(POLICY_COMPACT, compression=COMPRESSION_GZIP, compression_opts=level, shuffle=True,
+                             dtypes=dtypes)
+
+
+def get_storage_policies():
+    storage_policies = OrderedDict()
+    for storage_policy in [create_contiguous_policy(), create_gzip_policy(), create_lzf_policy(),
+                           create_compact_policy()]:
+        storage_policies[storage_policy.name] = storage_policy
+
+    return storage_policies
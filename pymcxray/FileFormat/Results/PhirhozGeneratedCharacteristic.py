@@ -15,14 +15,16 @@ __license__ = ""
 
 # Standard library modules.
 import os.path
-import csv
 
 # Third party modules.
+import numpy as np
 
 # Local modules.
 
 # Project modules
+import pymcxray.FileFormat.Results.Hdf5StoragePolicy as Hdf5StoragePolicy
 import pymcxray.FileFormat.Results.BaseResults as BaseResults
+import pymcxray.FileFormat.Results.ColumnarCsv as ColumnarCsv
 
 # Globals and constants variables.
 FIELD_DEPTH_A = "Depth (A)"
@@ -43,29 +45,27 @@ class PhirhozGeneratedCharacteristic(BaseResults.BaseResults):
         filename = self.basename + suffix
         filepath = os.path.join(self.path, filename)
 
-        with open(filepath, 'r') as csvFile:
-            reader = csv.DictReader(csvFile)
+        columns = ColumnarCsv.read_csv(filepath)
 
-            fieldnames = reader.fieldnames
-            assert fieldnames[0] == FIELD_DEPTH_A
-            self.fieldNames = fieldnames
+        fieldnames = columns.fieldnames
+        assert fieldnames[0] == FIELD_DEPTH_A
+        self.fieldNames = fieldnames
 
-            for row in reader:
-                self.depth_A.append(float(row[FIELD_DEPTH_A]))
+        self.depth_A = columns.get_column(FIELD_DEPTH_A)
 
-                for elementSymbolLine in self.fieldNames[1:]:
-                    symbol, xrayLine = elementSymbolLine.split()
-                    self.phirhozs.setdefault((symbol.strip(), xrayLine.strip()), []).append(float(row[elementSymbolLine]))
+        for elementSymbolLine in self.fieldNames[1:]:
+            symbol, xrayLine = elementSymbolLine.split()
+            self.phirhozs[(symbol.strip(), xrayLine.strip())] = columns.get_column(elementSymbolLine)
 
-    def write_hdf5(self, hdf5_group):
+    def write_hdf5(self, hdf5_group, storage_policy=None):
         hdf5_group = hdf5_group.require_group(HDF5_PHIRHOZ_GENERATED_CHARACTERISTIC)
         
-        hdf5_group.create_dataset(HDF5_DEPTH_nm, data=self.depth_nm)
+        Hdf5StoragePolicy.create_dataset(hdf5_group, HDF5_DEPTH_nm, self.depth_nm, storage_policy, HDF5_PHIRHOZ_GENERATED_CHARACTERISTIC)
         
         for phirhoz_name in self.phirhozs:
             symbol, subshell = phirhoz_name
             group = hdf5_group.require_group(symbol)
-            group.create_dataset(subshell, data=self.phirhozs[phirhoz_name])
+            Hdf5StoragePolicy.create_dataset(group, subshell, self.phirhozs[phirhoz_name], storage_policy, HDF5_PHIRHOZ_GENERATED_CHARACTERISTIC)
             
     @property
     def fieldNames(self):
@@ -82,7 +82,7 @@ class PhirhozGeneratedCharacteristic(BaseResults.BaseResults):
         self._depth_A = depth_A
     @property
     def depth_nm(self):
-        depths_nm = [depth_A*0.1 for depth_A in self._depth_A]
+        depths_nm = np.asarray(self._depth_A)*0.1
         return depths_nm
 
     @property
@@ -23,6 +23,7 @@ import numpy as np
 # Local modules.
 
 # Project modules
+import pymcxray.FileFormat.Results.Hdf5StoragePolicy as Hdf5StoragePolicy
 import pymcxray.FileFormat.Results.BaseResults as BaseResults
 
 # Globals and constants variables.
@@ -92,7 +93,7 @@ class PhirhozGeneratedCharacteristicThinFilm(BaseResults.BaseResults):
     def get_subshells(self):
         return [HDF5_SUBSHELL_K, HDF5_SUBSHELL_L, HDF5_SUBSHELL_M]
 
-    def write_hdf5(self, hdf5_group):
+    def write_hdf5(self, hdf5_group, storage_policy=None):
         hdf5_group = hdf5_group.require_group(HDF5_PHIRHOZ_GENERATED_CHARACTERISTIC_THIN_FILM)
 
         symbols = self.get_symbols()
@@ -110,7 +111,8 @@ class PhirhozGeneratedCharacteristicThinFilm(BaseResults.BaseResults):
                 for subshell_id, subshell in enumerate(self.get_subshells()):
                     intensity[region_id, subshell_id] = self.getIntensity(region_id, symbol, subshell)
 
-            dataset = hdf5_group.create_dataset(symbol, data=intensity)
+            dataset = Hdf5StoragePolicy.create_dataset(hdf5_group, symbol, intensity, storage_policy,
+                                                       HDF5_PHIRHOZ_GENERATED_CHARACTERISTIC_THIN_FILM)
             dataset.dims.create_scale(region_ids, 'Region ID')
             dataset.dims.create_scale(subshells, 'Subshell')
             dataset.dims[0].attach_scale(region_ids)
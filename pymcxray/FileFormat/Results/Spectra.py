@@ -21,6 +21,7 @@ __svnId__ = "$Id$"
 # Standard library modules.
 
 # Third party modules.
+import numpy as np
 
 # Local modules.
 
@@ -43,34 +44,42 @@ class Spectra(object):
         self._elementSpectra = {}
 
     def read(self, filepath):
-        lines = open(filepath, 'r').readlines()
+        with open(filepath, 'r') as inputFile:
+            lines = inputFile.readlines()
 
-        lineIndex = 0
+        tagIndex = Tags.TagIndex(lines)
+
+        self._readSpecimen(tagIndex)
+
+        self._readRegions(tagIndex)
+
+    def _readBlock(self, tagIndex, lineIndex, numberColumns):
+        """
+        Read the numeric block after the tag line `lineIndex` up to the next empty line.
 
-        lineIndex += self.readSpecimen(lines)
+        :return: tuple (index of the empty line, array of shape (columns, lines))
+        """
+        indexLineStop = tagIndex.findEmptyLine(lineIndex+1)
+        blockLines = tagIndex.lines[lineIndex+1:indexLineStop]
 
-        self.readRegions(lines)
+        if len(blockLines) == 0:
+            data = np.zeros((numberColumns, 0))
+        else:
+            data = np.loadtxt(blockLines, usecols=range(numberColumns), ndmin=2).T
+
+        return min(indexLineStop, len(tagIndex) - 1), data
 
     def readSpecimen(self, lines):
-        lineIndex = 0
+        return self._readSpecimen(Tags.TagIndex(lines))
 
-        lineIndex += self._extracSpecimenHeader(lines)
+    def _readSpecimen(self, tagIndex):
+        lineIndex = 0
 
-        lineIndex = Tags.findTag(TAG_SPECTRUM_SPECIMEN, lines)
+        lineIndex += self._extracSpecimenHeader(tagIndex.lines)
 
-        energies_keV = []
-        intensities = []
-        backgrounds = []
-        for line in lines[lineIndex+1:]:
-            lineIndex += 1
+        lineIndex = tagIndex.findTag(TAG_SPECTRUM_SPECIMEN)
 
-            if line.strip() == "":
-                break
-            else:
-                items = line.split()
-                energies_keV.append(float(items[0]))
-                intensities.append(float(items[1]))
-                backgrounds.append(float(items[2]))
+        lineIndex, (energies_keV, intensities, backgrounds) = self._readBlock(tagIndex, lineIndex, 3)
 
         self._specimenSpectrum = Spectrum.Spectrum()
         self._specimenSpectrum.energies_keV = energies_keV
@@ -133,39 +142,31 @@ class Spectra(object):
         return self._elementSpectra
 
     def readRegions(self, lines):
+        self._readRegions(Tags.TagIndex(lines))
+
+    def _readRegions(self, tagIndex):
         self._regionSpectra = {}
         self._regionParametersList = {}
         self._elementParameters = {}
         self._elementSpectra = {}
 
-        indexList = Tags.findAllTag(TAG_SPECTRUM_REGION, lines, contains="number of elements =")
+        indexList = tagIndex.findAllTag(TAG_SPECTRUM_REGION, contains="number of elements =")
 
         for lineIndex in indexList:
-            self.readRegion(lines[lineIndex:])
+            self._readRegion(tagIndex, lineIndex)
 
     def readRegion(self, lines):
-        lineIndex = 0
-        regionLines = lines[lineIndex:]
-        regionParameters = self._extractRegionHeader(regionLines)
+        self._readRegion(Tags.TagIndex(lines), 0)
+
+    def _readRegion(self, tagIndex, regionLineIndex):
+        regionParameters = self._extractRegionHeader(tagIndex.lines, regionLineIndex)
 
         self._regionParametersList[regionParameters.regionID] = regionParameters
 
         tag = "Region %i spectra and background:" % (regionParameters.regionID)
-        lineIndex = Tags.findTag(tag, regionLines)
-
-        energies_keV = []
-        intensities = []
-        backgrounds = []
-        for line in regionLines[lineIndex+1:]:
-            lineIndex += 1
+        lineIndex = tagIndex.findTag(tag, regionLineIndex)
 
-            if line.strip() == "":
-                break
-            else:
-                items = line.split()
-                energies_keV.append(float(items[0]))
-                intensities.append(float(items[1]))
-                backgrounds.append(float(items[2]))
+        lineIndex, (energies_keV, intensities, backgrounds) = self._readBlock(tagIndex, lineIndex, 3)
 
         regionSpectrum = Spectrum.Spectrum()
         regionSpectrum.energies_keV = energies_keV
@@ -178,26 +179,15 @@ class Spectra(object):
         self._elementSpectra.setdefault(regionParameters.regionID, {})
 
         for element in regionParameters.elements:
-            elementLines = regionLines[lineIndex:]
             tag = "%s weight fraction = %.6f" % (element.name, element.massFraction)
-            elementLineIndex = Tags.findTag(tag, elementLines)
+            elementLineIndex = tagIndex.findTag(tag, lineIndex)
 
-            elementParameters = self._extractElementHeader(elementLines[elementLineIndex:])
+            elementParameters = self._extractElementHeader(tagIndex.lines[elementLineIndex:elementLineIndex+1])
 
             tag = "%s spectra:" % (element.name)
-            elementLineIndex = Tags.findTag(tag, elementLines)
-
-            energies_keV = []
-            intensities = []
-            for line in elementLines[elementLineIndex+1:]:
-                elementLineIndex += 1
+            elementLineIndex = tagIndex.findTag(tag, lineIndex)
 
-                if line.strip() == "":
-                    break
-                else:
-                    items = line.split()
-                    energies_keV.append(float(items[0]))
-                    intensities.append(float(items[1]))
+            elementLineIndex, (energies_keV, intensities) = self._readBlock(tagIndex, elementLineIndex, 2)
 
             elementSpectrum = Spectrum.Spectrum()
             elementSpectrum.energies_keV = energies_keV
@@ -206,13 +196,11 @@ class Spectra(object):
             self._elementParameters[regionParameters.regionID][element.name] = elementParameters
             self._elementSpectra[regionParameters.regionID][element.name] = elementSpectrum
 
-            lineIndex += elementLineIndex
+            lineIndex = elementLineIndex
 
-    def _extractRegionHeader(self, lines):
+    def _extractRegionHeader(self, lines, lineIndex=0):
         regionParameters = RegionParameters.RegionParameters()
 
-        lineIndex = 0
-
         # Region 0 number of elements = 1
         line = lines[lineIndex]
         lineIndex += 1
@@ -21,10 +21,12 @@ __svnId__ = "$Id$"
 # Standard library modules.
 
 # Third party modules.
+import numpy as np
 
 # Local modules.
 
 # Project modules
+import pymcxray.FileFormat.Results.Tags as Tags
 import pymcxray.FileFormat.Results.SpectrumEDS as SpectrumEDS
 import pymcxray.FileFormat.Results.MicroscopeParameters as MicroscopeParameters
 
@@ -63,65 +65,70 @@ class SpectraEDS(object):
         self._parameters = {}
 
     def readFilepath(self, filepath):
-        inputFile = open(filepath, 'r')
-
-        self.readFileObject(inputFile)
+        with open(filepath, 'r') as inputFile:
+            self.readFileObject(inputFile)
 
     def readFileObject(self, inputFile):
         lineIndex = 0
         lines = inputFile.readlines()
         lines =[line.strip() for line in lines]
 
-        if self._isTestInputSection(lines):
+        tagIndex = Tags.TagIndex(lines)
+
+        if self._isTestInputSection(lines, tagIndex):
             lineIndex += self.readTestInputSection(lines)
 
-        if self._isPartialSpectraReferenceSection(lines):
-            lineIndex += self.readPartialSpectraReferenceSection(lines)
+        if self._isPartialSpectraReferenceSection(lines, tagIndex):
+            lineIndex += self._readPartialSpectraReferenceSection(tagIndex)
 
-        if self._isRegionSpectraSection(lines):
-            lineIndex += self.readRegionSpectraSection(lines[lineIndex:])
+        if self._isRegionSpectraSection(lines, tagIndex):
+            lineIndex = self._readRegionSpectraSection(tagIndex, lineIndex)
 
-    def _isTestInputSection(self, lines):
-        return self._isSection(lines, TEST_INPUT_SECTION_START, TEST_INPUT_SECTION_STOP)
+    def _isTestInputSection(self, lines, tagIndex=None):
+        return self._isSection(lines, TEST_INPUT_SECTION_START, TEST_INPUT_SECTION_STOP, tagIndex)
 
-    def _isPartialSpectraReferenceSection(self, lines):
-        return self._isSection(lines, PARTIAL_SPECTRA_REFERENCE_SECTION_START, PARTIAL_SPECTRA_REFERENCE_SECTION_STOP)
+    def _isPartialSpectraReferenceSection(self, lines, tagIndex=None):
+        return self._isSection(lines, PARTIAL_SPECTRA_REFERENCE_SECTION_START, PARTIAL_SPECTRA_REFERENCE_SECTION_STOP,
+                               tagIndex)
 
-    def _isRegionSpectraSection(self, lines):
-        for line in lines:
-            if line.startswith(REGION_SPECTRA_SECTION_START):
-                return True
-        else:
-            return False
+    def _isRegionSpectraSection(self, lines, tagIndex=None):
+        if tagIndex is None:
+            tagIndex = Tags.TagIndex(lines)
 
-    def _isSection(self, lines, lineStart, lineStop):
-        if lineStart in lines and lineStop in lines:
+        try:
+            tagIndex.findTag(REGION_SPECTRA_SECTION_START)
             return True
-        else:
+        except Tags.TagNotFoundError:
             return False
 
+    def _isSection(self, lines, lineStart, lineStop, tagIndex=None):
+        if tagIndex is None:
+            return lineStart in lines and lineStop in lines
+        else:
+            return tagIndex.hasLine(lineStart) and tagIndex.hasLine(lineStop)
+
     def readTestInputSection(self, lines):
         raise NotImplementedError()
 
     def readPartialSpectraReferenceSection(self, lines):
-        indexLineStart = lines.index(PARTIAL_SPECTRA_REFERENCE_SECTION_ORIGINAL)
-        indexLineStop = lines.index(PARTIAL_SPECTRA_REFERENCE_SECTION_ORIGINAL_1024)
-        self.originalSpectrumEDS = SpectrumEDS.SpectrumEDS(lines[indexLineStart+1:indexLineStop])
+        return self._readPartialSpectraReferenceSection(Tags.TagIndex(lines))
 
-        indexLineStart = lines.index(PARTIAL_SPECTRA_REFERENCE_SECTION_ORIGINAL_1024)
-        indexLineStop = lines.index(PARTIAL_SPECTRA_REFERENCE_SECTION_INTERPOLATED)
-        self.original1024SpectrumEDS = SpectrumEDS.SpectrumEDS(lines[indexLineStart+1:indexLineStop])
+    def _readPartialSpectraReferenceSection(self, tagIndex):
+        lines = tagIndex.lines
 
-        indexLineStart = lines.index(PARTIAL_SPECTRA_REFERENCE_SECTION_INTERPOLATED)
-        indexLineStop = lines.index(PARTIAL_SPECTRA_REFERENCE_SECTION_STOP)
-        self.interpolatedSpectrumEDS = SpectrumEDS.SpectrumEDS(lines[indexLineStart+1:indexLineStop])
+        indexLineOriginal = tagIndex.findLine(PARTIAL_SPECTRA_REFERENCE_SECTION_ORIGINAL)
+        indexLineOriginal1024 = tagIndex.findLine(PARTIAL_SPECTRA_REFERENCE_SECTION_ORIGINAL_1024)
+        indexLineInterpolated = tagIndex.findLine(PARTIAL_SPECTRA_REFERENCE_SECTION_INTERPOLATED)
+        indexLineStart = tagIndex.findLine(PARTIAL_SPECTRA_REFERENCE_SECTION_START)
+        indexLineStop = tagIndex.findLine(PARTIAL_SPECTRA_REFERENCE_SECTION_STOP)
 
-        indexLine = lines.index(PARTIAL_SPECTRA_REFERENCE_SECTION_STOP)-1
-        line = lines[indexLine]
+        self.originalSpectrumEDS = SpectrumEDS.SpectrumEDS(lines[indexLineOriginal+1:indexLineOriginal1024])
+        self.original1024SpectrumEDS = SpectrumEDS.SpectrumEDS(lines[indexLineOriginal1024+1:indexLineInterpolated])
+        self.interpolatedSpectrumEDS = SpectrumEDS.SpectrumEDS(lines[indexLineInterpolated+1:indexLineStop])
+
+        line = lines[indexLineStop-1]
         self.totalCountsOriginal, self.totalCountsInterpolated, self.totalCountsSynthetic = self._extractTotalCounts(line)
 
-        indexLineStart = lines.index(PARTIAL_SPECTRA_REFERENCE_SECTION_START)
-        indexLineStop = lines.index(PARTIAL_SPECTRA_REFERENCE_SECTION_STOP)
         return indexLineStop - indexLineStart
 
     def _extractTotalCounts(self, line):
@@ -144,13 +151,64 @@ class SpectraEDS(object):
 
         return totalCountsOriginal, totalCountsInterpolated, totalCountsSynthetic
 
+    def _readChannelBlock(self, tagIndex, indexLine, separator):
+        """
+        Read the block of lines starting with ``Channel`` after the section line `indexLine`.
+
+        The lines have the format ``Channel    0 [0.00000e+000 KeV] = 0.000000`` with `separator` between the energy and
+        the values.
+
+        :return: tuple (channels, energies (keV), array of shape (lines, values))
+        """
+        indexLineStart = indexLine + 1
+        indexLineStop = indexLineStart
+        while indexLineStop < len(tagIndex) and tagIndex.getStrippedLine(indexLineStop).startswith('Channel'):
+            indexLineStop += 1
+
+        numberLines = indexLineStop - indexLineStart
+        if numberLines == 0:
+            return np.zeros(0, dtype=int), np.zeros(0), np.zeros((0, 0))
+
+        text = " ".join(tagIndex.lines[indexLineStart:indexLineStop])
+        for characters in ['Channel', 'KeV', '[', ']', separator]:
+            text = text.replace(characters, ' ')
+        data = np.array(text.split(), dtype=float).reshape(numberLines, -1)
+
+        channels = data[:, 0].astype(int)
+        energies_keV = data[:, 1]
+        values = data[:, 2:]
+
+        return channels, energies_keV, values
+
+    def _readValuesBlock(self, tagIndex, sectionName, numberLines):
+        """
+        Read the values of the `numberLines` lines ``key value`` after the section line.
+
+        :return: tuple (index of the section line, array of the values)
+        """
+        indexLine = tagIndex.findLine(sectionName) + 1
+
+        items = " ".join(tagIndex.lines[indexLine:indexLine+numberLines]).split()
+        if len(items) != 2*numberLines:
+            raise ValueError("Section %s has not %i lines of key value" % (sectionName, numberLines))
+        values = np.array(items[1::2], dtype=float)
+
+        return indexLine, values
+
     def readRegionSpectraSection(self, lines):
-        indexLine = 0
-        for line in lines:
-            if line.startswith(REGION_SPECTRA_SECTION_START):
-                break
-            indexLine += 1
-        else:
+        return self._readRegionSpectraSection(Tags.TagIndex(lines), 0)
+
+    def _readRegionSpectraSection(self, tagIndex, indexLineStart):
+        """
+        Read the region spectra section with the lines after `indexLineStart`.
+
+        :return: the index of the last line of the section relative to `indexLineStart`
+        """
+        lines = tagIndex.lines
+
+        try:
+            indexLine = tagIndex.findTag(REGION_SPECTRA_SECTION_START, indexLineStart)
+        except Tags.TagNotFoundError:
             raise ValueError()
 
         line = lines[indexLine]
@@ -200,105 +258,47 @@ class SpectraEDS(object):
         self._parameters[key] = int(value)
         indexLine += 1
 
-        # todo: extract values from lines.
-        indexLine = lines.index(SECTION_ICC_FROM_XRAY_SPECTRA) + 1
-        for line in lines[indexLine:]:
-            line = line.strip()
-            if line.startswith('Peak'):
-                pass
-            else:
-                break
-
-        # todo: extract values from lines.
-        indexLine = lines.index(SECTION_ICC_FROM_ELECTRON_TRAJECTORIES) + 1
-        for line in lines[indexLine:]:
-            line = line.strip()
-            if line.startswith('Peak'):
-                pass
-            else:
-                break
-
-        # todo: extract values from lines.
-        indexLine = lines.index(SECTION_EIDEAL_EDETECTED_RATIO) + 1
-        for line in lines[indexLine:]:
-            line = line.strip()
-            if line.startswith('Peak'):
-                pass
-            else:
-                break
+        # todo: extract values from the peak lines of the sections.
+        for sectionName in [SECTION_ICC_FROM_XRAY_SPECTRA, SECTION_ICC_FROM_ELECTRON_TRAJECTORIES,
+                            SECTION_EIDEAL_EDETECTED_RATIO]:
+            tagIndex.findLine(sectionName, indexLineStart)
 
         self.iOutSpectrumEDS = SpectrumEDS.SpectrumEDS()
-        indexLine = lines.index(SECTION_I_OUT_CHANNEL) + 1
-        for line in lines[indexLine:]:
-            line = line.strip()
-            if line.startswith('Channel'):
-                # Channel    0 [0.00000e+000 KeV] = 0.000000
-                channelText, value = line.split('=')
-                items = channelText.split()
-                channel = int(items[1])
-                energy_keV = float(items[2][1:])
-                counts = float(value)
-
-                self.iOutSpectrumEDS.channels.append(channel)
-                self.iOutSpectrumEDS.enegies_keV.append(energy_keV)
-                self.iOutSpectrumEDS.countsList.append(counts)
-            else:
-                break
+        indexLine = tagIndex.findLine(SECTION_I_OUT_CHANNEL, indexLineStart)
+        channels, energies_keV, values = self._readChannelBlock(tagIndex, indexLine, '=')
+        self.iOutSpectrumEDS.channels = channels
+        self.iOutSpectrumEDS.enegies_keV = energies_keV
+        self.iOutSpectrumEDS.countsList = values[:, 0] if values.shape[1] > 0 else np.zeros(0)
 
         numberChannelEds = len(self.iOutSpectrumEDS.channels)
 
         self.eNetSpectrumEDS = {}
         for indexPeak in range(self.numberCharateristicPeaks):
             self.eNetSpectrumEDS[indexPeak] = SpectrumEDS.SpectrumEDS()
-        indexLine = lines.index(SECTION_E_NET_PEAK_CHANNEL) + 1
-        for line in lines[indexLine:]:
-            line = line.strip()
-            if line.startswith('Channel'):
-                # Channel    0 [0.00000e+000 KeV]:   0.000e+000 0.000e+000 0.000e+000 0.000e+000 0.000e+000
-                channelText, values = line.split(':')
-                items = channelText.split()
-                channel = int(items[1])
-                energy_keV = float(items[2][1:])
-
-                values = values.split()
-                for indexPeak in range(len(values)):
-                    counts = float(values[indexPeak])
-                    self.eNetSpectrumEDS[indexPeak].channels.append(channel)
-                    self.eNetSpectrumEDS[indexPeak].enegies_keV.append(energy_keV)
-                    self.eNetSpectrumEDS[indexPeak].countsList.append(counts)
-            else:
-                break
-
-        self.pCharacteristic = []
+        indexLine = tagIndex.findLine(SECTION_E_NET_PEAK_CHANNEL, indexLineStart)
+        channels, energies_keV, values = self._readChannelBlock(tagIndex, indexLine, ':')
+        for indexPeak in range(values.shape[1]):
+            self.eNetSpectrumEDS.setdefault(indexPeak, SpectrumEDS.SpectrumEDS())
+            self.eNetSpectrumEDS[indexPeak].channels = channels
+            self.eNetSpectrumEDS[indexPeak].enegies_keV = energies_keV
+            self.eNetSpectrumEDS[indexPeak].countsList = np.ascontiguousarray(values[:, indexPeak])
+
         numberLines = self.numberCharateristicPeaks
         sectionName = "%s(%i)" % (SECTION_P_CHARACTERISTIC_CHAR, numberLines)
-        indexLine = lines.index(sectionName) + 1
-        for line in lines[indexLine:indexLine+numberLines]:
-            line = line.strip()
-            key, value = line.split()
-            self.pCharacteristic.append(float(value))
+        indexLine, self.pCharacteristic = self._readValuesBlock(tagIndex, sectionName, numberLines)
 
-        self.pBackground = []
         numberLines = numberChannelEds
         sectionName = "%s(%i)" % (SECTION_P_BACKGROUND, numberLines)
-        indexLine = lines.index(sectionName) + 1
-        for line in lines[indexLine:indexLine+numberLines]:
-            line = line.strip()
-            key, value = line.split()
-            self.pBackground.append(float(value))
+        indexLine, self.pBackground = self._readValuesBlock(tagIndex, sectionName, numberLines)
 
-        self.continuumCumulativeEquiprobableChannels = []
         numberLines = numberChannelEds
         sectionName = "%s(%i)" % (SECTION_CONTINUUM_CUMULATIVE_EQUIPROBABLE_CHANNELS, numberLines)
-        indexLine = lines.index(sectionName) + 1
-        for line in lines[indexLine:indexLine+numberLines]:
-            line = line.strip()
-            key, value = line.split()
-            self.continuumCumulativeEquiprobableChannels.append(float(value))
+        indexLine, self.continuumCumulativeEquiprobableChannels = self._readValuesBlock(tagIndex, sectionName,
+                                                                                        numberLines)
 
         indexLine += numberLines
 
-        return indexLine
+        return indexLine - indexLineStart
 
     @property
     def regionID(self):
@@ -19,6 +19,7 @@ __svnDate__ = "$Date$"
 __svnId__ = "$Id$"
 
 # Standard library modules.
+import bisect
 
 # Third party modules.
 
@@ -27,6 +28,8 @@ __svnId__ = "$Id$"
 # Project modules
 
 # Globals and constants variables.
+PREFIX_LENGTH = 4
+
 class TagNotFoundError(ValueError): pass
 
 def findTag(tag, lines):
@@ -50,3 +53,94 @@ def findAllTag(tag, lines, contains=None):
                 indexList.append(index)
 
     return indexList
+
+class TagIndex(object):
+    """
+    Index of the lines of a file built in one pass, the lines are grouped by the first characters of the stripped line.
+
+    The methods have the semantics of :py:func:`findTag` and :py:func:`findAllTag`, with a `start` line index to search
+    only the lines after it. The returned line indexes are indexes in `lines`.
+    """
+    def __init__(self, lines, prefix_length=PREFIX_LENGTH):
+        self.lines = lines
+        self.prefix_length = prefix_length
+
+        self._strippedLines = [line.strip() for line in lines]
+        self._index = {}
+        for index, line in enumerate(self._strippedLines):
+            self._index.setdefault(line[:prefix_length], []).append(index)
+
+        self._shortTagCandidates = {}
+
+    def __len__(self):
+        return len(self.lines)
+
+    def getStrippedLine(self, index):
+        return self._strippedLines[index]
+
+    def _getCandidates(self, tag):
+        key = tag[:self.prefix_length]
+        if len(key) == self.prefix_length:
+            return self._index.get(key, [])
+
+        try:
+            return self._shortTagCandidates[key]
+        except KeyError:
+            candidates = []
+            for prefix in self._index:
+                if prefix.startswith(key):
+                    candidates.extend(self._index[prefix])
+            candidates.sort()
+            self._shortTagCandidates[key] = candidates
+            return candidates
+
+    def _iterateCandidates(self, tag, start):
+        candidates = self._getCandidates(tag)
+        for index in candidates[bisect.bisect_left(candidates, start):]:
+            yield index
+
+    def findTag(self, tag, start=0):
+        for index in self._iterateCandidates(tag, start):
+            if self._strippedLines[index].startswith(tag):
+                return index
+
+        message = "Tag %s not found in the lines" % (tag)
+        raise TagNotFoundError(message)
+
+    def findAllTag(self, tag, contains=None, start=0):
+        indexList = []
+        for index in self._iterateCandidates(tag, start):
+            line = self._strippedLines[index]
+            if line.startswith(tag) and (contains is None or contains in line):
+                indexList.append(index)
+
+        return indexList
+
+    def findLine(self, text, start=0):
+        """
+        Index of the first stripped line equal to `text`, as ``lines.index(text)`` with stripped lines.
+        """
+        for index in self._iterateCandidates(text, start):
+            if self._strippedLines[index] == text:
+                return index
+
+        message = "Line %s not found in the lines" % (text)
+        raise TagNotFoundError(message)
+
+    def hasLine(self, text):
+        try:
+            self.findLine(text)
+            return True
+        except TagNotFoundError:
+            return False
+
+    def findEmptyLine(self, start=0):
+        """
+        Index of the first empty line after `start`, the number of lines if there is none.
+        """
+        emptyLines = self._index.get("", [])
+        position = bisect.bisect_left(emptyLines, start)
+        if position < len(emptyLines):
+            return emptyLines[position]
+        else:
+            return len(self.lines)
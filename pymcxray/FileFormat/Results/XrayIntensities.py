@@ -24,6 +24,7 @@ import numpy as np
 # Local modules.
 
 # Project modules
+import pymcxray.FileFormat.Results.Hdf5StoragePolicy as Hdf5StoragePolicy
 import pymcxray.FileFormat.Results.BaseResults as BaseResults
 from pymcxray.ElementProperties import getSymbol
 
@@ -44,10 +45,38 @@ HDF5_REGION_IDS = "Region IDs"
 HDF5_XRAY_LINES = "X-ray lines"
 HDF5_RESULT_TYPES = "Result types"
 
+LINE_PREFIX = "Line "
+
+SUBSHELL_XRAY_LINES = {"K": "Ka1", "L": "Ka1", "M": "Ma"}
+
+TABLE_REGION = "region"
+TABLE_ATOM = "atom"
+TABLE_ATOMIC_NUMBER = "atomic_number"
+TABLE_LINE_CODE = "line_code"
+
+TABLE_RESULT_TYPES = [(LINE_ENERGY_KEV, "line_energy_keV"),
+                      (INTENSITY_GENERATED, "generated"),
+                      (INTENSITY_GENERATED_DETECTED, "generated_detected"),
+                      (INTENSITY_EMITTED, "emitted"),
+                      (INTENSITY_EMITTED_DETECTED, "emitted_detected"),
+                      (DETECTOR_EFFICIENCY, "detector_efficiency")]
+
+TABLE_DTYPE = np.dtype([(TABLE_REGION, np.int32), (TABLE_ATOM, np.int32), (TABLE_ATOMIC_NUMBER, np.int32),
+                        (TABLE_LINE_CODE, np.int16)] +
+                       [(field_name, np.float64) for _result_type, field_name in TABLE_RESULT_TYPES])
+
+def _get_detector_efficiency(intensity):
+    try:
+        return float(intensity[DETECTOR_EFFICIENCY])
+    except (KeyError, TypeError, ValueError):
+        return 0.0
+
 class XrayIntensities(BaseResults.BaseResults):
     def __init__(self):
         super(XrayIntensities, self).__init__()
 
+        self.line_names = self.get_xray_lines()
+        self._region_labels = {}
         self.intensities = []
         self.atomic_numbers = set()
         self.xray_lines = set()
@@ -81,101 +110,150 @@ class XrayIntensities(BaseResults.BaseResults):
 
                 self._intensities.append(intensity)
 
-    def getDetectedIntensity(self, atomicNumber, xrayLine):
-        return self.getIntensityEmittedDetected(atomicNumber, xrayLine)
+        self._set_table(self._create_table(self._intensities))
+
+    def _get_line_code(self, line_label):
+        line_name = line_label.strip()
+        if line_name.startswith(LINE_PREFIX):
+            line_name = line_name[len(LINE_PREFIX):].strip()
+
+        if line_name not in self.line_names:
+            self.line_names.append(line_name)
+
+        return self.line_names.index(line_name)
+
+    def _create_table(self, intensities):
+        """
+        Convert the rows of the csv file in a structured array of type :py:data:`TABLE_DTYPE`.
+
+        The x-ray line label is saved as a code, the index of the line in :py:attr:`line_names`. The region labels
+        of the csv file are kept as the keys of the results by region.
+        """
+        self._region_labels = {}
+        rows = []
+        for intensity in intensities:
+            self._region_labels.setdefault(int(intensity[INDEX_REGION]), intensity[INDEX_REGION])
+            row = [int(intensity[INDEX_REGION]), int(intensity[INDEX_ATOM]), int(intensity[ATOMIC_NUMBER]),
+                   self._get_line_code(intensity[LINE])]
+            row.extend(float(intensity[result_type]) for result_type, _field_name in TABLE_RESULT_TYPES[:-1])
+            row.append(_get_detector_efficiency(intensity))
+            rows.append(tuple(row))
+
+        return np.array(rows, dtype=TABLE_DTYPE)
+
+    def _set_table(self, table):
+        """
+        Set the structured array and build the (atomic number, line code, region) index of the results.
+
+        The index is a dense array, so a query for one element, one line and one region is a direct lookup.
+        Rows with the same key, e.g. the same element in two atoms of a region, are added together.
+        """
+        self.table = table
+        self._line_codes_cache = {}
+
+        self.table_atomic_numbers = np.unique(table[TABLE_ATOMIC_NUMBER])
+        self.table_region_ids = np.unique(table[TABLE_REGION])
+        self._atomic_number_indexes = dict((int(atomic_number), index)
+                                           for index, atomic_number in enumerate(self.table_atomic_numbers))
+
+        index_atomic_numbers = np.searchsorted(self.table_atomic_numbers, table[TABLE_ATOMIC_NUMBER])
+        index_regions = np.searchsorted(self.table_region_ids, table[TABLE_REGION])
+        index_lines = table[TABLE_LINE_CODE].astype(np.intp)
+        shape = (len(self.table_atomic_numbers), len(self.line_names), len(self.table_region_ids))
+
+        self._is_present = np.zeros(shape, dtype=bool)
+        self._is_present[index_atomic_numbers, index_lines, index_regions] = True
+
+        self._results = {}
+        for result_type, field_name in TABLE_RESULT_TYPES:
+            results = np.zeros(shape)
+            np.add.at(results, (index_atomic_numbers, index_lines, index_regions), table[field_name])
+            self._results[result_type] = results
+
+    def get_line_codes(self, xray_line):
+        """
+        Codes of all the x-ray lines starting with `xray_line`, e.g. ``"Ka"`` for the lines Ka1 and Ka2.
+
+        The ``"Line "`` prefix of the csv file label is optional.
+        """
+        try:
+            return self._line_codes_cache[xray_line]
+        except KeyError:
+            line_name = xray_line.strip()
+            if line_name.startswith(LINE_PREFIX):
+                line_name = line_name[len(LINE_PREFIX):]
+
+            line_codes = [line_code for line_code, name in enumerate(self.line_names) if name.startswith(line_name)]
+            line_codes = np.array(line_codes, dtype=np.intp)
+            self._line_codes_cache[xray_line] = line_codes
+            return line_codes
+
+    def _get_intensity(self, result_type, atomicNumber, xrayLine, total):
+        try:
+            index_atomic_number = self._atomic_number_indexes[int(atomicNumber)]
+        except KeyError:
+            return 0.0 if total else {}
+
+        line_codes = self.get_line_codes(xrayLine)
+        values = self._results[result_type][index_atomic_number, line_codes].sum(axis=0)
 
-    def getIntensityEmitted(self, atomicNumber, xrayLine, total=True):
         if total:
-            data = 0.0
-        else:
-            data = {}
+            return float(values.sum())
 
-        for intensity in self.intensities:
-            indexRegion = intensity[INDEX_REGION]
-
-            if not xrayLine.startswith("Line"):
-                xrayLineLabel = "Line %s" % (xrayLine)
-            else:
-                xrayLineLabel = xrayLine
-            if intensity[ATOMIC_NUMBER] == str(atomicNumber) and intensity[LINE].startswith(xrayLineLabel):
-                if not total and indexRegion not in data:
-                    data[indexRegion] = 0.0
-
-                if total:
-                    data += float(intensity[INTENSITY_EMITTED])
-                else:
-                    data[indexRegion] += float(intensity[INTENSITY_EMITTED])
+        is_present = self._is_present[index_atomic_number, line_codes].any(axis=0)
+        data = {}
+        for region_id, value in zip(self.table_region_ids[is_present], values[is_present]):
+            data[self._region_labels.get(int(region_id), str(region_id))] = float(value)
 
         return data
 
-    def getIntensityEmittedDetected(self, atomicNumber, xrayLine, total=True):
-        if total:
-            data = 0.0
-        else:
-            data = {}
-
-        for intensity in self.intensities:
-            indexRegion = intensity[INDEX_REGION]
-
-            xrayLineLabel = "Line %s" % (xrayLine)
-            if intensity[ATOMIC_NUMBER] == str(atomicNumber) and intensity[LINE].startswith(xrayLineLabel):
-                if not total and indexRegion not in data:
-                    data[indexRegion] = 0.0
+    def getDetectedIntensity(self, atomicNumber, xrayLine):
+        return self.getIntensityEmittedDetected(atomicNumber, xrayLine)
 
-                if total:
-                    data += float(intensity[INTENSITY_EMITTED_DETECTED])
-                else:
-                    data[indexRegion] += float(intensity[INTENSITY_EMITTED_DETECTED])
+    def getIntensityEmitted(self, atomicNumber, xrayLine, total=True):
+        return self._get_intensity(INTENSITY_EMITTED, atomicNumber, xrayLine, total)
 
-        return data
+    def getIntensityEmittedDetected(self, atomicNumber, xrayLine, total=True):
+        return self._get_intensity(INTENSITY_EMITTED_DETECTED, atomicNumber, xrayLine, total)
 
     def getIntensityGenerated(self, atomicNumber, xraySubshell, total=False):
-        if total:
-            data = 0.0
-        else:
-            data = {}
-
-        for intensity in self.intensities:
-            indexRegion = intensity[INDEX_REGION]
-
-            if xraySubshell == "K":
-                xrayLine = "Ka1"
-            elif xraySubshell == "L":
-                xrayLine = "Ka1"
-            elif xraySubshell == "M":
-                xrayLine = "Ma"
-            xrayLineLabel = "Line %s" % (xrayLine)
-            if intensity[ATOMIC_NUMBER] == str(atomicNumber) and intensity[LINE].startswith(xrayLineLabel):
-                if not total and indexRegion not in data:
-                    data[indexRegion] = 0.0
-
-                if total:
-                    data += float(intensity[INTENSITY_GENERATED])
-                else:
-                    data[indexRegion] += float(intensity[INTENSITY_GENERATED])
-
-        return data
+        xrayLine = SUBSHELL_XRAY_LINES[xraySubshell]
+        return self._get_intensity(INTENSITY_GENERATED, atomicNumber, xrayLine, total)
 
     def getIntensityGeneratedDetected(self, atomicNumber, xraySubshell):
-        data = {}
-
-        for intensity in self.intensities:
-            indexRegion = intensity[INDEX_REGION]
-
-            if xraySubshell == "K":
-                xrayLine = "Ka1"
-            elif xraySubshell == "L":
-                xrayLine = "Ka1"
-            elif xraySubshell == "M":
-                xrayLine = "Ma"
-            xrayLineLabel = "Line %s" % (xrayLine)
-            if intensity[ATOMIC_NUMBER] == str(atomicNumber) and intensity[LINE].startswith(xrayLineLabel):
-                if indexRegion not in data:
-                    data[indexRegion] = 0.0
+        xrayLine = SUBSHELL_XRAY_LINES[xraySubshell]
+        return self._get_intensity(INTENSITY_GENERATED_DETECTED, atomicNumber, xrayLine, total=False)
+
+    def get_intensities(self, result_type=INTENSITY_EMITTED_DETECTED, atomic_numbers=None, xray_lines=None,
+                        total=True):
+        """
+        Intensities of many elements and x-ray lines in one call.
+
+        :param result_type: one of the intensity columns, e.g. :py:data:`INTENSITY_EMITTED`
+        :param atomic_numbers: list of atomic numbers, all the elements of the results by default
+        :param xray_lines: list of x-ray lines or line prefixes, all the lines of the results by default
+        :param total: sum the intensities of all regions
+        :return: array of shape (atomic numbers, x-ray lines) if `total` else (atomic numbers, x-ray lines, regions),
+            the regions are :py:attr:`table_region_ids`
+        """
+        if atomic_numbers is None:
+            atomic_numbers = self.table_atomic_numbers
+        if xray_lines is None:
+            xray_lines = self.line_names
+
+        results = self._results[result_type]
+        intensities = np.zeros((len(atomic_numbers), len(xray_lines), len(self.table_region_ids)))
+        for index_line, xray_line in enumerate(xray_lines):
+            line_results = results[:, self.get_line_codes(xray_line)].sum(axis=1)
+            for index_atomic_number, atomic_number in enumerate(atomic_numbers):
+                if int(atomic_number) in self._atomic_number_indexes:
+                    intensities[index_atomic_number, index_line] = \
+                        line_results[self._atomic_number_indexes[int(atomic_number)]]
 
-                data[indexRegion] += float(intensity[INTENSITY_GENERATED_DETECTED])
-
-        return data
+        if total:
+            return intensities.sum(axis=2)
+        else:
+            return intensities
 
     def getAtomicNumberLineEnergySets(self):
         atomicNumberLineSets = set()
@@ -208,7 +286,7 @@ class XrayIntensities(BaseResults.BaseResults):
         else:
             return 0.0
 
-    def write_hdf5(self, hdf5_group):
+    def write_hdf5(self, hdf5_group, storage_policy=None):
         hdf5_group = hdf5_group.require_group(HDF5_INTENSITY)
 
         data = np.array(sorted(list(self.regions)))
@@ -228,24 +306,15 @@ class XrayIntensities(BaseResults.BaseResults):
 
             result_data = np.zeros(shape)
 
-            for intensity in self._intensities:
-                if int(intensity[ATOMIC_NUMBER]) == atomic_number:
-                    index_region = int(intensity[INDEX_REGION])
-                    xray_line = intensity[LINE][5:].strip()
-                    index_line = self.get_xray_lines().index(xray_line)
-
-                    result_data[index_region, index_line, 0] = float(intensity[LINE_ENERGY_KEV])
-                    result_data[index_region, index_line, 1] = float(intensity[INTENSITY_GENERATED])
-                    result_data[index_region, index_line, 2] = float(intensity[INTENSITY_GENERATED_DETECTED])
-                    result_data[index_region, index_line, 3] = float(intensity[INTENSITY_EMITTED])
-                    result_data[index_region, index_line, 4] = float(intensity[INTENSITY_EMITTED_DETECTED])
-                    try:
-                        result_data[index_region, index_line, 5] = float(intensity[DETECTOR_EFFICIENCY])
-                    except ValueError:
-                        result_data[index_region, index_line, 5] = 0.0
+            table = self.table[self.table[TABLE_ATOMIC_NUMBER] == atomic_number]
+            for line_code in np.unique(table[TABLE_LINE_CODE]):
+                if line_code >= len(xray_lines):
+                    raise ValueError("X-ray line %s not in the HDF5 x-ray lines" % (self.line_names[line_code]))
+            for index_result_type, (_result_type, field_name) in enumerate(TABLE_RESULT_TYPES):
+                result_data[table[TABLE_REGION], table[TABLE_LINE_CODE], index_result_type] = table[field_name]
 
             symbol = getSymbol(atomic_number)
-            dataset = hdf5_group.create_dataset(symbol, data=result_data)
+            dataset = Hdf5StoragePolicy.create_dataset(hdf5_group, symbol, result_data, storage_policy, HDF5_INTENSITY)
             dataset.dims.create_scale(region_ids, 'Region ID')
             dataset.dims.create_scale(xray_lines, 'X-ray line')
             dataset.dims.create_scale(result_types, 'Result types')
@@ -300,6 +369,7 @@ class XrayIntensities(BaseResults.BaseResults):
     @intensities.setter
     def intensities(self, intensities):
         self._intensities = intensities
+        self._set_table(self._create_table(intensities))
 
     @property
     def numberIntensities(self):
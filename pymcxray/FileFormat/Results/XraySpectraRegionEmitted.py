@@ -15,7 +15,6 @@ __license__ = "GPL 3"
 
 # Standard library modules.
 import os.path
-import csv
 
 # Third party modules.
 
@@ -23,6 +22,7 @@ import csv
 
 # Project modules
 import pymcxray.FileFormat.Results.BaseResults as BaseResults
+import pymcxray.FileFormat.Results.ColumnarCsv as ColumnarCsv
 
 # Globals and constants variables.
 FIELD_ENERGY = "Energy (keV)"
@@ -30,7 +30,25 @@ FIELD_TOTAL = " Spectrum Total"
 FIELD_CHARACTERISTIC = " Spectrum Lines"
 FIELD_BREMSSTRAHLUNG = " Spectrum Bremsstrahlung"
 
-class XraySpectraRegionEmitted(BaseResults.BaseResults):
+REGION_FILENAME_SUFFIX = "_SpectraPerElectron_1_srkeV_Region_%i.csv"
+
+def read_region_file(filepath):
+    """
+    Read one region spectra file.
+
+    :return: :py:class:`ColumnarCsv.ColumnarCsv` of the file
+    """
+    columns = ColumnarCsv.read_csv(filepath)
+
+    fieldnames = columns.fieldnames
+    assert fieldnames[0] == FIELD_ENERGY
+    assert fieldnames[1] == FIELD_TOTAL
+    assert fieldnames[2] == FIELD_CHARACTERISTIC
+    assert fieldnames[3] == FIELD_BREMSSTRAHLUNG
+
+    return columns
+
+class XraySpectraRegionEmitted(BaseResults.BaseSpectrumResults):
     def __init__(self):
         super(XraySpectraRegionEmitted, self).__init__()
 
@@ -42,67 +60,57 @@ class XraySpectraRegionEmitted(BaseResults.BaseResults):
         self.characteristic_1_ekeVsr = []
         self.bremsstrahlung_1_ekeVsr = []
 
-        suffix = "_SpectraPerElectron_1_srkeV_Region_%i.csv" % (regionID)
+        suffix = REGION_FILENAME_SUFFIX % (regionID)
         filename = self.basename + suffix
         filepath = os.path.join(self.path, filename)
 
         if not os.path.isfile(filepath):
             raise ValueError
 
-        self._read_fast(filepath)
+        self._read(filepath)
 
     def _read(self, filepath):
-        with open(filepath, 'r') as csvFile:
-            reader = csv.DictReader(csvFile)
-
-            fieldnames = reader.fieldnames
-            assert fieldnames[0] == FIELD_ENERGY
-            assert fieldnames[1] == FIELD_TOTAL
-            assert fieldnames[2] == FIELD_CHARACTERISTIC
-            assert fieldnames[3] == FIELD_BREMSSTRAHLUNG
-
-            self.fieldnames = fieldnames
-
-            for row in reader:
-                self.energies_keV.append(float(row[FIELD_ENERGY]))
-                self.total_1_ekeVsr.append(float(row[FIELD_TOTAL]))
-                self.characteristic_1_ekeVsr.append(float(row[FIELD_CHARACTERISTIC]))
-                self.bremsstrahlung_1_ekeVsr.append(float(row[FIELD_BREMSSTRAHLUNG]))
-
-    def _read_fast(self, filepath):
-        with open(filepath, 'r') as csvFile:
-            reader = csv.reader(csvFile)
-            next(reader)
-
-            for items in reader:
-                self.energies_keV.append(float(items[0]))
-                self.total_1_ekeVsr.append(float(items[1]))
-                self.characteristic_1_ekeVsr.append(float(items[2]))
-                self.bremsstrahlung_1_ekeVsr.append(float(items[3]))
+        columns = read_region_file(filepath)
 
-    def _indice(self, energy_keV):
-        energy_keV = float(energy_keV)
-        delta_eV = self.energies_keV[0]
-        for index, E_keV in enumerate(self.energies_keV):
-#            if E_keV - delta_eV <= energy_keV < E_keV + delta_eV:
-            if energy_keV > E_keV + delta_eV:
-                continue
-            else:
-                return index
+        self.fieldnames = columns.fieldnames
+
+        self.energies_keV = columns.get_column(FIELD_ENERGY)
+        self.total_1_ekeVsr = columns.get_column(FIELD_TOTAL)
+        self.characteristic_1_ekeVsr = columns.get_column(FIELD_CHARACTERISTIC)
+        self.bremsstrahlung_1_ekeVsr = columns.get_column(FIELD_BREMSSTRAHLUNG)
 
-        raise IndexError
+    def _indice(self, energy_keV):
+        return self.get_index(energy_keV)
 
     def totalValue_1_ekeVsr(self, energy_keV):
-            index = self._indice(energy_keV)
-            return self._total_1_ekeVsr[index]
+        index = self._indice(energy_keV)
+        return self.total_1_ekeVsr[index]
 
     def characteristicValue_1_ekeVsr(self, energy_keV):
-            index = self._indice(energy_keV)
-            return self.characteristic_1_ekeVsr[index]
+        index = self._indice(energy_keV)
+        return self.characteristic_1_ekeVsr[index]
 
     def bremsstrahlungValue_1_ekeVsr(self, energy_keV):
-            index = self._indice(energy_keV)
-            return self.bremsstrahlung_1_ekeVsr[index]
+        index = self._indice(energy_keV)
+        return self.bremsstrahlung_1_ekeVsr[index]
+
+    def totalValues_1_ekeVsr(self, energies_keV):
+        return self.get_values(self.total_1_ekeVsr, energies_keV)
+
+    def characteristicValues_1_ekeVsr(self, energies_keV):
+        return self.get_values(self.characteristic_1_ekeVsr, energies_keV)
+
+    def bremsstrahlungValues_1_ekeVsr(self, energies_keV):
+        return self.get_values(self.bremsstrahlung_1_ekeVsr, energies_keV)
+
+    def totalWindowSums_1_ekeVsr(self, lower_energies_keV, upper_energies_keV):
+        return self.get_window_sums(self.total_1_ekeVsr, lower_energies_keV, upper_energies_keV)
+
+    def characteristicWindowSums_1_ekeVsr(self, lower_energies_keV, upper_energies_keV):
+        return self.get_window_sums(self.characteristic_1_ekeVsr, lower_energies_keV, upper_energies_keV)
+
+    def bremsstrahlungWindowSums_1_ekeVsr(self, lower_energies_keV, upper_energies_keV):
+        return self.get_window_sums(self.bremsstrahlung_1_ekeVsr, lower_energies_keV, upper_energies_keV)
 
     @property
     def fieldnames(self):
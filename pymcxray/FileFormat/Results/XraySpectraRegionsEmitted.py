@@ -14,6 +14,9 @@ __copyright__ = "Copyright (c) 2015 Hendrix Demers"
 __license__ = "GPL 3"
 
 # Standard library modules.
+import os
+import os.path
+from concurrent.futures import ThreadPoolExecutor
 
 # Third party modules.
 import numpy as np
@@ -21,7 +24,9 @@ import numpy as np
 # Local modules.
 
 # Project modules
-from pymcxray.FileFormat.Results.XraySpectraRegionEmitted import XraySpectraRegionEmitted
+import pymcxray.FileFormat.Results.Hdf5StoragePolicy as Hdf5StoragePolicy
+from pymcxray.FileFormat.Results.XraySpectraRegionEmitted import XraySpectraRegionEmitted, read_region_file, \
+    REGION_FILENAME_SUFFIX, FIELD_ENERGY, FIELD_TOTAL, FIELD_CHARACTERISTIC, FIELD_BREMSSTRAHLUNG
 
 # Globals and constants variables.
 
@@ -31,42 +36,118 @@ HDF5_TOTAL = "total_1_ekeVsr"
 HDF5_CHARACTERISTIC = "characteristic_1_ekeVsr"
 HDF5_BREMSSTRAHLUNG = "bremsstrahlung_1_ekeVsr"
 
-class XraySpectraRegionsEmitted(XraySpectraRegionEmitted):
-
-    def read(self):
-        regionID = 0
-        super(XraySpectraRegionsEmitted, self).read(regionID=regionID)
-
-        energies_keV = np.array(self.energies_keV)
-        total_1_ekeVsr = np.array(self.total_1_ekeVsr)
-        characteristic_1_ekeVsr = np.array(self.characteristic_1_ekeVsr)
-        bremsstrahlung_1_ekeVsr = np.array(self.bremsstrahlung_1_ekeVsr)
-
-        regionID += 1
+SPECTRA_FIELDS = [FIELD_TOTAL, FIELD_CHARACTERISTIC, FIELD_BREMSSTRAHLUNG]
 
-        while True or regionID < 20:
+class XraySpectraRegionsEmitted(XraySpectraRegionEmitted):
+    def __init__(self, keep_regions=False, number_threads=1, file_names=None):
+        """
+        Sum of the emitted spectra of all regions.
+
+        :param keep_regions: keep the spectra of each region in arrays of shape (regions, channels)
+        :param number_threads: number of threads reading the region files, one per processor if None
+        :param file_names: set of the file names of the results folder shared by the reads of all the simulations,
+            e.g. from :py:meth:`pymcxray.CompletionIndex.CompletionIndex.get_file_names`, the results folder is listed
+            once by each read if None
+        """
+        super(XraySpectraRegionsEmitted, self).__init__()
+
+        self.keep_regions = keep_regions
+        self.number_threads = number_threads
+        self.file_names = file_names
+
+        self.region_ids = []
+        self.regions_total_1_ekeVsr = None
+        self.regions_characteristic_1_ekeVsr = None
+        self.regions_bremsstrahlung_1_ekeVsr = None
+
+    def get_region_filepaths(self):
+        """
+        Find the region spectra files, the region ids start at 0 and stop at the first missing file.
+
+        :return: list of tuple (region id, file path) sorted by region id
+        """
+        file_names = self.file_names
+        if file_names is None:
             try:
-                super(XraySpectraRegionsEmitted, self).read(regionID=regionID)
-
-                total_1_ekeVsr += np.array(self.total_1_ekeVsr)
-                characteristic_1_ekeVsr += np.array(self.characteristic_1_ekeVsr)
-                bremsstrahlung_1_ekeVsr += np.array(self.bremsstrahlung_1_ekeVsr)
-                regionID += 1
-            except ValueError:
+                file_names = set(os.listdir(self.path))
+            except OSError:
+                file_names = set()
+
+        region_filepaths = []
+        region_id = 0
+        while True:
+            filename = self.basename + REGION_FILENAME_SUFFIX % (region_id)
+            if filename not in file_names:
                 break
 
-        self.energies_keV = list(energies_keV)
-        self.total_1_ekeVsr = list(total_1_ekeVsr)
-        self.characteristic_1_ekeVsr = list(characteristic_1_ekeVsr)
-        self.bremsstrahlung_1_ekeVsr = list(bremsstrahlung_1_ekeVsr)
+            region_filepaths.append((region_id, os.path.join(self.path, filename)))
+            region_id += 1
 
-    def write_hdf5(self, hdf5_group):
+        return region_filepaths
+
+    def read(self):
+        region_filepaths = self.get_region_filepaths()
+        if len(region_filepaths) == 0:
+            raise ValueError("No region spectra files for %s in %s" % (self.basename, self.path))
+
+        self.region_ids = [region_id for region_id, _filepath in region_filepaths]
+        filepaths = [filepath for _region_id, filepath in region_filepaths]
+
+        number_threads = self.number_threads
+        if number_threads is None:
+            number_threads = os.cpu_count() or 1
+        number_threads = max(1, min(number_threads, len(filepaths)))
+
+        if number_threads == 1:
+            self._add_regions(map(read_region_file, filepaths))
+        else:
+            with ThreadPoolExecutor(max_workers=number_threads) as executor:
+                self._add_regions(executor.map(read_region_file, filepaths))
+
+    def _add_regions(self, regions_columns):
+        """
+        Add the spectra of the regions in preallocated arrays in the order of :py:attr:`region_ids`.
+        """
+        spectra = None
+        regions_spectra = None
+
+        for index_region, columns in enumerate(regions_columns):
+            if spectra is None:
+                self.fieldnames = columns.fieldnames
+                self.energies_keV = columns.get_column(FIELD_ENERGY)
+                number_channels = len(self.energies_keV)
+
+                spectra = np.zeros((len(SPECTRA_FIELDS), number_channels))
+                if self.keep_regions:
+                    regions_spectra = np.zeros((len(SPECTRA_FIELDS), len(self.region_ids), number_channels))
+
+            if columns.number_rows != number_channels:
+                raise ValueError("Region %i has %i channels instead of %i" %
+                                 (self.region_ids[index_region], columns.number_rows, number_channels))
+
+            for index_field, field in enumerate(SPECTRA_FIELDS):
+                values = columns.get_column(field)
+                spectra[index_field] += values
+                if regions_spectra is not None:
+                    regions_spectra[index_field, index_region] = values
+
+        self.total_1_ekeVsr, self.characteristic_1_ekeVsr, self.bremsstrahlung_1_ekeVsr = spectra
+
+        if regions_spectra is not None:
+            self.regions_total_1_ekeVsr, self.regions_characteristic_1_ekeVsr, \
+                self.regions_bremsstrahlung_1_ekeVsr = regions_spectra
+        else:
+            self.regions_total_1_ekeVsr = None
+            self.regions_characteristic_1_ekeVsr = None
+            self.regions_bremsstrahlung_1_ekeVsr = None
+
+    def write_hdf5(self, hdf5_group, storage_policy=None):
         hdf5_group = hdf5_group.require_group(HDF5_XRAY_SPECTRA_REGIONS_EMITTED)
 
-        hdf5_group.create_dataset(HDF5_ENERGIES_keV, data=self.energies_keV)
-        hdf5_group.create_dataset(HDF5_TOTAL, data=self.total_1_ekeVsr)
-        hdf5_group.create_dataset(HDF5_CHARACTERISTIC, data=self.characteristic_1_ekeVsr)
-        hdf5_group.create_dataset(HDF5_BREMSSTRAHLUNG, data=self.bremsstrahlung_1_ekeVsr)
+        Hdf5StoragePolicy.create_dataset(hdf5_group, HDF5_ENERGIES_keV, self.energies_keV, storage_policy, HDF5_XRAY_SPECTRA_REGIONS_EMITTED)
+        Hdf5StoragePolicy.create_dataset(hdf5_group, HDF5_TOTAL, self.total_1_ekeVsr, storage_policy, HDF5_XRAY_SPECTRA_REGIONS_EMITTED)
+        Hdf5StoragePolicy.create_dataset(hdf5_group, HDF5_CHARACTERISTIC, self.characteristic_1_ekeVsr, storage_policy, HDF5_XRAY_SPECTRA_REGIONS_EMITTED)
+        Hdf5StoragePolicy.create_dataset(hdf5_group, HDF5_BREMSSTRAHLUNG, self.bremsstrahlung_1_ekeVsr, storage_policy, HDF5_XRAY_SPECTRA_REGIONS_EMITTED)
 
 def run():
     pass
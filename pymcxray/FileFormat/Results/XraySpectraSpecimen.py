@@ -15,14 +15,15 @@ __license__ = ""
 
 # Standard library modules.
 import os.path
-import csv
 
 # Third party modules.
 
 # Local modules.
 
 # Project modules
+import pymcxray.FileFormat.Results.Hdf5StoragePolicy as Hdf5StoragePolicy
 import pymcxray.FileFormat.Results.BaseResults as BaseResults
+import pymcxray.FileFormat.Results.ColumnarCsv as ColumnarCsv
 
 # Globals and constants variables.
 ENERGIES_keV = "Energy (keV)"
@@ -36,7 +37,7 @@ HDF5_TOTAL = SPECTRUM_TOTAL
 HDF5_CHARACTERISTIC = SPECTRUM_LINES
 HDF5_BREMSSTRAHLUNG = SPECTRUM_BREMSSTRAHLUNG
 
-class XraySpectraSpecimen(BaseResults.BaseResults):
+class XraySpectraSpecimen(BaseResults.BaseSpectrumResults):
     def __init__(self):
         super(XraySpectraSpecimen, self).__init__()
 
@@ -50,24 +51,20 @@ class XraySpectraSpecimen(BaseResults.BaseResults):
         filename = self.basename + suffix
         filepath = os.path.join(self.path, filename)
 
-        with open(filepath, 'r') as csvFile:
-            reader = csv.DictReader(csvFile, self.fieldNames)
-            # Skip header row
-            next(reader)
+        columns = ColumnarCsv.read_csv(filepath, self.fieldNames)
 
-            for row in reader:
-                self.energies_keV.append(float(row[ENERGIES_keV]))
-                self.totals.append(float(row[SPECTRUM_TOTAL]))
-                self.characteristics.append(float(row[SPECTRUM_LINES]))
-                self.backgrounds.append(float(row[SPECTRUM_BREMSSTRAHLUNG]))
+        self.energies_keV = columns.get_column(ENERGIES_keV)
+        self.totals = columns.get_column(SPECTRUM_TOTAL)
+        self.characteristics = columns.get_column(SPECTRUM_LINES)
+        self.backgrounds = columns.get_column(SPECTRUM_BREMSSTRAHLUNG)
 
-    def write_hdf5(self, hdf5_group):
+    def write_hdf5(self, hdf5_group, storage_policy=None):
         hdf5_group = hdf5_group.require_group(HDF5_XRAY_SPECTRA_SPECIMEN)
 
-        hdf5_group.create_dataset(HDF5_ENERGIES_keV, data=self.energies_keV)
-        hdf5_group.create_dataset(HDF5_TOTAL, data=self.totals)
-        hdf5_group.create_dataset(HDF5_CHARACTERISTIC, data=self.characteristics)
-        hdf5_group.create_dataset(HDF5_BREMSSTRAHLUNG, data=self.backgrounds)
+        Hdf5StoragePolicy.create_dataset(hdf5_group, HDF5_ENERGIES_keV, self.energies_keV, storage_policy, HDF5_XRAY_SPECTRA_SPECIMEN)
+        Hdf5StoragePolicy.create_dataset(hdf5_group, HDF5_TOTAL, self.totals, storage_policy, HDF5_XRAY_SPECTRA_SPECIMEN)
+        Hdf5StoragePolicy.create_dataset(hdf5_group, HDF5_CHARACTERISTIC, self.characteristics, storage_policy, HDF5_XRAY_SPECTRA_SPECIMEN)
+        Hdf5StoragePolicy.create_dataset(hdf5_group, HDF5_BREMSSTRAHLUNG, self.backgrounds, storage_policy, HDF5_XRAY_SPECTRA_SPECIMEN)
 
     @property
     def fieldNames(self):
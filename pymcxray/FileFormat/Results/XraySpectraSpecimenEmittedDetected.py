@@ -15,15 +15,15 @@ __license__ = ""
 
 # Standard library modules.
 import os.path
-import csv
 
 # Third party modules.
-import numpy as np
 
 # Local modules.
 
 # Project modules
+import pymcxray.FileFormat.Results.Hdf5StoragePolicy as Hdf5StoragePolicy
 import pymcxray.FileFormat.Results.BaseResults as BaseResults
+import pymcxray.FileFormat.Results.ColumnarCsv as ColumnarCsv
 
 # Globals and constants variables.
 ENERGIES_keV = "Energy (keV)"
@@ -37,7 +37,7 @@ HDF5_TOTAL = SPECTRUM_TOTAL
 HDF5_CHARACTERISTIC = SPECTRUM_LINES
 HDF5_BREMSSTRAHLUNG = SPECTRUM_BREMSSTRAHLUNG
 
-class XraySpectraSpecimenEmittedDetected(BaseResults.BaseResults):
+class XraySpectraSpecimenEmittedDetected(BaseResults.BaseSpectrumResults):
     def __init__(self):
         super(XraySpectraSpecimenEmittedDetected, self).__init__()
 
@@ -52,47 +52,22 @@ class XraySpectraSpecimenEmittedDetected(BaseResults.BaseResults):
         filepath = os.path.join(self.path, filename)
 
         self._read(filepath)
-        #self._read_fast(filepath)
 
     def _read(self, file_path):
-        with open(file_path, 'r') as csvFile:
-            reader = csv.DictReader(csvFile, self.fieldNames)
-            # Skip header row
-            next(reader)
+        columns = ColumnarCsv.read_csv(file_path, self.fieldNames)
 
-            for row in reader:
-                self.energies_keV.append(float(row[ENERGIES_keV]))
-                self.totals.append(float(row[SPECTRUM_TOTAL]))
-                self.characteristics.append(float(row[SPECTRUM_LINES]))
-                self.backgrounds.append(float(row[SPECTRUM_BREMSSTRAHLUNG]))
+        self.energies_keV = columns.get_column(ENERGIES_keV)
+        self.totals = columns.get_column(SPECTRUM_TOTAL)
+        self.characteristics = columns.get_column(SPECTRUM_LINES)
+        self.backgrounds = columns.get_column(SPECTRUM_BREMSSTRAHLUNG)
 
-    def _read(self, file_path):
-        with open(file_path, 'r') as csvFile:
-            reader = csv.reader(csvFile, self.fieldNames)
-            # Skip header row
-            next(reader)
-
-            for items in reader:
-                self.energies_keV.append(float(items[0]))
-                self.totals.append(float(items[1]))
-                self.characteristics.append(float(items[2]))
-                self.backgrounds.append(float(items[3]))
-
-    def _read_fast(self, file_path):
-        with open(file_path, 'r') as data_file:
-            data = np.loadtxt(data_file, dtype=float, delimiter =',', skiprows=1)
-            self.energies_keV = data[:,0].tolist()
-            self.totals = data[:,1].tolist()
-            self.characteristics = data[:,2].tolist()
-            self.backgrounds = data[:,3].tolist()
-
-    def write_hdf5(self, hdf5_group):
+    def write_hdf5(self, hdf5_group, storage_policy=None):
         hdf5_group = hdf5_group.require_group(HDF5_XRAY_SPECTRA_SPECIMEN_EMITTED_DETECTED)
 
-        hdf5_group.create_dataset(HDF5_ENERGIES_keV, data=self.energies_keV)
-        hdf5_group.create_dataset(HDF5_TOTAL, data=self.totals)
-        hdf5_group.create_dataset(HDF5_CHARACTERISTIC, data=self.characteristics)
-        hdf5_group.create_dataset(HDF5_BREMSSTRAHLUNG, data=self.backgrounds)
+        Hdf5StoragePolicy.create_dataset(hdf5_group, HDF5_ENERGIES_keV, self.energies_keV, storage_policy, HDF5_XRAY_SPECTRA_SPECIMEN_EMITTED_DETECTED)
+        Hdf5StoragePolicy.create_dataset(hdf5_group, HDF5_TOTAL, self.totals, storage_policy, HDF5_XRAY_SPECTRA_SPECIMEN_EMITTED_DETECTED)
+        Hdf5StoragePolicy.create_dataset(hdf5_group, HDF5_CHARACTERISTIC, self.characteristics, storage_policy, HDF5_XRAY_SPECTRA_SPECIMEN_EMITTED_DETECTED)
+        Hdf5StoragePolicy.create_dataset(hdf5_group, HDF5_BREMSSTRAHLUNG, self.backgrounds, storage_policy, HDF5_XRAY_SPECTRA_SPECIMEN_EMITTED_DETECTED)
 
     @property
     def fieldNames(self):
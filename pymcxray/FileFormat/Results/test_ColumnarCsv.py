@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: FileFormat.Results.test_ColumnarCsv
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module `ColumnarCsv`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+import os.path
+import tempfile
+import shutil
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules
+import pymcxray.FileFormat.Results.ColumnarCsv as ColumnarCsv
+from pymcxray.FileFormat.Results.PhirhozGeneratedCharacteristic import PhirhozGeneratedCharacteristic
+from pymcxray.FileFormat.Results.PhirhozGeneratedCharacteristicThinFilm import \
+    PhirhozGeneratedCharacteristicThinFilm, SUBSHELL_K, ATOM_SYMBOL
+from pymcxray.FileFormat.Results.XraySpectraRegionsEmitted import XraySpectraRegionsEmitted
+
+# Globals and constants variables.
+
+
+class TestColumnarCsv(unittest.TestCase):
+    """
+    TestCase class for the module `ColumnarCsv`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+        self.temporary_path = tempfile.mkdtemp(prefix="Test_ColumnarCsv_")
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+        shutil.rmtree(self.temporary_path)
+
+    def _write_file(self, filename, lines):
+        file_path = os.path.join(self.temporary_path, filename)
+        with open(file_path, 'w') as csv_file:
+            for line in lines:
+                csv_file.write(line + "\n")
+
+        return file_path
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_read_csv(self):
+        """
+        Tests for method `read_csv`.
+        """
+
+        file_path = self._write_file("spectrum.csv", ["Energy (keV), Spectrum Total, Spectrum Lines,",
+                                                      "0.005, 1.0e-6, 0,",
+                                                      "0.015, 2.5e-6, 1.0e-7,",
+                                                      ""])
+
+        columns = ColumnarCsv.read_csv(file_path)
+        self.assertEqual(["Energy (keV)", " Spectrum Total", " Spectrum Lines"], columns.fieldnames)
+        self.assertEqual(2, columns.number_rows)
+        self.assertEqual((2, 3), columns.data.shape)
+
+        energies_keV = columns.get_column("Energy (keV)")
+        np.testing.assert_array_almost_equal([0.005, 0.015], energies_keV)
+        self.assertTrue(energies_keV.flags["C_CONTIGUOUS"])
+        self.assertEqual(np.float64, energies_keV.dtype)
+        np.testing.assert_array_almost_equal([0.0, 1.0e-7], columns.get_column(2))
+        self.assertEqual(np.float32, columns.get_column(" Spectrum Total", dtype=np.float32).dtype)
+
+        columns = ColumnarCsv.read_csv(file_path, dtype=np.float32)
+        self.assertEqual(np.float32, columns.get_column(1).dtype)
+
+        file_path = self._write_file("header.csv", ["Depth (A), Cu Ka1"])
+        columns = ColumnarCsv.read_csv(file_path)
+        self.assertEqual(0, columns.number_rows)
+        self.assertEqual(0, len(columns.get_column("Depth (A)")))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_read_results(self):
+        """
+        Tests for the results classes reading their file with `read_csv`.
+        """
+
+        basename = "SimulationTest"
+        self._write_file(basename + "_PhirhozGeneratedCharacteristic_Region0.csv",
+                         ["Depth (A), Cu K, Cu L", "0.0, 1.0, 2.0", "10.0, 1.5, 2.5", "20.0, 0.5, 0.25"])
+        phirhoz = PhirhozGeneratedCharacteristic()
+        phirhoz.path = self.temporary_path
+        phirhoz.basename = basename
+        phirhoz.read()
+        np.testing.assert_array_almost_equal([0.0, 1.0, 2.0], phirhoz.depth_nm)
+        self.assertEqual([("Cu", "K"), ("Cu", "L")], sorted(phirhoz.phirhozs.keys()))
+        np.testing.assert_array_almost_equal([2.0, 2.5, 0.25], phirhoz.phirhozs[("Cu", "L")])
+
+        self._write_file(basename + "_PhirhozGeneratedCharacteristicThinFilm.csv",
+                         ["Region, Symbol, Shell K, Shell L, Shell M", "0, Cu, 390.159, 13367.3, 0",
+                          "1, Cu, 12.5, 140.0, 0"])
+        phirhoz_thin_film = PhirhozGeneratedCharacteristicThinFilm()
+        phirhoz_thin_film.path = self.temporary_path
+        phirhoz_thin_film.basename = basename
+        phirhoz_thin_film.read()
+        self.assertEqual(2, phirhoz_thin_film.numberRegions)
+        self.assertEqual(set(["Cu"]), phirhoz_thin_film.get_symbols())
+        self.assertEqual("Cu", phirhoz_thin_film.intensities[0][ATOM_SYMBOL])
+        self.assertEqual("390.159", phirhoz_thin_film.intensities[0][SUBSHELL_K])
+        self.assertAlmostEqual(12.5, phirhoz_thin_film.getIntensity(1, "Cu", "K"))
+
+        for region_id in range(2):
+            self._write_file(basename + "_SpectraPerElectron_1_srkeV_Region_%i.csv" % (region_id),
+                             ["Energy (keV), Spectrum Total, Spectrum Lines, Spectrum Bremsstrahlung",
+                              "0.005, 3.0, 1.0, 2.0", "0.015, 6.0, 2.0, 4.0"])
+        spectra = XraySpectraRegionsEmitted()
+        spectra.path = self.temporary_path
+        spectra.basename = basename
+        spectra.read()
+        np.testing.assert_array_almost_equal([0.005, 0.015], spectra.energies_keV)
+        np.testing.assert_array_almost_equal([6.0, 12.0], spectra.total_1_ekeVsr)
+        np.testing.assert_array_almost_equal([2.0, 4.0], spectra.characteristic_1_ekeVsr)
+        np.testing.assert_array_almost_equal([4.0, 8.0], spectra.bremsstrahlung_1_ekeVsr)
+
+        #self.fail("Test if the testcase is working.")
+
+if __name__ == '__main__':  #pragma: no cover
+    from pymcxray.Testings import runTestModuleWithCoverage
+    runTestModuleWithCoverage(__file__)
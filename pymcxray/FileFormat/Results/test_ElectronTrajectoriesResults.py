@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: FileFormat.Results.test_ElectronTrajectoriesResults
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module `ElectronTrajectoriesResults`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+import os.path
+import tempfile
+import shutil
+
+# Third party modules.
+import h5py
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+# Local modules.
+
+# Project modules
+import pymcxray.FileFormat.Results.ElectronTrajectoriesResults as ElectronTrajectoriesResults
+import pymcxray.FileFormat.Results.Hdf5StoragePolicy as Hdf5StoragePolicy
+
+# Globals and constants variables.
+HEADER_11_COLUMNS = "Trajectory, Type, X (A), Y (A), Z (A), Corrected X (A), Corrected Y (A), Corrected Z (A), " \
+                    "Energy (keV), Region, Collision type\n"
+LINES_11_COLUMNS = """1, 1, 0.0, 0.0, -10.0, 0.0, 0.0, -10.0, 10.0, 0, 1
+1, 1, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 10.0, 1, 2
+1, 1, 5.0, 1.0, 20.0, 4.0, 2.0, 19.0, 9.5, 1, 5
+2, 2, 0.0, 0.0, -10.0, 0.0, 0.0, -10.0, 10.0, 0, 1
+3, 1, 0.0, 0.0, -10.0, 0.0, 0.0, -10.0, 10.0, 0, 1
+3, 1, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 10.0, 200, 3
+"""
+HEADER_8_COLUMNS = "Trajectory, Type, X (A), Y (A), Z (A), Energy (keV), Region, Collision type\n"
+LINES_8_COLUMNS = """1, 1, 0.0, 0.0, -10.0, 10.0, 0, 1
+1, 1, 5.0, 1.0, 20.0, 9.5, 1, 5
+2, 3, 0.0, 0.0, -10.0, 10.0, 0, 1
+"""
+
+
+class TestElectronTrajectoriesResults(unittest.TestCase):
+    """
+    TestCase class for the module `ElectronTrajectoriesResults`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+        self.temporary_path = tempfile.mkdtemp(prefix="Test_ElectronTrajectoriesResults_")
+        self.hdf5_file_path = os.path.join(self.temporary_path, "results.hdf5")
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+        shutil.rmtree(self.temporary_path)
+
+    def _create_results_file(self, header, lines):
+        file_path = os.path.join(self.temporary_path, "Test_ElectronTrajectoriesResults.csv")
+        with open(file_path, 'w') as results_file:
+            results_file.write(header)
+            results_file.write(lines)
+
+        return file_path
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_read(self):
+        """
+        Tests for method `read`.
+        """
+
+        file_path = self._create_results_file(HEADER_11_COLUMNS, LINES_11_COLUMNS)
+        results = ElectronTrajectoriesResults.ElectronTrajectoriesResults(file_path)
+
+        self.assertEqual(3, results.number_trajectories)
+        self.assertEqual(3, results.maximum_number_collisions)
+        self.assertEqual(6, results.number_collisions)
+        np.testing.assert_array_equal([0, 3, 4, 6], results.offsets)
+        np.testing.assert_array_equal([1, 2, 3], results.trajectory_indexes)
+        np.testing.assert_array_equal([1, 2, 1], results.trajectory_types)
+        self.assertEqual(9, len(results.column_names))
+        np.testing.assert_array_almost_equal([5.0, 1.0, 20.0], [results.get_column(ElectronTrajectoriesResults.HDF5_X_A, 0)[2],
+                                                              results.get_column(ElectronTrajectoriesResults.HDF5_Y_A, 0)[2],
+                                                              results.get_column(ElectronTrajectoriesResults.HDF5_Z_A, 0)[2]])
+
+        results_chunks = ElectronTrajectoriesResults.ElectronTrajectoriesResults(file_path, chunk_size_bytes=10)
+        np.testing.assert_array_equal(results.offsets, results_chunks.offsets)
+        for column_name in results.column_names:
+            np.testing.assert_array_equal(results.get_column(column_name), results_chunks.get_column(column_name))
+
+        trajectories = results.trajectories
+        self.assertEqual(3, len(trajectories))
+        self.assertEqual(3, len(trajectories[0].collisions))
+        self.assertAlmostEqual(19.0, trajectories[0].collisions[2].correctedZ_A)
+        self.assertEqual(200, trajectories[2].collisions[1].indexRegion)
+
+        positions_nm = results.getElectronGunPositions_nm()
+        self.assertEqual(3, len(positions_nm))
+        self.assertAlmostEqual(-1.0, positions_nm[0][2])
+
+        file_path = self._create_results_file(HEADER_8_COLUMNS, LINES_8_COLUMNS)
+        results = ElectronTrajectoriesResults.ElectronTrajectoriesResults(file_path)
+        self.assertEqual(2, results.number_trajectories)
+        self.assertEqual(6, len(results.column_names))
+        self.assertRaises(KeyError, results.get_column, ElectronTrajectoriesResults.HDF5_CORRECTED_X_A)
+
+        file_path = self._create_results_file(HEADER_8_COLUMNS, "")
+        results = ElectronTrajectoriesResults.ElectronTrajectoriesResults(file_path)
+        self.assertEqual(0, results.number_trajectories)
+        self.assertEqual(0, results.number_collisions)
+
+        file_path = self._create_results_file(HEADER_8_COLUMNS, "1, 1, 0.0, 0.0, 1.0\n")
+        self.assertRaises(ValueError, ElectronTrajectoriesResults.ElectronTrajectoriesResults, file_path)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_draw(self):
+        """
+        Tests for the draw methods.
+        """
+
+        file_path = self._create_results_file(HEADER_11_COLUMNS, LINES_11_COLUMNS)
+        results = ElectronTrajectoriesResults.ElectronTrajectoriesResults(file_path)
+
+        results.drawXZ(theta_deg=10.0)
+        results.drawXZ(corrected=True, colorType=ElectronTrajectoriesResults.COLOR_REGION, trajectoryIndexes=[1, 2])
+        results.drawXY(corrected=True)
+        results.drawYZ()
+        plt.close('all')
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_write_hdf5(self):
+        """
+        Tests for method `write_hdf5`.
+        """
+
+        file_path = self._create_results_file(HEADER_11_COLUMNS, LINES_11_COLUMNS)
+        results = ElectronTrajectoriesResults.ElectronTrajectoriesResults(file_path)
+
+        with h5py.File(self.hdf5_file_path, 'w') as hdf5_file:
+            results.write_hdf5(hdf5_file)
+
+        with h5py.File(self.hdf5_file_path, 'r') as hdf5_file:
+            hdf5_group = hdf5_file[ElectronTrajectoriesResults.HDF5_ELECTRON_TRAJECTORIES_RESULTS]
+
+            np.testing.assert_array_equal([0, 3, 4, 6], hdf5_group[ElectronTrajectoriesResults.HDF5_TRAJECTORY_OFFSETS])
+            np.testing.assert_array_equal([1, 2, 3], hdf5_group[ElectronTrajectoriesResults.HDF5_TRAJECTORY_INDEXES])
+            np.testing.assert_array_equal([1, 2, 1], hdf5_group[ElectronTrajectoriesResults.HDF5_TRAJECTORY_TYPES])
+
+            dataset = hdf5_group[ElectronTrajectoriesResults.HDF5_X_A]
+            self.assertEqual(np.float32, dataset.dtype)
+            np.testing.assert_array_equal([0.0, 0.0, 5.0, 0.0, 0.0, 0.0], dataset[...])
+            dataset = hdf5_group[ElectronTrajectoriesResults.HDF5_CORRECTED_Z_A]
+            np.testing.assert_array_equal([-10.0, 0.0, 19.0, -10.0, -10.0, 0.0], dataset[...])
+            dataset = hdf5_group[ElectronTrajectoriesResults.HDF5_COLLISION_TYPE]
+            self.assertEqual(np.int8, dataset.dtype)
+            np.testing.assert_array_equal([1, 2, 5, 1, 1, 3], dataset[...])
+
+            # Region index larger than the int8 range.
+            dataset = hdf5_group[ElectronTrajectoriesResults.HDF5_INDEX_REGION]
+            self.assertEqual(np.int32, dataset.dtype)
+            self.assertEqual(200, dataset[5])
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_write_hdf5_8_columns(self):
+        """
+        Tests for method `write_hdf5` with a file without the corrected positions.
+        """
+
+        file_path = self._create_results_file(HEADER_8_COLUMNS, LINES_8_COLUMNS)
+        results = ElectronTrajectoriesResults.ElectronTrajectoriesResults(file_path)
+
+        with h5py.File(self.hdf5_file_path, 'w') as hdf5_file:
+            results.write_hdf5(hdf5_file, Hdf5StoragePolicy.create_gzip_policy())
+
+        with h5py.File(self.hdf5_file_path, 'r') as hdf5_file:
+            trajectories = ElectronTrajectoriesResults.ElectronTrajectoriesResultsHdf5(hdf5_file)
+
+            self.assertEqual(2, len(trajectories))
+            self.assertEqual(3, trajectories.number_collisions)
+            self.assertFalse(ElectronTrajectoriesResults.HDF5_CORRECTED_X_A in trajectories.column_names)
+            self.assertEqual(6, len(trajectories.column_names))
+
+            trajectory = trajectories[1]
+            self.assertEqual(2, trajectory.index)
+            self.assertEqual(3, trajectory.trajectoryType)
+            self.assertEqual(1, len(trajectory.collisions))
+            self.assertAlmostEqual(-10.0, trajectory.collisions[0].z_A)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_ElectronTrajectoriesResultsHdf5(self):
+        """
+        Tests for class `ElectronTrajectoriesResultsHdf5`.
+        """
+
+        file_path = self._create_results_file(HEADER_11_COLUMNS, LINES_11_COLUMNS)
+        results = ElectronTrajectoriesResults.ElectronTrajectoriesResults(file_path)
+
+        with h5py.File(self.hdf5_file_path, 'w') as hdf5_file:
+            results.write_hdf5(hdf5_file)
+
+        with h5py.File(self.hdf5_file_path, 'r') as hdf5_file:
+            trajectories = ElectronTrajectoriesResults.ElectronTrajectoriesResultsHdf5(hdf5_file)
+
+            self.assertEqual(3, trajectories.number_trajectories)
+            self.assertEqual(6, trajectories.number_collisions)
+
+            trajectory = trajectories.get_trajectory(0)
+            self.assertEqual(1, trajectory.index)
+            self.assertEqual(1, trajectory.trajectoryType)
+            self.assertEqual(3, len(trajectory.collisions))
+            collision = trajectory.collisions[2]
+            self.assertAlmostEqual(5.0, collision.x_A)
+            self.assertAlmostEqual(1.0, collision.y_A)
+            self.assertAlmostEqual(20.0, collision.z_A)
+            self.assertAlmostEqual(4.0, collision.correctedX_A)
+            self.assertAlmostEqual(2.0, collision.correctedY_A)
+            self.assertAlmostEqual(19.0, collision.correctedZ_A)
+            self.assertAlmostEqual(9.5, collision.energy_keV)
+            self.assertEqual(1, collision.indexRegion)
+            self.assertEqual(5, collision.collisionType)
+
+            self.assertEqual(3, trajectories[-1].index)
+            self.assertRaises(IndexError, trajectories.get_trajectory, 3)
+
+            np.testing.assert_array_equal([10.0, 10.0], trajectories.get_column(ElectronTrajectoriesResults.HDF5_ENERGY_keV, 2))
+            self.assertEqual(6, len(trajectories.get_column(ElectronTrajectoriesResults.HDF5_ENERGY_keV)))
+
+            self.assertEqual([1, 2, 3], [trajectory.index for trajectory in trajectories])
+
+        #self.fail("Test if the testcase is working.")
+
+if __name__ == '__main__':  #pragma: no cover
+    from pymcxray.Testings import runTestModuleWithCoverage
+    runTestModuleWithCoverage(__file__)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: FileFormat.Results.test_EnergyAxis
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module `EnergyAxis`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules
+import pymcxray.FileFormat.Results.EnergyAxis as EnergyAxis
+from pymcxray.FileFormat.Results.XraySpectraSpecimenEmittedDetected import XraySpectraSpecimenEmittedDetected
+
+# Globals and constants variables.
+
+
+class TestEnergyAxis(unittest.TestCase):
+    """
+    TestCase class for the module `EnergyAxis`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+        self.energy_axis = EnergyAxis.EnergyAxis([0.5, 1.5, 2.5, 3.5, 5.5])
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_init(self):
+        """
+        Tests for method `__init__`.
+        """
+
+        self.assertEqual(5, len(self.energy_axis))
+        np.testing.assert_array_almost_equal([1.0, 2.0, 3.0, 4.5, 6.5], self.energy_axis.upper_edges_keV)
+        np.testing.assert_array_almost_equal([2.0], EnergyAxis.EnergyAxis([1.0]).upper_edges_keV)
+
+        self.assertRaises(ValueError, EnergyAxis.EnergyAxis, [])
+        self.assertRaises(ValueError, EnergyAxis.EnergyAxis, [1.0, 3.0, 2.0])
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_get_index(self):
+        """
+        Tests for methods `get_index` and `get_indexes`.
+        """
+
+        self.assertEqual(0, self.energy_axis.get_index(-1.0))
+        self.assertEqual(0, self.energy_axis.get_index(1.0))
+        self.assertEqual(1, self.energy_axis.get_index(1.01))
+        self.assertEqual(4, self.energy_axis.get_index(6.5))
+        self.assertRaises(IndexError, self.energy_axis.get_index, 6.6)
+
+        np.testing.assert_array_equal([0, 1, 3, 4], self.energy_axis.get_indexes([0.0, 1.7, 4.0, 5.0]))
+        self.assertRaises(IndexError, self.energy_axis.get_indexes, [0.0, 7.0])
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_get_window_sums(self):
+        """
+        Tests for method `get_window_sums`.
+        """
+
+        values = [1.0, 2.0, 4.0, 8.0, 16.0]
+
+        np.testing.assert_array_almost_equal([0.0, 1.0, 3.0, 7.0, 15.0, 31.0], EnergyAxis.get_cumulative_sums(values))
+
+        self.assertAlmostEqual(6.0, self.energy_axis.get_window_sums(values, 1.5, 2.5))
+        self.assertAlmostEqual(31.0, self.energy_axis.get_window_sums(values, 0.0, 10.0))
+        self.assertAlmostEqual(0.0, self.energy_axis.get_window_sums(values, 4.0, 5.0))
+        self.assertAlmostEqual(0.0, self.energy_axis.get_window_sums(values, 3.0, 2.0))
+
+        cumulative_sums = EnergyAxis.get_cumulative_sums(values)
+        window_sums = self.energy_axis.get_window_sums(values, [0.0, 2.0, 3.0], [1.0, 6.0, 3.4], cumulative_sums)
+        np.testing.assert_array_almost_equal([1.0, 28.0, 0.0], window_sums)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_spectrum_results(self):
+        """
+        Tests for the energy lookups of a spectrum results class.
+        """
+
+        spectrum = XraySpectraSpecimenEmittedDetected()
+        spectrum.energies_keV = np.arange(0.005, 10.0, 0.01)
+        spectrum.totals = np.ones(len(spectrum.energies_keV))
+
+        self.assertEqual(100, spectrum.get_index(1.0))
+        np.testing.assert_array_almost_equal([1.0, 1.0], spectrum.get_values(spectrum.totals, [1.0, 2.0]))
+        self.assertAlmostEqual(10.0, spectrum.get_window_sums(spectrum.totals, 1.0, 1.1))
+        energy_axis = spectrum.energy_axis
+        self.assertIs(energy_axis, spectrum.energy_axis)
+
+        spectrum.energies_keV = np.arange(0.05, 10.0, 0.1)
+        self.assertIsNot(energy_axis, spectrum.energy_axis)
+        self.assertEqual(10, spectrum.get_index(1.01))
+
+        #self.fail("Test if the testcase is working.")
+
+if __name__ == '__main__':  #pragma: no cover
+    from pymcxray.Testings import runTestModuleWithCoverage
+    runTestModuleWithCoverage(__file__)
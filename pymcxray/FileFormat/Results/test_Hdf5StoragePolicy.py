@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: FileFormat.Results.test_Hdf5StoragePolicy
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module `Hdf5StoragePolicy`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+import os.path
+import tempfile
+import shutil
+
+# Third party modules.
+import h5py
+import numpy as np
+
+# Local modules.
+
+# Project modules
+import pymcxray.FileFormat.Results.Hdf5StoragePolicy as Hdf5StoragePolicy
+from pymcxray.FileFormat.Results.XraySpectraSpecimenEmittedDetected import XraySpectraSpecimenEmittedDetected
+from pymcxray.Hdf5Payload import Hdf5PayloadGroup
+
+# Globals and constants variables.
+
+
+class TestHdf5StoragePolicy(unittest.TestCase):
+    """
+    TestCase class for the module `Hdf5StoragePolicy`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+        self.temporary_path = tempfile.mkdtemp(prefix="Test_Hdf5StoragePolicy_")
+        self.file_path = os.path.join(self.temporary_path, "results.hdf5")
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+        shutil.rmtree(self.temporary_path)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_get_dataset_options(self):
+        """
+        Tests for method `get_dataset_options`.
+        """
+
+        storage_policy = Hdf5StoragePolicy.create_contiguous_policy()
+        options = storage_policy.get_dataset_options("XrayIntensities", np.zeros(1000))
+        self.assertEqual({"dtype": np.float64}, options)
+
+        storage_policy = Hdf5StoragePolicy.create_gzip_policy(level=6)
+        options = storage_policy.get_dataset_options("XrayIntensities", np.zeros(1000))
+        self.assertEqual("gzip", options["compression"])
+        self.assertEqual(6, options["compression_opts"])
+        self.assertEqual(True, options["shuffle"])
+        self.assertEqual((1000,), options["chunks"])
+
+        options = storage_policy.get_dataset_options("XrayIntensities", np.zeros(10))
+        self.assertEqual({"dtype": np.float64}, options)
+        options = storage_policy.get_dataset_options("XrayIntensities", np.zeros(0))
+        self.assertEqual({"dtype": np.float64}, options)
+
+        storage_policy = Hdf5StoragePolicy.create_lzf_policy()
+        options = storage_policy.get_dataset_options("XrayIntensities", np.zeros(1000))
+        self.assertEqual("lzf", options["compression"])
+        self.assertFalse("compression_opts" in options)
+
+        storage_policy = Hdf5StoragePolicy.create_compact_policy()
+        options = storage_policy.get_dataset_options("XraySpectraRegionsEmitted", np.zeros((10, 100, 50)))
+        self.assertEqual(np.float32, options["dtype"])
+        options = storage_policy.get_dataset_options("XraySpectraRegionsEmitted", np.zeros(1000, dtype=np.int64))
+        self.assertEqual(np.int64, options["dtype"])
+        options = storage_policy.get_dataset_options("XrayIntensities", np.zeros(1000))
+        self.assertEqual(np.float64, options["dtype"])
+        options = storage_policy.get_dataset_options("XraySpectraRegionsEmitted", np.zeros(1000), dtype='i4')
+        self.assertEqual(np.int32, options["dtype"])
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_get_chunks(self):
+        """
+        Tests for method `get_chunks`.
+        """
+
+        storage_policy = Hdf5StoragePolicy.Hdf5StoragePolicy(chunk_size_bytes=8000)
+
+        self.assertEqual((1000,), storage_policy.get_chunks((1000,), 8))
+        self.assertEqual((501,), storage_policy.get_chunks((1001,), 8))
+        self.assertEqual((3, 2, 100), storage_policy.get_chunks((10, 100, 100), 8))
+        self.assertEqual((1, 1, 1000), storage_policy.get_chunks((3, 2, 2000), 8))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_create_dataset(self):
+        """
+        Tests for method `create_dataset`.
+        """
+
+        spectrum = XraySpectraSpecimenEmittedDetected()
+        spectrum.energies_keV = np.linspace(0.0, 10.0, 1000)
+        spectrum.totals = np.ones(1000)
+        spectrum.characteristics = np.zeros(1000)
+        spectrum.backgrounds = list(np.ones(1000))
+
+        with h5py.File(self.file_path, 'w') as hdf5_file:
+            spectrum.write_hdf5(hdf5_file.require_group("contiguous"))
+            spectrum.write_hdf5(hdf5_file.require_group("gzip"), Hdf5StoragePolicy.create_gzip_policy())
+
+            payload = Hdf5PayloadGroup("lzf")
+            spectrum.write_hdf5(payload, Hdf5StoragePolicy.create_lzf_policy())
+            payload.write(hdf5_file.require_group(payload.name))
+
+        with h5py.File(self.file_path, 'r') as hdf5_file:
+            dataset = hdf5_file["contiguous/XraySpectraSpecimenEmittedDetected/Spectra Total"]
+            self.assertEqual(None, dataset.compression)
+            self.assertEqual(None, dataset.chunks)
+
+            dataset = hdf5_file["gzip/XraySpectraSpecimenEmittedDetected/Spectra Total"]
+            self.assertEqual("gzip", dataset.compression)
+            self.assertEqual((1000,), dataset.chunks)
+            self.assertTrue(dataset.shuffle)
+            np.testing.assert_array_equal(np.ones(1000), dataset[...])
+
+            dataset = hdf5_file["lzf/XraySpectraSpecimenEmittedDetected/Spectra Bremsstrahlung"]
+            self.assertEqual("lzf", dataset.compression)
+            np.testing.assert_array_equal(np.ones(1000), dataset[...])
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_get_storage_policies(self):
+        """
+        Tests for method `get_storage_policies`.
+        """
+
+        storage_policies = Hdf5StoragePolicy.get_storage_policies()
+        self.assertEqual(["contiguous", "gzip", "lzf", "compact"], list(storage_policies.keys()))
+        for name, storage_policy in storage_policies.items():
+            self.assertEqual(name, storage_policy.name)
+
+        #self.fail("Test if the testcase is working.")
+
+if __name__ == '__main__':  #pragma: no cover
+    from pymcxray.Testings import runTestModuleWithCoverage
+    runTestModuleWithCoverage(__file__)
@@ -203,6 +203,50 @@ TEST INPUT - STOP
 
         #self.fail("Test if the testcase is working.")
 
+    def test__readChannelBlock(self):
+        """
+        Tests for method `_readChannelBlock` and `_readValuesBlock`.
+        """
+
+        lines = """I_Out[channel]
+Channel    0 [0.00000e+000 KeV] = 0.000000
+Channel    1 [1.00000e-002 KeV] = 2.500000e+001
+Channel    2 [2.00000e-002 KeV] = 7.5
+
+E_Net[peak][channel]
+Channel    0 [0.00000e+000 KeV] : 0.1 1.0
+Channel    1 [1.00000e-002 KeV] : 0.2 2.0
+Channel    2 [2.00000e-002 KeV] : 0.3 3.0
+P_B (cont)(3)
+0 0.25
+1 0.5
+2 1.0
+""".splitlines()
+        tagIndex = SpectraEDS.Tags.TagIndex(lines)
+        spectraEDS = SpectraEDS.SpectraEDS()
+
+        channels, energies_keV, values = spectraEDS._readChannelBlock(tagIndex, 0, '=')
+        self.assertEqual([0, 1, 2], list(channels))
+        self.assertEqual([0.0, 0.01, 0.02], list(energies_keV))
+        self.assertEqual((3, 1), values.shape)
+        self.assertEqual([0.0, 25.0, 7.5], list(values[:, 0]))
+
+        channels, energies_keV, values = spectraEDS._readChannelBlock(tagIndex, 5, ':')
+        self.assertEqual([0, 1, 2], list(channels))
+        self.assertEqual((3, 2), values.shape)
+        self.assertEqual([1.0, 2.0, 3.0], list(values[:, 1]))
+
+        channels, energies_keV, values = spectraEDS._readChannelBlock(tagIndex, 9, '=')
+        self.assertEqual(0, len(channels))
+
+        indexLine, values = spectraEDS._readValuesBlock(tagIndex, "P_B (cont)(3)", 3)
+        self.assertEqual(10, indexLine)
+        self.assertEqual([0.25, 0.5, 1.0], list(values))
+        self.assertRaises(ValueError, spectraEDS._readValuesBlock, tagIndex, "P_B (cont)(3)", 4)
+        self.assertRaises(ValueError, spectraEDS._readValuesBlock, tagIndex, "P_B (cont)(4)", 4)
+
+        #self.fail("Test if the testcase is working.")
+
     def test__isRegionSpectraSection(self):
         """
         Tests for method `_isRegionSpectraSection`.
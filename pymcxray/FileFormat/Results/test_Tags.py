@@ -87,6 +87,40 @@ class TestTags(unittest.TestCase):
 
         #self.fail("Test if the testcase is working.")
 
+    def test_TagIndex(self):
+        """
+        Tests for class `TagIndex`.
+        """
+
+        lines = self.getLines()
+        tagIndex = Tags.TagIndex(lines)
+        self.assertEqual(len(lines), len(tagIndex))
+
+        tag = "##### Energy Update End #####"
+        self.assertEqual(Tags.findTag(tag, lines), tagIndex.findTag(tag))
+        self.assertEqual(23, tagIndex.findTag(tag, 10))
+        self.assertRaises(Tags.TagNotFoundError, tagIndex.findTag, tag, 24)
+        self.assertRaises(ValueError, tagIndex.findTag, "##### Energy Update End ######")
+
+        tag = "faults"
+        self.assertEqual(Tags.findAllTag(tag, lines), tagIndex.findAllTag(tag))
+        self.assertEqual([18, 19, 20, 21], tagIndex.findAllTag(tag, start=18))
+        self.assertEqual([17, 19, 21], tagIndex.findAllTag(tag, contains="pos"))
+        self.assertEqual([0, 8, 10, 23], tagIndex.findAllTag("#"))
+        self.assertEqual([4], tagIndex.findAllTag("0"))
+
+        self.assertEqual(4, tagIndex.findLine("0 BOX"))
+        self.assertRaises(Tags.TagNotFoundError, tagIndex.findLine, "0 BO")
+        self.assertTrue(tagIndex.hasLine("Voxel failed precision = 0"))
+        self.assertFalse(tagIndex.hasLine("Voxel failed precision"))
+
+        self.assertEqual(1, tagIndex.findEmptyLine(0))
+        self.assertEqual(6, tagIndex.findEmptyLine(3))
+        self.assertEqual(len(lines), tagIndex.findEmptyLine(23))
+        self.assertEqual("faults X neg = 0    min coord index = 0", tagIndex.getStrippedLine(16))
+
+        #self.fail("Test if the testcase is working.")
+
     def getLines(self):
         lines = \
 """##### Geometry Setup Start #####
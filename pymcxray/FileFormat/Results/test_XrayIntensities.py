@@ -16,8 +16,12 @@ __license__ = ""
 # Standard library modules.
 import unittest
 import logging
+import os.path
+import tempfile
+import shutil
 
 # Third party modules.
+import numpy as np
 
 # Local modules.
 from pymcxray import get_current_module_path
@@ -39,6 +43,8 @@ class TestXrayIntensities(unittest.TestCase):
 
         unittest.TestCase.setUp(self)
 
+        self.temporary_path = tempfile.mkdtemp(prefix="Test_XrayIntensities_")
+
     def tearDown(self):
         """
         Teardown method.
@@ -46,6 +52,28 @@ class TestXrayIntensities(unittest.TestCase):
 
         unittest.TestCase.tearDown(self)
 
+        shutil.rmtree(self.temporary_path)
+
+    def _create_intensities_file(self):
+        basename = "SimulationTest_AlCu_E10d0keV"
+        with open(os.path.join(self.temporary_path, basename + "_XrayIntensities.csv"), 'w') as results_file:
+            results_file.write("Index Region, Index Atom, Atomic number, Line, Line energy (keV), "
+                               "Intensity Generated (photons/e/sr), Intensity Generated Detected (photons), "
+                               "Intensity Emitted (photons/e/sr), Intensity Emitted Detected (photons), "
+                               "Detector efficiency\n")
+            results_file.write("0, 0, 29, Line Ka1, 8.048, 10.0, 1.0, 8.0, 0.8, 0.9\n")
+            results_file.write("0, 0, 29, Line Ka2, 8.028, 5.0, 0.5, 4.0, 0.4, 0.9\n")
+            results_file.write("0, 0, 29, Line La, 0.930, 20.0, 2.0, 6.0, 0.6, 0.5\n")
+            results_file.write("2, 0, 29, Line Ka1, 8.048, 1.0, 0.1, 0.8, 0.08, 0.9\n")
+            results_file.write("2, 1, 13, Line Ka1, 1.487, 30.0, 3.0, 15.0, 1.5, \n")
+
+        intensitiesFile = XrayIntensities.XrayIntensities()
+        intensitiesFile.path = self.temporary_path
+        intensitiesFile.basename = basename
+        intensitiesFile.read()
+
+        return intensitiesFile
+
     def testSkeleton(self):
         """
         First test to check if the testcase is working with the testing framework.
@@ -69,6 +97,87 @@ class TestXrayIntensities(unittest.TestCase):
 
         #self.fail("Test if the testcase is working.")
 
+    def test_read_table(self):
+        """
+        Tests for method `read`.
+        """
+
+        intensitiesFile = self._create_intensities_file()
+
+        self.assertEqual(5, intensitiesFile.numberIntensities)
+        self.assertEqual(5, len(intensitiesFile.table))
+        self.assertEqual(XrayIntensities.TABLE_DTYPE, intensitiesFile.table.dtype)
+        np.testing.assert_array_equal([29, 29, 29, 29, 13], intensitiesFile.table[XrayIntensities.TABLE_ATOMIC_NUMBER])
+        np.testing.assert_array_equal([0, 0, 0, 2, 2], intensitiesFile.table[XrayIntensities.TABLE_REGION])
+        np.testing.assert_array_equal([0, 1, 4, 0, 0], intensitiesFile.table[XrayIntensities.TABLE_LINE_CODE])
+        np.testing.assert_array_almost_equal([0.9, 0.9, 0.5, 0.9, 0.0], intensitiesFile.table["detector_efficiency"])
+        np.testing.assert_array_equal([13, 29], intensitiesFile.table_atomic_numbers)
+        np.testing.assert_array_equal([0, 2], intensitiesFile.table_region_ids)
+        self.assertEqual("29", intensitiesFile.intensities[0][XrayIntensities.ATOMIC_NUMBER])
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_getIntensity(self):
+        """
+        Tests for methods `getIntensityEmitted`, `getIntensityEmittedDetected`, `getIntensityGenerated` and
+        `getIntensityGeneratedDetected`.
+        """
+
+        intensitiesFile = self._create_intensities_file()
+
+        self.assertAlmostEqual(8.8, intensitiesFile.getIntensityEmitted(29, "Ka1"))
+        self.assertAlmostEqual(12.8, intensitiesFile.getIntensityEmitted(29, "Ka"))
+        self.assertAlmostEqual(12.8, intensitiesFile.getIntensityEmitted(29, "Line Ka"))
+        self.assertAlmostEqual(18.8, intensitiesFile.getIntensityEmitted(29, "K") + intensitiesFile.getIntensityEmitted(29, "L"))
+        self.assertAlmostEqual(0.0, intensitiesFile.getIntensityEmitted(29, "Ma"))
+        self.assertAlmostEqual(0.0, intensitiesFile.getIntensityEmitted(26, "Ka1"))
+
+        data = intensitiesFile.getIntensityEmitted(29, "Ka", total=False)
+        self.assertEqual(["0", "2"], sorted(data.keys()))
+        self.assertAlmostEqual(12.0, data["0"])
+        self.assertAlmostEqual(0.8, data["2"])
+        self.assertEqual({"2": 15.0}, intensitiesFile.getIntensityEmitted(13, "Ka1", total=False))
+        self.assertEqual({}, intensitiesFile.getIntensityEmitted(13, "La", total=False))
+
+        self.assertAlmostEqual(1.5, intensitiesFile.getIntensityEmittedDetected(13, "Ka"))
+        self.assertAlmostEqual(1.28, intensitiesFile.getDetectedIntensity(29, "Ka"))
+
+        data = intensitiesFile.getIntensityGenerated(29, "K")
+        self.assertEqual(["0", "2"], sorted(data.keys()))
+        self.assertAlmostEqual(10.0, data["0"])
+        self.assertAlmostEqual(11.0, intensitiesFile.getIntensityGenerated(29, "L", total=True))
+        self.assertEqual({"0": 1.0, "2": 0.1}, intensitiesFile.getIntensityGeneratedDetected(29, "L"))
+        self.assertEqual({"2": 3.0}, intensitiesFile.getIntensityGeneratedDetected(13, "K"))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_get_intensities(self):
+        """
+        Tests for method `get_intensities`.
+        """
+
+        intensitiesFile = self._create_intensities_file()
+
+        intensities = intensitiesFile.get_intensities(XrayIntensities.INTENSITY_EMITTED)
+        self.assertEqual((2, 9), intensities.shape)
+        self.assertAlmostEqual(15.0, intensities[0, 0])
+        self.assertAlmostEqual(8.8, intensities[1, 0])
+        self.assertAlmostEqual(6.0, intensities[1, 4])
+        self.assertAlmostEqual(33.8, np.sum(intensities))
+
+        intensities = intensitiesFile.get_intensities(XrayIntensities.INTENSITY_EMITTED, [29, 13, 26], ["Ka", "La"],
+                                                      total=False)
+        self.assertEqual((3, 2, 2), intensities.shape)
+        np.testing.assert_array_almost_equal([[12.0, 0.8], [6.0, 0.0]], intensities[0])
+        np.testing.assert_array_almost_equal([[0.0, 15.0], [0.0, 0.0]], intensities[1])
+        np.testing.assert_array_almost_equal(np.zeros((2, 2)), intensities[2])
+
+        for atomic_number, xray_line in [(29, "Ka"), (29, "La"), (13, "Ka1")]:
+            intensity = intensitiesFile.get_intensities(XrayIntensities.INTENSITY_EMITTED, [atomic_number], [xray_line])
+            self.assertAlmostEqual(intensitiesFile.getIntensityEmitted(atomic_number, xray_line), intensity[0, 0])
+
+        #self.fail("Test if the testcase is working.")
+
 if __name__ == '__main__':  #pragma: no cover
     logging.getLogger().setLevel(logging.DEBUG)
     from pymcxray.Testings import runTestModuleWithCoverage
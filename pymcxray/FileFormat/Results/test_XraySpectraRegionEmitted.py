@@ -19,6 +19,7 @@ import os.path
 
 # Third party modules.
 from nose import SkipTest
+import numpy as np
 
 # Local modules.
 
@@ -315,6 +316,40 @@ class TestXraySpectraRegionEmitted(unittest.TestCase):
 
         #self.fail("Test if the testcase is working.")
 
+    def test_energy_lookups(self):
+        """
+        Tests for methods `totalValue_1_ekeVsr`, `totalValues_1_ekeVsr` and `totalWindowSums_1_ekeVsr`.
+        """
+
+        spectra = XraySpectraRegionEmitted()
+        spectra.energies_keV = np.arange(0.0025, 10.0, 0.005)
+        spectra.total_1_ekeVsr = np.arange(len(spectra.energies_keV), dtype=float)
+        spectra.characteristic_1_ekeVsr = np.ones(len(spectra.energies_keV))
+        spectra.bremsstrahlung_1_ekeVsr = np.zeros(len(spectra.energies_keV))
+
+        self.assertEqual(0, spectra._indice(0.0))
+        self.assertEqual(0, spectra._indice(0.005))
+        self.assertEqual(1, spectra._indice(0.0051))
+        self.assertEqual(1000, spectra._indice(5.0025))
+        self.assertRaises(IndexError, spectra._indice, 10.1)
+
+        self.assertAlmostEqual(1000.0, spectra.totalValue_1_ekeVsr(5.0025))
+        self.assertAlmostEqual(1.0, spectra.characteristicValue_1_ekeVsr(5.0025))
+        self.assertAlmostEqual(0.0, spectra.bremsstrahlungValue_1_ekeVsr(5.0025))
+
+        np.testing.assert_array_almost_equal([0.0, 1000.0, 1999.0], spectra.totalValues_1_ekeVsr([0.001, 5.0025, 9.9975]))
+        self.assertRaises(IndexError, spectra.totalValues_1_ekeVsr, [1.0, 10.1])
+
+        self.assertAlmostEqual(1000.0+1001.0, spectra.totalWindowSums_1_ekeVsr(5.0, 5.01))
+        np.testing.assert_array_almost_equal([2.0, 20.0, 0.0],
+                                             spectra.characteristicWindowSums_1_ekeVsr([5.0, 1.0, 3.0], [5.01, 1.1, 2.0]))
+        self.assertAlmostEqual(0.0, spectra.bremsstrahlungWindowSums_1_ekeVsr(0.0, 10.0))
+
+        spectra.total_1_ekeVsr = np.ones(len(spectra.energies_keV))
+        self.assertAlmostEqual(2.0, spectra.totalWindowSums_1_ekeVsr(5.0, 5.01))
+
+        #self.fail("Test if the testcase is working.")
+
 if __name__ == '__main__':  #pragma: no cover
     import nose
     nose.runmodule()
@@ -16,9 +16,12 @@ __license__ = "GPL 3"
 # Standard library modules.
 import unittest
 import os.path
+import tempfile
+import shutil
 
 # Third party modules.
 from nose import SkipTest
+import numpy as np
 
 # Local modules.
 
@@ -39,6 +42,7 @@ class TestXraySpectraRegionsEmitted(unittest.TestCase):
 
         unittest.TestCase.setUp(self)
         self.testDataPath = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../test_data/results"))
+        self.temporary_path = tempfile.mkdtemp(prefix="Test_XraySpectraRegionsEmitted_")
 
     def tearDown(self):
         """
@@ -47,6 +51,15 @@ class TestXraySpectraRegionsEmitted(unittest.TestCase):
 
         unittest.TestCase.tearDown(self)
 
+        shutil.rmtree(self.temporary_path)
+
+    def _write_region_file(self, basename, filename_suffix, factor, number_channels=4):
+        file_path = os.path.join(self.temporary_path, basename + filename_suffix)
+        with open(file_path, 'w') as csv_file:
+            csv_file.write("Energy (keV), Spectrum Total, Spectrum Lines, Spectrum Bremsstrahlung\n")
+            for channel in range(number_channels):
+                csv_file.write("%f, %f, %f, %f\n" % (0.005 + channel*0.01, 3.0*factor, 1.0*factor, 2.0*factor))
+
     def testSkeleton(self):
         """
         First test to check if the testcase is working with the testing framework.
@@ -150,6 +163,66 @@ class TestXraySpectraRegionsEmitted(unittest.TestCase):
 
         #self.fail("Test if the testcase is working.")
 
+    def test_read_regions(self):
+        """
+        Tests for method `read` with region files found in the results folder.
+        """
+
+        basename = "SimulationTest"
+        for region_id, factor in [(0, 1.0), (1, 10.0), (2, 100.0), (4, 1000.0)]:
+            self._write_region_file(basename, "_SpectraPerElectron_1_srkeV_Region_%i.csv" % (region_id), factor)
+        self._write_region_file(basename + "2", "_SpectraPerElectron_1_srkeV_Region_3.csv", 1000.0)
+        self._write_region_file(basename, "_SpectraPerElectron_1_srkeV_Region_3.csv.bak", 1000.0)
+
+        spectra = XraySpectraRegionsEmitted()
+        spectra.path = self.temporary_path
+        spectra.basename = basename
+        self.assertEqual([0, 1, 2], [region_id for region_id, _file_path in spectra.get_region_filepaths()])
+
+        file_names = set(os.listdir(self.temporary_path))
+        spectra = XraySpectraRegionsEmitted(file_names=file_names)
+        spectra.path = self.temporary_path
+        spectra.basename = basename
+        self.assertEqual([0, 1, 2], [region_id for region_id, _file_path in spectra.get_region_filepaths()])
+        file_names.remove(basename + "_SpectraPerElectron_1_srkeV_Region_1.csv")
+        self.assertEqual([0], [region_id for region_id, _file_path in spectra.get_region_filepaths()])
+
+        spectra = XraySpectraRegionsEmitted()
+        spectra.path = os.path.join(self.temporary_path, "missing")
+        spectra.basename = basename
+        self.assertEqual([], spectra.get_region_filepaths())
+
+        for number_threads in [1, 2, None]:
+            spectra = XraySpectraRegionsEmitted(keep_regions=True, number_threads=number_threads)
+            spectra.path = self.temporary_path
+            spectra.basename = basename
+            spectra.read()
+
+            self.assertEqual([0, 1, 2], spectra.region_ids)
+            np.testing.assert_array_almost_equal([0.005, 0.015, 0.025, 0.035], spectra.energies_keV)
+            np.testing.assert_array_almost_equal(np.full(4, 333.0), spectra.total_1_ekeVsr)
+            np.testing.assert_array_almost_equal(np.full(4, 111.0), spectra.characteristic_1_ekeVsr)
+            np.testing.assert_array_almost_equal(np.full(4, 222.0), spectra.bremsstrahlung_1_ekeVsr)
+            self.assertEqual((3, 4), spectra.regions_total_1_ekeVsr.shape)
+            np.testing.assert_array_almost_equal([3.0, 30.0, 300.0], spectra.regions_total_1_ekeVsr[:, 0])
+            np.testing.assert_array_almost_equal([100.0]*4, spectra.regions_characteristic_1_ekeVsr[2])
+            np.testing.assert_array_almost_equal([20.0]*4, spectra.regions_bremsstrahlung_1_ekeVsr[1])
+
+        spectra = XraySpectraRegionsEmitted()
+        spectra.path = self.temporary_path
+        spectra.basename = basename
+        spectra.read()
+        np.testing.assert_array_almost_equal(np.full(4, 333.0), spectra.total_1_ekeVsr)
+        self.assertEqual(None, spectra.regions_total_1_ekeVsr)
+
+        self._write_region_file(basename, "_SpectraPerElectron_1_srkeV_Region_3.csv", 1.0, number_channels=3)
+        self.assertRaises(ValueError, spectra.read)
+
+        spectra.basename = "SimulationMissing"
+        self.assertRaises(ValueError, spectra.read)
+
+        #self.fail("Test if the testcase is working.")
+
 if __name__ == '__main__':  #pragma: no cover
     import nose
     nose.runmodule()
@@ -14,6 +14,7 @@ __copyright__ = "Copyright (c) 2012 Hendrix Demers"
 __license__ = ""
 
 # Standard library modules.
+import io
 import os.path
 import copy
 
@@ -72,10 +73,20 @@ class SimulationInputs(object):
                     self._filenames[key] = str(items[-1])
 
     def write(self, filepath):
+        with open(filepath, 'w') as outputFile:
+            self._write(outputFile, filepath)
+
+    def createContent(self, filepath):
+        """
+        Content of the file written by :py:meth:`write` at `filepath`.
+        """
+        outputFile = io.StringIO()
+        self._write(outputFile, filepath)
+        return outputFile.getvalue()
+
+    def _write(self, outputFile, filepath):
         title = self._extractTitleFromFilepath(filepath)
 
-        outputFile = open(filepath, 'w')
-
         self.version.writeLine(outputFile)
 
         keys = self._createKeys()
@@ -19,6 +19,7 @@ __svnDate__ = "$Date$"
 __svnId__ = "$Id$"
 
 # Standard library modules.
+import io
 import copy
 
 # Third party modules.
@@ -119,10 +120,20 @@ class Specimen(object):
                     indexLine += region.extractFromLinesWithoutVersion(lines[indexLine:])
 
     def write(self, filepath):
+        with open(filepath, 'w') as outputFile:
+            self._write(outputFile)
+
+    def createContent(self):
+        """
+        Content of the file written by :py:meth:`write`.
+        """
+        outputFile = io.StringIO()
+        self._write(outputFile)
+        return outputFile.getvalue()
+
+    def _write(self, outputFile):
         assert self.numberRegions == len(self.regions)
 
-        outputFile = open(filepath, 'w')
-
         self._writeHeader(outputFile)
 
         self.version.writeLine(outputFile)
@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: pymcxray.FileManifest
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Persistent manifest of the size, modification time and content hash of the result and cache files.
+
+A derived file (results cache, serialization file) is recorded with the content hash of its source files. It is
+older than its sources when its content or the content of one source changed since it was recorded. The timestamps
+are only used as a first-level filter: the content of a file is hashed again only when its size or modification
+time changed, so copying the files between computers does not make the derived files stale and restoring an old
+derived file does.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import os
+import os.path
+import stat
+import json
+import hashlib
+import logging
+
+# Third party modules.
+
+# Local modules.
+
+# Project modules
+
+# Globals and constants variables.
+MANIFEST_VERSION = 1
+HASH_BLOCK_SIZE = 1024*1024
+HASH_DIGEST_SIZE = 16
+
+KEY_VERSION = "version"
+KEY_FILES = "files"
+KEY_RECORDS = "records"
+KEY_DIGEST = "digest"
+KEY_SOURCES = "sources"
+
+
+def is_older_than_stat(file_path, other_file_path):
+    """
+    Check with the modification and change times if `file_path` is older than `other_file_path`.
+
+    This is the heuristic used when a file is not recorded in a manifest.
+    """
+    if not os.path.isfile(file_path):
+        return True
+
+    if not os.path.isfile(other_file_path):
+        return False
+
+    return is_older_than_stat_result(os.stat(file_path), os.stat(other_file_path))
+
+
+def is_older_than_stat_result(stat_main_file, stat_other_file):
+    """
+    Same as :py:func:`is_older_than_stat` with the stat results of the two files.
+    """
+    if stat_other_file[stat.ST_MTIME] > stat_main_file[stat.ST_MTIME]:
+        return True
+    elif stat_other_file[stat.ST_CTIME] > stat_main_file[stat.ST_MTIME] and stat_other_file[stat.ST_CTIME] > stat_main_file[stat.ST_CTIME]:
+        return True
+    else:
+        return False
+
+
+def compute_digest(file_path):
+    """
+    Fast content hash of a file.
+    """
+    digest = hashlib.blake2b(digest_size=HASH_DIGEST_SIZE)
+    with open(file_path, 'rb') as hash_file:
+        while True:
+            block = hash_file.read(HASH_BLOCK_SIZE)
+            if not block:
+                break
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def _get_file_paths(file_paths):
+    if isinstance(file_paths, str):
+        return [file_paths]
+    else:
+        return list(file_paths)
+
+
+class FileManifest(object):
+    def __init__(self, file_path=None, root_path=None):
+        """
+        Manifest of the files.
+
+        :param file_path: path of the json file where the manifest is saved, the manifest is only in memory if None
+        :param root_path: the paths of the files under it are saved relative to it, so the manifest stays valid when
+            the folder is copied
+        """
+        self.file_path = file_path
+        self.root_path = root_path
+
+        self._files = {}
+        self._records = {}
+        self._is_modified = False
+
+        if self.file_path is not None and os.path.isfile(self.file_path):
+            self.load()
+
+    def _get_key(self, file_path):
+        file_path = os.path.abspath(file_path)
+
+        if self.root_path is not None:
+            try:
+                relative_path = os.path.relpath(file_path, os.path.abspath(self.root_path))
+                if not relative_path.startswith(os.pardir):
+                    return relative_path
+            except ValueError:
+                pass
+
+        return file_path
+
+    def load(self):
+        try:
+            with open(self.file_path, 'r') as manifest_file:
+                data = json.load(manifest_file)
+        except ValueError as message:
+            logging.warning("Invalid file manifest %s: %s", self.file_path, message)
+            data = {}
+
+        if data.get(KEY_VERSION) == MANIFEST_VERSION:
+            self._files = data[KEY_FILES]
+            self._records = data[KEY_RECORDS]
+        else:
+            self._files = {}
+            self._records = {}
+        self._is_modified = False
+
+    def save(self):
+        """
+        Save the manifest in its json file if it was modified.
+        """
+        if self.file_path is None or not self._is_modified:
+            return
+
+        data = {KEY_VERSION: MANIFEST_VERSION, KEY_FILES: self._files, KEY_RECORDS: self._records}
+
+        temporary_file_path = self.file_path + ".tmp"
+        with open(temporary_file_path, 'w') as manifest_file:
+            json.dump(data, manifest_file)
+        os.replace(temporary_file_path, self.file_path)
+        self._is_modified = False
+
+    def get_digest(self, file_path, file_stat=None):
+        """
+        Content hash of a file, computed again only if the size or modification time of the file changed.
+
+        :param file_stat: stat result of the file if it is already known
+        :return: hexadecimal digest string or None if the file does not exist
+        """
+        key = self._get_key(file_path)
+        if file_stat is None:
+            try:
+                file_stat = os.stat(file_path)
+            except OSError:
+                return None
+
+        entry = self._files.get(key)
+        if entry is not None and entry[0] == file_stat.st_size and entry[1] == file_stat.st_mtime_ns:
+            return entry[2]
+
+        digest = compute_digest(file_path)
+        self._files[key] = [file_stat.st_size, file_stat.st_mtime_ns, digest]
+        self._is_modified = True
+
+        return digest
+
+    def is_recorded(self, derived_file_path, source_file_paths=()):
+        record = self._records.get(self._get_key(derived_file_path))
+        if record is None:
+            return False
+
+        for source_file_path in _get_file_paths(source_file_paths):
+            if self._get_key(source_file_path) not in record[KEY_SOURCES]:
+                return False
+
+        return True
+
+    def record(self, derived_file_path, source_file_paths=()):
+        """
+        Record the current content of a derived file and of the source files used to create it.
+
+        The sources already recorded for the derived file are kept.
+        """
+        source_stats = [(source_file_path, None) for source_file_path in _get_file_paths(source_file_paths)]
+        self._record(derived_file_path, None, source_stats)
+
+    def _record(self, derived_file_path, derived_stat, source_stats):
+        key = self._get_key(derived_file_path)
+        record = self._records.setdefault(key, {KEY_DIGEST: None, KEY_SOURCES: {}})
+        record[KEY_DIGEST] = self.get_digest(derived_file_path, derived_stat)
+
+        for source_file_path, source_stat in source_stats:
+            record[KEY_SOURCES][self._get_key(source_file_path)] = self.get_digest(source_file_path, source_stat)
+
+        self._is_modified = True
+
+    def remove(self, derived_file_path):
+        if self._records.pop(self._get_key(derived_file_path), None) is not None:
+            self._is_modified = True
+
+    def is_older_than(self, derived_file_path, source_file_paths):
+        """
+        Check if a derived file is older than one of its source files.
+
+        A derived file recorded with the sources is older if its content or the content of one source changed since
+        it was recorded. Otherwise, the modification times are compared and the files are recorded if the derived
+        file is up to date. Each file is only stat once.
+        """
+        try:
+            derived_stat = os.stat(derived_file_path)
+        except OSError:
+            return True
+
+        source_stats = []
+        for source_file_path in _get_file_paths(source_file_paths):
+            try:
+                source_stats.append((source_file_path, os.stat(source_file_path)))
+            except OSError:
+                pass
+        if len(source_stats) == 0:
+            return False
+
+        if not self.is_recorded(derived_file_path, [source_file_path for source_file_path, _ in source_stats]):
+            for _source_file_path, source_stat in source_stats:
+                if is_older_than_stat_result(derived_stat, source_stat):
+                    return True
+
+            self._record(derived_file_path, derived_stat, source_stats)
+            return False
+
+        record = self._records[self._get_key(derived_file_path)]
+        if self.get_digest(derived_file_path, derived_stat) != record[KEY_DIGEST]:
+            return True
+
+        for source_file_path, source_stat in source_stats:
+            if self.get_digest(source_file_path, source_stat) != record[KEY_SOURCES][self._get_key(source_file_path)]:
+                return True
+
+        return False
@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: pymcxray.Hdf5Payload
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+In memory HDF5 group used to transfer the results of one simulation between processes.
+
+The payload group records the calls done by the ``write_hdf5`` methods of the result classes (groups, datasets,
+attributes and dimension scales) as plain numpy arrays. The payload can be pickled, sent to another process and
+written in a real HDF5 file with :py:meth:`Hdf5PayloadGroup.write`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+from collections import OrderedDict
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules
+
+# Globals and constants variables.
+
+
+class Hdf5PayloadDimension(object):
+    def __init__(self, dataset, axis):
+        self._dataset = dataset
+        self._axis = axis
+
+    def attach_scale(self, scale_dataset):
+        self._dataset._attached_scales.append((self._axis, scale_dataset))
+
+
+class Hdf5PayloadDimensions(object):
+    def __init__(self, dataset):
+        self._dataset = dataset
+
+    def create_scale(self, scale_dataset, name=""):
+        scale_dataset.make_scale(name)
+
+    def __getitem__(self, axis):
+        return Hdf5PayloadDimension(self._dataset, axis)
+
+
+class Hdf5PayloadDataset(object):
+    def __init__(self, name, data=None, dtype=None, **kwargs):
+        self.name = name
+        if dtype is not None:
+            self.data = np.asarray(data, dtype=dtype)
+        else:
+            self.data = np.asarray(data)
+        self.options = kwargs
+        self.attrs = OrderedDict()
+
+        self.scale_name = None
+        self._attached_scales = []
+
+    def make_scale(self, name=""):
+        self.scale_name = name
+
+    @property
+    def dims(self):
+        return Hdf5PayloadDimensions(self)
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+
+class Hdf5PayloadGroup(object):
+    def __init__(self, name=""):
+        self.name = name
+        self.attrs = OrderedDict()
+        self._items = OrderedDict()
+
+    def require_group(self, name):
+        if name not in self._items:
+            self._items[name] = Hdf5PayloadGroup(name)
+
+        return self._items[name]
+
+    def create_group(self, name):
+        if name in self._items:
+            raise ValueError("Unable to create group (name already exists): %s" % (name))
+
+        return self.require_group(name)
+
+    def create_dataset(self, name, shape=None, dtype=None, data=None, **kwargs):
+        if name in self._items:
+            raise ValueError("Unable to create dataset (name already exists): %s" % (name))
+
+        if data is None:
+            data = np.zeros(shape, dtype=dtype)
+
+        dataset = Hdf5PayloadDataset(name, data=data, dtype=dtype, **kwargs)
+        self._items[name] = dataset
+
+        return dataset
+
+    def keys(self):
+        return self._items.keys()
+
+    def values(self):
+        return self._items.values()
+
+    def items(self):
+        return self._items.items()
+
+    def __contains__(self, name):
+        return name in self._items
+
+    def __getitem__(self, name):
+        return self._items[name]
+
+    def __delitem__(self, name):
+        del self._items[name]
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def write(self, hdf5_group):
+        """
+        Write the content of the payload in a HDF5 group.
+
+        :param hdf5_group: h5py group where the groups, datasets and attributes of the payload are created
+        """
+        hdf5_datasets = []
+        self._write_items(hdf5_group, hdf5_datasets)
+
+        for dataset, hdf5_dataset in hdf5_datasets:
+            if dataset.scale_name is not None:
+                hdf5_dataset.make_scale(dataset.scale_name)
+
+        hdf5_datasets_by_id = dict((id(dataset), hdf5_dataset) for dataset, hdf5_dataset in hdf5_datasets)
+        for dataset, hdf5_dataset in hdf5_datasets:
+            for axis, scale_dataset in dataset._attached_scales:
+                hdf5_dataset.dims[axis].attach_scale(hdf5_datasets_by_id[id(scale_dataset)])
+
+    def _write_items(self, hdf5_group, hdf5_datasets):
+        for name, value in self.attrs.items():
+            hdf5_group.attrs[name] = value
+
+        for name, item in self._items.items():
+            if isinstance(item, Hdf5PayloadGroup):
+                item._write_items(hdf5_group.require_group(name), hdf5_datasets)
+            else:
+                hdf5_dataset = hdf5_group.create_dataset(name, data=item.data, **item.options)
+                for attribute_name, value in item.attrs.items():
+                    hdf5_dataset.attrs[attribute_name] = value
+                hdf5_datasets.append((item, hdf5_dataset))
+
+
+HDF5_DIMENSION_SCALE_ATTRIBUTES = ("CLASS", "NAME", "REFERENCE_LIST", "DIMENSION_LIST")
+
+
+def read_group(hdf5_group, name=None):
+    """
+    Read the content of a HDF5 group in a payload group.
+
+    The datasets are read in numpy arrays, the HDF5 file can be closed after the call. The dimension scales are not
+    read.
+
+    :param hdf5_group: h5py group to read
+    :param name: name of the payload group, the name of the HDF5 group by default
+    :return: :py:class:`Hdf5PayloadGroup`
+    """
+    if name is None:
+        name = hdf5_group.name.split('/')[-1]
+
+    group = Hdf5PayloadGroup(name)
+    _read_items(group, hdf5_group)
+
+    return group
+
+
+def _read_items(group, hdf5_group):
+    for name, value in hdf5_group.attrs.items():
+        group.attrs[name] = value
+
+    for name, hdf5_item in hdf5_group.items():
+        if hasattr(hdf5_item, "keys"):
+            _read_items(group.require_group(name), hdf5_item)
+        else:
+            dataset = group.create_dataset(name, data=hdf5_item[...])
+            for attribute_name, value in hdf5_item.attrs.items():
+                if attribute_name not in HDF5_DIMENSION_SCALE_ATTRIBUTES:
+                    dataset.attrs[attribute_name] = value
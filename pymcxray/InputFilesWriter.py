@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: pymcxray.InputFilesWriter
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Parallel generation and deduplication of the simulation input files.
+
+The content of the six input files of a simulation is created in worker processes and written by a bounded pool of
+threads, so the slow file system operations overlap the creation of the next simulations. The files are the same as
+the ones written by :py:meth:`pymcxray.Simulation.Simulation.createSimulationFiles`. A shared content addressed file
+is written only once.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import os
+import os.path
+import logging
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Third party modules.
+
+# Local modules.
+
+# Project modules
+from pymcxray.Simulation import SimulationRecord, getSharedInputFilename, isSharedInputFilename, write_input_file, \
+    INPUT_FILENAME_ATTRIBUTES, SHARED_INPUT_FILENAME_ATTRIBUTES
+from pymcxray.FileFormat.SimulationInputs import SimulationInputs
+
+# Globals and constants variables.
+LOG_INTERVAL = 1000
+
+# Function creating the full simulations in the worker processes.
+_worker_create_simulation = None
+
+
+def _initialize_worker(create_simulation):
+    global _worker_create_simulation
+    _worker_create_simulation = create_simulation
+
+
+def _create_input_files_content(simulation, path):
+    if isinstance(simulation, SimulationRecord):
+        simulation.set_create_simulation(_worker_create_simulation)
+        simulation = simulation.get_simulation()
+
+    return simulation.createSimulationFilesContent(path)
+
+
+class ParallelInputFilesWriter(object):
+    def __init__(self, create_simulation, number_processes, number_threads=4, log_interval=LOG_INTERVAL):
+        """
+        Write the input files of the simulations with a process pool and a thread pool.
+
+        Use it as a context manager, the files are all written when the context exits.
+
+        :param create_simulation: function creating a full :py:class:`pymcxray.Simulation.Simulation` from the
+            parameters of a :py:class:`pymcxray.Simulation.SimulationRecord`, it must be picklable
+        :param number_processes: number of processes creating the content of the files
+        :param number_threads: number of threads writing the files
+        :param log_interval: number of simulations between the progress logs
+        """
+        self.number_processes = number_processes
+        self.number_threads = number_threads
+        self.log_interval = log_interval
+
+        self._create_simulation = create_simulation
+
+        self._process_executor = None
+        self._thread_executor = None
+        self._pending_contents = deque()
+        self._pending_writes = deque()
+        self._shared_filepaths = set()
+
+        self.number_simulations = 0
+        self.number_files = 0
+        self._starting_time = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def open(self):
+        self._starting_time = time.perf_counter()
+        self._process_executor = ProcessPoolExecutor(max_workers=self.number_processes,
+                                                     initializer=_initialize_worker,
+                                                     initargs=(self._create_simulation,))
+        self._thread_executor = ThreadPoolExecutor(max_workers=self.number_threads)
+
+    def add(self, simulation, path):
+        """
+        Create and write the input files of one simulation in the folder `path`.
+        """
+        future = self._process_executor.submit(_create_input_files_content, simulation, path)
+        self._pending_contents.append(future)
+
+        while len(self._pending_contents) >= 2*self.number_processes:
+            self._write_contents(self._pending_contents.popleft().result())
+
+    def _write_contents(self, contents):
+        for filepath, content in contents:
+            if isSharedInputFilename(filepath):
+                if filepath in self._shared_filepaths:
+                    continue
+                self._shared_filepaths.add(filepath)
+                if os.path.isfile(filepath):
+                    continue
+
+            self._pending_writes.append(self._thread_executor.submit(write_input_file, filepath, content))
+            self.number_files += 1
+
+        while len(self._pending_writes) > 4*self.number_threads:
+            self._pending_writes.popleft().result()
+
+        self.number_simulations += 1
+        if self.log_interval is not None and self.number_simulations % self.log_interval == 0:
+            self._log_progress()
+
+    def _log_progress(self):
+        elapse_time_s = time.perf_counter() - self._starting_time
+        if elapse_time_s > 0.0:
+            rate = self.number_simulations/elapse_time_s
+        else:
+            rate = 0.0
+        logging.info("Input files of %i simulations written in %.1f s (%.1f simulations/s, %i files)",
+                     self.number_simulations, elapse_time_s, rate, self.number_files)
+
+    def close(self):
+        """
+        Wait until all the files are written and stop the pools.
+        """
+        if self._process_executor is None:
+            return
+
+        try:
+            while len(self._pending_contents) > 0:
+                self._write_contents(self._pending_contents.popleft().result())
+
+            while len(self._pending_writes) > 0:
+                self._pending_writes.popleft().result()
+        finally:
+            self._process_executor.shutdown()
+            self._thread_executor.shutdown()
+            self._process_executor = None
+            self._thread_executor = None
+
+        self._log_progress()
+
+
+def _get_input_filename(simulation_inputs, attribute_name):
+    try:
+        return getattr(simulation_inputs, attribute_name)
+    except KeyError:
+        return None
+
+
+def deduplicate_input_files(input_path):
+    """
+    Replace the input files of the existing `.sim` files of a folder by shared content addressed files.
+
+    The files of :py:data:`pymcxray.Simulation.SHARED_INPUT_FILENAME_ATTRIBUTES` referenced by the `.sim` files,
+    except the ones already shared, are renamed or removed if a shared file with the same content exists and the
+    `.sim` files are rewritten to reference the shared files. Use it to migrate an input folder created without
+    :py:attr:`pymcxray.Simulation.Simulation.shareInputFiles`.
+
+    :return: tuple (number of `.sim` files rewritten, number of input files removed)
+    """
+    simulation_file_paths = sorted(os.path.join(input_path, file_name) for file_name in os.listdir(input_path)
+                                   if file_name.endswith(".sim"))
+
+    shared_filenames = {}
+    simulations_inputs = []
+    for simulation_file_path in simulation_file_paths:
+        simulation_inputs = SimulationInputs()
+        simulation_inputs.read(simulation_file_path)
+        # The files not in the .sim file stay unused when it is written again.
+        for attribute_name in INPUT_FILENAME_ATTRIBUTES + ["mapFilename", "snrFilename"]:
+            if _get_input_filename(simulation_inputs, attribute_name) is None:
+                setattr(simulation_inputs, attribute_name, None)
+        simulations_inputs.append((simulation_file_path, simulation_inputs))
+
+        for attribute_name in SHARED_INPUT_FILENAME_ATTRIBUTES:
+            filename = _get_input_filename(simulation_inputs, attribute_name)
+            if filename is None or isSharedInputFilename(filename) or filename in shared_filenames:
+                continue
+
+            file_path = os.path.join(input_path, filename)
+            if os.path.isfile(file_path):
+                with open(file_path, 'r') as input_file:
+                    content = input_file.read()
+                shared_filenames[filename] = getSharedInputFilename(content, os.path.splitext(filename)[1])
+
+    number_simulation_files = 0
+    for simulation_file_path, simulation_inputs in simulations_inputs:
+        is_modified = False
+        for attribute_name in SHARED_INPUT_FILENAME_ATTRIBUTES:
+            filename = _get_input_filename(simulation_inputs, attribute_name)
+            if filename in shared_filenames:
+                setattr(simulation_inputs, attribute_name, shared_filenames[filename])
+                is_modified = True
+
+        if is_modified:
+            simulation_inputs.write(simulation_file_path)
+            number_simulation_files += 1
+
+    number_removed_files = 0
+    for filename, shared_filename in shared_filenames.items():
+        file_path = os.path.join(input_path, filename)
+        shared_file_path = os.path.join(input_path, shared_filename)
+        if os.path.isfile(shared_file_path):
+            os.remove(file_path)
+            number_removed_files += 1
+        else:
+            os.replace(file_path, shared_file_path)
+
+    logging.info("Deduplicated the input files of %i simulations: %i files removed", number_simulation_files,
+                 number_removed_files)
+
+    return number_simulation_files, number_removed_files
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: pymcxray.LocalRunner
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Run the MCXRay program on the local computer with a pool of worker processes.
+
+Instead of static batch files, each simulation is started as soon as a worker is free, so a slow simulation does not
+leave the other processors idle. A run that exceeds the timeout is killed and a run that leaves incomplete results is
+started again.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import os
+import logging
+import subprocess
+import time
+from collections import deque
+
+# Third party modules.
+
+# Local modules.
+
+# Project modules
+
+# Globals and constants variables.
+POLL_INTERVAL_s = 0.1
+PROGRESS_INTERVAL_s = 60.0
+
+
+class LocalRunner(object):
+    def __init__(self, command, working_path, number_workers=None, timeout_s=None, maximum_number_attempts=2):
+        """
+        Pool of worker processes running the simulations.
+
+        :param command: program path or list of the program and its first arguments, the simulation file is added
+            as the last argument
+        :param working_path: folder where the program is run, the simulation files are relative to it
+        :param number_workers: number of simulations run at the same time, the number of processors if None
+        :param timeout_s: maximum run time of a simulation, no limit if None
+        :param maximum_number_attempts: number of times a simulation is run before it is reported as failed
+        """
+        if isinstance(command, str):
+            self.command = [command]
+        else:
+            self.command = list(command)
+        self.working_path = working_path
+
+        if number_workers is None:
+            number_workers = os.cpu_count() or 1
+        self.number_workers = max(1, number_workers)
+        self.timeout_s = timeout_s
+        self.maximum_number_attempts = maximum_number_attempts
+
+        self.progress_interval_s = PROGRESS_INTERVAL_s
+        self.poll_interval_s = POLL_INTERVAL_s
+
+        # Run time in second of the last successful run of each completed simulation file.
+        self.durations_s = {}
+
+    def run(self, simulation_filenames, is_done=None, finished=None, is_cancelled=None):
+        """
+        Run the simulations and wait until they are all done or failed.
+
+        :param simulation_filenames: simulation files to run, in the order they are started; an iterator is only
+            advanced when a worker is free, so the next simulation can be chosen at that time
+        :param is_done: function called with a simulation file after its run, return False if the results are
+            incomplete, the run is then considered as failed; only the exit code is checked if None
+        :param finished: function called with a simulation file and True if it is completed or False if it failed
+        :param is_cancelled: function called with a running simulation file, return True to kill its run; a cancelled
+            simulation is neither completed nor failed
+        :return: tuple (list of the completed simulation files, list of the failed simulation files)
+        """
+        try:
+            total = len(simulation_filenames)
+        except TypeError:
+            total = None
+        simulation_filenames = iter(simulation_filenames)
+        is_source_empty = False
+
+        pending = deque()
+        running = []
+        completed = []
+        failed = []
+
+        starting_time = time.perf_counter()
+        last_progress_time = starting_time
+        try:
+            while len(pending) > 0 or len(running) > 0 or not is_source_empty:
+                while len(running) < self.number_workers:
+                    if len(pending) > 0:
+                        simulation_filename, attempt = pending.popleft()
+                    elif not is_source_empty:
+                        simulation_filename, attempt = next(simulation_filenames, None), 1
+                        if simulation_filename is None:
+                            is_source_empty = True
+                            break
+                    else:
+                        break
+                    running.append((self._start(simulation_filename), simulation_filename, attempt,
+                                    time.perf_counter()))
+
+                still_running = []
+                for process, simulation_filename, attempt, start_time in running:
+                    if is_cancelled is not None and is_cancelled(simulation_filename):
+                        logging.warning("Simulation %s cancelled", simulation_filename)
+                        process.kill()
+                        process.wait()
+                        continue
+
+                    return_code = process.poll()
+                    if return_code is None:
+                        if self.timeout_s is not None and time.perf_counter() - start_time > self.timeout_s:
+                            logging.warning("Timeout of simulation %s after %.1f s", simulation_filename,
+                                            self.timeout_s)
+                            process.kill()
+                            process.wait()
+                        else:
+                            still_running.append((process, simulation_filename, attempt, start_time))
+                            continue
+
+                    if return_code == 0 and (is_done is None or is_done(simulation_filename)):
+                        logging.debug("Simulation done: %s", simulation_filename)
+                        completed.append(simulation_filename)
+                        self.durations_s[simulation_filename] = time.perf_counter() - start_time
+                        if finished is not None:
+                            finished(simulation_filename, True)
+                    elif attempt < self.maximum_number_attempts:
+                        logging.warning("Simulation %s incomplete (exit code %s), run it again", simulation_filename,
+                                        return_code)
+                        pending.append((simulation_filename, attempt + 1))
+                    else:
+                        logging.error("Simulation failed after %i attempts: %s", attempt, simulation_filename)
+                        failed.append(simulation_filename)
+                        if finished is not None:
+                            finished(simulation_filename, False)
+                running = still_running
+
+                current_time = time.perf_counter()
+                if current_time - last_progress_time >= self.progress_interval_s:
+                    last_progress_time = current_time
+                    self._log_progress(total, len(completed), len(failed), len(running), current_time - starting_time)
+
+                if len(running) >= self.number_workers or (len(pending) == 0 and len(running) > 0):
+                    time.sleep(self.poll_interval_s)
+        finally:
+            for process, _simulation_filename, _attempt, _start_time in running:
+                process.kill()
+                process.wait()
+
+        self._log_progress(total, len(completed), len(failed), 0, time.perf_counter() - starting_time)
+
+        return completed, failed
+
+    def _start(self, simulation_filename):
+        logging.debug("Start simulation: %s", simulation_filename)
+        return subprocess.Popen(self.command + [simulation_filename], cwd=self.working_path,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def _log_progress(self, total, number_completed, number_failed, number_running, elapse_time_s):
+        if elapse_time_s > 0.0:
+            rate = number_completed/elapse_time_s*3600.0
+        else:
+            rate = 0.0
+        if total is None:
+            total = "?"
+        logging.info("Simulations done: %i/%s, failed: %i, running: %i (%.1f s, %.1f simulations/h)",
+                     number_completed, total, number_failed, number_running, elapse_time_s, rate)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: pymcxray.ResultsStore
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Lazy mapping of the simulation results with a bounded cache.
+
+The results are loaded from the serialization cache or the HDF5 file the first time a key is accessed and only the
+most recently used results are kept in memory.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+from collections import OrderedDict
+from collections.abc import Mapping
+
+# Third party modules.
+
+# Local modules.
+
+# Project modules
+
+# Globals and constants variables.
+
+
+class LazyResultsStore(Mapping):
+    def __init__(self, keys, load_result, maximum_number_results=None):
+        """
+        Lazy mapping of the results.
+
+        A result evicted from the cache is loaded again when accessed, the modifications done on it are lost.
+
+        :param keys: results keys in the sweep order
+        :param load_result: function returning the result of one key
+        :param maximum_number_results: number of results kept in the cache, all the loaded results if None
+        """
+        self._keys = []
+        self._key_set = set()
+        for key in keys:
+            self.add_key(key)
+
+        self._load_result = load_result
+        self.maximum_number_results = maximum_number_results
+
+        self._cache = OrderedDict()
+
+    def add_key(self, key):
+        """
+        Add a key without loading its result.
+        """
+        if key not in self._key_set:
+            self._key_set.add(key)
+            self._keys.append(key)
+
+    def __getitem__(self, key):
+        try:
+            result = self._cache[key]
+            self._cache.move_to_end(key)
+            return result
+        except KeyError:
+            if key not in self._key_set:
+                raise
+
+        result = self._load_result(key)
+        self._add_to_cache(key, result)
+
+        return result
+
+    def __contains__(self, key):
+        return key in self._key_set
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _add_to_cache(self, key, result):
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+
+        if self.maximum_number_results is not None:
+            while len(self._cache) > max(self.maximum_number_results, 0):
+                self._cache.popitem(last=False)
+
+    @property
+    def number_cached_results(self):
+        return len(self._cache)
+
+    def add(self, key, result):
+        """
+        Add a key with a result already in memory, e.g. a result just read.
+        """
+        self.add_key(key)
+        self._add_to_cache(key, result)
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def iter_results(self, keys=None):
+        """
+        Iterate over the (key, result) pairs without adding the loaded results in the cache.
+
+        Only one result not in the cache is in memory at a time, use it for the map/reduce analyses of all the results.
+
+        :param keys: keys to iterate over, all the keys in the sweep order by default
+        """
+        if keys is None:
+            keys = list(self._keys)
+
+        for key in keys:
+            if key in self._cache:
+                yield key, self._cache[key]
+            elif key in self._key_set:
+                yield key, self._load_result(key)
+            else:
+                raise KeyError(key)
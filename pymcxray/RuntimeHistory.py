@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: pymcxray.RuntimeHistory
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+History of the run time of the MCXRay simulations.
+
+The run time of each simulation is recorded with the parameters of the cost model, either measured by the
+:py:class:`pymcxray.LocalRunner.LocalRunner` or estimated from the modification times of the results files. The
+history is used to fit the coefficients of a :py:class:`pymcxray.CostModel.CostModel`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import os
+import os.path
+import json
+import logging
+import socket
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules
+from pymcxray.CostModel import CostModel, get_features, DEFAULT_COEFFICIENTS
+
+# Globals and constants variables.
+HISTORY_VERSION = 1
+
+KEY_VERSION = "version"
+KEY_RECORDS = "records"
+
+KEY_NUMBER_ELECTRONS = "numberElectrons"
+KEY_NUMBER_PHOTONS = "numberPhotons"
+KEY_ENERGY_keV = "energy_keV"
+KEY_NUMBER_REGIONS = "numberRegions"
+KEY_TIME_s = "time_s"
+KEY_SOURCE = "source"
+KEY_HOST = "host"
+
+SOURCE_RUNNER = "runner"
+SOURCE_TIMESTAMPS = "timestamps"
+
+MINIMUM_NUMBER_RECORDS = 5
+# Weight of the default coefficients of the varied parameters in the fit, it only matters for the parameters varied
+# together in the history.
+PRIOR_WEIGHT = 1.0e-6
+
+
+def get_results_time_s(simulation, simulationPath, completion_index=None):
+    """
+    Run time estimated from the results files of a simulation, the time between the first and last modification.
+
+    :param completion_index: :py:class:`pymcxray.CompletionIndex.CompletionIndex` giving the file stats, None to
+        stat each file
+    :return: time in second or None if there is less than two results files
+    """
+    modification_times_ns = simulation.get_results_modification_times_ns(simulationPath, completion_index)
+    if len(modification_times_ns) < 2:
+        return None
+
+    return (max(modification_times_ns) - min(modification_times_ns))*1.0e-9
+
+
+class RuntimeHistory(object):
+    def __init__(self, file_path=None):
+        """
+        Run time of the simulations keyed by the simulation name, which is built from the simulation parameters.
+
+        :param file_path: path of the json file where the history is saved, the history is only in memory if None
+        """
+        self.file_path = file_path
+
+        self._records = {}
+        self._modified_names = set()
+
+        if self.file_path is not None and os.path.isfile(self.file_path):
+            self.load()
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, name):
+        return name in self._records
+
+    def _read_records(self):
+        try:
+            with open(self.file_path, 'r') as history_file:
+                data = json.load(history_file)
+        except FileNotFoundError:
+            data = {}
+        except ValueError as message:
+            logging.warning("Invalid runtime history %s: %s", self.file_path, message)
+            data = {}
+
+        if data.get(KEY_VERSION) == HISTORY_VERSION:
+            return data[KEY_RECORDS]
+        else:
+            return {}
+
+    def load(self):
+        self._records = self._read_records()
+        self._modified_names = set()
+
+    def save(self):
+        """
+        Save the history in its json file if it was modified.
+
+        The records saved by the other workers since the history was loaded are kept.
+        """
+        if self.file_path is None or len(self._modified_names) == 0:
+            return
+
+        records = self._read_records()
+        for name in self._modified_names:
+            records[name] = self._records[name]
+        self._records = records
+
+        data = {KEY_VERSION: HISTORY_VERSION, KEY_RECORDS: self._records}
+
+        temporary_file_path = "%s.tmp_%s_%i" % (self.file_path, socket.gethostname(), os.getpid())
+        with open(temporary_file_path, 'w') as history_file:
+            json.dump(data, history_file)
+        os.replace(temporary_file_path, self.file_path)
+        self._modified_names = set()
+
+    def get_record(self, name):
+        return self._records[name]
+
+    def add(self, simulation, time_s, source=SOURCE_RUNNER):
+        """
+        Record the run time of a :py:class:`pymcxray.Simulation.Simulation` or
+        :py:class:`pymcxray.Simulation.SimulationRecord`.
+
+        A time measured by the runner is not replaced by a time estimated from the timestamps.
+        """
+        name = simulation.name
+        if source == SOURCE_TIMESTAMPS and self._records.get(name, {}).get(KEY_SOURCE) == SOURCE_RUNNER:
+            return
+
+        record = {}
+        record[KEY_NUMBER_ELECTRONS] = simulation.numberElectrons
+        record[KEY_NUMBER_PHOTONS] = simulation.numberPhotons
+        record[KEY_ENERGY_keV] = simulation.energy_keV
+        record[KEY_NUMBER_REGIONS] = simulation.numberRegions
+        record[KEY_TIME_s] = float(time_s)
+        record[KEY_SOURCE] = source
+        record[KEY_HOST] = socket.gethostname()
+
+        self._records[name] = record
+        self._modified_names.add(name)
+
+    def add_from_results_files(self, simulation, simulationPath, completion_index=None):
+        """
+        Record the run time estimated from the results files if the simulation is not in the history.
+
+        :return: True if the simulation was added
+        """
+        if simulation.name in self._records:
+            return False
+
+        time_s = get_results_time_s(simulation, simulationPath, completion_index)
+        if time_s is None or time_s <= 0.0:
+            return False
+
+        self.add(simulation, time_s, SOURCE_TIMESTAMPS)
+        return True
+
+    def get_arrays(self, sources=None):
+        """
+        Parameters and run times of the records as numpy arrays.
+
+        :param sources: sources of the records used, all the records if None
+        :return: tuple (number_electrons, number_photons, energies_keV, number_regions, times_s)
+        """
+        records = [record for record in self._records.values() if sources is None or record[KEY_SOURCE] in sources]
+        keys = [KEY_NUMBER_ELECTRONS, KEY_NUMBER_PHOTONS, KEY_ENERGY_keV, KEY_NUMBER_REGIONS, KEY_TIME_s]
+        return tuple(np.array([record[key] for record in records], dtype=float) for key in keys)
+
+    def fit_cost_model(self, minimum_number_records=MINIMUM_NUMBER_RECORDS, sources=(SOURCE_RUNNER,)):
+        """
+        Fit a cost model on the history with a least squares fit of the logarithm of the run times.
+
+        Only the intercept and the coefficients of the parameters varied in the history are fitted, the other
+        parameters keep their default coefficient. The fitted coefficients are regularized toward the default ones,
+        so the parameters varied together in the history keep a sensible effect. By default, only the run times measured by the runner are used, the time between the
+        modifications of the results files is not the run time of the simulation.
+
+        :param sources: sources of the records used in the fit, all the records if None
+        :return: :py:class:`pymcxray.CostModel.CostModel` or None if there are less than `minimum_number_records`
+            records
+        """
+        if len(self._records) < minimum_number_records:
+            return None
+
+        number_electrons, number_photons, energies_keV, number_regions, times_s = self.get_arrays(sources)
+        mask = times_s > 0.0
+        if np.count_nonzero(mask) < minimum_number_records:
+            return None
+
+        features = get_features(number_electrons[mask], number_photons[mask], energies_keV[mask],
+                                number_regions[mask])
+        log_times = np.log(times_s[mask])
+
+        # A parameter not varied is collinear with the intercept, its coefficient cannot be fitted.
+        coefficients = np.array(DEFAULT_COEFFICIENTS, dtype=float)
+        varied_ids = [index for index in range(1, features.shape[1]) if np.ptp(features[:, index]) > 0.0]
+        fixed_ids = [index for index in range(1, features.shape[1]) if index not in varied_ids]
+        fitted_ids = [0] + varied_ids
+
+        log_times = log_times - features[:, fixed_ids].dot(coefficients[fixed_ids])
+
+        weight = np.sqrt(PRIOR_WEIGHT*len(log_times))
+        prior_matrix = weight*np.eye(len(fitted_ids))[1:]
+        matrix = np.vstack([features[:, fitted_ids], prior_matrix])
+        values = np.concatenate([log_times, weight*coefficients[varied_ids]])
+
+        coefficients[fitted_ids], _residuals, _rank, _singular_values = np.linalg.lstsq(matrix, values, rcond=None)
+        logging.debug("Cost model coefficients fitted on %i simulations: %s", len(log_times), coefficients)
+
+        return CostModel(coefficients)
@@ -28,6 +28,10 @@ MCXRay simulation parameters.
 # Standard library modules.
 import logging
 import os.path
+import hashlib
+import contextlib
+import socket
+import threading
 from itertools import product
 
 # Third party modules.
@@ -60,6 +64,48 @@ from pymcxray.SimulationsParameters import PARAMETER_INCIDENT_ENERGY_keV, PARAME
     PARAMETER_MODEL_ATOM_MAC, PARAMETER_NUMBER_LAYERS_X, PARAMETER_NUMBER_LAYERS_Y, PARAMETER_NUMBER_LAYERS_Z
 
 # Globals and constants variables.
+SHARED_INPUT_FILE_PREFIX = "Shared_"
+SHARED_INPUT_FILE_HASH_SIZE = 20
+
+# Parameters used by Simulation.setParameters, the other parameters define the specimen.
+SIMULATION_PARAMETERS = [PARAMETER_INCIDENT_ENERGY_keV, PARAMETER_NUMBER_ELECTRONS, PARAMETER_NUMBER_XRAYS,
+                         PARAMETER_BEAM_DIAMETER_nm, PARAMETER_BEAM_TILT_deg, PARAMETER_BEAM_POSITION_nm,
+                         PARAMETER_DETECTOR_DISTANCE_cm, PARAMETER_DETECTOR_RADIUS_cm, PARAMETER_DETECTOR_THICKNESS_cm,
+                         PARAMETER_DETECTOR_NOISE_eV, PARAMETER_DETECTOR_CHANNEL_WIDTH_eV, PARAMETER_TOA_deg,
+                         PARAMETER_DETECTOR_AZIMUTHAL_ANGLE_deg, PARAMETER_NUMBER_WINDOWS, PARAMETER_NUMBER_LAYERS_X,
+                         PARAMETER_NUMBER_LAYERS_Y, PARAMETER_NUMBER_LAYERS_Z,
+                         PARAMETER_ELASTIC_CROSS_SECTION_SCALING_FACTOR, PARAMETER_ENERGY_LOSS_SCALING_FACTOR,
+                         PARAMETER_MODEL_SAMPLE_ENERGY_LOSS, PARAMETER_MODEL_XRAY_CHARACTERISTIC,
+                         PARAMETER_MODEL_XRAY_BREMSSTRAHLUNG, PARAMETER_MODEL_ATOM_CROSS_SECTION,
+                         PARAMETER_MODEL_ATOM_COLLISION, PARAMETER_MODEL_ATOM_MAC]
+
+INPUT_FILENAME_ATTRIBUTES = ["specimenFilename", "modelFilename", "microsopeFilename", "simulationParametersFilename",
+                             "resultParametersFilename"]
+# Input files shared with shareInputFiles. The microscope file contains the beam position and the simulation
+# parameters file the results base file name, they are unique to each simulation and keep the simulation name.
+SHARED_INPUT_FILENAME_ATTRIBUTES = ["specimenFilename", "modelFilename", "resultParametersFilename"]
+
+
+def getSharedInputFilename(content, extension):
+    """
+    Content addressed name of a shared input file, the same content always gives the same name.
+    """
+    digest = hashlib.sha1(content.encode('utf-8')).hexdigest()[:SHARED_INPUT_FILE_HASH_SIZE]
+    return "%s%s%s" % (SHARED_INPUT_FILE_PREFIX, digest, extension)
+
+
+def isSharedInputFilename(filename):
+    return os.path.basename(filename).startswith(SHARED_INPUT_FILE_PREFIX)
+
+
+def write_input_file(filepath, content):
+    """
+    Write an input file with a temporary file moved in place, so a file is never seen partially written.
+    """
+    temporary_filepath = "%s.tmp_%s_%i_%i" % (filepath, socket.gethostname(), os.getpid(), threading.get_ident())
+    with open(temporary_filepath, 'w') as output_file:
+        output_file.write(content)
+    os.replace(temporary_filepath, filepath)
 
 
 def createPureBulkSample(atomic_number):
@@ -903,6 +949,96 @@ def create_weight_fractions_trace(weight_fraction_step, number_elements, min_wei
     return list(weight_fractions_data)
 
 
+def create_simulation_name(basename, specimen_name, parameters, format_digit):
+    """
+    Name of a simulation built from the basename of the analysis, the name of its specimen and its parameters.
+    """
+    name = "%s_%s" % (basename, specimen_name)
+
+    if PARAMETER_INCIDENT_ENERGY_keV in parameters:
+        if PARAMETER_INCIDENT_ENERGY_keV in format_digit:
+            name += "_E{:.{}f}keV".format(parameters[PARAMETER_INCIDENT_ENERGY_keV], format_digit[PARAMETER_INCIDENT_ENERGY_keV])
+        else:
+            name += "_E%.1fkeV" % (parameters[PARAMETER_INCIDENT_ENERGY_keV])
+
+    if PARAMETER_NUMBER_ELECTRONS in parameters:
+        name += "_N%ie" % (parameters[PARAMETER_NUMBER_ELECTRONS])
+
+    if PARAMETER_NUMBER_XRAYS in parameters:
+        name += "_N%iX" % (parameters[PARAMETER_NUMBER_XRAYS])
+
+    if PARAMETER_REPETITION in parameters:
+        name += "_R%0i" % (parameters[PARAMETER_REPETITION])
+
+    if PARAMETER_BEAM_DIAMETER_nm in parameters:
+        name += "_dB%.1fnm" % (parameters[PARAMETER_BEAM_DIAMETER_nm])
+
+    if PARAMETER_BEAM_TILT_deg in parameters:
+        name += "_tB%.1fdeg" % (parameters[PARAMETER_BEAM_TILT_deg])
+
+    if PARAMETER_BEAM_POSITION_nm in parameters:
+        name += "_PX%.1fPY%.1fnm" % (parameters[PARAMETER_BEAM_POSITION_nm])
+
+    if PARAMETER_TIME_s in parameters:
+        name += "_t%is" % (parameters[PARAMETER_TIME_s])
+
+    if PARAMETER_CURRENT_nA in parameters:
+        name += "_I%inA" % (parameters[PARAMETER_CURRENT_nA])
+
+    if PARAMETER_DETECTOR_DISTANCE_cm in parameters:
+        name += "_dX%.2fcm" % (parameters[PARAMETER_DETECTOR_DISTANCE_cm])
+    if PARAMETER_DETECTOR_RADIUS_cm in parameters:
+        name += "_rDX%.2fcm" % (parameters[PARAMETER_DETECTOR_RADIUS_cm])
+    if PARAMETER_DETECTOR_THICKNESS_cm in parameters:
+        name += "_TDX%.2fcm" % (parameters[PARAMETER_DETECTOR_THICKNESS_cm])
+    if PARAMETER_DETECTOR_NOISE_eV in parameters:
+        name += "_N%.1feV" % (parameters[PARAMETER_DETECTOR_NOISE_eV])
+    if PARAMETER_DETECTOR_CHANNEL_WIDTH_eV in parameters:
+        name += "_w%ieV" % (parameters[PARAMETER_DETECTOR_CHANNEL_WIDTH_eV])
+    if PARAMETER_TOA_deg in parameters:
+        name += "_TOA%.1fdeg" % (parameters[PARAMETER_TOA_deg])
+    if PARAMETER_DETECTOR_AZIMUTHAL_ANGLE_deg in parameters:
+        name += "_AA%.1fdeg" % (parameters[PARAMETER_DETECTOR_AZIMUTHAL_ANGLE_deg])
+    if PARAMETER_NUMBER_WINDOWS in parameters:
+        name += "_N%iW" % (parameters[PARAMETER_NUMBER_WINDOWS])
+    if PARAMETER_NUMBER_LAYERS_X in parameters:
+        name += "_N%iLX" % (parameters[PARAMETER_NUMBER_LAYERS_X])
+    if PARAMETER_NUMBER_LAYERS_Y in parameters:
+        name += "_N%iLY" % (parameters[PARAMETER_NUMBER_LAYERS_Y])
+    if PARAMETER_NUMBER_LAYERS_Z in parameters:
+        name += "_N%iLZ" % (parameters[PARAMETER_NUMBER_LAYERS_Z])
+
+    if PARAMETER_ELASTIC_CROSS_SECTION_SCALING_FACTOR in parameters:
+        name += "_ECSF%f" % (parameters[PARAMETER_ELASTIC_CROSS_SECTION_SCALING_FACTOR])
+
+    if PARAMETER_ENERGY_LOSS_SCALING_FACTOR in parameters:
+        name += "_ELF%f" % (parameters[PARAMETER_ENERGY_LOSS_SCALING_FACTOR])
+
+    if PARAMETER_MODEL_SAMPLE_ENERGY_LOSS in parameters:
+        name += "_MSEL%i" % (parameters[PARAMETER_MODEL_SAMPLE_ENERGY_LOSS])
+    if PARAMETER_MODEL_XRAY_CHARACTERISTIC in parameters:
+        name += "_MXC%i" % (parameters[PARAMETER_MODEL_XRAY_CHARACTERISTIC])
+    if PARAMETER_MODEL_XRAY_BREMSSTRAHLUNG in parameters:
+        name += "_MXB%i" % (parameters[PARAMETER_MODEL_XRAY_BREMSSTRAHLUNG])
+    if PARAMETER_MODEL_ATOM_CROSS_SECTION in parameters:
+        name += "_MACS%i" % (parameters[PARAMETER_MODEL_ATOM_CROSS_SECTION])
+    if PARAMETER_MODEL_ATOM_COLLISION in parameters:
+        name += "_MAC%i" % (parameters[PARAMETER_MODEL_ATOM_COLLISION])
+    if PARAMETER_MODEL_ATOM_MAC in parameters:
+        name += "_MAM%i" % (parameters[PARAMETER_MODEL_ATOM_MAC])
+
+    return name
+
+
+def get_results_basename(name):
+    """
+    Base file name of the results files of a simulation relative to the simulations folder.
+    """
+    nameWithoutDot = name.replace('.', 'd')
+    baseFilenameRef = "Results/%s" % (nameWithoutDot)
+    return os.path.normpath(baseFilenameRef)
+
+
 class Simulation(object):
     def __init__(self, overwrite=True):
         self._simulationInputs = SimulationInputs.SimulationInputs()
@@ -913,6 +1049,7 @@ class Simulation(object):
         self._resultParameters = ResultsParameters.ResultsParameters()
 
         self._overwrite = overwrite
+        self.shareInputFiles = False
 
         self._useOldVersion = False
 
@@ -920,7 +1057,55 @@ class Simulation(object):
 
         self.format_digit = {}
 
-    def createSimulationFiles(self, path, simulationPath, hdf5_group):
+    def createSimulationFiles(self, path, simulationPath, hdf5_group, completion_index=None):
+        self._setInputFilenames(path)
+
+        if not self._overwrite and self.isDone(simulationPath, hdf5_group, completion_index):
+            self.removeInputsFiles()
+        elif self.shareInputFiles:
+            for filepath, content in self.createSimulationFilesContent(path):
+                if isSharedInputFilename(filepath) and os.path.isfile(filepath):
+                    continue
+
+                write_input_file(filepath, content)
+        else:
+            self._createSimulationInputsFile()
+            self._createSpecimenInputFile()
+            self._createModelsInputFile()
+            self._createMicroscopeInputFile()
+            self._createSimulationParametersInputFile()
+            self._createResultParametersInputFile()
+
+    def createSimulationFilesContent(self, path):
+        """
+        Content of the input files written by :py:meth:`createSimulationFiles`, without writing them.
+
+        With :py:attr:`shareInputFiles`, the files of :py:data:`SHARED_INPUT_FILENAME_ATTRIBUTES` are named from
+        their content with :py:func:`getSharedInputFilename` and the `.sim` file references these shared files.
+
+        :return: list of tuple (filepath, content) in the writing order
+        """
+        self._setInputFilenames(path)
+
+        inputContents = [self._specimen.createContent(), self._models.createContent(),
+                         self._microscopeParameters.createContent(), self._simulationParameters.createContent(),
+                         self._resultParameters.createContent()]
+
+        contents = []
+        for attributeName, content in zip(INPUT_FILENAME_ATTRIBUTES, inputContents):
+            filename = getattr(self._simulationInputs, attributeName)
+            if self.shareInputFiles and attributeName in SHARED_INPUT_FILENAME_ATTRIBUTES:
+                filename = getSharedInputFilename(content, os.path.splitext(filename)[1])
+                setattr(self._simulationInputs, attributeName, filename)
+
+            contents.append((os.path.join(self._path, filename), content))
+
+        filepath = os.path.join(self._path, self.filename)
+        contents.insert(0, (filepath, self._simulationInputs.createContent(filepath)))
+
+        return contents
+
+    def _setInputFilenames(self, path):
         nameWithoutDot = self.name.replace('.', 'd')
         baseFilenameRef = "Results/%s" % (nameWithoutDot)
         self._simulationParameters.baseFilename = os.path.normpath(baseFilenameRef)
@@ -935,16 +1120,6 @@ class Simulation(object):
 
         self._path = path
 
-        if self._overwrite or not self.isDone(simulationPath, hdf5_group):
-            self._createSimulationInputsFile()
-            self._createSpecimenInputFile()
-            self._createModelsInputFile()
-            self._createMicroscopeInputFile()
-            self._createSimulationParametersInputFile()
-            self._createResultParametersInputFile()
-        elif self.isDone(simulationPath, hdf5_group):
-            self.removeInputsFiles()
-
     def _createSimulationInputsFile(self):
         simulationInputsFilepath = os.path.join(self._path, self.filename)
 
@@ -990,13 +1165,26 @@ class Simulation(object):
         filepath = os.path.join(self._path, self._simulationInputs.resultParametersFilename)
         self._resultParameters.write(filepath)
 
-    def isDone(self, simulationPath, hdf5_group=None):
+    def isDone(self, simulationPath, hdf5_group=None, completion_index=None):
+        """
+        Check if all the results files exist or if the results are in the HDF5 group.
+
+        :param completion_index: :py:class:`pymcxray.CompletionIndex.CompletionIndex` used instead of checking each
+            file on the disk, `hdf5_group` is not used and the HDF5 group names of the index are used instead
+        """
+        if completion_index is not None:
+            base_filepath = os.path.join(simulationPath, self.resultsBasename)
+            if completion_index.is_done(base_filepath, self.getFilenameSuffixes()):
+                return True
+            else:
+                return completion_index.has_hdf5_group(self.name)
+
         _isDone = True
         for suffix in self.getFilenameSuffixes():
-            filepath = os.path.join(simulationPath, self._simulationParameters.baseFilename + suffix)
+            filepath = os.path.join(simulationPath, self.resultsBasename + suffix)
             if not os.path.isfile(filepath):
                 _isDone = False
-                logging.debug("Missing file: %s", self._simulationParameters.baseFilename + suffix)
+                logging.debug("Missing file: %s", self.resultsBasename + suffix)
                 break
 
         if hdf5_group is not None and not _isDone:
@@ -1072,8 +1260,76 @@ _XrayIntensitiesFromPhirhoz.csv""".splitlines()
 
         return filenameSuffixes
 
+    def get_results_fingerprint(self, simulationPath, completion_index=None):
+        """
+        Fingerprint of the results files of the simulation.
+
+        The fingerprint is computed from the size and modification time of each results file, a missing file is
+        included as such. The fingerprint changes when a results file is created, removed or rewritten.
+
+        :param simulationPath: folder containing the results files
+        :param completion_index: :py:class:`pymcxray.CompletionIndex.CompletionIndex` giving the file stats, None to
+            stat each file
+        :return: hexadecimal digest string
+        """
+        fingerprint = hashlib.sha1()
+        for suffix, file_stat in self._get_results_file_stats(simulationPath, completion_index):
+            if file_stat is not None:
+                file_information = "%s:%i:%i;" % (suffix, file_stat[0], file_stat[1])
+            else:
+                file_information = "%s:missing;" % (suffix)
+            fingerprint.update(file_information.encode('utf-8'))
+
+        return fingerprint.hexdigest()
+
+    def _get_results_file_stats(self, simulationPath, completion_index=None):
+        """
+        Generate the suffix of each results file with its size and modification time, None if the file is missing.
+        """
+        for suffix in self.getFilenameSuffixes():
+            filepath = os.path.join(simulationPath, self.resultsBasename + suffix)
+            if completion_index is not None:
+                file_stat = completion_index.get_file_stat(filepath)
+            else:
+                try:
+                    os_stat = os.stat(filepath)
+                    file_stat = (os_stat.st_size, os_stat.st_mtime_ns)
+                except OSError:
+                    file_stat = None
+            yield suffix, file_stat
+
+    def get_results_modification_times_ns(self, simulationPath, completion_index=None):
+        """
+        Modification times of the existing results files of the simulation.
+
+        :return: list of modification times in nanosecond
+        """
+        return [file_stat[1] for _suffix, file_stat in self._get_results_file_stats(simulationPath, completion_index)
+                if file_stat is not None]
+
+    def get_results_filepaths(self, simulationPath, completion_index=None):
+        """
+        Paths of the existing results files of the simulation.
+
+        :param simulationPath: folder containing the results files
+        :param completion_index: :py:class:`pymcxray.CompletionIndex.CompletionIndex` used instead of checking each
+            file, None to check each file
+        :return: list of file paths
+        """
+        filepaths = []
+        for suffix in self.getFilenameSuffixes():
+            filepath = os.path.join(simulationPath, self.resultsBasename + suffix)
+            if completion_index is not None:
+                is_file = completion_index.is_file(filepath)
+            else:
+                is_file = os.path.isfile(filepath)
+            if is_file:
+                filepaths.append(filepath)
+
+        return filepaths
+
     def getProgramVersionFilepath(self, simulationPath):
-        filepath = os.path.join(simulationPath, self._simulationParameters.baseFilename + "_ProgramVersion.dat")
+        filepath = os.path.join(simulationPath, self.resultsBasename + "_ProgramVersion.dat")
         return filepath
 
     def setParameters(self, parameters):
@@ -1137,9 +1393,7 @@ _XrayIntensitiesFromPhirhoz.csv""".splitlines()
         return self._parameters
 
     def generateBaseFilename(self):
-        nameWithoutDot = self.name.replace('.', 'd')
-        baseFilenameRef = "Results/%s" % (nameWithoutDot)
-        self._simulationParameters.baseFilename = os.path.normpath(baseFilenameRef)
+        self._simulationParameters.baseFilename = get_results_basename(self.name)
 
     @property
     def energy_keV(self):
@@ -1281,79 +1535,7 @@ _XrayIntensitiesFromPhirhoz.csv""".splitlines()
 
     @property
     def name(self):
-        name = "%s_%s" % (self.basename, self._specimen.name)
-
-        if PARAMETER_INCIDENT_ENERGY_keV in self._parameters:
-            if PARAMETER_INCIDENT_ENERGY_keV in self.format_digit:
-                name += "_E{:.{}f}keV".format(self._parameters[PARAMETER_INCIDENT_ENERGY_keV], self.format_digit[PARAMETER_INCIDENT_ENERGY_keV])
-            else:
-                name += "_E%.1fkeV" % (self._parameters[PARAMETER_INCIDENT_ENERGY_keV])
-
-        if PARAMETER_NUMBER_ELECTRONS in self._parameters:
-            name += "_N%ie" % (self._parameters[PARAMETER_NUMBER_ELECTRONS])
-
-        if PARAMETER_NUMBER_XRAYS in self._parameters:
-            name += "_N%iX" % (self._parameters[PARAMETER_NUMBER_XRAYS])
-
-        if PARAMETER_REPETITION in self._parameters:
-            name += "_R%0i" % (self._parameters[PARAMETER_REPETITION])
-
-        if PARAMETER_BEAM_DIAMETER_nm in self._parameters:
-            name += "_dB%.1fnm" % (self._parameters[PARAMETER_BEAM_DIAMETER_nm])
-
-        if PARAMETER_BEAM_TILT_deg in self._parameters:
-            name += "_tB%.1fdeg" % (self._parameters[PARAMETER_BEAM_TILT_deg])
-
-        if PARAMETER_BEAM_POSITION_nm in self._parameters:
-            name += "_PX%.1fPY%.1fnm" % (self._parameters[PARAMETER_BEAM_POSITION_nm])
-
-        if PARAMETER_TIME_s in self._parameters:
-            name += "_t%is" % (self._parameters[PARAMETER_TIME_s])
-
-        if PARAMETER_CURRENT_nA in self._parameters:
-            name += "_I%inA" % (self._parameters[PARAMETER_CURRENT_nA])
-
-        if PARAMETER_DETECTOR_DISTANCE_cm in self._parameters:
-            name += "_dX%.2fcm" % (self._parameters[PARAMETER_DETECTOR_DISTANCE_cm])
-        if PARAMETER_DETECTOR_RADIUS_cm in self._parameters:
-            name += "_rDX%.2fcm" % (self._parameters[PARAMETER_DETECTOR_RADIUS_cm])
-        if PARAMETER_DETECTOR_THICKNESS_cm in self._parameters:
-            name += "_TDX%.2fcm" % (self._parameters[PARAMETER_DETECTOR_THICKNESS_cm])
-        if PARAMETER_DETECTOR_NOISE_eV in self._parameters:
-            name += "_N%.1feV" % (self._parameters[PARAMETER_DETECTOR_NOISE_eV])
-        if PARAMETER_DETECTOR_CHANNEL_WIDTH_eV in self._parameters:
-            name += "_w%ieV" % (self._parameters[PARAMETER_DETECTOR_CHANNEL_WIDTH_eV])
-        if PARAMETER_TOA_deg in self._parameters:
-            name += "_TOA%.1fdeg" % (self._parameters[PARAMETER_TOA_deg])
-        if PARAMETER_DETECTOR_AZIMUTHAL_ANGLE_deg in self._parameters:
-            name += "_AA%.1fdeg" % (self._parameters[PARAMETER_DETECTOR_AZIMUTHAL_ANGLE_deg])
-        if PARAMETER_NUMBER_WINDOWS in self._parameters:
-            name += "_N%iW" % (self._parameters[PARAMETER_NUMBER_WINDOWS])
-        if PARAMETER_NUMBER_LAYERS_X in self._parameters:
-            name += "_N%iLX" % (self._parameters[PARAMETER_NUMBER_LAYERS_X])
-        if PARAMETER_NUMBER_LAYERS_Y in self._parameters:
-            name += "_N%iLY" % (self._parameters[PARAMETER_NUMBER_LAYERS_Y])
-        if PARAMETER_NUMBER_LAYERS_Z in self._parameters:
-            name += "_N%iLZ" % (self._parameters[PARAMETER_NUMBER_LAYERS_Z])
-
-        if PARAMETER_ELASTIC_CROSS_SECTION_SCALING_FACTOR in self._parameters:
-            name += "_ECSF%f" % (self._parameters[PARAMETER_ELASTIC_CROSS_SECTION_SCALING_FACTOR])
-
-        if PARAMETER_ENERGY_LOSS_SCALING_FACTOR in self._parameters:
-            name += "_ELF%f" % (self._parameters[PARAMETER_ENERGY_LOSS_SCALING_FACTOR])
-
-        if PARAMETER_MODEL_SAMPLE_ENERGY_LOSS in self._parameters:
-            name += "_MSEL%i" % (self._parameters[PARAMETER_MODEL_SAMPLE_ENERGY_LOSS])
-        if PARAMETER_MODEL_XRAY_CHARACTERISTIC in self._parameters:
-            name += "_MXC%i" % (self._parameters[PARAMETER_MODEL_XRAY_CHARACTERISTIC])
-        if PARAMETER_MODEL_XRAY_BREMSSTRAHLUNG in self._parameters:
-            name += "_MXB%i" % (self._parameters[PARAMETER_MODEL_XRAY_BREMSSTRAHLUNG])
-        if PARAMETER_MODEL_ATOM_CROSS_SECTION in self._parameters:
-            name += "_MACS%i" % (self._parameters[PARAMETER_MODEL_ATOM_CROSS_SECTION])
-        if PARAMETER_MODEL_ATOM_COLLISION in self._parameters:
-            name += "_MAC%i" % (self._parameters[PARAMETER_MODEL_ATOM_COLLISION])
-        if PARAMETER_MODEL_ATOM_MAC in self._parameters:
-            name += "_MAM%i" % (self._parameters[PARAMETER_MODEL_ATOM_MAC])
+        name = create_simulation_name(self.basename, self._specimen.name, self._parameters, self.format_digit)
 
         if self._useOldVersion:
             name += "_E%.1fkeV" % (self.energy_keV)
@@ -1384,6 +1566,10 @@ _XrayIntensitiesFromPhirhoz.csv""".splitlines()
     def numberPhotons(self, numberPhotons):
         self._simulationParameters.numberPhotons = numberPhotons
 
+    @property
+    def numberRegions(self):
+        return self._specimen.numberRegions
+
     @property
     def modelXrayBremsstrahlung(self):
         return self._models.modelXrayBremsstrahlung
@@ -1418,3 +1604,122 @@ _XrayIntensitiesFromPhirhoz.csv""".splitlines()
     @energyLossScalingFactor.setter
     def energyLossScalingFactor(self, energyLossScalingFactor):
         self._simulationParameters.energyLossScalingFactor = energyLossScalingFactor
+
+
+class SimulationRecord(object):
+    """
+    Lightweight record of one simulation of a sweep with its parameters and derived names.
+
+    The methods on the results files are the ones of :py:class:`Simulation`. The other attributes are read from a
+    full :py:class:`Simulation` created when needed with `create_simulation` and not kept by the record, except
+    inside a :py:meth:`keep_simulation` block.
+    """
+    INPUT_FILE_EXTENSIONS = [".sim", ".sam", ".mdl", ".mic", ".par", ".rp"]
+
+    def __init__(self, parameters, name, resultsBasename, create_simulation=None, overwrite=True, attributes=None):
+        """
+        :param parameters: dict of the simulation parameters
+        :param name: name of the simulation
+        :param resultsBasename: base file name of the results files relative to the simulations folder
+        :param create_simulation: function creating the full :py:class:`Simulation` from the parameters
+        :param overwrite: same as the `overwrite` of the full :py:class:`Simulation`
+        :param attributes: dict of attribute values of the full :py:class:`Simulation` kept by the record
+        """
+        self._parameters = parameters
+        self.name = name
+        self.resultsBasename = resultsBasename
+        self._create_simulation = create_simulation
+        self._overwrite = overwrite
+        self._attributes = dict(attributes or {})
+        self._simulation = None
+        self._is_simulation_kept = False
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_create_simulation"] = None
+        state["_simulation"] = None
+        state["_is_simulation_kept"] = False
+        return state
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        try:
+            return self._attributes[name]
+        except KeyError:
+            return getattr(self.get_simulation(), name)
+
+    def set_create_simulation(self, create_simulation):
+        self._create_simulation = create_simulation
+
+    def get_simulation(self):
+        """
+        Create the full :py:class:`Simulation` of the record, the same one is returned inside a
+        :py:meth:`keep_simulation` block.
+        """
+        if self._simulation is not None:
+            return self._simulation
+
+        if self._create_simulation is None:
+            raise ValueError("No function to create the simulation %s" % (self.name))
+
+        simulation = self._create_simulation(self._parameters)
+        if self._is_simulation_kept:
+            self._simulation = simulation
+
+        return simulation
+
+    @contextlib.contextmanager
+    def keep_simulation(self):
+        """
+        Keep the full :py:class:`Simulation` created inside the block, so it is created at most once for all the
+        attributes read in the block. It is released at the end of the block.
+        """
+        is_outer_block = not self._is_simulation_kept
+        self._is_simulation_kept = True
+        try:
+            yield self
+        finally:
+            if is_outer_block:
+                self._is_simulation_kept = False
+                self._simulation = None
+
+    def getParameters(self):
+        return self._parameters
+
+    @property
+    def filename(self):
+        return self.name + ".sim"
+
+    @property
+    def energy_keV(self):
+        if PARAMETER_INCIDENT_ENERGY_keV in self._parameters:
+            return self._parameters[PARAMETER_INCIDENT_ENERGY_keV]
+        elif "energy_keV" in self._attributes:
+            return self._attributes["energy_keV"]
+        else:
+            return self.get_simulation().energy_keV
+
+    def createSimulationFiles(self, path, simulationPath, hdf5_group, completion_index=None):
+        """
+        Write the input files with the full :py:class:`Simulation`, only created if the simulation is not done.
+        """
+        if self._overwrite or not self.isDone(simulationPath, hdf5_group, completion_index):
+            self.get_simulation().createSimulationFiles(path, simulationPath, hdf5_group, completion_index)
+        else:
+            self.removeInputsFiles(path)
+
+    def removeInputsFiles(self, path):
+        for extension in SimulationRecord.INPUT_FILE_EXTENSIONS:
+            filepath = os.path.join(path, self.name + extension)
+            if os.path.exists(filepath):
+                os.remove(filepath)
+
+    isDone = Simulation.isDone
+    getFilenameSuffixes = Simulation.getFilenameSuffixes
+    get_results_fingerprint = Simulation.get_results_fingerprint
+    _get_results_file_stats = Simulation._get_results_file_stats
+    get_results_modification_times_ns = Simulation.get_results_modification_times_ns
+    get_results_filepaths = Simulation.get_results_filepaths
+    getProgramVersionFilepath = Simulation.getProgramVersionFilepath
@@ -16,11 +16,12 @@ __license__ = ""
 # Standard library modules.
 import logging
 import csv
+from itertools import product
 
 # Third party modules.
+import numpy as np
 
 # Local modules.
-import pymcxray.multipleloop as multipleloop
 
 # Project modules
 
@@ -83,12 +84,311 @@ PARAMETER_MODEL_ATOM_CROSS_SECTION = "modelAtomCrossSection"
 PARAMETER_MODEL_ATOM_COLLISION = "modelAtomCollision"
 PARAMETER_MODEL_ATOM_MAC = "modelAtomMac"
 
+SOLID_ANGLE_sr = 0.0351945099176
+
+def _getParameterValues(values):
+    """
+    List of the values of one parameter, a scalar is a single value as in :py:func:`pymcxray.multipleloop.combine`.
+    """
+    if isinstance(values, (float, int, complex, str)):
+        return [values]
+    else:
+        return list(values)
+
+class ParametersProduct(object):
+    def __init__(self, parameters):
+        """
+        Lazy Cartesian product of the parameter values.
+
+        The experiments are in the same order as :py:func:`pymcxray.multipleloop.combine`, the first parameter varies
+        the fastest. They are generated one at a time or accessed by their flat index, the product is never
+        materialized.
+
+        :param parameters: dict or list of (name, values), the values are a list or a scalar
+        """
+        if isinstance(parameters, dict):
+            parameters = [(name, parameters[name]) for name in parameters]
+
+        self._names = []
+        self._values = []
+        for name, values in parameters:
+            self._names.append(name)
+            self._values.append(_getParameterValues(values))
+
+    @property
+    def names(self):
+        return list(self._names)
+
+    @property
+    def shape(self):
+        """
+        Number of values of each parameter, in the order of :py:attr:`names`.
+        """
+        return tuple(len(values) for values in self._values)
+
+    @property
+    def varied(self):
+        return [name for name, values in zip(self._names, self._values) if len(values) > 1]
+
+    def __len__(self):
+        numberExperiments = 1
+        for values in self._values:
+            numberExperiments *= len(values)
+        return numberExperiments
+
+    def __iter__(self):
+        if len(self._values) == 0:
+            return
+
+        for reversedValues in product(*reversed(self._values)):
+            yield list(reversed(reversedValues))
+
+    def getIndices(self, index):
+        """
+        Index of the value of each parameter for the experiment at the flat index `index`.
+        """
+        numberExperiments = len(self)
+        if index < 0:
+            index += numberExperiments
+        if index < 0 or index >= numberExperiments:
+            raise IndexError("Experiment index out of range: %i" % (index))
+
+        indices = []
+        for values in self._values:
+            index, valueIndex = divmod(index, len(values))
+            indices.append(valueIndex)
+
+        return indices
+
+    def __getitem__(self, index):
+        indices = self.getIndices(index)
+        return [values[valueIndex] for values, valueIndex in zip(self._values, indices)]
+
+    def getValuesColumn(self, name):
+        """
+        Value of the parameter `name` for all the experiments, as an object array.
+        """
+        parameterIndex = self._names.index(name)
+        values = self._values[parameterIndex]
+
+        valuesArray = np.empty(len(values), dtype=object)
+        for valueIndex, value in enumerate(values):
+            valuesArray[valueIndex] = value
+
+        numberRepeats = 1
+        for otherValues in self._values[:parameterIndex]:
+            numberRepeats *= len(otherValues)
+        numberTiles = len(self) // (numberRepeats*len(values))
+
+        return np.tile(np.repeat(valuesArray, numberRepeats), numberTiles)
+
+def _addColumns(columns, name, values):
+    """
+    Add the column of one parameter, the tuple values are split in one numeric column per item named `name_i`.
+    """
+    if len(values) > 0 and isinstance(values[0], (tuple, list)):
+        valuesArray = np.array(list(values), dtype=float)
+        for itemIndex in range(valuesArray.shape[1]):
+            columns["%s_%i" % (name, itemIndex)] = valuesArray[:, itemIndex]
+    else:
+        columns[name] = np.array(list(values))
+
+class ParametersTable(object):
+    def __init__(self, numberRows, fixedParameters=None):
+        """
+        Columnar table of the experiments of a sweep, one numpy array per varied parameter.
+
+        Use the column masks to select experiments with array operations instead of dict lookups, e.g.
+        ``table.getRows(table.isEqual(PARAMETER_INCIDENT_ENERGY_keV, 15.0) & table.isInRange("beamPosition_0", 0.0, 10.0))``.
+
+        :param numberRows: number of experiments
+        :param fixedParameters: dict of the parameters with the same value for all the experiments
+        """
+        self._numberRows = numberRows
+        self._columns = {}
+        self.fixedParameters = dict(fixedParameters or {})
+        self._simulationNames = None
+
+    def __len__(self):
+        return self._numberRows
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    @property
+    def columnNames(self):
+        return list(self._columns.keys())
+
+    def addColumn(self, name, values):
+        """
+        Add the column of a parameter, tuple values are split in numeric columns `name_0`, `name_1`, ...
+        """
+        if len(values) != self._numberRows:
+            raise ValueError("Column %s has %i rows instead of %i" % (name, len(values), self._numberRows))
+
+        _addColumns(self._columns, name, values)
+
+    def isEqual(self, name, value):
+        """
+        Mask of the rows where the parameter `name` is equal to `value`, within the float tolerance for numbers.
+        """
+        column = self._columns[name]
+        if np.issubdtype(column.dtype, np.number):
+            return np.isclose(column, value)
+        else:
+            return column == value
+
+    def isInRange(self, name, minimum=None, maximum=None):
+        """
+        Mask of the rows where `minimum` <= parameter <= `maximum`, a limit is not used if None.
+        """
+        column = self._columns[name]
+        mask = np.ones(self._numberRows, dtype=bool)
+        if minimum is not None:
+            mask &= column >= minimum
+        if maximum is not None:
+            mask &= column <= maximum
+
+        return mask
+
+    def getRows(self, mask):
+        return np.flatnonzero(mask)
+
+    def setSimulationNames(self, simulationNames):
+        if len(simulationNames) != self._numberRows:
+            raise ValueError("%i simulation names for %i rows" % (len(simulationNames), self._numberRows))
+
+        self._simulationNames = np.array(list(simulationNames), dtype=object)
+
+    def getSimulationNames(self, rows=None):
+        """
+        Names of the simulations of the rows, all the rows if None.
+        """
+        if self._simulationNames is None:
+            raise ValueError("No simulation names in the parameters table")
+
+        if rows is None:
+            return list(self._simulationNames)
+        else:
+            return list(self._simulationNames[rows])
+
+class NumberXraysTable(object):
+    def __init__(self, filepath):
+        """
+        Table of the x-ray counts (1/s/A/sr) versus the incident energy and the sphere diameter.
+
+        The csv file is read once in a 2D grid, the exact grid values are found with a dict lookup and the other values
+        can be linearly interpolated between the grid points.
+
+        :param filepath: csv file with a header line and the energy (keV), diameter (nm), counts (1/s/A/sr) columns
+        """
+        self.filepath = filepath
+
+        self._counts = {}
+        with open(filepath, 'r') as csvFile:
+            reader = csv.reader(csvFile)
+            next(reader)
+
+            for row in reader:
+                if len(row) < 3:
+                    continue
+
+                key = (float(row[0]), float(row[1]))
+                if key not in self._counts:
+                    self._counts[key] = float(row[2])
+
+        self.energies_keV = np.array(sorted(set(key[0] for key in self._counts)))
+        self.diameters_nm = np.array(sorted(set(key[1] for key in self._counts)))
+
+        self.counts_1_sAsr = np.full((len(self.energies_keV), len(self.diameters_nm)), np.nan)
+        energyIndices = dict((energy_keV, index) for index, energy_keV in enumerate(self.energies_keV))
+        diameterIndices = dict((diameter_nm, index) for index, diameter_nm in enumerate(self.diameters_nm))
+        for (energy_keV, diameter_nm), counts_1_sAsr in self._counts.items():
+            self.counts_1_sAsr[energyIndices[energy_keV], diameterIndices[diameter_nm]] = counts_1_sAsr
+
+    def getCounts(self, energy_keV, diameter_nm, interpolate=False):
+        """
+        Counts of one grid point, None if not in the table.
+
+        With `interpolate`, the counts between the grid points are bilinearly interpolated.
+        """
+        try:
+            return self._counts[(float(energy_keV), float(diameter_nm))]
+        except KeyError:
+            if not interpolate:
+                return None
+
+        counts_1_sAsr = float(self.getCountsArray(energy_keV, diameter_nm, interpolate=True))
+        if np.isnan(counts_1_sAsr):
+            return None
+        else:
+            return counts_1_sAsr
+
+    def getCountsArray(self, energies_keV, diameters_nm, interpolate=False):
+        """
+        Counts for arrays of energies and diameters, NaN where a value is not in the table.
+        """
+        energies_keV, diameters_nm = np.broadcast_arrays(np.asarray(energies_keV, dtype=float),
+                                                         np.asarray(diameters_nm, dtype=float))
+
+        if len(self.energies_keV) == 0 or len(self.diameters_nm) == 0:
+            return np.full(energies_keV.shape, np.nan)
+
+        if not interpolate:
+            energyIndices = np.searchsorted(self.energies_keV, energies_keV)
+            diameterIndices = np.searchsorted(self.diameters_nm, diameters_nm)
+            energyIndices = np.minimum(energyIndices, len(self.energies_keV) - 1)
+            diameterIndices = np.minimum(diameterIndices, len(self.diameters_nm) - 1)
+
+            counts_1_sAsr = self.counts_1_sAsr[energyIndices, diameterIndices]
+            isGridPoint = (self.energies_keV[energyIndices] == energies_keV) & \
+                          (self.diameters_nm[diameterIndices] == diameters_nm)
+            return np.where(isGridPoint, counts_1_sAsr, np.nan)
+
+        energyIndices, energyWeights = _getInterpolationWeights(self.energies_keV, energies_keV)
+        diameterIndices, diameterWeights = _getInterpolationWeights(self.diameters_nm, diameters_nm)
+
+        counts_1_sAsr = np.zeros(energies_keV.shape)
+        for energyOffset, energyWeight in ((0, 1.0 - energyWeights), (1, energyWeights)):
+            for diameterOffset, diameterWeight in ((0, 1.0 - diameterWeights), (1, diameterWeights)):
+                weight = energyWeight*diameterWeight
+                counts = self.counts_1_sAsr[np.minimum(energyIndices + energyOffset, len(self.energies_keV) - 1),
+                                            np.minimum(diameterIndices + diameterOffset, len(self.diameters_nm) - 1)]
+                # A missing grid point is only used if its weight is not zero.
+                counts_1_sAsr += np.where(weight > 0.0, weight*counts, 0.0)
+
+        isInside = (energies_keV >= self.energies_keV[0]) & (energies_keV <= self.energies_keV[-1]) & \
+                   (diameters_nm >= self.diameters_nm[0]) & (diameters_nm <= self.diameters_nm[-1])
+        return np.where(isInside, counts_1_sAsr, np.nan)
+
+def _getInterpolationWeights(gridValues, values):
+    """
+    Index of the lower grid point and weight of the upper one for the linear interpolation of `values`.
+
+    With a single grid point, the index and the weight are 0.
+    """
+    if len(gridValues) == 1:
+        return np.zeros(values.shape, dtype=int), np.zeros(values.shape)
+
+    indices = np.searchsorted(gridValues, values, side='right') - 1
+    indices = np.clip(indices, 0, len(gridValues) - 2)
+    weights = (values - gridValues[indices])/(gridValues[indices + 1] - gridValues[indices])
+    weights = np.clip(weights, 0.0, 1.0)
+
+    return indices, weights
+
 class SimulationsParameters(dict):
     def __init__(self):
         self._variedParameters = {}
         self._fixedParameters = {}
         self._computedParameters = set()
 
+        self._numberXraysTable = None
+        self.computeNumberXraysInterpolation = False
+
     def addVaried(self, parameterKey, values):
         if parameterKey not in self._variedParameters:
             self._variedParameters[parameterKey] = []
@@ -116,47 +416,119 @@ class SimulationsParameters(dict):
     def addCompute(self, parameterKey):
         self._computedParameters.add(parameterKey)
 
-    def getAllSimulationParameters(self):
+    def getParametersProduct(self):
         parametersList = {}
         parametersList.update(self._variedParameters)
         parametersList.update(self._fixedParameters)
 
-        allValues, names, dummyVaried = multipleloop.combine(parametersList)
+        return ParametersProduct(parametersList)
 
-        experiments = []
+    def _createExperiment(self, names, values):
+        experiment = dict(zip(names, values))
 
-        for values in allValues:
-            experiment = dict(zip(names, values))
+        for parameterKey in self._computedParameters:
+            if parameterKey == PARAMETER_NUMBER_XRAYS:
+                value = self.computeNumberXrays(experiment)
+                experiment[PARAMETER_NUMBER_XRAYS] = value
 
-            for parameterKey in self._computedParameters:
-                if parameterKey == PARAMETER_NUMBER_XRAYS:
-                    value = self.computeNumberXrays(experiment)
-                    experiment[PARAMETER_NUMBER_XRAYS] = value
+        return experiment
 
-            experiments.append(experiment)
+    def iterSimulationParameters(self):
+        """
+        Generate the experiments one at a time.
+        """
+        parametersProduct = self.getParametersProduct()
+        names = parametersProduct.names
 
-        return experiments
+        for values in parametersProduct:
+            yield self._createExperiment(names, values)
 
-    def computeNumberXrays(self, experiment):
-        reader = csv.reader(open(self.computeNumberXraysFilepath, 'r'))
+    def getSimulationParameters(self, index):
+        """
+        Experiment at the flat index `index` of the sweep.
+        """
+        parametersProduct = self.getParametersProduct()
+        return self._createExperiment(parametersProduct.names, parametersProduct[index])
 
-        next(reader)
+    def getNumberSimulations(self):
+        return len(self.getParametersProduct())
 
-        for row in reader:
-            if float(row[0]) == float(experiment[PARAMETER_INCIDENT_ENERGY_keV]) and float(row[1]) == float(experiment[PARAMETER_SPHERE_DIAMETER_nm]):
-                counts_1_sAsr = float(row[2])
-                break
-        else:
+    def getShape(self):
+        """
+        Number of values of each parameter, in the order of the experiment loops.
+        """
+        return self.getParametersProduct().shape
+
+    def getAllSimulationParameters(self):
+        return list(self.iterSimulationParameters())
+
+    def getParametersTable(self):
+        """
+        Columnar table of the sweep, one column per varied parameter in the experiment order.
+        """
+        parametersProduct = self.getParametersProduct()
+        variedNames = [name for name in parametersProduct.names if name not in self._fixedParameters]
+
+        parametersTable = ParametersTable(len(parametersProduct), self._fixedParameters)
+        for name in variedNames:
+            parametersTable.addColumn(name, parametersProduct.getValuesColumn(name))
+
+        if PARAMETER_NUMBER_XRAYS in self._computedParameters and \
+                type(self).computeNumberXrays is not SimulationsParameters.computeNumberXrays:
+            numberXrays = [experiment[PARAMETER_NUMBER_XRAYS] for experiment in self.iterSimulationParameters()]
+            parametersTable.addColumn(PARAMETER_NUMBER_XRAYS, numberXrays)
+        elif PARAMETER_NUMBER_XRAYS in self._computedParameters:
+            arguments = []
+            for name in [PARAMETER_INCIDENT_ENERGY_keV, PARAMETER_SPHERE_DIAMETER_nm, PARAMETER_CURRENT_nA,
+                         PARAMETER_TIME_s]:
+                if name in parametersTable:
+                    arguments.append(parametersTable[name])
+                else:
+                    arguments.append(np.full(len(parametersTable), self._fixedParameters[name], dtype=float))
+            parametersTable.addColumn(PARAMETER_NUMBER_XRAYS, self.computeNumberXraysArray(*arguments))
+
+        return parametersTable
+
+    def getNumberXraysTable(self):
+        """
+        Table of the counts of :py:attr:`computeNumberXraysFilepath`, read once.
+        """
+        if self._numberXraysTable is None:
+            self._numberXraysTable = NumberXraysTable(self.computeNumberXraysFilepath)
+
+        return self._numberXraysTable
+
+    def computeNumberXrays(self, experiment):
+        counts_1_sAsr = self.getNumberXraysTable().getCounts(experiment[PARAMETER_INCIDENT_ENERGY_keV],
+                                                             experiment[PARAMETER_SPHERE_DIAMETER_nm],
+                                                             self.computeNumberXraysInterpolation)
+        if counts_1_sAsr is None:
             logging.warning("counts_1_sAsr not found for these conditions.")
             return 0
 
         current_A = experiment[PARAMETER_CURRENT_nA]*1.0e-9
         time_s = experiment[PARAMETER_TIME_s]
-        solidAngle_sr =  0.0351945099176
 
-        numberXrays = int(counts_1_sAsr*current_A*time_s*solidAngle_sr)
+        numberXrays = int(counts_1_sAsr*current_A*time_s*SOLID_ANGLE_sr)
         return numberXrays
 
+    def computeNumberXraysArray(self, energies_keV, diameters_nm, currents_nA, times_s):
+        """
+        Vectorized :py:meth:`computeNumberXrays`, the number of x-rays is 0 where the counts are not found.
+        """
+        counts_1_sAsr = self.getNumberXraysTable().getCountsArray(energies_keV, diameters_nm,
+                                                                  self.computeNumberXraysInterpolation)
+        isNotFound = np.isnan(counts_1_sAsr)
+        if np.any(isNotFound):
+            logging.warning("counts_1_sAsr not found for %i conditions.", np.count_nonzero(isNotFound))
+
+        counts_1_sAsr = np.where(isNotFound, 0.0, counts_1_sAsr)
+        currents_A = np.asarray(currents_nA, dtype=float)*1.0e-9
+        times_s = np.asarray(times_s, dtype=float)
+
+        numberXrays = np.trunc(counts_1_sAsr*currents_A*times_s*SOLID_ANGLE_sr)
+        return numberXrays.astype(int)
+
     def getVariedParameterLabels(self):
         return sorted(self._variedParameters.keys())
 
@@ -166,6 +538,7 @@ class SimulationsParameters(dict):
     @computeNumberXraysFilepath.setter
     def computeNumberXraysFilepath(self, filepath):
         self._computeNumberXraysFilepath = filepath
+        self._numberXraysTable = None
 
     @property
     def fixedParameters(self):
@@ -182,5 +555,47 @@ class SimulationsParametersFixed(object):
     def addExperiment(self, experiment):
         self._experiments.append(experiment)
 
+    def iterSimulationParameters(self):
+        return iter(self._experiments)
+
+    def getSimulationParameters(self, index):
+        return self._experiments[index]
+
+    def getNumberSimulations(self):
+        return len(self._experiments)
+
+    def getShape(self):
+        return (len(self._experiments),)
+
+    def getParametersTable(self):
+        """
+        Columnar table of the experiments, one column per parameter not having the same value in all experiments.
+        """
+        names = []
+        for experiment in self._experiments:
+            for name in experiment:
+                if name not in names:
+                    names.append(name)
+
+        fixedParameters = {}
+        variedNames = []
+        for name in names:
+            values = [experiment.get(name) for experiment in self._experiments]
+            try:
+                isFixed = all(value == values[0] for value in values)
+            except ValueError:
+                isFixed = False
+
+            if isFixed:
+                fixedParameters[name] = values[0]
+            else:
+                variedNames.append(name)
+
+        parametersTable = ParametersTable(len(self._experiments), fixedParameters)
+        for name in variedNames:
+            parametersTable.addColumn(name, [experiment.get(name) for experiment in self._experiments])
+
+        return parametersTable
+
     def getAllSimulationParameters(self):
         return self._experiments
@@ -0,0 +1,394 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: pymcxray.WorkQueue
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+File based work queue shared by the workers of several computers.
+
+The queue is a folder on the shared file system, there is no central service. A worker claims a simulation by
+creating its claim file with an exclusive create, only one worker can succeed, and writes its worker id in it. The
+worker refreshes the modification time of its claim files while the simulations run. A claim not refreshed for
+`stale_timeout_s` is left by a dead worker, it is removed by the next worker trying to claim the simulation. A
+simulation is marked done or failed by a marker file.
+
+A worker only refreshes, removes or marks a claim with its worker id. A claim recovered by another worker is lost,
+see :py:meth:`WorkQueue.is_claim_lost`, the run of the simulation has to be stopped.
+
+The ages of the claims are computed with the time of the file system, given by the modification time of a file of
+the worker, so the clocks of the computers do not need to be synchronized.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import os
+import os.path
+import logging
+import socket
+import threading
+
+# Third party modules.
+
+# Local modules.
+
+# Project modules
+
+# Globals and constants variables.
+HEARTBEAT_INTERVAL_s = 60.0
+STALE_TIMEOUT_s = 600.0
+
+CLAIMS_FOLDER = "claims"
+DONE_FOLDER = "done"
+FAILED_FOLDER = "failed"
+WORKERS_FOLDER = "workers"
+
+CLAIM_EXTENSION = ".claim"
+DONE_EXTENSION = ".done"
+FAILED_EXTENSION = ".failed"
+WORKER_EXTENSION = ".alive"
+
+
+def get_worker_id():
+    return "%s_%i" % (socket.gethostname(), os.getpid())
+
+
+def _scan_names(folder_path, extension):
+    """
+    Names of the files of a folder with the extension and their modification times.
+    """
+    names = {}
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if entry.name.endswith(extension):
+                try:
+                    names[entry.name[:-len(extension)]] = entry.stat().st_mtime
+                except OSError:
+                    pass
+
+    return names
+
+
+class WorkQueueStatus(object):
+    def __init__(self, claims, done_names, failed_names, current_time_s, stale_timeout_s):
+        """
+        Snapshot of the queue folders.
+
+        :param claims: dict of the claimed names and the modification times of their claim files
+        """
+        self.claims = claims
+        self.done_names = done_names
+        self.failed_names = failed_names
+        self.current_time_s = current_time_s
+        self.stale_timeout_s = stale_timeout_s
+
+    def is_finished(self, name):
+        return name in self.done_names or name in self.failed_names
+
+    def is_stale(self, name):
+        return self.current_time_s - self.claims[name] > self.stale_timeout_s
+
+    def is_claimed(self, name):
+        """
+        Check if the name has a claim not stale.
+        """
+        return name in self.claims and not self.is_stale(name)
+
+    def get_number_stale_claims(self):
+        return sum(1 for name in self.claims if self.is_stale(name))
+
+
+class WorkQueue(object):
+    def __init__(self, queue_path, stale_timeout_s=STALE_TIMEOUT_s, heartbeat_interval_s=HEARTBEAT_INTERVAL_s):
+        """
+        Work queue in the folder `queue_path`, the items are the simulation names.
+
+        Use it as a context manager to refresh the claims in a background thread, the claims still held are released
+        when the context exits.
+
+        :param stale_timeout_s: age of a claim not refreshed after which the worker is considered dead, it has to be
+            much larger than `heartbeat_interval_s`
+        :param heartbeat_interval_s: interval between the refreshes of the claims of this worker
+        """
+        self.queue_path = queue_path
+        self.stale_timeout_s = stale_timeout_s
+        self.heartbeat_interval_s = heartbeat_interval_s
+        self.worker_id = get_worker_id()
+
+        for folder in [CLAIMS_FOLDER, DONE_FOLDER, FAILED_FOLDER, WORKERS_FOLDER]:
+            os.makedirs(os.path.join(self.queue_path, folder), exist_ok=True)
+
+        self._claimed_names = set()
+        self._lost_names = set()
+        self._claimed_names_lock = threading.Lock()
+        self._heartbeat_thread = None
+        self._heartbeat_stop = threading.Event()
+
+    def __enter__(self):
+        self.start_heartbeat()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop_heartbeat()
+        for name in self.get_claimed_names():
+            self.release(name)
+        self._remove_file(self._get_worker_path())
+        return False
+
+    def _get_claim_path(self, name):
+        return os.path.join(self.queue_path, CLAIMS_FOLDER, name + CLAIM_EXTENSION)
+
+    def _get_done_path(self, name):
+        return os.path.join(self.queue_path, DONE_FOLDER, name + DONE_EXTENSION)
+
+    def _get_failed_path(self, name):
+        return os.path.join(self.queue_path, FAILED_FOLDER, name + FAILED_EXTENSION)
+
+    def _get_worker_path(self):
+        return os.path.join(self.queue_path, WORKERS_FOLDER, self.worker_id + WORKER_EXTENSION)
+
+    def _remove_file(self, file_path):
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+
+    def get_current_time_s(self):
+        """
+        Current time of the file system, the modification time of the worker file after it is touched.
+        """
+        worker_path = self._get_worker_path()
+        try:
+            os.utime(worker_path, None)
+        except FileNotFoundError:
+            with open(worker_path, 'w') as worker_file:
+                worker_file.write(self.worker_id)
+
+        return os.stat(worker_path).st_mtime
+
+    def get_claimed_names(self):
+        """
+        Names claimed by this worker.
+        """
+        with self._claimed_names_lock:
+            return sorted(self._claimed_names)
+
+    def get_status(self):
+        """
+        Read the claims and the markers of the queue with one scan of each folder.
+
+        :rtype: :py:class:`WorkQueueStatus`
+        """
+        current_time_s = self.get_current_time_s()
+        claims = _scan_names(os.path.join(self.queue_path, CLAIMS_FOLDER), CLAIM_EXTENSION)
+        done_names = set(_scan_names(os.path.join(self.queue_path, DONE_FOLDER), DONE_EXTENSION))
+        failed_names = set(_scan_names(os.path.join(self.queue_path, FAILED_FOLDER), FAILED_EXTENSION))
+
+        return WorkQueueStatus(claims, done_names, failed_names, current_time_s, self.stale_timeout_s)
+
+    def is_marked_done(self, name):
+        return os.path.isfile(self._get_done_path(name))
+
+    def is_marked_failed(self, name):
+        return os.path.isfile(self._get_failed_path(name))
+
+    def claim(self, name):
+        """
+        Claim the name for this worker, a stale claim of another worker is recovered.
+
+        :return: True if the name is claimed by this worker
+        """
+        claim_path = self._get_claim_path(name)
+        for _attempt in range(2):
+            try:
+                claim_file = os.open(claim_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                if not self._recover_stale_claim(name):
+                    return False
+                continue
+
+            try:
+                os.write(claim_file, self.worker_id.encode('utf-8'))
+            finally:
+                os.close(claim_file)
+
+            with self._claimed_names_lock:
+                self._claimed_names.add(name)
+                self._lost_names.discard(name)
+            return True
+
+        return False
+
+    def _recover_stale_claim(self, name):
+        """
+        Remove the claim of a dead worker.
+
+        The stale claim is renamed to a path unique to it, built from its modification time, so only one worker can
+        succeed and only this worker removes it. The renamed file is compared with the stale claim: if it was
+        refreshed or claimed again in between, the name is not claimed by this worker. A renamed claim is never put
+        back, its worker finds out it lost the claim at its next heartbeat.
+
+        :return: True if there is no claim anymore and the name can be claimed by this worker
+        """
+        claim_path = self._get_claim_path(name)
+        try:
+            claim_stat = os.stat(claim_path)
+        except FileNotFoundError:
+            return True
+
+        if self.get_current_time_s() - claim_stat.st_mtime <= self.stale_timeout_s:
+            return False
+
+        stale_path = "%s.stale_%i" % (claim_path, claim_stat.st_mtime_ns)
+        try:
+            os.rename(claim_path, stale_path)
+        except (FileNotFoundError, FileExistsError):
+            # Renamed first by another worker.
+            return True
+
+        try:
+            renamed_stat = os.stat(stale_path)
+        except FileNotFoundError:
+            return False
+
+        self._remove_file(stale_path)
+        if (renamed_stat.st_ino, renamed_stat.st_mtime_ns) != (claim_stat.st_ino, claim_stat.st_mtime_ns):
+            logging.warning("The claim of simulation %s was renewed while it was recovered", name)
+            return False
+
+        logging.warning("Recovered the stale claim of simulation %s", name)
+        return True
+
+    def is_owner(self, name):
+        """
+        Check if the claim of the name has the worker id of this worker.
+        """
+        try:
+            with open(self._get_claim_path(name), 'r', encoding='utf-8') as claim_file:
+                return claim_file.read() == self.worker_id
+        except FileNotFoundError:
+            return False
+
+    def is_claim_lost(self, name):
+        """
+        Check if the claim of the name was recovered by another worker while this worker held it.
+        """
+        with self._claimed_names_lock:
+            return name in self._lost_names
+
+    def _lose_claim(self, name):
+        with self._claimed_names_lock:
+            if name not in self._claimed_names:
+                # Released while checking the claim.
+                return
+            self._claimed_names.discard(name)
+            self._lost_names.add(name)
+        logging.warning("Claim of simulation %s lost, it was recovered by another worker", name)
+
+    def release(self, name):
+        """
+        Release the claim of the name, the claim file is only removed if it has the worker id of this worker.
+        """
+        is_owner = self.is_owner(name)
+        with self._claimed_names_lock:
+            self._claimed_names.discard(name)
+        if is_owner:
+            self._remove_file(self._get_claim_path(name))
+
+    def mark_done(self, name):
+        """
+        Mark the name as done and release its claim.
+
+        :return: False if the claim was lost, the name is not marked
+        """
+        if not self.is_owner(name):
+            self._lose_claim(name)
+            return False
+
+        with open(self._get_done_path(name), 'w') as done_file:
+            done_file.write(self.worker_id)
+        self._remove_file(self._get_failed_path(name))
+        self.release(name)
+        return True
+
+    def mark_failed(self, name):
+        """
+        Mark the name as failed and release its claim, the other workers do not run it again.
+
+        :return: False if the claim was lost, the name is not marked
+        """
+        if not self.is_owner(name):
+            self._lose_claim(name)
+            return False
+
+        with open(self._get_failed_path(name), 'w') as failed_file:
+            failed_file.write(self.worker_id)
+        self.release(name)
+        return True
+
+    def reset_failed(self):
+        """
+        Remove the failed markers, so the failed simulations are run again.
+
+        :return: number of failed markers removed
+        """
+        failed_names = _scan_names(os.path.join(self.queue_path, FAILED_FOLDER), FAILED_EXTENSION)
+        for name in failed_names:
+            self._remove_file(self._get_failed_path(name))
+
+        return len(failed_names)
+
+    def heartbeat(self):
+        """
+        Refresh the modification time of the claims of this worker, the claims recovered by another worker are lost.
+        """
+        self.get_current_time_s()
+        for name in self.get_claimed_names():
+            if not self.is_owner(name):
+                self._lose_claim(name)
+                continue
+
+            try:
+                os.utime(self._get_claim_path(name), None)
+            except FileNotFoundError:
+                self._lose_claim(name)
+
+    def _run_heartbeat(self):
+        while not self._heartbeat_stop.wait(self.heartbeat_interval_s):
+            try:
+                self.heartbeat()
+            except OSError as message:
+                logging.error("Heartbeat of the work queue failed: %s", message)
+
+    def start_heartbeat(self):
+        if self._heartbeat_thread is not None:
+            return
+
+        self._heartbeat_stop.clear()
+        self._heartbeat_thread = threading.Thread(target=self._run_heartbeat, name="WorkQueueHeartbeat")
+        self._heartbeat_thread.daemon = True
+        self._heartbeat_thread.start()
+
+    def stop_heartbeat(self):
+        if self._heartbeat_thread is None:
+            return
+
+        self._heartbeat_stop.set()
+        self._heartbeat_thread.join()
+        self._heartbeat_thread = None
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: pymcxray.examples.benchmark_hdf5_storage_policies
+   :synopsis: Script to compare the HDF5 storage policies.
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Script to compare the write time, read time and file size of the HDF5 storage policies with synthetic results.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import logging
+import os.path
+import tempfile
+import shutil
+import time
+
+# Third party modules.
+import h5py
+import numpy as np
+
+# Local modules.
+
+# Project modules.
+import pymcxray.FileFormat.Results.Hdf5StoragePolicy as Hdf5StoragePolicy
+from pymcxray.FileFormat.Results.XraySpectraSpecimenEmittedDetected import XraySpectraSpecimenEmittedDetected, \
+    HDF5_XRAY_SPECTRA_SPECIMEN_EMITTED_DETECTED, HDF5_TOTAL
+from pymcxray.FileFormat.Results.ElectronTrajectoriesResults import ElectronTrajectoriesResultsHdf5, \
+    write_trajectories_hdf5, HDF5_X_A, HDF5_Y_A, HDF5_Z_A, HDF5_CORRECTED_X_A, HDF5_CORRECTED_Y_A, \
+    HDF5_CORRECTED_Z_A, HDF5_ENERGY_keV, HDF5_INDEX_REGION, HDF5_COLLISION_TYPE
+
+# Globals and constants variables.
+
+
+def create_spectrum(random_state, number_channels):
+    energies_keV = np.linspace(0.005, 20.0, number_channels)
+    backgrounds = 1.0e-6*np.exp(-energies_keV/5.0)
+    characteristics = np.zeros_like(energies_keV)
+    for peak_energy_keV in [1.74, 6.40, 8.04]:
+        characteristics += 1.0e-5*np.exp(-0.5*((energies_keV - peak_energy_keV)/0.06)**2)
+    totals = (backgrounds + characteristics)*random_state.normal(1.0, 0.02, number_channels)
+
+    spectrum = XraySpectraSpecimenEmittedDetected()
+    spectrum.energies_keV = energies_keV
+    spectrum.totals = totals
+    spectrum.characteristics = characteristics
+    spectrum.backgrounds = backgrounds
+
+    return spectrum
+
+
+def create_electron_trajectories(random_state, number_trajectories, maximum_number_collisions):
+    """
+    Create random trajectories with a number of collisions between 1 and `maximum_number_collisions`.
+
+    :return: tuple (offsets, trajectory indexes, trajectory types, columns)
+    """
+    number_collisions = random_state.randint(1, maximum_number_collisions + 1, number_trajectories)
+    offsets = np.zeros(number_trajectories + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(number_collisions)
+    total_number_collisions = int(offsets[-1])
+
+    columns = {}
+    positions_A = np.cumsum(random_state.normal(0.0, 100.0, (3, total_number_collisions)), axis=1)
+    columns[HDF5_X_A], columns[HDF5_Y_A], columns[HDF5_Z_A] = positions_A
+    columns[HDF5_CORRECTED_X_A], columns[HDF5_CORRECTED_Y_A], columns[HDF5_CORRECTED_Z_A] = positions_A
+    columns[HDF5_ENERGY_keV] = random_state.uniform(0.0, 20.0, total_number_collisions)
+    columns[HDF5_INDEX_REGION] = np.zeros(total_number_collisions, dtype=int)
+    columns[HDF5_COLLISION_TYPE] = np.full(total_number_collisions, 5)
+
+    trajectory_indexes = np.arange(1, number_trajectories + 1)
+    trajectory_types = np.ones(number_trajectories, dtype=int)
+
+    return offsets, trajectory_indexes, trajectory_types, columns
+
+
+def create_results(number_simulations, number_channels, number_trajectories, number_collisions):
+    """
+    Create the synthetic results of the simulations, outside the timed write.
+
+    :return: list of tuple (spectrum, trajectories) where trajectories is the tuple of
+        :py:func:`create_electron_trajectories`
+    """
+    random_state = np.random.RandomState(42)
+
+    results = []
+    for _simulation_id in range(number_simulations):
+        spectrum = create_spectrum(random_state, number_channels)
+        trajectories = create_electron_trajectories(random_state, number_trajectories, number_collisions)
+        results.append((spectrum, trajectories))
+
+    return results
+
+
+def write_results(file_path, storage_policy, results):
+    with h5py.File(file_path, 'w') as hdf5_file:
+        for simulation_id, (spectrum, trajectories) in enumerate(results):
+            hdf5_group = hdf5_file.require_group("simulation_%i" % (simulation_id))
+
+            spectrum.write_hdf5(hdf5_group, storage_policy)
+
+            offsets, trajectory_indexes, trajectory_types, columns = trajectories
+            write_trajectories_hdf5(hdf5_group, offsets, trajectory_indexes, trajectory_types, columns,
+                                    storage_policy)
+
+
+def read_results(file_path, number_simulations):
+    """
+    Read the total spectrum and the first trajectory of each simulation.
+    """
+    total_sum = 0.0
+    with h5py.File(file_path, 'r') as hdf5_file:
+        for simulation_id in range(number_simulations):
+            hdf5_group = hdf5_file["simulation_%i" % (simulation_id)]
+            total_sum += np.sum(hdf5_group[HDF5_XRAY_SPECTRA_SPECIMEN_EMITTED_DETECTED][HDF5_TOTAL][...])
+            trajectories = ElectronTrajectoriesResultsHdf5(hdf5_group)
+            total_sum += np.sum(trajectories.get_column(HDF5_ENERGY_keV, 0))
+
+    return total_sum
+
+
+def benchmark_storage_policies(number_simulations=100, number_channels=2000, number_trajectories=100,
+                               number_collisions=200, storage_policies=None):
+    """
+    Benchmark the storage policies.
+
+    :return: list of tuple (policy name, write time (s), read time (s), file size (bytes))
+    """
+    if storage_policies is None:
+        storage_policies = Hdf5StoragePolicy.get_storage_policies()
+
+    simulations_results = create_results(number_simulations, number_channels, number_trajectories, number_collisions)
+
+    results = []
+    temporary_path = tempfile.mkdtemp(prefix="benchmark_hdf5_")
+    try:
+        for name, storage_policy in storage_policies.items():
+            file_path = os.path.join(temporary_path, name + ".hdf5")
+
+            starting_time = time.perf_counter()
+            write_results(file_path, storage_policy, simulations_results)
+            write_time_s = time.perf_counter() - starting_time
+
+            starting_time = time.perf_counter()
+            read_results(file_path, number_simulations)
+            read_time_s = time.perf_counter() - starting_time
+
+            file_size = os.path.getsize(file_path)
+            results.append((name, write_time_s, read_time_s, file_size))
+    finally:
+        shutil.rmtree(temporary_path)
+
+    return results
+
+
+def run():
+    results = benchmark_storage_policies()
+
+    logging.info("%-12s %12s %12s %14s", "Policy", "Write (s)", "Read (s)", "Size (MB)")
+    for name, write_time_s, read_time_s, file_size in results:
+        logging.info("%-12s %12.3f %12.3f %14.2f", name, write_time_s, read_time_s, file_size/1.0e6)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    logging.getLogger().setLevel(logging.INFO)
+    run()
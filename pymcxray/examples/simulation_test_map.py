@@ -32,7 +32,6 @@ import os.path
 
 # Third party modules.
 import matplotlib.pyplot as plt
-import h5py
 import numpy as np
 
 # Local modules.
@@ -188,31 +187,30 @@ class SimulationTestMapsMM2017(mcxray._Simulations):
         electronResults.path = self.getSimulationsPath()
         electronResults.basename = simulation.resultsBasename
         electronResults.read()
-        electronResults.write_hdf5(hdf5_group)
+        electronResults.write_hdf5(hdf5_group, self.hdf5_storage_policy)
 
         xrayIntensities = XrayIntensities.XrayIntensities()
         xrayIntensities.path = self.getSimulationsPath()
         xrayIntensities.basename = simulation.resultsBasename
         xrayIntensities.read()
-        xrayIntensities.write_hdf5(hdf5_group)
+        xrayIntensities.write_hdf5(hdf5_group, self.hdf5_storage_policy)
 
         spectrum = XraySpectraRegionsEmitted.XraySpectraRegionsEmitted()
         spectrum.path = self.getSimulationsPath()
         spectrum.basename = simulation.resultsBasename
         spectrum.read()
-        spectrum.write_hdf5(hdf5_group)
+        spectrum.write_hdf5(hdf5_group, self.hdf5_storage_policy)
 
         spectrum = XraySpectraSpecimenEmittedDetected.XraySpectraSpecimenEmittedDetected()
         spectrum.path = self.getSimulationsPath()
         spectrum.basename = simulation.resultsBasename
         spectrum.read()
-        spectrum.write_hdf5(hdf5_group)
+        spectrum.write_hdf5(hdf5_group, self.hdf5_storage_policy)
 
     def analyze_results_hdf5(self): #pragma: no cover
         self.readResults()
 
-        file_path = self.get_hdf5_file_path()
-        with h5py.File(file_path, 'r', driver='core') as hdf5_file:
+        with self.open_hdf5_file('r') as hdf5_file:
             hdf5_group = self.get_hdf5_group(hdf5_file)
             logging.info(hdf5_group.name)
 
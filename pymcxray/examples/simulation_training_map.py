@@ -32,7 +32,6 @@ import os.path
 
 # Third party modules.
 import matplotlib.pyplot as plt
-import h5py
 import numpy as np
 
 # Local modules.
@@ -103,31 +102,30 @@ class SimulationTrainingMapsMM2017(mcxray._Simulations):
         electron_results.path = self.getSimulationsPath()
         electron_results.basename = simulation.resultsBasename
         electron_results.read()
-        electron_results.write_hdf5(hdf5_group)
+        electron_results.write_hdf5(hdf5_group, self.hdf5_storage_policy)
 
         xray_intensities = XrayIntensities.XrayIntensities()
         xray_intensities.path = self.getSimulationsPath()
         xray_intensities.basename = simulation.resultsBasename
         xray_intensities.read()
-        xray_intensities.write_hdf5(hdf5_group)
+        xray_intensities.write_hdf5(hdf5_group, self.hdf5_storage_policy)
 
         spectrum = XraySpectraRegionsEmitted.XraySpectraRegionsEmitted()
         spectrum.path = self.getSimulationsPath()
         spectrum.basename = simulation.resultsBasename
         spectrum.read()
-        spectrum.write_hdf5(hdf5_group)
+        spectrum.write_hdf5(hdf5_group, self.hdf5_storage_policy)
 
         spectrum = XraySpectraSpecimenEmittedDetected.XraySpectraSpecimenEmittedDetected()
         spectrum.path = self.getSimulationsPath()
         spectrum.basename = simulation.resultsBasename
         spectrum.read()
-        spectrum.write_hdf5(hdf5_group)
+        spectrum.write_hdf5(hdf5_group, self.hdf5_storage_policy)
 
     def analyze_results_hdf5(self):  # pragma: no cover
         self.readResults()
 
-        file_path = self.get_hdf5_file_path()
-        with h5py.File(file_path, 'r', driver='core') as hdf5_file:
+        with self.open_hdf5_file('r') as hdf5_file:
             hdf5_group = self.get_hdf5_group(hdf5_file)
             logging.info(hdf5_group.name)
 
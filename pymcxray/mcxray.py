@@ -20,10 +20,12 @@ import time
 import argparse
 import logging
 import zipfile
-import stat
 import math
 import datetime
 import filecmp
+import contextlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 # Third party modules.
 import numpy as np
@@ -33,10 +35,22 @@ from apscheduler.schedulers.blocking import BlockingScheduler
 # Local modules.
 from pymcxray import get_current_module_path, create_path, get_results_mcgill_path, get_mcxray_program_path, get_mcxray_program_name, get_mcxray_archive_path, get_mcxray_archive_name
 import pymcxray.serialization.SerializationPickle as SerializationPickle
+import pymcxray.serialization.SerializationShardedPickle as SerializationShardedPickle
+from pymcxray.Hdf5Payload import Hdf5PayloadGroup
+import pymcxray.Hdf5Payload as Hdf5Payload
+from pymcxray.ResultsStore import LazyResultsStore
+import pymcxray.FileManifest as FileManifest
+from pymcxray.CompletionIndex import CompletionIndex
+from pymcxray.LocalRunner import LocalRunner
+from pymcxray.CostModel import CostModel
+from pymcxray.RuntimeHistory import RuntimeHistory
+import pymcxray.InputFilesWriter as InputFilesWriter
+from pymcxray.WorkQueue import WorkQueue, HEARTBEAT_INTERVAL_s, STALE_TIMEOUT_s
 
 # Project modules
 import pymcxray.Simulation as Simulation
-from pymcxray.SimulationsParameters import PARAMETER_SPECIMEN
+from pymcxray.SimulationsParameters import PARAMETER_SPECIMEN, PARAMETER_NUMBER_ELECTRONS, PARAMETER_NUMBER_XRAYS, \
+    PARAMETER_INCIDENT_ENERGY_keV
 
 # Globals and constants variables.
 ANALYZE_TYPE_GENERATE_INPUT_FILE = "generate"
@@ -44,11 +58,49 @@ ANALYZE_TYPE_CHECK_PROGRESS = "check"
 ANALYZE_TYPE_READ_RESULTS = "read"
 ANALYZE_TYPE_ANALYZE_RESULTS = "analyze"
 ANALYZE_TYPE_ANALYZE_SCHEDULED_READ = "scheduled_read"
+ANALYZE_TYPE_RUN = "run"
+ANALYZE_TYPE_WORKER = "worker"
 
 SAVE_EVERY_SIMULATIONS = 10
+RESULTS_CACHE_SIZE = 64
+
+# Attributes of the full simulations kept in the simulation records, used by the cost model, with the parameter
+# setting each one.
+SIMULATION_RECORD_ATTRIBUTES = {"numberElectrons": PARAMETER_NUMBER_ELECTRONS, "numberPhotons": PARAMETER_NUMBER_XRAYS,
+                                "energy_keV": PARAMETER_INCIDENT_ENERGY_keV}
 
 HDF5_SIMULATIONS = "simulations"
 HDF5_PARAMETERS = "parameters"
+HDF5_RESULTS_FINGERPRINT = "results_fingerprint"
+
+HDF5_STORAGE_MODE_CORE = "core"
+HDF5_STORAGE_MODE_DISK = "disk"
+
+# Simulations object used by the worker processes when reading the results in parallel.
+_read_worker_simulations = None
+
+def _initialize_read_worker(simulations):
+    global _read_worker_simulations
+    _read_worker_simulations = simulations
+
+def _read_one_results_payload(simulation):
+    if isinstance(simulation, Simulation.SimulationRecord):
+        simulation.set_create_simulation(_read_worker_simulations._create_simulation)
+
+    payload = Hdf5PayloadGroup(simulation.name)
+    with _keep_simulation(simulation):
+        _read_worker_simulations.read_one_results_hdf5(simulation, payload)
+    return payload
+
+def _keep_simulation(simulation):
+    """
+    Context keeping the full simulation of a record while its results are read, see
+    :py:meth:`pymcxray.Simulation.SimulationRecord.keep_simulation`.
+    """
+    if isinstance(simulation, Simulation.SimulationRecord):
+        return simulation.keep_simulation()
+    else:
+        return contextlib.nullcontext(simulation)
 
 def _getOptions():
     analyzeTypes = []
@@ -57,6 +109,8 @@ def _getOptions():
     analyzeTypes.append(ANALYZE_TYPE_READ_RESULTS)
     analyzeTypes.append(ANALYZE_TYPE_ANALYZE_RESULTS)
     analyzeTypes.append(ANALYZE_TYPE_ANALYZE_SCHEDULED_READ)
+    analyzeTypes.append(ANALYZE_TYPE_RUN)
+    analyzeTypes.append(ANALYZE_TYPE_WORKER)
 
     parser = argparse.ArgumentParser(description='Analyze MCXRay x-ray background problem.')
     parser.add_argument('type', metavar='AnalyzeType', type=str, choices=analyzeTypes, nargs='?',
@@ -75,6 +129,7 @@ class _Simulations(object):
     RESULTS_FOLDER = os.path.join(SIMULATIONS_FOLDER, "Results")
     ANALYSES_FOLDER = "analyzes"
     INPUTS_FOLDER = "input"
+    QUEUE_FOLDER = "queue"
 
     def __init__(self, simulationPath=None, basepath=None, relativePath=None, configurationFilepath=None):
         if configurationFilepath is None:
@@ -86,10 +141,32 @@ class _Simulations(object):
         self.overwrite = True
         self.resetCache = False
         self.useSerialization = True
+        self.use_sharded_serialization = False
+        # The backup copies the whole shards folder, so it is only done on request.
+        self.create_sharded_backup = False
+        self.results_cache_size = RESULTS_CACHE_SIZE
+        self.use_file_manifest = True
+        self.use_completion_index = True
         self.verbose = True
         self.createBackup = True
         self.use_hdf5 = False
         self.delete_result_files = False
+        self.number_read_processes = 1
+        self.number_input_processes = 1
+        self.number_input_threads = 4
+        self.share_input_files = False
+        self.mcxray_program_command = None
+        self.number_run_workers = None
+        self.run_timeout_s = None
+        self.run_maximum_number_attempts = 2
+        self.cost_model = CostModel()
+        self.use_runtime_history = True
+        self.queue_heartbeat_interval_s = HEARTBEAT_INTERVAL_s
+        self.queue_stale_timeout_s = STALE_TIMEOUT_s
+        self.queue_wait_for_claims = True
+        self.hdf5_storage_mode = HDF5_STORAGE_MODE_CORE
+        self.hdf5_flush_interval = 50
+        self.hdf5_storage_policy = None
         self.read_interval_h = 1
         self.read_interval_m = None
 
@@ -112,6 +189,13 @@ class _Simulations(object):
 
         self._simulationResultsList = {}
         self._serializationExtension = '.ser'
+        self._file_manifest = None
+        self._completion_index = None
+        self._runtime_history = None
+        self._simulation_records = None
+        self._simulation_records_key = None
+        self._specimen_information = {}
+        self._default_record_attributes = None
 
         self.format_digit = {}
 
@@ -163,6 +247,107 @@ class _Simulations(object):
         logging.debug(file_path)
         return file_path
 
+    def __getstate__(self):
+        """
+        State sent to the worker processes, without the memoized simulations and the results.
+        """
+        state = self.__dict__.copy()
+        state["_simulationResultsList"] = {}
+        state["_file_manifest"] = None
+        state["_completion_index"] = None
+        state["_runtime_history"] = None
+        state["_simulation_records"] = None
+        state["_simulation_records_key"] = None
+        state["_specimen_information"] = {}
+        return state
+
+    def get_file_manifest_path(self):
+        return os.path.join(self.getResultsPath(), self.getAnalysisName() + "_manifest.json")
+
+    def get_file_manifest(self):
+        """
+        Manifest of the results and cache files used to check if a cache file is older than the results files.
+
+        :return: :py:class:`pymcxray.FileManifest.FileManifest` or None if `use_file_manifest` is not set
+        """
+        if not self.use_file_manifest:
+            return None
+
+        file_path = self.get_file_manifest_path()
+        if self._file_manifest is None or self._file_manifest.file_path != file_path:
+            self._file_manifest = FileManifest.FileManifest(file_path, root_path=self.getSimulationPath())
+
+        return self._file_manifest
+
+    def _save_file_manifest(self):
+        if self._file_manifest is not None:
+            self._file_manifest.save()
+
+    def get_runtime_history_path(self):
+        return os.path.join(self.getResultsPath(), self.getAnalysisName() + "_runtime_history.json")
+
+    def get_runtime_history(self):
+        """
+        History of the run time of the simulations, used to fit the :py:attr:`cost_model`.
+
+        :return: :py:class:`pymcxray.RuntimeHistory.RuntimeHistory` or None if `use_runtime_history` is not set
+        """
+        if not self.use_runtime_history:
+            return None
+
+        file_path = self.get_runtime_history_path()
+        if self._runtime_history is None or self._runtime_history.file_path != file_path:
+            self._runtime_history = RuntimeHistory(file_path)
+
+        return self._runtime_history
+
+    def update_cost_model(self):
+        """
+        Fit the :py:attr:`cost_model` on the runtime history, the cost model is kept if the history is too small.
+        """
+        runtime_history = self.get_runtime_history()
+        if runtime_history is None:
+            return
+
+        cost_model = runtime_history.fit_cost_model()
+        if cost_model is not None:
+            logging.info("Cost model fitted on the runtime history")
+            self.cost_model = cost_model
+
+    def open_hdf5_file(self, mode='r'):
+        """
+        Open the HDF5 results file with the driver of the `hdf5_storage_mode`.
+
+        With :py:data:`HDF5_STORAGE_MODE_CORE`, the whole file is loaded in memory and written back when closed.
+        With :py:data:`HDF5_STORAGE_MODE_DISK`, the file is read and written directly on the disk, the memory used
+        does not depend on the size of the file.
+
+        :param mode: h5py file mode
+        :return: h5py file object
+        """
+        file_path = self.get_hdf5_file_path()
+
+        if self.hdf5_storage_mode == HDF5_STORAGE_MODE_CORE:
+            if mode == 'r':
+                return h5py.File(file_path, mode, driver='core')
+            else:
+                return h5py.File(file_path, mode, driver='core', backing_store=True)
+        elif self.hdf5_storage_mode == HDF5_STORAGE_MODE_DISK:
+            return h5py.File(file_path, mode)
+        else:
+            raise ValueError("Unknown HDF5 storage mode: %s" % (self.hdf5_storage_mode))
+
+    def _flush_hdf5_file(self, hdf5_root, number_simulations_read):
+        """
+        Flush the HDF5 file on the disk every `hdf5_flush_interval` simulations.
+
+        Only done with :py:data:`HDF5_STORAGE_MODE_DISK`, with the core driver a flush writes the whole file.
+        """
+        if self.hdf5_storage_mode == HDF5_STORAGE_MODE_DISK and self.hdf5_flush_interval:
+            if number_simulations_read % self.hdf5_flush_interval == 0:
+                logging.debug("Flush HDF5 file after %i simulations", number_simulations_read)
+                hdf5_root.file.flush()
+
     def get_hdf5_group(self, hdf5_file):
         try:
             hdf5_group = hdf5_file[HDF5_SIMULATIONS]
@@ -251,13 +436,32 @@ class _Simulations(object):
         except WindowsError as message:
             logging.error(message)
 
+    def get_completion_index(self, hdf5_group=None):
+        """
+        Index of the completed simulations, refreshed with the folders modified since the last call.
+
+        :param hdf5_group: HDF5 group of the simulations, None if the HDF5 file is not used
+        :return: :py:class:`pymcxray.CompletionIndex.CompletionIndex` or None if `use_completion_index` is not set
+        """
+        if not self.use_completion_index:
+            return None
+
+        if self._completion_index is None:
+            self._completion_index = CompletionIndex()
+        else:
+            self._completion_index.refresh()
+        self._completion_index.set_hdf5_group(hdf5_group)
+
+        return self._completion_index
+
     def logNumberSimulations(self):
         numberSimulations = 0
         numberSimulationsTodo = 0
         numberSimulationsDone = 0
 
-        for simulation in self.getAllSimulationParameters():
-            if simulation.isDone(self.getSimulationsPath()):
+        completion_index = self.get_completion_index()
+        for simulation in self.iter_simulations():
+            if simulation.isDone(self.getSimulationsPath(), None, completion_index):
                 numberSimulationsDone += 1
             else:
                 numberSimulationsTodo += 1
@@ -273,10 +477,11 @@ class _Simulations(object):
         logging.info("generateInputFiles for analysis: %s", self.getAnalysisName())
 
         self._copyMCXRayProgram()
+        self.update_cost_model()
 
         file_path = self.get_hdf5_file_path()
         if self.use_hdf5 and os.path.isfile(file_path):
-            with h5py.File(file_path, 'r', driver='core') as hdf5_file:
+            with self.open_hdf5_file('r') as hdf5_file:
                 hdf5_group = self.get_hdf5_group(hdf5_file)
                 self._generate_input_files(batchFile, hdf5_group)
         else:
@@ -289,17 +494,40 @@ class _Simulations(object):
         numberSimulationsDone = 0
         simulationTodoNames = []
 
-        for simulation in self.getAllSimulationParameters():
-            simulation.createSimulationFiles(self.getInputPath(), self.getSimulationsPath(), hdf5_group)
+        completion_index = self.get_completion_index(hdf5_group)
+        input_path = self.getInputPath()
 
-            if simulation.isDone(self.getSimulationsPath(), hdf5_group):
-                numberSimulationsDone += 1
-            else:
-                numberSimulationsTodo += 1
-                simulationTodoNames.append(simulation.name)
-                filename = os.path.join("input", simulation.filename)
-                batchFile.addSimulationName(filename)
-            numberSimulations += 1
+        input_files_writer = None
+        if self.number_input_processes is not None and self.number_input_processes > 1:
+            logging.info("Generate input files with %i processes", self.number_input_processes)
+            input_files_writer = InputFilesWriter.ParallelInputFilesWriter(self._create_simulation,
+                                                                           self.number_input_processes,
+                                                                           self.number_input_threads)
+            input_files_writer.open()
+
+        try:
+            for simulation in self.iter_simulations():
+                is_done = simulation.isDone(self.getSimulationsPath(), hdf5_group, completion_index)
+
+                if input_files_writer is None:
+                    simulation.createSimulationFiles(input_path, self.getSimulationsPath(), hdf5_group,
+                                                     completion_index)
+                elif self._overwrite or not is_done:
+                    input_files_writer.add(simulation, input_path)
+                else:
+                    simulation.removeInputsFiles(input_path)
+
+                if is_done:
+                    numberSimulationsDone += 1
+                else:
+                    numberSimulationsTodo += 1
+                    simulationTodoNames.append(simulation.name)
+                    filename = os.path.join("input", simulation.filename)
+                    batchFile.addSimulationName(filename, self.cost_model.estimate_simulation_time_s(simulation))
+                numberSimulations += 1
+        finally:
+            if input_files_writer is not None:
+                input_files_writer.close()
 
         if self._verbose:
             for simulationTodoName in simulationTodoNames:
@@ -310,10 +538,179 @@ class _Simulations(object):
         percentage = 100.0*float(numberSimulationsTodo)/float(numberSimulations)
         logging.info("Number of todo: %4i/%i (%5.2f%%)", numberSimulationsTodo, numberSimulations, percentage)
 
+    def deduplicate_input_files(self):
+        """
+        Migrate the existing input folder to the shared input files, see :py:attr:`share_input_files`.
+        """
+        return InputFilesWriter.deduplicate_input_files(self.getInputPath())
+
+    def get_mcxray_program_command(self):
+        """
+        Command running one simulation, the MCXRay program extracted in the simulations folder by default.
+        """
+        if self.mcxray_program_command is not None:
+            return self.mcxray_program_command
+
+        program_name = get_mcxray_program_name(self._configurationFilepath)
+        return os.path.join(self.getSimulationsPath(), program_name)
+
+    def run_simulations(self):
+        """
+        Run the simulations not done with a :py:class:`pymcxray.LocalRunner.LocalRunner`.
+
+        The run time of the completed simulations is added to the runtime history.
+
+        :return: list of the simulation files that failed
+        """
+        self.update_cost_model()
+
+        simulations_by_filename = {}
+        completion_index = self.get_completion_index()
+        for simulation in self.iter_simulations():
+            if not simulation.isDone(self.getSimulationsPath(), None, completion_index):
+                filename = os.path.join(self.INPUTS_FOLDER, simulation.filename)
+                simulations_by_filename[filename] = simulation
+
+        logging.info("Run %i simulations", len(simulations_by_filename))
+
+        def is_done(filename):
+            return simulations_by_filename[filename].isDone(self.getSimulationsPath())
+
+        # The longest simulations first, so the last running simulations are short ones.
+        estimated_times_s = dict((filename, self.cost_model.estimate_simulation_time_s(simulation))
+                                 for filename, simulation in simulations_by_filename.items())
+        filenames = sorted(simulations_by_filename.keys(), key=estimated_times_s.get, reverse=True)
+
+        runner = LocalRunner(self.get_mcxray_program_command(), self.getSimulationsPath(), self.number_run_workers,
+                             self.run_timeout_s, self.run_maximum_number_attempts)
+        completed, failed = runner.run(filenames, is_done)
+
+        if self._completion_index is not None:
+            self._completion_index.refresh()
+
+        runtime_history = self.get_runtime_history()
+        if runtime_history is not None:
+            for filename in completed:
+                runtime_history.add(simulations_by_filename[filename], runner.durations_s[filename])
+            runtime_history.save()
+
+        for filename in failed:
+            logging.error("Failed: \t%s", filename)
+
+        return failed
+
+    def get_work_queue_path(self):
+        return os.path.join(self.getSimulationsPath(), self.QUEUE_FOLDER)
+
+    def get_work_queue(self):
+        """
+        Work queue shared by the workers of all the computers using the simulations folder.
+
+        :rtype: :py:class:`pymcxray.WorkQueue.WorkQueue`
+        """
+        return WorkQueue(self.get_work_queue_path(), self.queue_stale_timeout_s, self.queue_heartbeat_interval_s)
+
+    def run_queue_worker(self):
+        """
+        Claim the simulations not done from the work queue and run them until there is no simulation left.
+
+        Start one worker per computer sharing the simulations folder, after the input files are generated once. The
+        longest simulations are claimed first. If `queue_wait_for_claims` is set, the worker waits for the
+        simulations claimed by the other workers, so it can run again the ones of a dead worker.
+
+        :return: list of the simulation files that failed on this worker
+        """
+        self.update_cost_model()
+
+        simulations_by_name = {}
+        for simulation in self.iter_simulations():
+            simulations_by_name[simulation.name] = simulation
+
+        estimated_times_s = dict((name, self.cost_model.estimate_simulation_time_s(simulation))
+                                 for name, simulation in simulations_by_name.items())
+        names = sorted(simulations_by_name.keys(), key=estimated_times_s.get, reverse=True)
+
+        runner = LocalRunner(self.get_mcxray_program_command(), self.getSimulationsPath(), self.number_run_workers,
+                             self.run_timeout_s, self.run_maximum_number_attempts)
+        runtime_history = self.get_runtime_history()
+
+        def get_name(filename):
+            return os.path.splitext(os.path.basename(filename))[0]
+
+        def is_done(filename):
+            return simulations_by_name[get_name(filename)].isDone(self.getSimulationsPath())
+
+        all_failed = []
+        with self.get_work_queue() as work_queue:
+            def finished(filename, is_completed):
+                name = get_name(filename)
+                if is_completed:
+                    work_queue.mark_done(name)
+                    if runtime_history is not None:
+                        runtime_history.add(simulations_by_name[name], runner.durations_s[filename])
+                else:
+                    work_queue.mark_failed(name)
+
+            # The claim was recovered by another worker, which runs the simulation again.
+            def is_cancelled(filename):
+                return work_queue.is_claim_lost(get_name(filename))
+
+            while True:
+                status = work_queue.get_status()
+                # The simulations done before the queue was used are not claimed.
+                completion_index = self.get_completion_index()
+                names_todo = [name for name in names if not status.is_finished(name) and
+                               not simulations_by_name[name].isDone(self.getSimulationsPath(), None, completion_index)]
+                logging.info("Work queue: %i simulations todo, %i claimed, %i stale claims", len(names_todo),
+                             len(status.claims), status.get_number_stale_claims())
+
+                claimed_filenames = self._claim_queue_simulations(work_queue, status, names_todo, simulations_by_name)
+                _completed, failed = runner.run(claimed_filenames, is_done, finished, is_cancelled)
+                all_failed.extend(failed)
+
+                if runtime_history is not None:
+                    runtime_history.save()
+
+                status = work_queue.get_status()
+                names_claimed = [name for name in names_todo if not status.is_finished(name) and name in status.claims]
+                if len(names_claimed) == 0 or not self.queue_wait_for_claims:
+                    break
+
+                logging.info("Wait for the %i simulations claimed by the other workers", len(names_claimed))
+                time.sleep(self.queue_heartbeat_interval_s)
+
+        for filename in all_failed:
+            logging.error("Failed: \t%s", filename)
+
+        return all_failed
+
+    def _claim_queue_simulations(self, work_queue, status, names, simulations_by_name):
+        """
+        Generate the simulation files claimed by this worker, a name is only claimed when the runner has a free worker.
+        """
+        for name in names:
+            if status.is_claimed(name) or status.is_finished(name):
+                continue
+
+            if not work_queue.claim(name):
+                continue
+
+            # Finished by another worker since the queue was scanned.
+            if work_queue.is_marked_done(name) or work_queue.is_marked_failed(name):
+                work_queue.release(name)
+                continue
+
+            simulation = simulations_by_name[name]
+            if simulation.isDone(self.getSimulationsPath()):
+                work_queue.mark_done(name)
+                continue
+
+            yield os.path.join(self.INPUTS_FOLDER, simulation.filename)
+
     def checkProgress(self):
         file_path = self.get_hdf5_file_path()
         if self.use_hdf5 and os.path.isfile(file_path):
-            with h5py.File(file_path, 'r', driver='core') as hdf5_file:
+            with self.open_hdf5_file('r') as hdf5_file:
                 hdf5_group = self.get_hdf5_group(hdf5_file)
                 self._check_progress(hdf5_group)
         else:
@@ -329,14 +726,24 @@ class _Simulations(object):
         inputPath = os.path.join(self.getSimulationsPath(), "input")
         inputPath = create_path(inputPath)
 
-        for simulation in self.getAllSimulationParameters():
-            if simulation.isDone(self.getSimulationsPath(), hdf5_group):
+        completion_index = self.get_completion_index(hdf5_group)
+        runtime_history = self.get_runtime_history()
+        simulationsTodo = []
+        for simulation in self.iter_simulations():
+            if simulation.isDone(self.getSimulationsPath(), hdf5_group, completion_index):
                 numberSimulationsDone += 1
+                if runtime_history is not None:
+                    runtime_history.add_from_results_files(simulation, self.getSimulationsPath(), completion_index)
             else:
                 numberSimulationsTodo += 1
                 simulationTodoNames.append(simulation.name)
+                simulationsTodo.append(simulation)
             numberSimulations += 1
 
+        if runtime_history is not None:
+            runtime_history.save()
+            self.update_cost_model()
+
         if self._verbose:
             for simulationTodoName in simulationTodoNames:
                 logging.debug("Todo: \t%s", simulationTodoName)
@@ -347,26 +754,144 @@ class _Simulations(object):
         percentage = 100.0*float(numberSimulationsTodo)/float(numberSimulations)
         logging.info("Number of todo: %4i/%i (%5.2f%%)", numberSimulationsTodo, numberSimulations, percentage)
 
+        if os.path.isdir(self.get_work_queue_path()):
+            with self.get_work_queue() as work_queue:
+                status = work_queue.get_status()
+            logging.info("Work queue: %i claimed (%i stale), %i done, %i failed", len(status.claims),
+                         status.get_number_stale_claims(), len(status.done_names), len(status.failed_names))
+
+        # The default cost model only gives the relative cost of the simulations.
+        if len(simulationsTodo) > 0 and not self.cost_model.is_default:
+            estimated_time_s = self.estimate_run_time_s(simulationsTodo)
+            logging.info("Estimated time to completion: %.2f h with %i workers", estimated_time_s/3600.0,
+                         self._get_number_run_workers())
+
+    def _get_number_run_workers(self):
+        if self.number_run_workers is None:
+            return os.cpu_count() or 1
+        else:
+            return max(1, self.number_run_workers)
+
+    def estimate_run_time_s(self, simulations=None):
+        """
+        Estimated wall time to run the simulations with :py:attr:`number_run_workers` workers.
+
+        :param simulations: simulations to run, all the simulations of the sweep if None
+        """
+        if simulations is None:
+            simulations = self.iter_simulations()
+
+        times_s = [self.cost_model.estimate_simulation_time_s(simulation) for simulation in simulations]
+        if len(times_s) == 0:
+            return 0.0
+
+        # The longest simulation cannot be shared between the workers.
+        return max(sum(times_s)/self._get_number_run_workers(), max(times_s))
+
     def getAllSimulationParameters(self):
-        simulationParametersList = []
+        """
+        Simulations of the sweep as :py:class:`pymcxray.Simulation.SimulationRecord`.
+
+        The list is built once and reused by the next calls, see :py:meth:`iter_simulations`.
+        """
+        return list(self.iter_simulations())
+
+    def iter_simulations(self):
+        """
+        Generate the simulation records of the sweep.
+
+        The records are built lazily the first time and memoized once the sweep is complete. A full
+        :py:class:`pymcxray.Simulation.Simulation` is only created for a record when it is needed, e.g. to write the
+        input files. Call :py:meth:`reset_simulations` after modifying the parameters of the sweep.
+        """
+        records_key = id(self._simulationsParameters)
+        if self._simulation_records is not None and self._simulation_records_key == records_key:
+            for record in self._simulation_records:
+                yield record
+            return
+
+        records = []
+        for parameters in self._simulationsParameters.iterSimulationParameters():
+            record = self._create_simulation_record(parameters)
+            records.append(record)
+            yield record
+
+        self._simulation_records = records
+        self._simulation_records_key = records_key
+
+    def get_parameters_table(self):
+        """
+        Columnar table of the sweep with the simulation name of each row.
+
+        :rtype: :py:class:`pymcxray.SimulationsParameters.ParametersTable`
+        """
+        parameters_table = self._simulationsParameters.getParametersTable()
+        parameters_table.setSimulationNames([simulation.name for simulation in self.iter_simulations()])
+
+        return parameters_table
+
+    def reset_simulations(self):
+        self._simulation_records = None
+        self._simulation_records_key = None
+        self._specimen_information = {}
+
+    def _create_simulation(self, parameters):
+        simulation = Simulation.Simulation(overwrite=self._overwrite)
+        simulation.shareInputFiles = self.share_input_files
+        simulation.format_digit = self.format_digit
+        simulation.basename = self.getAnalysisName()
+
+        simulation.setParameters(parameters)
+
+        if PARAMETER_SPECIMEN in parameters:
+            simulation._specimen = parameters[PARAMETER_SPECIMEN]
+        else:
+            simulation._specimen = self.createSpecimen(parameters)
 
-        for parameters in self._simulationsParameters.getAllSimulationParameters():
-            simulation = Simulation.Simulation(overwrite=self._overwrite)
-            simulation.format_digit = self.format_digit
-            simulation.basename = self.getAnalysisName()
+        simulation.generateBaseFilename()
 
-            simulation.setParameters(parameters)
+        return simulation
 
-            if PARAMETER_SPECIMEN in parameters:
-                simulation._specimen = parameters[PARAMETER_SPECIMEN]
-            else:
-                simulation._specimen = self.createSpecimen(parameters)
+    def _get_specimen_information(self, parameters):
+        """
+        Name and number of regions of the specimen of the simulation parameters.
+
+        The information is cached with the parameters not in :py:data:`pymcxray.Simulation.SIMULATION_PARAMETERS`
+        as key, `createSpecimen` is only called once for the simulations of the sweep differing only by the beam,
+        detector and model parameters.
+        """
+        if PARAMETER_SPECIMEN in parameters:
+            specimen = parameters[PARAMETER_SPECIMEN]
+            return specimen.name, specimen.numberRegions
+
+        key = tuple(sorted((name, repr(value)) for name, value in parameters.items()
+                           if name not in Simulation.SIMULATION_PARAMETERS))
+        if key not in self._specimen_information:
+            specimen = self.createSpecimen(parameters)
+            self._specimen_information[key] = (specimen.name, specimen.numberRegions)
+
+        return self._specimen_information[key]
 
-            simulation.generateBaseFilename()
+    def _create_simulation_record(self, parameters):
+        """
+        Create the record of a simulation with its name and attributes derived from the parameters, without creating
+        the full :py:class:`pymcxray.Simulation.Simulation`.
+        """
+        if self._default_record_attributes is None:
+            default_simulation = Simulation.Simulation()
+            self._default_record_attributes = dict((name, getattr(default_simulation, name))
+                                                   for name in SIMULATION_RECORD_ATTRIBUTES)
 
-            simulationParametersList.append(simulation)
+        specimen_name, number_regions = self._get_specimen_information(parameters)
+        name = Simulation.create_simulation_name(self.getAnalysisName(), specimen_name, parameters, self.format_digit)
 
-        return simulationParametersList
+        attributes = {}
+        for attribute_name, parameter_name in SIMULATION_RECORD_ATTRIBUTES.items():
+            attributes[attribute_name] = parameters.get(parameter_name, self._default_record_attributes[attribute_name])
+        attributes["numberRegions"] = number_regions
+
+        return Simulation.SimulationRecord(parameters, name, Simulation.get_results_basename(name),
+                                           self._create_simulation, self._overwrite, attributes)
 
     def _isAllResultFileExist(self, resultFilepath, simulationFilepath):
         resultSerializedFilepath = resultFilepath.replace('.cas', '_numpy.npz')
@@ -386,18 +911,14 @@ class _Simulations(object):
         return False
 
     def isOlderThan(self, resultFilepath, simulationFilepath):
+        file_manifest = self.get_file_manifest()
+        if file_manifest is not None:
+            return file_manifest.is_older_than(resultFilepath, simulationFilepath)
+
         if not os.path.isfile(resultFilepath):
             return True
 
-        statMainFile = os.stat(resultFilepath)
-        statOtherFile = os.stat(simulationFilepath)
-
-        if statOtherFile[stat.ST_MTIME] > statMainFile[stat.ST_MTIME]:
-            return True
-        elif statOtherFile[stat.ST_CTIME] > statMainFile[stat.ST_MTIME] and statOtherFile[stat.ST_CTIME] > statMainFile[stat.ST_CTIME]:
-            return True
-        else:
-            return False
+        return FileManifest.is_older_than_stat(resultFilepath, simulationFilepath)
 
     def readResults(self, resultFilepaths=None, serializationFilename="", isResultsKeep=True):
         logging.info("readResults")
@@ -411,14 +932,23 @@ class _Simulations(object):
         if self.useSerialization:
             if serializationFilename == "":
                 serializationFilename = self.getAnalysisName() + ".ser"
-            self._readAllResultsSerialization(serializationFilename, isResultsKeep)
+            if self.use_sharded_serialization:
+                self._read_all_results_sharded_serialization(serializationFilename, isResultsKeep)
+            else:
+                self._readAllResultsSerialization(serializationFilename, isResultsKeep)
         else:
             self._readAllResultsNoSerialization(isResultsKeep)
 
+    def _create_serialization(self):
+        if self.use_sharded_serialization:
+            return SerializationShardedPickle.SerializationShardedPickle()
+        else:
+            return SerializationPickle.SerializationPickle()
+
     def _readResultsSerialization(self, serializationFilename):
         logging.info("_readAllResultsSerialization")
 
-        simulationsResults = SerializationPickle.SerializationPickle()
+        simulationsResults = self._create_serialization()
         simulationsResults.setPathname(self.getResultsPath())
         simulationsResults.setFilename(serializationFilename)
 
@@ -438,11 +968,13 @@ class _Simulations(object):
         simulationsResults = SerializationPickle.SerializationPickle()
         simulationsResults.setPathname(self.getResultsPath())
         simulationsResults.setFilename(serializationFilename)
+        simulationsResults.setManifest(self.get_file_manifest())
 
         if self.createBackup:
             simulationsResults.backupFile()
 
         newResults = False
+        newSourceFilepaths = []
         if self.resetCache:
             simulationsResults.deleteFile()
 
@@ -453,19 +985,25 @@ class _Simulations(object):
         _numberError = 0
         simulations = self.getAllSimulationParameters()
         total = len(simulations)
+        completion_index = self.get_completion_index()
         for index, simulation in enumerate(simulations):
-            if simulation.isDone(self.getSimulationsPath()):
+            if simulation.isDone(self.getSimulationsPath(), None, completion_index):
                 try:
                     key = self.generateResultsKey(simulation)
                     filepath = simulation.getProgramVersionFilepath(self.getSimulationsPath())
-                    if simulationsResults.isOlderThan(filepath) or key not in simulationResultsList:
+                    sourceFilepaths = simulation.get_results_filepaths(self.getSimulationsPath(), completion_index)
+                    if key not in simulationResultsList or simulationsResults.isOlderThan(sourceFilepaths):
                         logging.info("Processing file %i/%i", (index+1), total)
                         if os.path.isfile(filepath):
                             logging.debug(filepath)
-                            simulationResultsList[key] = self.readOneResults(simulation)
+                            with _keep_simulation(simulation):
+                                simulationResultsList[key] = self.readOneResults(simulation)
                             newResults = True
+                            newSourceFilepaths.extend(sourceFilepaths)
                             if index % SAVE_EVERY_SIMULATIONS == 0:
-                                simulationsResults.save(simulationResultsList)
+                                self._save_results_serialization(simulationsResults, simulationResultsList,
+                                                                 newSourceFilepaths)
+                                newSourceFilepaths = []
                         else:
                             logging.warning("File not found: %s", filepath)
                 except UnboundLocalError as message:
@@ -486,7 +1024,9 @@ class _Simulations(object):
             logging.info("Number of IO error: %i", _numberError)
 
         if newResults:
-            simulationsResults.save(simulationResultsList)
+            self._save_results_serialization(simulationsResults, simulationResultsList, newSourceFilepaths)
+        else:
+            self._save_file_manifest()
 
         if isResultsKeep:
             self._simulationResultsList = simulationResultsList
@@ -494,6 +1034,85 @@ class _Simulations(object):
         else:
             del simulationResultsList
 
+    def _save_results_serialization(self, simulationsResults, simulationResultsList, sourceFilepaths):
+        """
+        Save the results and record the new serialization file in the manifest, so the results already saved are
+        not read again after a later save or if the process stops before the end.
+        """
+        simulationsResults.save(simulationResultsList)
+        simulationsResults.updateManifest(sourceFilepaths)
+        self._save_file_manifest()
+
+    def _read_all_results_sharded_serialization(self, serialization_filename, is_results_keep):
+        """
+        Read the results with one serialization shard per results key.
+
+        A new result is saved in its shard as soon as it is read, the other shards are not rewritten. The kept
+        results are a :py:class:`LazyResultsStore`, a result already in the shards is only loaded when accessed.
+        """
+        logging.info("_read_all_results_sharded_serialization")
+
+        simulations_results = SerializationShardedPickle.SerializationShardedPickle()
+        simulations_results.setPathname(self.getResultsPath())
+        simulations_results.setFilename(serialization_filename)
+        simulations_results.setManifest(self.get_file_manifest())
+
+        if self.create_sharded_backup:
+            simulations_results.backupFile()
+
+        if self.resetCache:
+            simulations_results.deleteFile()
+
+        saved_keys = set(simulations_results.getKeys())
+        simulation_results_list = LazyResultsStore([], simulations_results.loadResult, self.results_cache_size)
+
+        _numberError = 0
+        simulations = self.getAllSimulationParameters()
+        total = len(simulations)
+        completion_index = self.get_completion_index()
+        for index, simulation in enumerate(simulations):
+            if simulation.isDone(self.getSimulationsPath(), None, completion_index):
+                try:
+                    key = self.generateResultsKey(simulation)
+                    filepath = simulation.getProgramVersionFilepath(self.getSimulationsPath())
+                    source_filepaths = simulation.get_results_filepaths(self.getSimulationsPath(), completion_index)
+                    if key not in saved_keys or simulations_results.isOlderThan(source_filepaths, key):
+                        logging.info("Processing file %i/%i", (index+1), total)
+                        if os.path.isfile(filepath):
+                            logging.debug(filepath)
+                            with _keep_simulation(simulation):
+                                results = self.readOneResults(simulation)
+                            simulations_results.saveResult(key, results)
+                            simulations_results.updateManifest(source_filepaths, key)
+                            saved_keys.add(key)
+                            simulation_results_list.add(key, results)
+                        else:
+                            logging.warning("File not found: %s", filepath)
+                    else:
+                        simulation_results_list.add_key(key)
+                except UnboundLocalError as message:
+                    logging.error("UnboundLocalError in %s for %s", "_read_all_results_sharded_serialization", filepath)
+                    logging.error(message)
+                except ValueError as message:
+                    logging.error("ValueError in %s for %s", "_read_all_results_sharded_serialization", filepath)
+                    logging.error(message)
+                except AssertionError as message:
+                    logging.error("AssertionError in %s for %s", "_read_all_results_sharded_serialization", filepath)
+                    logging.error(message)
+                except IOError as message:
+                    logging.warning(message)
+                    logging.warning(simulation.name)
+                    _numberError += 1
+
+        if _numberError > 0:
+            logging.info("Number of IO error: %i", _numberError)
+
+        self._save_file_manifest()
+
+        if is_results_keep:
+            self._simulationResultsList = simulation_results_list
+            logging.info("Number of simulation results: %i", len(self._simulationResultsList))
+
     def _readAllResultsNoSerialization(self, isResultsKeep):
         logging.info("_readAllResultsNoSerialization")
 
@@ -502,8 +1121,9 @@ class _Simulations(object):
         _numberError = 0
         simulations = self.getAllSimulationParameters()
         total = len(simulations)
+        completion_index = self.get_completion_index()
         for index, simulation in enumerate(simulations):
-            if simulation.isDone(self.getSimulationsPath()):
+            if simulation.isDone(self.getSimulationsPath(), None, completion_index):
                 try:
                     key = self.generateResultsKey(simulation)
                     if key not in simulationResultsList:
@@ -514,7 +1134,8 @@ class _Simulations(object):
                         filepath = simulation.getProgramVersionFilepath(self.getSimulationsPath())
                         if os.path.isfile(filepath):
                             logging.debug(filepath)
-                            simulationResultsList[key] = self.readOneResults(simulation)
+                            with _keep_simulation(simulation):
+                                simulationResultsList[key] = self.readOneResults(simulation)
                         else:
                             logging.warning("File not found: %s", filepath)
                 except UnboundLocalError as message:
@@ -550,74 +1171,204 @@ class _Simulations(object):
         if os.path.isfile(file_path):
             backup_file_path = self.backup_hdf5_File(file_path)
 
-        with h5py.File(file_path, 'a', driver='core', backing_store=True) as hdf5_file:
+        with self.open_hdf5_file('a') as hdf5_file:
             hdf5_root = hdf5_file.require_group(HDF5_SIMULATIONS)
 
-            _numberError = 0
             simulations = self.getAllSimulationParameters()
 
             self._write_parameters_hdf5(hdf5_root)
 
-            total = len(simulations)
-            for index, simulation in enumerate(simulations):
-                if simulation.isDone(self.getSimulationsPath(), None):
-                    starting_time = time.perf_counter()
-                    try:
-                        filepath = simulation.getProgramVersionFilepath(self.getSimulationsPath())
-                        logging.info("Processing file %i/%i", (index+1), total)
-
-                        if os.path.isfile(filepath):
-                            logging.debug(filepath)
-
-                            name = simulation.name
-                            if name in hdf5_root:
-                                del hdf5_root[name]
-                            hdf5_group = hdf5_root.require_group(name)
-
-                            parameters = simulation.getParameters()
-                            for parameter_name in parameters:
-                                hdf5_group.attrs[parameter_name] = parameters[parameter_name]
-
-                            self.read_one_results_hdf5(simulation, hdf5_group)
-
-                            # if number_simulations_read%50 == 0:
-                            #     hdf5_root.file.flush()
-
-                            if self.delete_result_files:
-                                self.delete_simulation_result_files(simulation)
-                        else:
-                            logging.warning("File not found: %s", filepath)
-                    except UnboundLocalError as message:
-                        logging.error("UnboundLocalError in %s for %s", "_read_all_results_hdf5", filepath)
-                        logging.error(message)
-                    except ValueError as message:
-                        logging.error("ValueError in %s for %s", "_read_all_results_hdf5", filepath)
-                        logging.error(message)
-                    except AssertionError as message:
-                        logging.error("AssertionError in %s for %s", "_read_all_results_hdf5", filepath)
-                        logging.error(message)
-                    except IOError as message:
-                        logging.warning(message)
-                        logging.warning(simulation.name)
-                        _numberError += 1
-
-                    elapse_time = time.perf_counter() - starting_time
-                    logging.info("Elapse time for one simulation: %.1f s", elapse_time)
-                    number_simulations_read += 1
+            if self.number_read_processes is not None and self.number_read_processes > 1:
+                number_simulations_read, _numberError = self._read_all_results_hdf5_parallel(hdf5_root, simulations)
+            else:
+                number_simulations_read, _numberError = self._read_all_results_hdf5_serial(hdf5_root, simulations)
 
             if _numberError > 0:
                 logging.info("Number of IO error: %i", _numberError)
 
+            self._simulationResultsList = self._create_results_store_hdf5(hdf5_root, simulations)
+
             elapse_time_all = time.perf_counter() - starting_time_all
             logging.info("Elapse time for all simulations (%i): %.1f s", number_simulations_read, elapse_time_all)
 
         if not self.createBackup and os.path.isfile(backup_file_path):
             file_path = self.get_hdf5_file_path()
             if self.use_hdf5 and os.path.isfile(file_path):
-                with h5py.File(file_path, 'r', driver='core') as hdf5_file:
+                with self.open_hdf5_file('r') as hdf5_file:
                     logging.info("Remove file: %s", backup_file_path)
                     os.remove(backup_file_path)
 
+    def _create_results_store_hdf5(self, hdf5_root, simulations):
+        """
+        Create the lazy results mapping of the simulations with results in the HDF5 file.
+
+        The result of a key is loaded from the HDF5 file with :py:meth:`load_one_results_hdf5` when accessed.
+        """
+        simulations_by_key = {}
+        for simulation in simulations:
+            name = simulation.name
+            if name in hdf5_root and HDF5_RESULTS_FINGERPRINT in hdf5_root[name].attrs:
+                key = self.generateResultsKey(simulation)
+                simulations_by_key.setdefault(key, simulation)
+
+        file_path = self.get_hdf5_file_path()
+        def load_result(key):
+            simulation = simulations_by_key[key]
+            with h5py.File(file_path, 'r') as hdf5_file:
+                hdf5_group = hdf5_file[HDF5_SIMULATIONS][simulation.name]
+                return self.load_one_results_hdf5(simulation, hdf5_group)
+
+        keys = [key for key in (self.generateResultsKey(simulation) for simulation in simulations)
+                if key in simulations_by_key]
+        return LazyResultsStore(keys, load_result, self.results_cache_size)
+
+    def load_one_results_hdf5(self, simulation, hdf5_group):
+        """
+        Load the results of one simulation from its group in the HDF5 file.
+
+        The default implementation reads the whole group in a :py:class:`Hdf5PayloadGroup`, override it to create
+        the result objects of the analysis. The HDF5 file is closed after the call.
+        """
+        return Hdf5Payload.read_group(hdf5_group)
+
+    def _read_all_results_hdf5_serial(self, hdf5_root, simulations):
+        number_simulations_read = 0
+        _numberError = 0
+
+        total = len(simulations)
+        for index, simulation, fingerprint in self._get_simulations_to_read_hdf5(hdf5_root, simulations):
+            _numberError += self._write_one_results_hdf5(hdf5_root, simulation, index, fingerprint, total=total)
+            number_simulations_read += 1
+            self._flush_hdf5_file(hdf5_root, number_simulations_read)
+
+        return number_simulations_read, _numberError
+
+    def _get_simulations_to_read_hdf5(self, hdf5_root, simulations):
+        """
+        Generate the simulations with new or modified results files.
+
+        A simulation is skipped when its group in the HDF5 file has the same results fingerprint as its results
+        files, unless `resetCache` is set.
+
+        :return: generator of tuple (index, simulation, fingerprint)
+        """
+        number_simulations_skipped = 0
+        completion_index = self.get_completion_index()
+        for index, simulation in enumerate(simulations):
+            if simulation.isDone(self.getSimulationsPath(), None, completion_index):
+                fingerprint = simulation.get_results_fingerprint(self.getSimulationsPath(), completion_index)
+                if not self.resetCache and self._is_results_hdf5_up_to_date(hdf5_root, simulation, fingerprint):
+                    logging.debug("Results already read: %s", simulation.name)
+                    number_simulations_skipped += 1
+                else:
+                    yield index, simulation, fingerprint
+
+        if number_simulations_skipped > 0:
+            logging.info("Number of simulations already read: %i", number_simulations_skipped)
+
+    def _is_results_hdf5_up_to_date(self, hdf5_root, simulation, fingerprint):
+        name = simulation.name
+        if name in hdf5_root:
+            return hdf5_root[name].attrs.get(HDF5_RESULTS_FINGERPRINT, "") == fingerprint
+        else:
+            return False
+
+    def _read_all_results_hdf5_parallel(self, hdf5_root, simulations):
+        """
+        Read the results files in worker processes and write them in the HDF5 file from this process.
+
+        The workers only parse the results files into :py:class:`Hdf5PayloadGroup` objects, the HDF5 file is only
+        accessed by the calling process.
+        """
+        logging.info("Read results with %i processes", self.number_read_processes)
+        number_simulations_read = 0
+        _numberError = 0
+
+        maximum_number_pending = 2*self.number_read_processes
+        pending_reads = deque()
+
+        total = len(simulations)
+        with ProcessPoolExecutor(max_workers=self.number_read_processes, initializer=_initialize_read_worker,
+                                 initargs=(self,)) as executor:
+            for index, simulation, fingerprint in self._get_simulations_to_read_hdf5(hdf5_root, simulations):
+                future = executor.submit(_read_one_results_payload, simulation)
+                pending_reads.append((index, simulation, fingerprint, future))
+
+                if len(pending_reads) >= maximum_number_pending:
+                    index_pending, simulation_pending, fingerprint_pending, future_pending = pending_reads.popleft()
+                    _numberError += self._write_one_results_hdf5(hdf5_root, simulation_pending, index_pending,
+                                                                 fingerprint_pending, future_pending, total)
+                    number_simulations_read += 1
+                    self._flush_hdf5_file(hdf5_root, number_simulations_read)
+
+            while len(pending_reads) > 0:
+                index_pending, simulation_pending, fingerprint_pending, future_pending = pending_reads.popleft()
+                _numberError += self._write_one_results_hdf5(hdf5_root, simulation_pending, index_pending,
+                                                             fingerprint_pending, future_pending, total)
+                number_simulations_read += 1
+                self._flush_hdf5_file(hdf5_root, number_simulations_read)
+
+        return number_simulations_read, _numberError
+
+    def _write_one_results_hdf5(self, hdf5_root, simulation, index, fingerprint, future=None, total=0):
+        """
+        Write the results of one simulation in the HDF5 file.
+
+        If `future` is None, the results files are read in this process, otherwise the payload returned by the
+        future is written. The results `fingerprint` is saved with the group once the results are written.
+
+        :return: number of IO error, 0 or 1
+        """
+        _numberError = 0
+        starting_time = time.perf_counter()
+        try:
+            filepath = simulation.getProgramVersionFilepath(self.getSimulationsPath())
+            logging.info("Processing file %i/%i", (index+1), total)
+
+            if os.path.isfile(filepath):
+                logging.debug(filepath)
+
+                name = simulation.name
+                if name in hdf5_root:
+                    del hdf5_root[name]
+                hdf5_group = hdf5_root.require_group(name)
+
+                parameters = simulation.getParameters()
+                for parameter_name in parameters:
+                    hdf5_group.attrs[parameter_name] = parameters[parameter_name]
+
+                if future is not None:
+                    payload = future.result()
+                    payload.write(hdf5_group)
+                else:
+                    with _keep_simulation(simulation):
+                        self.read_one_results_hdf5(simulation, hdf5_group)
+
+                hdf5_group.attrs[HDF5_RESULTS_FINGERPRINT] = fingerprint
+
+                if self.delete_result_files:
+                    self.delete_simulation_result_files(simulation)
+            else:
+                logging.warning("File not found: %s", filepath)
+        except UnboundLocalError as message:
+            logging.error("UnboundLocalError in %s for %s", "_read_all_results_hdf5", filepath)
+            logging.error(message)
+        except ValueError as message:
+            logging.error("ValueError in %s for %s", "_read_all_results_hdf5", filepath)
+            logging.error(message)
+        except AssertionError as message:
+            logging.error("AssertionError in %s for %s", "_read_all_results_hdf5", filepath)
+            logging.error(message)
+        except IOError as message:
+            logging.warning(message)
+            logging.warning(simulation.name)
+            _numberError += 1
+
+        elapse_time = time.perf_counter() - starting_time
+        logging.info("Elapse time for one simulation: %.1f s", elapse_time)
+
+        return _numberError
+
     def _write_parameters_hdf5(self, hdf5_root):
         hdf5_parameters_group = hdf5_root.require_group(HDF5_PARAMETERS)
 
@@ -680,6 +1431,29 @@ class _Simulations(object):
     def getAllResults(self):
         return self._simulationResultsList
 
+    def iter_results(self):
+        """
+        Iterate over the (key, results) pairs in the sweep order.
+
+        With a :py:class:`LazyResultsStore`, the results are loaded one at a time and not kept in the cache.
+        """
+        results = self._simulationResultsList
+
+        keys = []
+        key_set = set()
+        for simulation in self.iter_simulations():
+            key = self.generateResultsKey(simulation)
+            if key in results and key not in key_set:
+                key_set.add(key)
+                keys.append(key)
+
+        if isinstance(results, LazyResultsStore):
+            for key, result in results.iter_results(keys):
+                yield key, result
+        else:
+            for key in keys:
+                yield key, results[key]
+
     def _initData(self): #pragma: no cover
         raise NotImplementedError
 
@@ -700,6 +1474,14 @@ class _Simulations(object):
     def readOneResults(self, simulation):
         raise NotImplementedError
 
+    def read_one_results_hdf5(self, simulation, hdf5_group): #pragma: no cover
+        """
+        Read the results files of one simulation and write them in its HDF5 group.
+
+        Pass :py:attr:`hdf5_storage_policy` to the `write_hdf5` methods to use the storage policy of the simulations.
+        """
+        raise NotImplementedError
+
     def generateResultsKey(self, simulation):
         variedParameterLabels = self.getVariedParameterLabels()
 
@@ -717,6 +1499,11 @@ class _Simulations(object):
             batchFile.write(self.getSimulationsPath())
         if options == ANALYZE_TYPE_CHECK_PROGRESS:
             self.checkProgress()
+        if options == ANALYZE_TYPE_RUN:
+            self.generateInputFiles(batchFile)
+            self.run_simulations()
+        if options == ANALYZE_TYPE_WORKER:
+            self.run_queue_worker()
         if options == ANALYZE_TYPE_READ_RESULTS:
             self.readResultsFiles()
         if options == ANALYZE_TYPE_ANALYZE_RESULTS:
@@ -785,6 +1572,7 @@ class _Simulations(object):
     @overwrite.setter
     def overwrite(self, overwrite):
         self._overwrite = overwrite
+        self.reset_simulations()
 
     @property
     def resetCache(self):
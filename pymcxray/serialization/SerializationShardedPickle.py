@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+"""
+Serialization of a dict of results with one pickle shard file per key.
+
+The shards are saved in a folder with the highest pickle protocol and the numpy arrays are written as out-of-band
+buffers after the pickle stream. A key is saved or loaded without reading or rewriting the other keys. The keys are
+listed in an append-only index file of the folder.
+"""
+
+# Script information for the file.
+__author__ = "Hendrix Demers (hendrix.demers@mail.mcgill.ca)"
+__version__ = ""
+__date__ = ""
+__copyright__ = "Copyright (c) 2017 Hendrix Demers"
+__license__ = ""
+
+# Standard library modules.
+import pickle
+import logging
+import os.path
+import stat
+import shutil
+import hashlib
+
+# Third party modules.
+
+# Local modules.
+import pymcxray.serialization._Serialization as _Serialization
+
+# Globals and constants variables.
+INDEX_FILENAME = "index.pkl"
+SHARD_EXTENSION = ".pkl"
+
+class SerializationShardedPickle(_Serialization._Serialization):
+    KEY_FILE_VERSION = "fileVersion"
+    KEY_RESULT_KEY = "key"
+    KEY_PAYLOAD_SIZE = "payloadSize"
+    KEY_BUFFER_SIZES = "bufferSizes"
+
+    def __init__(self, filename=None, verbose=True):
+        super(SerializationShardedPickle, self).__init__(filename, verbose)
+
+        self._keys = None
+        self._keySet = None
+
+    def _getSerializationExtension(self):
+        return ".shards"
+
+    def setPathname(self, pathname):
+        super(SerializationShardedPickle, self).setPathname(pathname)
+        self._keys = None
+        self._keySet = None
+
+    def setFilename(self, filename):
+        super(SerializationShardedPickle, self).setFilename(filename)
+        self._keys = None
+        self._keySet = None
+
+    def setFilepath(self, filepath):
+        super(SerializationShardedPickle, self).setFilepath(filepath)
+        self._keys = None
+        self._keySet = None
+
+    def _getIndexFilepath(self):
+        return os.path.join(self.getFilepath(), INDEX_FILENAME)
+
+    def getShardFilepath(self, key):
+        name = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.getFilepath(), name + SHARD_EXTENSION)
+
+    def isFile(self):
+        return os.path.isfile(self._getIndexFilepath())
+
+    def deleteFile(self):
+        folderpath = self.getFilepath()
+        if os.path.isdir(folderpath):
+            if self._verbose:
+                logging.info("Removing serialization folder: %s.", folderpath)
+
+            shutil.rmtree(folderpath)
+
+        self._keys = None
+        self._keySet = None
+
+    def backupFile(self, suffix=None):
+        sourceFolderpath = self.getFilepath()
+
+        if os.path.isdir(sourceFolderpath):
+            if suffix is None:
+                suffix = self._generateTimeStamp()
+
+            if suffix != "":
+                destinationFolderpath = sourceFolderpath + "_" + suffix + ".bak"
+            else:
+                destinationFolderpath = sourceFolderpath + ".bak"
+
+            shutil.copytree(sourceFolderpath, destinationFolderpath)
+            logging.info("Backup created: %s", destinationFolderpath)
+
+    def _readKeys(self):
+        """
+        Read the keys saved in the folder once from the index file, in a list and a set for the membership tests.
+        """
+        if self._keys is None:
+            self._keys = []
+            self._keySet = set()
+
+            if self.isFile():
+                with open(self._getIndexFilepath(), "rb") as indexFile:
+                    while True:
+                        try:
+                            key = pickle.load(indexFile)
+                        except EOFError:
+                            break
+
+                        if key not in self._keySet and os.path.isfile(self.getShardFilepath(key)):
+                            self._keySet.add(key)
+                            self._keys.append(key)
+
+    def getKeys(self):
+        """
+        Keys saved in the folder, read once from the index file.
+        """
+        self._readKeys()
+        return list(self._keys)
+
+    def hasKey(self, key):
+        self._readKeys()
+        return key in self._keySet
+
+    def updateManifest(self, sourceFilepaths=(), key=None):
+        """
+        Record the shard of `key` and the source files read in it, call it after :py:meth:`saveResult`.
+        """
+        if self._manifest is not None:
+            if key is None:
+                shardFilepath = self._getIndexFilepath()
+            else:
+                shardFilepath = self.getShardFilepath(key)
+            self._manifest.record(shardFilepath, sourceFilepaths)
+
+    def isOlderThan(self, filepath, key=None):
+        """
+        Check if the shard of `key` is older than the file `filepath`.
+
+        Without a key, the index file of the folder is compared as the single file of the other serialization classes.
+        """
+        if key is None:
+            shardFilepath = self._getIndexFilepath()
+        else:
+            shardFilepath = self.getShardFilepath(key)
+
+        if self._manifest is not None:
+            return self._manifest.is_older_than(shardFilepath, filepath)
+
+        if not isinstance(filepath, str):
+            for otherFilepath in filepath:
+                if self.isOlderThan(otherFilepath, key):
+                    return True
+            return False
+
+        if not os.path.isfile(shardFilepath):
+            return True
+
+        if not os.path.isfile(filepath):
+            return False
+
+        statSerilization = os.stat(shardFilepath)
+        statOtherFile = os.stat(filepath)
+
+        if statOtherFile[stat.ST_MTIME] > statSerilization[stat.ST_MTIME]:
+            return True
+        elif statOtherFile[stat.ST_CTIME] > statSerilization[stat.ST_MTIME] and statOtherFile[stat.ST_CTIME] > statSerilization[stat.ST_CTIME]:
+            return True
+        else:
+            return False
+
+    def saveResult(self, key, result):
+        """
+        Save the result of one key in its shard, the other shards are not modified.
+        """
+        folderpath = self.getFilepath()
+        if not os.path.isdir(folderpath):
+            os.makedirs(folderpath)
+
+        buffers = []
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL, buffer_callback=buffers.append)
+        rawBuffers = []
+        for buffer in buffers:
+            try:
+                rawBuffers.append(buffer.raw())
+            except BufferError:
+                # Non contiguous buffer.
+                rawBuffers.append(memoryview(bytes(buffer)))
+
+        header = {}
+        header[SerializationShardedPickle.KEY_FILE_VERSION] = self._currentVersion
+        header[SerializationShardedPickle.KEY_RESULT_KEY] = key
+        header[SerializationShardedPickle.KEY_PAYLOAD_SIZE] = len(payload)
+        header[SerializationShardedPickle.KEY_BUFFER_SIZES] = [rawBuffer.nbytes for rawBuffer in rawBuffers]
+
+        shardFilepath = self.getShardFilepath(key)
+        temporaryFilepath = shardFilepath + ".tmp"
+        with open(temporaryFilepath, "wb") as shardFile:
+            pickle.dump(header, shardFile, protocol=pickle.HIGHEST_PROTOCOL)
+            shardFile.write(payload)
+            for rawBuffer in rawBuffers:
+                shardFile.write(rawBuffer)
+        os.replace(temporaryFilepath, shardFilepath)
+
+        if not self.hasKey(key):
+            with open(self._getIndexFilepath(), "ab") as indexFile:
+                pickle.dump(key, indexFile, protocol=pickle.HIGHEST_PROTOCOL)
+            self._keys.append(key)
+            self._keySet.add(key)
+
+    def loadResult(self, key):
+        """
+        Load the result of one key from its shard.
+
+        :raise KeyError: if there is no shard for the key
+        """
+        shardFilepath = self.getShardFilepath(key)
+        if not os.path.isfile(shardFilepath):
+            raise KeyError(key)
+
+        with open(shardFilepath, "rb") as shardFile:
+            header = pickle.load(shardFile)
+            if header[SerializationShardedPickle.KEY_RESULT_KEY] != key:
+                raise KeyError(key)
+
+            self._fileVersion = header[SerializationShardedPickle.KEY_FILE_VERSION]
+            payload = shardFile.read(header[SerializationShardedPickle.KEY_PAYLOAD_SIZE])
+            buffers = []
+            for bufferSize in header[SerializationShardedPickle.KEY_BUFFER_SIZES]:
+                buffer = bytearray(bufferSize)
+                shardFile.readinto(buffer)
+                buffers.append(buffer)
+
+        return pickle.loads(payload, buffers=buffers)
+
+    def deleteResult(self, key):
+        shardFilepath = self.getShardFilepath(key)
+        if os.path.isfile(shardFilepath):
+            os.remove(shardFilepath)
+
+        if self._keys is not None and key in self._keySet:
+            self._keys.remove(key)
+            self._keySet.remove(key)
+
+    def load(self):
+        """
+        Load all the results as a dict, as the :py:meth:`load` of the other serialization classes.
+        """
+        if self._verbose:
+            logging.debug("Reading serialization folder: %s.", self.getFilepath())
+
+        serializedData = {}
+        for key in self.getKeys():
+            serializedData[key] = self.loadResult(key)
+
+        return serializedData
+
+    def save(self, serializedData):
+        """
+        Save all the results of the dict `serializedData`, one shard per key.
+        """
+        if self._verbose:
+            logging.debug("Writing serialization folder %s.", self.getFilepath())
+
+        for key in serializedData:
+            self.saveResult(key, serializedData[key])
@@ -35,6 +35,8 @@ class _Serialization(object):
 
         self._verbose = verbose
 
+        self._manifest = None
+
         if filename:
             self.setFilename(filename)
 
@@ -99,7 +101,32 @@ class _Serialization(object):
         isFile = os.path.isfile(filepath)
         return isFile
 
+    def setManifest(self, manifest):
+        """
+        Use a :py:class:`pymcxray.FileManifest.FileManifest` to check if the serialization file is older.
+        """
+        self._manifest = manifest
+
+    def getManifest(self):
+        return self._manifest
+
+    def updateManifest(self, sourceFilepaths=()):
+        """
+        Record the serialization file and the source files read in it, call it after :py:meth:`save`.
+        """
+        if self._manifest is not None:
+            self._manifest.record(self.getFilepath(), sourceFilepaths)
+
     def isOlderThan(self, filepath):
+        if not isinstance(filepath, str):
+            for otherFilepath in filepath:
+                if self.isOlderThan(otherFilepath):
+                    return True
+            return False
+
+        if self._manifest is not None:
+            return self._manifest.is_older_than(self.getFilepath(), filepath)
+
         if not self.isFile():
             return True
 
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+""" """
+
+# Script information for the file.
+__author__ = "Hendrix Demers (hendrix.demers@mail.mcgill.ca)"
+__version__ = ""
+__date__ = ""
+__copyright__ = "Copyright (c) 2017 Hendrix Demers"
+__license__ = ""
+
+# Standard library modules.
+import unittest
+import logging
+import tempfile
+import shutil
+import os.path
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+import pymcxray.serialization.SerializationShardedPickle as SerializationShardedPickle
+
+# Globals and constants variables.
+
+class TestSerializationShardedPickle(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+
+        self.tempPath = tempfile.mkdtemp(prefix="Test_SerializationShardedPickle_")
+
+    def tearDown(self):
+        unittest.TestCase.tearDown(self)
+
+        shutil.rmtree(self.tempPath)
+
+    def testSkeleton(self):
+        #self.fail("Test if the TestCase is working.")
+        self.assertTrue(True)
+
+    def _createSerialization(self):
+        serialization = SerializationShardedPickle.SerializationShardedPickle(verbose=False)
+        serialization.setPathname(self.tempPath)
+        serialization.setFilename("SimulationsTest.ser")
+
+        return serialization
+
+    def test_loadSave(self):
+        dataRef = {(5.0, 100): {"spectrum": np.linspace(0.0, 1.0, 1000), "name": "a"},
+                   (10.0, 100): {"spectrum": np.ones((10, 20))[:, ::2], "name": "b"}}
+
+        serialization = self._createSerialization()
+        self.assertEqual(os.path.join(self.tempPath, "SimulationsTest.shards"), serialization.getFilepath())
+        self.assertFalse(serialization.isFile())
+        self.assertEqual({}, serialization.load())
+
+        serialization.save(dataRef)
+        self.assertTrue(serialization.isFile())
+
+        serialization = self._createSerialization()
+        data = serialization.load()
+
+        self.assertEqual(sorted(dataRef.keys()), sorted(data.keys()))
+        for key in dataRef:
+            self.assertEqual(dataRef[key]["name"], data[key]["name"])
+            np.testing.assert_array_equal(dataRef[key]["spectrum"], data[key]["spectrum"])
+
+        data[(5.0, 100)]["spectrum"][0] = 1.0
+
+        serialization.deleteFile()
+        self.assertFalse(serialization.isFile())
+        self.assertEqual([], serialization.getKeys())
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_saveResult(self):
+        serialization = self._createSerialization()
+
+        serialization.saveResult((5.0,), np.arange(10))
+        serialization.saveResult((10.0,), np.arange(20))
+        serialization.saveResult((5.0,), np.arange(30))
+        self.assertEqual([(5.0,), (10.0,)], serialization.getKeys())
+
+        serialization = self._createSerialization()
+        self.assertEqual([(5.0,), (10.0,)], serialization.getKeys())
+        self.assertTrue(serialization.hasKey((10.0,)))
+        self.assertFalse(serialization.hasKey((15.0,)))
+        np.testing.assert_array_equal(np.arange(30), serialization.loadResult((5.0,)))
+        np.testing.assert_array_equal(np.arange(20), serialization.loadResult((10.0,)))
+        self.assertRaises(KeyError, serialization.loadResult, (15.0,))
+
+        serialization.deleteResult((5.0,))
+        self.assertEqual([(10.0,)], serialization.getKeys())
+        self.assertFalse(serialization.hasKey((5.0,)))
+        serialization.saveResult((5.0,), np.arange(5))
+        self.assertEqual([(10.0,), (5.0,)], serialization.getKeys())
+        serialization.deleteResult((5.0,))
+        self.assertEqual([(10.0,)], self._createSerialization().getKeys())
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_isOlderThan(self):
+        serialization = self._createSerialization()
+        filepath = os.path.join(self.tempPath, "results.txt")
+        open(filepath, 'w').close()
+
+        self.assertTrue(serialization.isOlderThan(filepath, (5.0,)))
+
+        serialization.saveResult((5.0,), [1, 2, 3])
+        self.assertFalse(serialization.isOlderThan(filepath, (5.0,)))
+        self.assertFalse(serialization.isOlderThan(filepath))
+        self.assertTrue(serialization.isOlderThan(filepath, (10.0,)))
+
+        fileStat = os.stat(filepath)
+        os.utime(filepath, ns=(fileStat.st_atime_ns, fileStat.st_mtime_ns + 10000000000))
+        self.assertTrue(serialization.isOlderThan(filepath, (5.0,)))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_backupFile(self):
+        serialization = self._createSerialization()
+        serialization.saveResult((5.0,), [1, 2, 3])
+
+        serialization.backupFile("")
+        self.assertTrue(os.path.isdir(serialization.getFilepath() + ".bak"))
+
+        #self.fail("Test if the testcase is working.")
+
+if __name__ == '__main__': #pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    from pymcxray.Testings import runTestModule
+    runTestModule()
@@ -16,6 +16,9 @@ __license__ = ""
 # Standard library modules.
 import unittest
 import logging
+import os.path
+import tempfile
+import shutil
 
 # Third party modules.
 
@@ -53,6 +56,57 @@ class TestBatchFileConsole(unittest.TestCase):
         #self.fail("Test if the testcase is working.")
         self.assert_(True)
 
+    def test_splitSimulations(self):
+        """
+        Tests for method `splitSimulations`.
+        """
+
+        batchFile = BatchFileConsole.BatchFileConsole("Batch", "mcxray.exe", numberFiles=3)
+        estimatedTimes_s = [100.0, 70.0, 60.0, 50.0, 40.0, 30.0, 20.0, 10.0]
+        for index, estimatedTime_s in enumerate(estimatedTimes_s):
+            batchFile.addSimulationName("Sim%i.sim" % (index), estimatedTime_s)
+
+        batches = batchFile.splitSimulations()
+        self.assertEqual(3, len(batches))
+        self.assertEqual([(130.0, ["Sim0.sim", "Sim5.sim"]), (130.0, ["Sim1.sim", "Sim4.sim", "Sim6.sim"]),
+                          (120.0, ["Sim2.sim", "Sim3.sim", "Sim7.sim"])], batches)
+
+        batchFile = BatchFileConsole.BatchFileConsole("Batch", "mcxray.exe", numberFiles=4)
+        for index in range(10):
+            batchFile.addSimulationName("Sim%i.sim" % (index))
+        numberSimulations = sorted(len(filenames) for _time_s, filenames in batchFile.splitSimulations())
+        self.assertEqual([2, 2, 3, 3], numberSimulations)
+
+        batchFile = BatchFileConsole.BatchFileConsole("Batch", "mcxray.exe", numberFiles=4)
+        batchFile.addSimulationName("Sim0.sim")
+        self.assertEqual([(1.0, ["Sim0.sim"])], batchFile.splitSimulations())
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_write(self):
+        """
+        Tests for method `write`.
+        """
+
+        path = tempfile.mkdtemp(prefix="Test_BatchFileConsole_")
+        try:
+            batchFile = BatchFileConsole.BatchFileConsole("Batch", "mcxray.exe", numberFiles=2)
+            batchFile.addSimulationName("Sim0.sim", 7200.0)
+            batchFile.addSimulationName("Sim1.sim", 3600.0)
+            batchFile.addSimulationName("Sim2.sim", 1800.0)
+            batchFile.write(path)
+
+            with open(os.path.join(path, "Batch_1.bat"), 'r') as batchFileOutput:
+                self.assertEqual("REM Estimated wall time: 2.00 h for 1 simulations\nmcxray.exe Sim0.sim\n",
+                                 batchFileOutput.read())
+            with open(os.path.join(path, "Batch_2.bat"), 'r') as batchFileOutput:
+                self.assertEqual("REM Estimated wall time: 1.50 h for 2 simulations\nmcxray.exe Sim1.sim\n"
+                                 "mcxray.exe Sim2.sim\n", batchFileOutput.read())
+        finally:
+            shutil.rmtree(path)
+
+        #self.fail("Test if the testcase is working.")
+
 if __name__ == '__main__':  #pragma: no cover
     logging.getLogger().setLevel(logging.DEBUG)
     from pymcxray.Testings import runTestModuleWithCoverage
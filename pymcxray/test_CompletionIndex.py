@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: pymcxray.test_CompletionIndex
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`pymcxray.CompletionIndex`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+import os
+import os.path
+import tempfile
+import shutil
+
+# Third party modules.
+
+# Local modules.
+
+# Project modules
+from pymcxray.CompletionIndex import CompletionIndex
+
+# Globals and constants variables.
+
+
+class TestCompletionIndex(unittest.TestCase):
+    """
+    TestCase class for the module `pymcxray.CompletionIndex`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+        self.temporary_path = tempfile.mkdtemp(prefix="Test_CompletionIndex_")
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+        shutil.rmtree(self.temporary_path)
+
+    def _create_file(self, file_name):
+        open(os.path.join(self.temporary_path, file_name), 'w').close()
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_is_done(self):
+        """
+        Tests for method `is_done`.
+        """
+
+        self._create_file("Sim1_ProgramVersion.dat")
+        self._create_file("Sim1_XrayIntensities.csv")
+        self._create_file("Sim2_ProgramVersion.dat")
+        os.makedirs(os.path.join(self.temporary_path, "Sim3_ProgramVersion.dat"))
+
+        completion_index = CompletionIndex()
+        suffixes = ["_ProgramVersion.dat", "_XrayIntensities.csv"]
+        self.assertTrue(completion_index.is_done(os.path.join(self.temporary_path, "Sim1"), suffixes))
+        self.assertFalse(completion_index.is_done(os.path.join(self.temporary_path, "Sim2"), suffixes))
+        self.assertTrue(completion_index.is_done(os.path.join(self.temporary_path, "Sim2"), suffixes[:1]))
+        self.assertFalse(completion_index.is_done(os.path.join(self.temporary_path, "Sim3"), suffixes[:1]))
+        self.assertTrue(completion_index.is_file(os.path.join(self.temporary_path, "Sim2_ProgramVersion.dat")))
+
+        missing_path = os.path.join(self.temporary_path, "missing")
+        self.assertFalse(completion_index.is_done(os.path.join(missing_path, "Sim1"), suffixes))
+        self.assertEqual(set(), completion_index.get_file_names(missing_path))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_refresh(self):
+        """
+        Tests for method `refresh`.
+        """
+
+        completion_index = CompletionIndex()
+        file_names = completion_index.get_file_names(self.temporary_path)
+        self.assertEqual(set(), file_names)
+
+        completion_index.refresh()
+        self.assertIs(file_names, completion_index.get_file_names(self.temporary_path))
+
+        self._create_file("Sim1_ProgramVersion.dat")
+        self.assertFalse(completion_index.is_file(os.path.join(self.temporary_path, "Sim1_ProgramVersion.dat")))
+
+        folder_stat = os.stat(self.temporary_path)
+        os.utime(self.temporary_path, ns=(folder_stat.st_atime_ns, folder_stat.st_mtime_ns + 1000000000))
+        completion_index.refresh()
+        self.assertTrue(completion_index.is_file(os.path.join(self.temporary_path, "Sim1_ProgramVersion.dat")))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_get_file_stat(self):
+        """
+        Tests for method `get_file_stat`.
+        """
+
+        file_path = os.path.join(self.temporary_path, "Sim1_ProgramVersion.dat")
+        with open(file_path, 'w') as results_file:
+            results_file.write("Version")
+
+        completion_index = CompletionIndex()
+        file_stat = os.stat(file_path)
+        self.assertEqual((file_stat.st_size, file_stat.st_mtime_ns), completion_index.get_file_stat(file_path))
+        missing_path = os.path.join(self.temporary_path, "Sim2_ProgramVersion.dat")
+        self.assertEqual(None, completion_index.get_file_stat(missing_path))
+
+        # Rewritten in place, the folder is not modified.
+        with open(file_path, 'a') as results_file:
+            results_file.write("2")
+        completion_index.refresh()
+        file_stat = os.stat(file_path)
+        self.assertEqual((file_stat.st_size, file_stat.st_mtime_ns), completion_index.get_file_stat(file_path))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_set_hdf5_group(self):
+        """
+        Tests for method `set_hdf5_group`.
+        """
+
+        completion_index = CompletionIndex()
+        completion_index.set_hdf5_group({"Sim1": None, "Sim2": None})
+        self.assertTrue(completion_index.has_hdf5_group("Sim1"))
+        self.assertFalse(completion_index.has_hdf5_group("Sim3"))
+
+        completion_index.set_hdf5_group(None)
+        self.assertFalse(completion_index.has_hdf5_group("Sim1"))
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+    nose.runmodule()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: pymcxray.test_CostModel
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`pymcxray.CostModel`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+import math
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules
+from pymcxray.CostModel import CostModel, get_features, FEATURE_NAMES
+import pymcxray.Simulation as Simulation
+
+# Globals and constants variables.
+
+
+class TestCostModel(unittest.TestCase):
+    """
+    TestCase class for the module `pymcxray.CostModel`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_get_features(self):
+        """
+        Tests for method `get_features`.
+        """
+
+        features = get_features(1000, 0, 15.0, 1)
+        self.assertEqual((len(FEATURE_NAMES),), features.shape)
+        np.testing.assert_allclose([1.0, math.log(1000), 0.0, math.log(15.0), 0.0], features)
+
+        features = get_features([100, 1000], 10, [5.0, 10.0], 2)
+        self.assertEqual((2, len(FEATURE_NAMES)), features.shape)
+        np.testing.assert_allclose([math.log(2.0), math.log(2.0)], features[:, 4])
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_estimate_time_s(self):
+        """
+        Tests for method `estimate_time_s`.
+        """
+
+        cost_model = CostModel([math.log(2.0), 1.0, 0.0, 2.0, 1.0])
+        self.assertAlmostEqual(2.0*100*25.0*3, cost_model.estimate_time_s(100, 1000, 5.0, 3))
+        np.testing.assert_allclose([2.0*100*25.0, 2.0*200*100.0],
+                                   cost_model.estimate_time_s([100, 200], 0, [5.0, 10.0], 1))
+        self.assertFalse(cost_model.is_default)
+
+        cost_model = CostModel()
+        self.assertTrue(cost_model.is_default)
+        self.assertTrue(cost_model.estimate_time_s(1000, 0, 30.0, 1) > cost_model.estimate_time_s(1000, 0, 5.0, 1))
+        self.assertTrue(cost_model.estimate_time_s(1000, 0, 5.0, 3) > cost_model.estimate_time_s(1000, 0, 5.0, 1))
+        self.assertRaises(ValueError, CostModel, [1.0, 2.0])
+
+        simulation = Simulation.Simulation()
+        simulation.setParameters({})
+        simulation._specimen = Simulation.createPureBulkSample(29)
+        simulation.numberElectrons = 100
+        simulation.energy_keV = 5.0
+        cost_model = CostModel([math.log(2.0), 1.0, 0.0, 2.0, 1.0])
+        self.assertAlmostEqual(2.0*100*25.0, cost_model.estimate_simulation_time_s(simulation))
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+    nose.runmodule()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: pymcxray.test_FileManifest
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`pymcxray.FileManifest`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+import os
+import os.path
+import tempfile
+import shutil
+
+# Third party modules.
+
+# Local modules.
+
+# Project modules
+import pymcxray.FileManifest as FileManifest
+
+# Globals and constants variables.
+
+
+class TestFileManifest(unittest.TestCase):
+    """
+    TestCase class for the module `pymcxray.FileManifest`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+        self.temporary_path = tempfile.mkdtemp(prefix="Test_FileManifest_")
+        self.root_path = os.path.join(self.temporary_path, "root")
+        os.makedirs(self.root_path)
+
+        self.derived_file_path = self._write_file("results.ser", "results")
+        self.source_file_path = self._write_file("simulation_ProgramVersion.dat", "version 1")
+        self._shift_time(self.source_file_path, -10)
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+        shutil.rmtree(self.temporary_path)
+
+    def _write_file(self, filename, content, path=None):
+        if path is None:
+            path = self.root_path
+        file_path = os.path.join(path, filename)
+        with open(file_path, 'w') as output_file:
+            output_file.write(content)
+
+        return file_path
+
+    def _shift_time(self, file_path, seconds):
+        file_stat = os.stat(file_path)
+        time_ns = file_stat.st_mtime_ns + int(seconds*1.0e9)
+        os.utime(file_path, ns=(time_ns, time_ns))
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_is_older_than_stat(self):
+        """
+        Tests for method `is_older_than_stat`.
+        """
+
+        self.assertFalse(FileManifest.is_older_than_stat(self.derived_file_path, self.source_file_path))
+        self.assertTrue(FileManifest.is_older_than_stat(self.source_file_path, self.derived_file_path))
+        self.assertTrue(FileManifest.is_older_than_stat(self.derived_file_path + "_missing", self.source_file_path))
+        self.assertFalse(FileManifest.is_older_than_stat(self.derived_file_path, self.source_file_path + "_missing"))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_get_digest(self):
+        """
+        Tests for method `get_digest`.
+        """
+
+        file_manifest = FileManifest.FileManifest()
+        digest = file_manifest.get_digest(self.derived_file_path)
+        self.assertEqual(FileManifest.compute_digest(self.derived_file_path), digest)
+        self.assertEqual(2*FileManifest.HASH_DIGEST_SIZE, len(digest))
+        self.assertEqual(None, file_manifest.get_digest(self.derived_file_path + "_missing"))
+
+        self._write_file("results.ser", "other")
+        self._shift_time(self.derived_file_path, 1)
+        self.assertNotEqual(digest, file_manifest.get_digest(self.derived_file_path))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_is_older_than(self):
+        """
+        Tests for method `is_older_than`.
+        """
+
+        file_manifest_path = os.path.join(self.root_path, "manifest.json")
+        file_manifest = FileManifest.FileManifest(file_manifest_path, root_path=self.root_path)
+
+        self.assertTrue(file_manifest.is_older_than(self.derived_file_path + "_missing", self.source_file_path))
+        self.assertFalse(file_manifest.is_older_than(self.derived_file_path, []))
+        self.assertFalse(file_manifest.is_recorded(self.derived_file_path))
+        self.assertFalse(file_manifest.is_older_than(self.derived_file_path, self.source_file_path))
+        self.assertTrue(file_manifest.is_recorded(self.derived_file_path, [self.source_file_path]))
+        file_manifest.save()
+        self.assertTrue(os.path.isfile(file_manifest_path))
+
+        # Copy the files with new timestamps.
+        copy_path = os.path.join(self.temporary_path, "copy")
+        shutil.copytree(self.root_path, copy_path, copy_function=shutil.copyfile)
+        derived_file_path = os.path.join(copy_path, "results.ser")
+        source_file_path = os.path.join(copy_path, "simulation_ProgramVersion.dat")
+        self._shift_time(source_file_path, 10)
+        self.assertTrue(FileManifest.is_older_than_stat(derived_file_path, source_file_path))
+
+        file_manifest = FileManifest.FileManifest(os.path.join(copy_path, "manifest.json"), root_path=copy_path)
+        self.assertTrue(file_manifest.is_recorded(derived_file_path, source_file_path))
+        self.assertFalse(file_manifest.is_older_than(derived_file_path, source_file_path))
+
+        # Simulation run again.
+        self._write_file("simulation_ProgramVersion.dat", "version 2", copy_path)
+        self._shift_time(source_file_path, -20)
+        self.assertTrue(file_manifest.is_older_than(derived_file_path, [source_file_path]))
+        file_manifest.record(derived_file_path, source_file_path)
+        self.assertFalse(file_manifest.is_older_than(derived_file_path, [source_file_path]))
+
+        # Old derived file restored from a backup with a new timestamp.
+        self._write_file("results.ser", "old results", copy_path)
+        self._shift_time(derived_file_path, 20)
+        self.assertTrue(file_manifest.is_older_than(derived_file_path, source_file_path))
+
+        file_manifest.remove(derived_file_path)
+        self.assertFalse(file_manifest.is_recorded(derived_file_path))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_load(self):
+        """
+        Tests for method `load`.
+        """
+
+        file_manifest_path = self._write_file("manifest.json", "{")
+        file_manifest = FileManifest.FileManifest(file_manifest_path)
+        self.assertFalse(file_manifest.is_recorded(self.derived_file_path))
+
+        file_manifest.record(self.derived_file_path, [self.source_file_path])
+        file_manifest.save()
+
+        file_manifest = FileManifest.FileManifest(file_manifest_path)
+        self.assertTrue(file_manifest.is_recorded(self.derived_file_path, [self.source_file_path]))
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+    nose.runmodule()
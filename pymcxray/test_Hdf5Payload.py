@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: pymcxray.test_Hdf5Payload
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`pymcxray.Hdf5Payload`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+import os.path
+import tempfile
+import shutil
+import pickle
+
+# Third party modules.
+import h5py
+import numpy as np
+
+# Local modules.
+
+# Project modules
+from pymcxray.Hdf5Payload import Hdf5PayloadGroup
+import pymcxray.Hdf5Payload as Hdf5Payload
+
+# Globals and constants variables.
+
+
+class TestHdf5Payload(unittest.TestCase):
+    """
+    TestCase class for the module `pymcxray.Hdf5Payload`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+        self.temporary_path = tempfile.mkdtemp(prefix="Test_Hdf5Payload_")
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+        shutil.rmtree(self.temporary_path)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_write(self):
+        """
+        Tests for method `write`.
+        """
+
+        payload = Hdf5PayloadGroup("simulation")
+        payload.attrs["energy_keV"] = 10.0
+        group = payload.require_group("Intensity")
+        self.assertIs(group, payload.require_group("Intensity"))
+
+        region_ids = group.create_dataset("Region ID", data=np.arange(2))
+        xray_lines = group.create_dataset("X-ray line", data=np.array([b"Ka1", b"La"]))
+        dataset = group.create_dataset("Cu", data=np.ones((2, 2)))
+        dataset.attrs["unit"] = "photons"
+        dataset.dims.create_scale(region_ids, 'Region ID')
+        xray_lines.make_scale('X-ray line')
+        dataset.dims[0].attach_scale(region_ids)
+        dataset.dims[1].attach_scale(xray_lines)
+        payload.create_dataset("empty", (3,), dtype=np.int32)
+
+        self.assertRaises(ValueError, group.create_dataset, "Cu", data=np.ones(2))
+        self.assertEqual((2, 2), dataset.shape)
+        self.assertEqual(["Intensity", "empty"], list(payload.keys()))
+
+        payload = pickle.loads(pickle.dumps(payload))
+
+        file_path = os.path.join(self.temporary_path, "payload.hdf5")
+        with h5py.File(file_path, 'w') as hdf5_file:
+            payload.write(hdf5_file.require_group(payload.name))
+
+        with h5py.File(file_path, 'r') as hdf5_file:
+            hdf5_group = hdf5_file["simulation"]
+            self.assertEqual(10.0, hdf5_group.attrs["energy_keV"])
+            self.assertEqual(np.int32, hdf5_group["empty"].dtype)
+            self.assertEqual((3,), hdf5_group["empty"].shape)
+
+            hdf5_dataset = hdf5_group["Intensity/Cu"]
+            self.assertEqual("photons", hdf5_dataset.attrs["unit"])
+            np.testing.assert_array_equal(np.ones((2, 2)), hdf5_dataset[...])
+            np.testing.assert_array_equal(np.arange(2), hdf5_dataset.dims[0][0][...])
+            self.assertEqual([b"Ka1", b"La"], list(hdf5_dataset.dims[1][0][...]))
+            self.assertEqual("X-ray line", hdf5_dataset.dims[1].keys()[0])
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_read_group(self):
+        """
+        Tests for method `read_group`.
+        """
+
+        file_path = os.path.join(self.temporary_path, "payload.hdf5")
+        with h5py.File(file_path, 'w') as hdf5_file:
+            hdf5_group = hdf5_file.require_group("simulations/simulation")
+            hdf5_group.attrs["energy_keV"] = 10.0
+            region_ids = hdf5_group.create_dataset("Intensity/Region ID", data=np.arange(2))
+            region_ids.make_scale("Region ID")
+            hdf5_dataset = hdf5_group.create_dataset("Intensity/Cu", data=np.ones((2, 2)))
+            hdf5_dataset.attrs["unit"] = "photons"
+            hdf5_dataset.dims[0].attach_scale(region_ids)
+
+        with h5py.File(file_path, 'r') as hdf5_file:
+            payload = Hdf5Payload.read_group(hdf5_file["simulations/simulation"])
+
+        self.assertEqual("simulation", payload.name)
+        self.assertEqual(10.0, payload.attrs["energy_keV"])
+        self.assertEqual(["Intensity"], list(payload.keys()))
+        self.assertEqual(["Region ID", "Cu"], sorted(payload["Intensity"].keys(), reverse=True))
+        np.testing.assert_array_equal(np.ones((2, 2)), payload["Intensity"]["Cu"][...])
+        self.assertEqual({"unit": "photons"}, dict(payload["Intensity"]["Cu"].attrs))
+        self.assertEqual({}, dict(payload["Intensity"]["Region ID"].attrs))
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+    nose.runmodule()
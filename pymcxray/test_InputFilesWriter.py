@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: pymcxray.test_InputFilesWriter
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`pymcxray.InputFilesWriter`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+import os
+import os.path
+import tempfile
+import shutil
+
+# Third party modules.
+
+# Local modules.
+
+# Project modules
+from pymcxray.InputFilesWriter import ParallelInputFilesWriter, write_input_file, deduplicate_input_files
+import pymcxray.Simulation as Simulation
+from pymcxray.SimulationsParameters import PARAMETER_INCIDENT_ENERGY_keV
+
+# Globals and constants variables.
+
+
+def create_simulation(parameters):
+    simulation = Simulation.Simulation()
+    simulation.shareInputFiles = parameters.get("shareInputFiles", False)
+    simulation.basename = "Test"
+    simulation.setParameters(parameters)
+    simulation._specimen = Simulation.createPureBulkSample(29)
+    simulation.generateBaseFilename()
+    return simulation
+
+
+class TestInputFilesWriter(unittest.TestCase):
+    """
+    TestCase class for the module `pymcxray.InputFilesWriter`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+        self.temporary_path = tempfile.mkdtemp(prefix="Test_InputFilesWriter_")
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+        shutil.rmtree(self.temporary_path)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_write_input_file(self):
+        """
+        Tests for method `write_input_file`.
+        """
+
+        file_path = os.path.join(self.temporary_path, "Test.sim")
+        write_input_file(file_path, "Version=1.4.3\nSpecimen=Test.sam\n")
+        with open(file_path, 'r') as input_file:
+            self.assertEqual("Version=1.4.3\nSpecimen=Test.sam\n", input_file.read())
+
+        write_input_file(file_path, "Version=1.4.3\n")
+        with open(file_path, 'r') as input_file:
+            self.assertEqual("Version=1.4.3\n", input_file.read())
+        self.assertEqual(["Test.sim"], os.listdir(self.temporary_path))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_ParallelInputFilesWriter(self):
+        """
+        Tests for class `ParallelInputFilesWriter`.
+        """
+
+        serial_path = os.path.join(self.temporary_path, "serial")
+        parallel_path = os.path.join(self.temporary_path, "parallel")
+        os.makedirs(serial_path)
+        os.makedirs(parallel_path)
+
+        records = []
+        for energy_keV in [5.0, 10.0, 15.0]:
+            parameters = {PARAMETER_INCIDENT_ENERGY_keV: energy_keV}
+            simulation = create_simulation(parameters)
+            simulation.createSimulationFiles(serial_path, self.temporary_path, None)
+            records.append(Simulation.SimulationRecord(parameters, simulation.name, simulation.resultsBasename))
+
+        with ParallelInputFilesWriter(create_simulation, 2, 2, log_interval=1) as input_files_writer:
+            for record in records:
+                input_files_writer.add(record, parallel_path)
+
+        self.assertEqual(3, input_files_writer.number_simulations)
+        self.assertEqual(18, input_files_writer.number_files)
+
+        file_names = sorted(os.listdir(serial_path))
+        self.assertEqual(18, len(file_names))
+        self.assertEqual(file_names, sorted(os.listdir(parallel_path)))
+        for file_name in file_names:
+            with open(os.path.join(serial_path, file_name), 'rb') as serial_file:
+                with open(os.path.join(parallel_path, file_name), 'rb') as parallel_file:
+                    self.assertEqual(serial_file.read(), parallel_file.read())
+
+        #self.fail("Test if the testcase is working.")
+
+
+    def _read_files(self, path):
+        files = {}
+        for file_name in os.listdir(path):
+            with open(os.path.join(path, file_name), 'rb') as input_file:
+                files[file_name] = input_file.read()
+
+        return files
+
+    def test_deduplicate_input_files(self):
+        """
+        Tests for method `deduplicate_input_files`.
+        """
+
+        migrated_path = os.path.join(self.temporary_path, "migrated")
+        shared_path = os.path.join(self.temporary_path, "shared")
+        parallel_path = os.path.join(self.temporary_path, "parallel")
+        os.makedirs(migrated_path)
+        os.makedirs(shared_path)
+        os.makedirs(parallel_path)
+
+        records = []
+        for energy_keV in [5.0, 10.0, 15.0]:
+            parameters = {PARAMETER_INCIDENT_ENERGY_keV: energy_keV}
+            simulation = create_simulation(parameters)
+            simulation.createSimulationFiles(migrated_path, self.temporary_path, None)
+
+            simulation = create_simulation(parameters)
+            simulation.shareInputFiles = True
+            simulation.createSimulationFiles(shared_path, self.temporary_path, None)
+
+            parameters = {PARAMETER_INCIDENT_ENERGY_keV: energy_keV, "shareInputFiles": True}
+            records.append(Simulation.SimulationRecord(parameters, simulation.name, simulation.resultsBasename))
+
+        with ParallelInputFilesWriter(create_simulation, 2, 2) as input_files_writer:
+            for record in records:
+                input_files_writer.add(record, parallel_path)
+
+        shared_files = self._read_files(shared_path)
+        self.assertTrue(len(shared_files) < 18)
+        self.assertEqual(3, len([file_name for file_name in shared_files if file_name.endswith(".sim")]))
+        # The .mic and .par files are unique to each simulation.
+        self.assertEqual(9, len([file_name for file_name in shared_files
+                                 if not Simulation.isSharedInputFilename(file_name)]))
+        self.assertEqual(shared_files, self._read_files(parallel_path))
+        self.assertEqual(len(shared_files), input_files_writer.number_files)
+
+        self.assertEqual(18, len(os.listdir(migrated_path)))
+        number_simulation_files, number_removed_files = deduplicate_input_files(migrated_path)
+        self.assertEqual(3, number_simulation_files)
+        self.assertEqual(18 - len(shared_files), number_removed_files)
+        self.assertEqual(shared_files, self._read_files(migrated_path))
+
+        self.assertEqual((0, 0), deduplicate_input_files(migrated_path))
+
+        for record in records:
+            record.removeInputsFiles(shared_path)
+        self.assertEqual([], [file_name for file_name in os.listdir(shared_path)
+                              if not Simulation.isSharedInputFilename(file_name)])
+
+        #self.fail("Test if the testcase is working.")
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+    nose.runmodule()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: pymcxray.test_LocalRunner
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`pymcxray.LocalRunner`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+import sys
+import os
+import os.path
+import tempfile
+import shutil
+import time
+
+# Third party modules.
+
+# Local modules.
+
+# Project modules
+from pymcxray.LocalRunner import LocalRunner
+
+# Globals and constants variables.
+STAND_IN_PROGRAM = """
+import sys
+import os.path
+import time
+
+mode = sys.argv[1]
+simulation_filename = sys.argv[-1]
+name = os.path.splitext(os.path.basename(simulation_filename))[0]
+
+if mode == "sleep":
+    time.sleep(30.0)
+
+attempt_filepath = os.path.join("Results", name + ".attempt")
+if mode == "incomplete_once" and not os.path.isfile(attempt_filepath):
+    open(attempt_filepath, 'w').close()
+    sys.exit(0)
+
+if mode == "fail":
+    sys.exit(1)
+
+open(os.path.join("Results", name + ".dat"), 'w').close()
+"""
+
+
+class TestLocalRunner(unittest.TestCase):
+    """
+    TestCase class for the module `pymcxray.LocalRunner`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+        self.temporary_path = tempfile.mkdtemp(prefix="Test_LocalRunner_")
+        os.makedirs(os.path.join(self.temporary_path, "Results"))
+
+        self.program_path = os.path.join(self.temporary_path, "stand_in_mcxray.py")
+        with open(self.program_path, 'w') as program_file:
+            program_file.write(STAND_IN_PROGRAM)
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+        shutil.rmtree(self.temporary_path)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def _is_done(self, simulation_filename):
+        name = os.path.splitext(os.path.basename(simulation_filename))[0]
+        return os.path.isfile(os.path.join(self.temporary_path, "Results", name + ".dat"))
+
+    def _create_runner(self, mode, **kwargs):
+        runner = LocalRunner([sys.executable, self.program_path, mode], self.temporary_path, **kwargs)
+        runner.poll_interval_s = 0.01
+        return runner
+
+    def test_run(self):
+        """
+        Tests for method `run`.
+        """
+
+        simulation_filenames = [os.path.join("input", "Sim%i.sim" % (index)) for index in range(5)]
+
+        runner = self._create_runner("complete", number_workers=2)
+        completed, failed = runner.run(simulation_filenames, self._is_done)
+        self.assertEqual(sorted(simulation_filenames), sorted(completed))
+        self.assertEqual([], failed)
+        self.assertEqual(sorted(simulation_filenames), sorted(runner.durations_s.keys()))
+        for duration_s in runner.durations_s.values():
+            self.assertTrue(duration_s > 0.0)
+
+        completed, failed = self._create_runner("complete", number_workers=3).run([])
+        self.assertEqual(([], []), (completed, failed))
+
+        finished_filenames = []
+        runner = self._create_runner("complete", number_workers=2)
+        completed, failed = runner.run(iter(simulation_filenames), self._is_done,
+                                       lambda filename, is_completed: finished_filenames.append((filename,
+                                                                                                 is_completed)))
+        self.assertEqual(sorted(simulation_filenames), sorted(completed))
+        self.assertEqual(sorted((filename, True) for filename in simulation_filenames), sorted(finished_filenames))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_run_requeue(self):
+        """
+        Tests for method `run` with incomplete and failed runs.
+        """
+
+        simulation_filenames = [os.path.join("input", "Sim%i.sim" % (index)) for index in range(3)]
+
+        runner = self._create_runner("incomplete_once", number_workers=2)
+        completed, failed = runner.run(simulation_filenames, self._is_done)
+        self.assertEqual(sorted(simulation_filenames), sorted(completed))
+        self.assertEqual([], failed)
+
+        runner = self._create_runner("incomplete_once", number_workers=2, maximum_number_attempts=1)
+        completed, failed = runner.run(["Other.sim"], self._is_done)
+        self.assertEqual(([], ["Other.sim"]), (completed, failed))
+
+        runner = self._create_runner("fail", number_workers=2, maximum_number_attempts=2)
+        finished_filenames = []
+        completed, failed = runner.run(simulation_filenames,
+                                       finished=lambda filename, is_completed: finished_filenames.append(is_completed))
+        self.assertEqual([], completed)
+        self.assertEqual(sorted(simulation_filenames), sorted(failed))
+        self.assertEqual([False]*len(simulation_filenames), finished_filenames)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_run_timeout(self):
+        """
+        Tests for method `run` with a timeout.
+        """
+
+        runner = self._create_runner("sleep", number_workers=2, timeout_s=0.5, maximum_number_attempts=1)
+        completed, failed = runner.run(["Sim1.sim", "Sim2.sim"], self._is_done)
+        self.assertEqual([], completed)
+        self.assertEqual(["Sim1.sim", "Sim2.sim"], sorted(failed))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_run_cancelled(self):
+        """
+        Tests for method `run` with cancelled runs.
+        """
+
+        runner = self._create_runner("sleep", number_workers=2)
+        finished_filenames = []
+        starting_time = time.perf_counter()
+        completed, failed = runner.run(["Sim1.sim", "Sim2.sim"], self._is_done,
+                                       lambda filename, is_completed: finished_filenames.append(filename),
+                                       lambda filename: True)
+        self.assertTrue(time.perf_counter() - starting_time < 10.0)
+        self.assertEqual(([], []), (completed, failed))
+        self.assertEqual([], finished_filenames)
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+    nose.runmodule()
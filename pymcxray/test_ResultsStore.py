@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: pymcxray.test_ResultsStore
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`pymcxray.ResultsStore`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+
+# Third party modules.
+
+# Local modules.
+
+# Project modules
+from pymcxray.ResultsStore import LazyResultsStore
+
+# Globals and constants variables.
+
+
+class TestResultsStore(unittest.TestCase):
+    """
+    TestCase class for the module `pymcxray.ResultsStore`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+        self.loaded_keys = []
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+    def _load_result(self, key):
+        self.loaded_keys.append(key)
+        return {"key": key}
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_LazyResultsStore(self):
+        """
+        Tests for class `LazyResultsStore`.
+        """
+
+        keys = [(5.0,), (10.0,), (15.0,), (10.0,)]
+        results = LazyResultsStore(keys, self._load_result, maximum_number_results=2)
+
+        self.assertEqual([(5.0,), (10.0,), (15.0,)], list(results))
+        self.assertEqual(3, len(results))
+        self.assertTrue((10.0,) in results)
+        self.assertFalse((20.0,) in results)
+        self.assertEqual([], self.loaded_keys)
+
+        self.assertEqual({"key": (5.0,)}, results[(5.0,)])
+        self.assertIs(results[(5.0,)], results[(5.0,)])
+        self.assertEqual([(5.0,)], self.loaded_keys)
+
+        results[(10.0,)]
+        results[(5.0,)]
+        results[(15.0,)]
+        self.assertEqual(2, results.number_cached_results)
+        self.assertEqual([(5.0,), (10.0,), (15.0,)], self.loaded_keys)
+
+        results[(5.0,)]
+        results[(10.0,)]
+        self.assertEqual([(5.0,), (10.0,), (15.0,), (10.0,)], self.loaded_keys)
+
+        self.assertRaises(KeyError, results.__getitem__, (20.0,))
+        self.assertEqual(None, results.get((20.0,)))
+
+        results.add((20.0,), {"key": "read"})
+        self.assertEqual(4, len(results))
+        self.assertEqual({"key": "read"}, results[(20.0,)])
+        self.assertEqual(2, results.number_cached_results)
+
+        results.clear_cache()
+        self.assertEqual(0, results.number_cached_results)
+
+        results = LazyResultsStore(keys, self._load_result)
+        for key in results:
+            results[key]
+        self.assertEqual(3, results.number_cached_results)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_iter_results(self):
+        """
+        Tests for method `iter_results`.
+        """
+
+        results = LazyResultsStore([(5.0,), (10.0,), (15.0,)], self._load_result, maximum_number_results=1)
+        results[(10.0,)]
+        self.loaded_keys = []
+
+        items = list(results.iter_results())
+        self.assertEqual([(5.0,), (10.0,), (15.0,)], [key for key, _result in items])
+        self.assertEqual([(5.0,), (15.0,)], self.loaded_keys)
+        self.assertEqual(1, results.number_cached_results)
+
+        items = list(results.iter_results([(15.0,), (5.0,)]))
+        self.assertEqual([(15.0,), (5.0,)], [key for key, _result in items])
+        self.assertRaises(KeyError, list, results.iter_results([(20.0,)]))
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+    nose.runmodule()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: pymcxray.test_RuntimeHistory
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`pymcxray.RuntimeHistory`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+import os
+import os.path
+import math
+import tempfile
+import shutil
+from collections import namedtuple
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Project modules
+from pymcxray.RuntimeHistory import RuntimeHistory, get_results_time_s, SOURCE_RUNNER, SOURCE_TIMESTAMPS, \
+    KEY_TIME_s, KEY_SOURCE
+from pymcxray.CostModel import CostModel, DEFAULT_COEFFICIENTS
+import pymcxray.Simulation as Simulation
+from pymcxray.CompletionIndex import CompletionIndex
+
+# Globals and constants variables.
+SimulationStub = namedtuple("SimulationStub", ["name", "numberElectrons", "numberPhotons", "energy_keV",
+                                               "numberRegions"])
+
+
+class TestRuntimeHistory(unittest.TestCase):
+    """
+    TestCase class for the module `pymcxray.RuntimeHistory`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+        self.temporary_path = tempfile.mkdtemp(prefix="Test_RuntimeHistory_")
+        self.file_path = os.path.join(self.temporary_path, "runtime_history.json")
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+        shutil.rmtree(self.temporary_path, ignore_errors=True)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def test_add_save_load(self):
+        """
+        Tests for methods `add`, `save` and `load`.
+        """
+
+        runtime_history = RuntimeHistory(self.file_path)
+        self.assertEqual(0, len(runtime_history))
+
+        runtime_history.add(SimulationStub("Sim1", 1000, 0, 15.0, 1), 12.5)
+        runtime_history.add(SimulationStub("Sim2", 2000, 0, 15.0, 1), 25.0, SOURCE_TIMESTAMPS)
+        runtime_history.add(SimulationStub("Sim1", 1000, 0, 15.0, 1), 30.0, SOURCE_TIMESTAMPS)
+        self.assertEqual(2, len(runtime_history))
+        self.assertEqual(12.5, runtime_history.get_record("Sim1")[KEY_TIME_s])
+        self.assertFalse(os.path.isfile(self.file_path))
+
+        runtime_history.save()
+        self.assertTrue(os.path.isfile(self.file_path))
+
+        runtime_history = RuntimeHistory(self.file_path)
+        self.assertEqual(2, len(runtime_history))
+        self.assertTrue("Sim2" in runtime_history)
+        self.assertEqual(SOURCE_RUNNER, runtime_history.get_record("Sim1")[KEY_SOURCE])
+        self.assertEqual(25.0, runtime_history.get_record("Sim2")[KEY_TIME_s])
+
+        # The records saved by another worker are kept.
+        other_runtime_history = RuntimeHistory(self.file_path)
+        runtime_history.add(SimulationStub("Sim3", 1000, 0, 5.0, 1), 2.0)
+        other_runtime_history.add(SimulationStub("Sim4", 1000, 0, 30.0, 1), 40.0)
+        other_runtime_history.save()
+        runtime_history.save()
+        self.assertEqual(4, len(runtime_history))
+        self.assertEqual(4, len(RuntimeHistory(self.file_path)))
+
+        with open(self.file_path, 'w') as history_file:
+            history_file.write("{")
+        self.assertEqual(0, len(RuntimeHistory(self.file_path)))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_add_from_results_files(self):
+        """
+        Tests for method `add_from_results_files` and function `get_results_time_s`.
+        """
+
+        simulation = Simulation.SimulationRecord({}, "Sim1", "Sim1", attributes={"numberElectrons": 1000,
+                                                                                  "numberPhotons": 0,
+                                                                                  "energy_keV": 15.0,
+                                                                                  "numberRegions": 1})
+        self.assertEqual(None, get_results_time_s(simulation, self.temporary_path))
+
+        suffixes = simulation.getFilenameSuffixes()
+        for index, suffix in enumerate(suffixes[:3]):
+            file_path = os.path.join(self.temporary_path, "Sim1" + suffix)
+            open(file_path, 'w').close()
+            os.utime(file_path, (1000.0 + 10.0*index, 1000.0 + 10.0*index))
+        self.assertAlmostEqual(20.0, get_results_time_s(simulation, self.temporary_path))
+        self.assertAlmostEqual(20.0, get_results_time_s(simulation, self.temporary_path, CompletionIndex()))
+
+        runtime_history = RuntimeHistory()
+        self.assertTrue(runtime_history.add_from_results_files(simulation, self.temporary_path))
+        self.assertFalse(runtime_history.add_from_results_files(simulation, self.temporary_path))
+        self.assertEqual(SOURCE_TIMESTAMPS, runtime_history.get_record("Sim1")[KEY_SOURCE])
+        self.assertAlmostEqual(20.0, runtime_history.get_record("Sim1")[KEY_TIME_s])
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_fit_cost_model(self):
+        """
+        Tests for method `fit_cost_model`.
+        """
+
+        runtime_history = RuntimeHistory()
+        self.assertEqual(None, runtime_history.fit_cost_model())
+
+        coefficients = [math.log(1.0e-3), 1.0, 0.0, 2.0, DEFAULT_COEFFICIENTS[4]]
+        index = 0
+        for number_electrons in [100, 1000, 10000]:
+            for energy_keV in [5.0, 10.0, 20.0]:
+                time_s = math.exp(coefficients[0])*number_electrons**coefficients[1]*energy_keV**coefficients[3]
+                runtime_history.add(SimulationStub("Sim%i" % (index), number_electrons, 0, energy_keV, 1), time_s)
+                index += 1
+
+        cost_model = runtime_history.fit_cost_model()
+        np.testing.assert_allclose(coefficients[1], cost_model.coefficients[1], atol=1.0e-2)
+        np.testing.assert_allclose(coefficients[3], cost_model.coefficients[3], atol=1.0e-2)
+        # The number of regions is not varied, its coefficient stays the default one.
+        self.assertAlmostEqual(DEFAULT_COEFFICIENTS[4], cost_model.coefficients[4])
+        self.assertAlmostEqual(2.0e-3*1000*100.0, cost_model.estimate_time_s(2000, 0, 10.0, 1), delta=20.0)
+
+        self.assertEqual(None, runtime_history.fit_cost_model(minimum_number_records=10))
+
+        # The times estimated from the timestamps are not used by default.
+        for index in range(5):
+            runtime_history.add(SimulationStub("Timestamps%i" % (index), 1000, 0, 10.0, 1), 1.0e6, SOURCE_TIMESTAMPS)
+        np.testing.assert_allclose(cost_model.coefficients, runtime_history.fit_cost_model().coefficients)
+        self.assertTrue(runtime_history.fit_cost_model(sources=None).estimate_time_s(1000, 0, 10.0, 1) > 1.0e3)
+
+        # Only the intercept is fitted when no parameter is varied.
+        runtime_history = RuntimeHistory()
+        default_time_s = CostModel().estimate_time_s(1000, 0, 10.0, 1)
+        for index in range(6):
+            runtime_history.add(SimulationStub("Sim%i" % (index), 1000, 0, 10.0, 1), 10.0*default_time_s)
+        cost_model = runtime_history.fit_cost_model()
+        np.testing.assert_allclose(DEFAULT_COEFFICIENTS[1:], cost_model.coefficients[1:])
+        np.testing.assert_allclose(10.0*CostModel().estimate_time_s(1.0e6, 0, 10.0, 1),
+                                   cost_model.estimate_time_s(1.0e6, 0, 10.0, 1))
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+    nose.runmodule()
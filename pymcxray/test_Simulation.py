@@ -26,15 +26,21 @@ Tests for the module `Simulation`.
 
 # Standard library modules.
 import unittest
+import os.path
+import tempfile
+import shutil
+import pickle
 
 # Third party modules.
 
 # Local modules.
 
 # Project modules
-# import pymcxray.Simulation as Simulation
+import pymcxray.Simulation as Simulation
 from pymcxray.Simulation import create_weight_fractions, create_weight_fractions_trace
 from pymcxray.Simulation import Layer, create_multi_horizontal_layer
+from pymcxray.CompletionIndex import CompletionIndex
+from pymcxray.SimulationsParameters import PARAMETER_INCIDENT_ENERGY_keV
 
 # Globals and constants variables.
 
@@ -271,6 +277,136 @@ class TestSimulation(unittest.TestCase):
         # self.fail("Test if the testcase is working.")
 
 
+    def test_get_results_fingerprint(self):
+        """
+        Tests for method `get_results_fingerprint`.
+        """
+
+        simulation_path = tempfile.mkdtemp(prefix="Test_Simulation_")
+        try:
+            simulation = Simulation.Simulation()
+            simulation.basename = "Test"
+            simulation.setParameters({})
+            simulation._specimen = Simulation.createPureBulkSample(29)
+            simulation.generateBaseFilename()
+            os.makedirs(os.path.join(simulation_path, "Results"))
+
+            fingerprint = simulation.get_results_fingerprint(simulation_path)
+            self.assertEqual(fingerprint, simulation.get_results_fingerprint(simulation_path))
+
+            file_path = simulation.getProgramVersionFilepath(simulation_path)
+            with open(file_path, 'w') as results_file:
+                results_file.write("Version")
+            fingerprint_created = simulation.get_results_fingerprint(simulation_path)
+            self.assertNotEqual(fingerprint, fingerprint_created)
+            self.assertEqual(fingerprint_created, simulation.get_results_fingerprint(simulation_path, CompletionIndex()))
+
+            with open(file_path, 'a') as results_file:
+                results_file.write("2")
+            self.assertNotEqual(fingerprint_created, simulation.get_results_fingerprint(simulation_path))
+        finally:
+            shutil.rmtree(simulation_path)
+
+        # self.fail("Test if the testcase is working.")
+
+    def test_isDone(self):
+        """
+        Tests for method `isDone` with a completion index.
+        """
+
+        simulation_path = tempfile.mkdtemp(prefix="Test_Simulation_")
+        try:
+            simulation = Simulation.Simulation()
+            simulation.basename = "Test"
+            simulation.setParameters({})
+            simulation._specimen = Simulation.createPureBulkSample(29)
+            simulation.generateBaseFilename()
+            os.makedirs(os.path.join(simulation_path, "Results"))
+
+            completion_index = CompletionIndex()
+            self.assertFalse(simulation.isDone(simulation_path))
+            self.assertFalse(simulation.isDone(simulation_path, None, completion_index))
+            self.assertEqual([], simulation.get_results_filepaths(simulation_path))
+
+            suffixes = simulation.getFilenameSuffixes()
+            for suffix in suffixes[:-1]:
+                open(os.path.join(simulation_path, simulation.resultsBasename + suffix), 'w').close()
+            completion_index.refresh()
+            self.assertFalse(simulation.isDone(simulation_path, None, completion_index))
+            self.assertEqual(len(suffixes) - 1, len(simulation.get_results_filepaths(simulation_path)))
+
+            completion_index.set_hdf5_group({simulation.name: None})
+            self.assertTrue(simulation.isDone(simulation_path, None, completion_index))
+            completion_index.set_hdf5_group(None)
+
+            open(os.path.join(simulation_path, simulation.resultsBasename + suffixes[-1]), 'w').close()
+            self.assertTrue(simulation.isDone(simulation_path))
+            completion_index.refresh()
+            self.assertTrue(simulation.isDone(simulation_path, None, completion_index))
+        finally:
+            shutil.rmtree(simulation_path)
+
+        # self.fail("Test if the testcase is working.")
+
+    def test_SimulationRecord(self):
+        """
+        Tests for class `SimulationRecord`.
+        """
+
+        def create_simulation(parameters):
+            simulation = Simulation.Simulation()
+            simulation.basename = "Test"
+            simulation.setParameters(parameters)
+            simulation._specimen = Simulation.createPureBulkSample(29)
+            simulation.generateBaseFilename()
+            return simulation
+
+        parameters = {PARAMETER_INCIDENT_ENERGY_keV: 15.0}
+        simulation = create_simulation(parameters)
+        record = Simulation.SimulationRecord(parameters, simulation.name, simulation.resultsBasename,
+                                             create_simulation)
+
+        self.assertEqual(simulation.name, record.name)
+        self.assertEqual(simulation.filename, record.filename)
+        self.assertEqual(15.0, record.energy_keV)
+        self.assertEqual(parameters, record.getParameters())
+        self.assertEqual(simulation.numberElectrons, record.numberElectrons)
+        self.assertEqual(simulation.getProgramVersionFilepath("path"), record.getProgramVersionFilepath("path"))
+        self.assertTrue(isinstance(record.get_simulation(), Simulation.Simulation))
+        self.assertIsNot(record.get_simulation(), record.get_simulation())
+
+        with record.keep_simulation():
+            kept_simulation = record.get_simulation()
+            self.assertIs(kept_simulation, record.get_simulation())
+            with record.keep_simulation():
+                self.assertIs(kept_simulation, record.get_simulation())
+            self.assertIs(kept_simulation, record.get_simulation())
+        self.assertIsNot(kept_simulation, record.get_simulation())
+
+        record = pickle.loads(pickle.dumps(record))
+        self.assertEqual(simulation.name, record.name)
+        self.assertRaises(ValueError, record.get_simulation)
+        record.set_create_simulation(create_simulation)
+        self.assertEqual(simulation.numberElectrons, record.numberElectrons)
+
+        simulation_path = tempfile.mkdtemp(prefix="Test_Simulation_")
+        try:
+            os.makedirs(os.path.join(simulation_path, "Results"))
+            for suffix in record.getFilenameSuffixes():
+                open(os.path.join(simulation_path, record.resultsBasename + suffix), 'w').close()
+            input_file_path = os.path.join(simulation_path, record.filename)
+            open(input_file_path, 'w').close()
+
+            record = Simulation.SimulationRecord(parameters, simulation.name, simulation.resultsBasename, None,
+                                                 overwrite=False)
+            record.createSimulationFiles(simulation_path, simulation_path, None)
+            self.assertFalse(os.path.isfile(input_file_path))
+        finally:
+            shutil.rmtree(simulation_path)
+
+        # self.fail("Test if the testcase is working.")
+
+
 if __name__ == '__main__':  # pragma: no cover
     import nose
     nose.runmodule()
@@ -16,13 +16,18 @@ __license__ = ""
 # Standard library modules.
 import unittest
 import logging
+import os.path
+import tempfile
+import shutil
 
 # Third party modules.
+import numpy as np
 
 # Local modules.
 
 # Project modules
 import pymcxray.SimulationsParameters as SimulationsParameters
+import pymcxray.multipleloop as multipleloop
 
 # Globals and constants variables.
 
@@ -38,6 +43,8 @@ class TestSimulationsParameters(unittest.TestCase):
 
         unittest.TestCase.setUp(self)
 
+        self.temporaryPath = tempfile.mkdtemp(prefix="Test_SimulationsParameters_")
+
     def tearDown(self):
         """
         Teardown method.
@@ -45,6 +52,21 @@ class TestSimulationsParameters(unittest.TestCase):
 
         unittest.TestCase.tearDown(self)
 
+        shutil.rmtree(self.temporaryPath)
+
+    def _createNumberXraysFile(self):
+        filepath = os.path.join(self.temporaryPath, "NumberXrays.csv")
+        with open(filepath, 'w') as csvFile:
+            csvFile.write("Energy (keV), Diameter (nm), Counts (1/s/A/sr)\n")
+            csvFile.write("5.0, 10.0, 1.0e12\n")
+            csvFile.write("5.0, 20.0, 2.0e12\n")
+            csvFile.write("10.0, 10.0, 3.0e12\n")
+            csvFile.write("10.0, 20.0, 5.0e12\n")
+            csvFile.write("10.0, 20.0, 9.0e12\n")
+            csvFile.write("15.0, 10.0, 4.0e12\n")
+
+        return filepath
+
     def testSkeleton(self):
         """
         First test to check if the testcase is working with the testing framework.
@@ -53,6 +75,180 @@ class TestSimulationsParameters(unittest.TestCase):
         #self.fail("Test if the testcase is working.")
         self.assert_(True)
 
+    def test_ParametersProduct(self):
+        """
+        Tests for class `ParametersProduct`.
+        """
+
+        parameters = {"a": [1, 2, 3], "b": ["x", "y"], "c": 5.0, "d": (10, 20)}
+        allValuesRef, namesRef, _variedRef = multipleloop.combine(parameters)
+
+        parametersProduct = SimulationsParameters.ParametersProduct(parameters)
+        self.assertEqual(namesRef, parametersProduct.names)
+        self.assertEqual(["a", "b", "d"], parametersProduct.varied)
+        self.assertEqual((3, 2, 1, 2), parametersProduct.shape)
+        self.assertEqual(12, len(parametersProduct))
+        self.assertEqual(allValuesRef, list(parametersProduct))
+
+        for index, valuesRef in enumerate(allValuesRef):
+            self.assertEqual(valuesRef, parametersProduct[index])
+        self.assertEqual(allValuesRef[-1], parametersProduct[-1])
+        self.assertEqual([2, 1, 0, 1], parametersProduct.getIndices(11))
+        self.assertRaises(IndexError, parametersProduct.__getitem__, 12)
+
+        parametersProduct = SimulationsParameters.ParametersProduct({})
+        self.assertEqual(1, len(parametersProduct))
+        self.assertEqual([], list(parametersProduct))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_iterSimulationParameters(self):
+        """
+        Tests for method `iterSimulationParameters`.
+        """
+
+        class SimulationsParametersTest(SimulationsParameters.SimulationsParameters):
+            def computeNumberXrays(self, experiment):
+                return int(experiment[SimulationsParameters.PARAMETER_INCIDENT_ENERGY_keV]*100)
+
+        simulationsParameters = SimulationsParametersTest()
+        simulationsParameters.addVaried(SimulationsParameters.PARAMETER_INCIDENT_ENERGY_keV, [5.0, 10.0])
+        simulationsParameters.addVaried(SimulationsParameters.PARAMETER_NUMBER_ELECTRONS, [100, 200, 300])
+        simulationsParameters.addFixed(SimulationsParameters.PARAMETER_TIME_s, 60.0)
+        simulationsParameters.addCompute(SimulationsParameters.PARAMETER_NUMBER_XRAYS)
+
+        self.assertEqual(6, simulationsParameters.getNumberSimulations())
+        self.assertEqual((2, 3, 1), simulationsParameters.getShape())
+
+        experiments = simulationsParameters.getAllSimulationParameters()
+        self.assertEqual(experiments, list(simulationsParameters.iterSimulationParameters()))
+        self.assertEqual(6, len(experiments))
+        self.assertEqual({SimulationsParameters.PARAMETER_INCIDENT_ENERGY_keV: 10.0,
+                          SimulationsParameters.PARAMETER_NUMBER_ELECTRONS: 100,
+                          SimulationsParameters.PARAMETER_TIME_s: 60.0,
+                          SimulationsParameters.PARAMETER_NUMBER_XRAYS: 1000}, experiments[1])
+        for index, experiment in enumerate(experiments):
+            self.assertEqual(experiment, simulationsParameters.getSimulationParameters(index))
+
+        simulationsParametersFixed = SimulationsParameters.SimulationsParametersFixed()
+        simulationsParametersFixed.addExperiment(experiments[0])
+        simulationsParametersFixed.addExperiment(experiments[3])
+        self.assertEqual(2, simulationsParametersFixed.getNumberSimulations())
+        self.assertEqual((2,), simulationsParametersFixed.getShape())
+        self.assertEqual([experiments[0], experiments[3]], list(simulationsParametersFixed.iterSimulationParameters()))
+        self.assertEqual(experiments[3], simulationsParametersFixed.getSimulationParameters(1))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_getParametersTable(self):
+        """
+        Tests for method `getParametersTable`.
+        """
+
+        simulationsParameters = SimulationsParameters.SimulationsParameters()
+        simulationsParameters.addVaried(SimulationsParameters.PARAMETER_INCIDENT_ENERGY_keV, [5.0, 15.0])
+        simulationsParameters.addVaried(SimulationsParameters.PARAMETER_BEAM_POSITION_nm,
+                                        [(0.0, 1.0), (5.0, 2.0), (20.0, 3.0)])
+        simulationsParameters.addVaried(SimulationsParameters.PARAMETER_MODEL_XRAY_BREMSSTRAHLUNG, ["a", "b"])
+        simulationsParameters.addFixed(SimulationsParameters.PARAMETER_NUMBER_ELECTRONS, 100)
+
+        parametersTable = simulationsParameters.getParametersTable()
+        self.assertEqual(12, len(parametersTable))
+        self.assertEqual({SimulationsParameters.PARAMETER_NUMBER_ELECTRONS: 100}, parametersTable.fixedParameters)
+        self.assertEqual(["incidentEnergy", "beamPosition_0", "beamPosition_1", "modelXrayBremsstrahlung"],
+                         parametersTable.columnNames)
+
+        experiments = simulationsParameters.getAllSimulationParameters()
+        for row, experiment in enumerate(experiments):
+            self.assertEqual(experiment["incidentEnergy"], parametersTable["incidentEnergy"][row])
+            self.assertEqual(experiment["beamPosition"][0], parametersTable["beamPosition_0"][row])
+            self.assertEqual(experiment["beamPosition"][1], parametersTable["beamPosition_1"][row])
+            self.assertEqual(experiment["modelXrayBremsstrahlung"], parametersTable["modelXrayBremsstrahlung"][row])
+
+        mask = parametersTable.isEqual("incidentEnergy", 15.0) & parametersTable.isInRange("beamPosition_0", 1.0, 10.0)
+        rows = parametersTable.getRows(mask)
+        self.assertEqual([3, 9], list(rows))
+        self.assertEqual(4, len(parametersTable.getRows(parametersTable.isEqual("modelXrayBremsstrahlung", "a") &
+                                                        parametersTable.isInRange("beamPosition_0", minimum=5.0))))
+
+        self.assertRaises(ValueError, parametersTable.getSimulationNames)
+        parametersTable.setSimulationNames(["Sim%i" % row for row in range(12)])
+        self.assertEqual(["Sim3", "Sim9"], parametersTable.getSimulationNames(rows))
+        self.assertRaises(ValueError, parametersTable.setSimulationNames, ["Sim"])
+
+        simulationsParametersFixed = SimulationsParameters.SimulationsParametersFixed()
+        for experiment in experiments[:4]:
+            simulationsParametersFixed.addExperiment(experiment)
+        parametersTable = simulationsParametersFixed.getParametersTable()
+        self.assertEqual(4, len(parametersTable))
+        self.assertEqual(["incidentEnergy", "beamPosition_0", "beamPosition_1"], parametersTable.columnNames)
+        self.assertEqual({SimulationsParameters.PARAMETER_NUMBER_ELECTRONS: 100,
+                          SimulationsParameters.PARAMETER_MODEL_XRAY_BREMSSTRAHLUNG: "a"},
+                         parametersTable.fixedParameters)
+        self.assertEqual([0.0, 0.0, 5.0, 5.0], list(parametersTable["beamPosition_0"]))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_NumberXraysTable(self):
+        """
+        Tests for class `NumberXraysTable`.
+        """
+
+        numberXraysTable = SimulationsParameters.NumberXraysTable(self._createNumberXraysFile())
+        np.testing.assert_array_equal([5.0, 10.0, 15.0], numberXraysTable.energies_keV)
+        np.testing.assert_array_equal([10.0, 20.0], numberXraysTable.diameters_nm)
+        self.assertTrue(np.isnan(numberXraysTable.counts_1_sAsr[2, 1]))
+
+        self.assertEqual(5.0e12, numberXraysTable.getCounts(10.0, 20.0))
+        self.assertEqual(3.0e12, numberXraysTable.getCounts(10, "10.0"))
+        self.assertEqual(None, numberXraysTable.getCounts(7.5, 15.0))
+        self.assertAlmostEqual(2.75e12, numberXraysTable.getCounts(7.5, 15.0, interpolate=True))
+        self.assertAlmostEqual(3.5e12, numberXraysTable.getCounts(12.5, 10.0, interpolate=True))
+        self.assertEqual(None, numberXraysTable.getCounts(12.5, 15.0, interpolate=True))
+        self.assertEqual(None, numberXraysTable.getCounts(20.0, 10.0, interpolate=True))
+
+        counts_1_sAsr = numberXraysTable.getCountsArray([5.0, 10.0, 15.0, 7.5], [20.0, 10.0, 10.0, 15.0])
+        np.testing.assert_array_equal([2.0e12, 3.0e12, 4.0e12], counts_1_sAsr[:3])
+        self.assertTrue(np.isnan(counts_1_sAsr[3]))
+        counts_1_sAsr = numberXraysTable.getCountsArray([15.0, 7.5], [10.0, 15.0], interpolate=True)
+        np.testing.assert_allclose([4.0e12, 2.75e12], counts_1_sAsr)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_computeNumberXrays(self):
+        """
+        Tests for method `computeNumberXrays`.
+        """
+
+        simulationsParameters = SimulationsParameters.SimulationsParameters()
+        simulationsParameters.computeNumberXraysFilepath = self._createNumberXraysFile()
+        simulationsParameters.addVaried(SimulationsParameters.PARAMETER_INCIDENT_ENERGY_keV, [5.0, 7.5, 10.0])
+        simulationsParameters.addVaried(SimulationsParameters.PARAMETER_SPHERE_DIAMETER_nm, [10.0, 20.0])
+        simulationsParameters.addFixed(SimulationsParameters.PARAMETER_CURRENT_nA, 1.0)
+        simulationsParameters.addFixed(SimulationsParameters.PARAMETER_TIME_s, 100.0)
+        simulationsParameters.addCompute(SimulationsParameters.PARAMETER_NUMBER_XRAYS)
+
+        numberXraysRef = [int(1.0e12*1.0e-7*SimulationsParameters.SOLID_ANGLE_sr), 0,
+                          int(3.0e12*1.0e-7*SimulationsParameters.SOLID_ANGLE_sr),
+                          int(2.0e12*1.0e-7*SimulationsParameters.SOLID_ANGLE_sr), 0,
+                          int(5.0e12*1.0e-7*SimulationsParameters.SOLID_ANGLE_sr)]
+        experiments = simulationsParameters.getAllSimulationParameters()
+        self.assertEqual(numberXraysRef, [experiment[SimulationsParameters.PARAMETER_NUMBER_XRAYS]
+                                          for experiment in experiments])
+        parametersTable = simulationsParameters.getParametersTable()
+        self.assertEqual(numberXraysRef, list(parametersTable[SimulationsParameters.PARAMETER_NUMBER_XRAYS]))
+
+        simulationsParameters.computeNumberXraysInterpolation = True
+        numberXraysRef[1] = int(2.0e12*1.0e-7*SimulationsParameters.SOLID_ANGLE_sr)
+        numberXraysRef[4] = int(3.5e12*1.0e-7*SimulationsParameters.SOLID_ANGLE_sr)
+        experiments = simulationsParameters.getAllSimulationParameters()
+        self.assertEqual(numberXraysRef, [experiment[SimulationsParameters.PARAMETER_NUMBER_XRAYS]
+                                          for experiment in experiments])
+        parametersTable = simulationsParameters.getParametersTable()
+        self.assertEqual(numberXraysRef, list(parametersTable[SimulationsParameters.PARAMETER_NUMBER_XRAYS]))
+
+        #self.fail("Test if the testcase is working.")
+
 if __name__ == '__main__':  #pragma: no cover
     logging.getLogger().setLevel(logging.DEBUG)
     from pymcxray.Testings import runTestModuleWithCoverage
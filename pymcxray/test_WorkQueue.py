@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+.. py:currentmodule:: pymcxray.test_WorkQueue
+
+.. moduleauthor:: Hendrix Demers <hendrix.demers@mail.mcgill.ca>
+
+Tests for the module :py:mod:`pymcxray.WorkQueue`.
+"""
+
+###############################################################################
+# Copyright 2017 Hendrix Demers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###############################################################################
+
+# Standard library modules.
+import unittest
+import os
+import os.path
+import tempfile
+import shutil
+from unittest import mock
+
+# Third party modules.
+
+# Local modules.
+
+# Project modules
+from pymcxray.WorkQueue import WorkQueue
+
+# Globals and constants variables.
+
+
+class TestWorkQueue(unittest.TestCase):
+    """
+    TestCase class for the module `pymcxray.WorkQueue`.
+    """
+
+    def setUp(self):
+        """
+        Setup method.
+        """
+
+        unittest.TestCase.setUp(self)
+
+        self.temporary_path = tempfile.mkdtemp(prefix="Test_WorkQueue_")
+        self.queue_path = os.path.join(self.temporary_path, "queue")
+
+    def tearDown(self):
+        """
+        Teardown method.
+        """
+
+        unittest.TestCase.tearDown(self)
+
+        shutil.rmtree(self.temporary_path, ignore_errors=True)
+
+    def testSkeleton(self):
+        """
+        First test to check if the testcase is working with the testing framework.
+        """
+
+        #self.fail("Test if the testcase is working.")
+        self.assertTrue(True)
+
+    def _age_claim(self, work_queue, name, age_s):
+        claim_path = os.path.join(self.queue_path, "claims", name + ".claim")
+        modification_time_s = work_queue.get_current_time_s() - age_s
+        os.utime(claim_path, (modification_time_s, modification_time_s))
+
+    def test_claim(self):
+        """
+        Tests for methods `claim`, `release`, `mark_done` and `mark_failed`.
+        """
+
+        work_queue = WorkQueue(self.queue_path)
+        other_work_queue = WorkQueue(self.queue_path)
+        other_work_queue.worker_id = "other_worker"
+
+        self.assertTrue(work_queue.claim("Sim1"))
+        self.assertFalse(other_work_queue.claim("Sim1"))
+        self.assertTrue(other_work_queue.claim("Sim2"))
+        self.assertEqual(["Sim1"], work_queue.get_claimed_names())
+
+        work_queue.release("Sim1")
+        self.assertEqual([], work_queue.get_claimed_names())
+        self.assertTrue(other_work_queue.claim("Sim1"))
+
+        other_work_queue.mark_done("Sim1")
+        other_work_queue.mark_failed("Sim2")
+        self.assertTrue(work_queue.is_marked_done("Sim1"))
+        self.assertTrue(work_queue.is_marked_failed("Sim2"))
+        self.assertEqual([], other_work_queue.get_claimed_names())
+
+        status = work_queue.get_status()
+        self.assertEqual({}, status.claims)
+        self.assertTrue(status.is_finished("Sim1"))
+        self.assertTrue(status.is_finished("Sim2"))
+        self.assertFalse(status.is_finished("Sim3"))
+
+        self.assertEqual(1, work_queue.reset_failed())
+        self.assertFalse(work_queue.is_marked_failed("Sim2"))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_stale_claim(self):
+        """
+        Tests for the recovery of the stale claims.
+        """
+
+        work_queue = WorkQueue(self.queue_path, stale_timeout_s=100.0)
+        dead_work_queue = WorkQueue(self.queue_path, stale_timeout_s=100.0)
+        dead_work_queue.worker_id = "dead_worker"
+
+        self.assertTrue(dead_work_queue.claim("Sim1"))
+        self._age_claim(work_queue, "Sim1", 50.0)
+        status = work_queue.get_status()
+        self.assertTrue(status.is_claimed("Sim1"))
+        self.assertEqual(0, status.get_number_stale_claims())
+        self.assertFalse(work_queue.claim("Sim1"))
+
+        self._age_claim(work_queue, "Sim1", 200.0)
+        status = work_queue.get_status()
+        self.assertFalse(status.is_claimed("Sim1"))
+        self.assertEqual(1, status.get_number_stale_claims())
+        self.assertTrue(work_queue.claim("Sim1"))
+
+        # The dead worker finds its claim lost at its next heartbeat.
+        work_queue.release("Sim1")
+        dead_work_queue.heartbeat()
+        self.assertEqual([], dead_work_queue.get_claimed_names())
+
+        self.assertTrue(work_queue.claim("Sim1"))
+        self.assertEqual(["Sim1.claim"], os.listdir(os.path.join(self.queue_path, "claims")))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_stale_claim_renewed(self):
+        """
+        Tests for a stale claim claimed again by another worker while it is recovered.
+        """
+
+        work_queue = WorkQueue(self.queue_path, stale_timeout_s=100.0)
+        other_work_queue = WorkQueue(self.queue_path, stale_timeout_s=100.0)
+        other_work_queue.worker_id = "other_worker"
+        claim_path = os.path.join(self.queue_path, "claims", "Sim1.claim")
+
+        self.assertTrue(other_work_queue.claim("Sim1"))
+        self._age_claim(work_queue, "Sim1", 200.0)
+
+        rename = os.rename
+        def claim_again_and_rename(source_path, destination_path):
+            os.remove(claim_path)
+            self.assertTrue(other_work_queue.claim("Sim1"))
+            rename(source_path, destination_path)
+
+        with mock.patch("pymcxray.WorkQueue.os.rename", side_effect=claim_again_and_rename):
+            self.assertFalse(work_queue.claim("Sim1"))
+
+        self.assertEqual([], work_queue.get_claimed_names())
+        self.assertEqual([], os.listdir(os.path.join(self.queue_path, "claims")))
+        other_work_queue.heartbeat()
+        self.assertTrue(other_work_queue.is_claim_lost("Sim1"))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_lost_claim(self):
+        """
+        Tests for a claim recovered by another worker while its worker is still running.
+        """
+
+        work_queue = WorkQueue(self.queue_path, stale_timeout_s=100.0)
+        slow_work_queue = WorkQueue(self.queue_path, stale_timeout_s=100.0)
+        slow_work_queue.worker_id = "slow_worker"
+        claim_path = os.path.join(self.queue_path, "claims", "Sim1.claim")
+
+        self.assertTrue(slow_work_queue.claim("Sim1"))
+        self.assertTrue(slow_work_queue.is_owner("Sim1"))
+        self._age_claim(work_queue, "Sim1", 200.0)
+        self.assertTrue(work_queue.claim("Sim1"))
+        self.assertTrue(work_queue.is_owner("Sim1"))
+        self.assertFalse(slow_work_queue.is_owner("Sim1"))
+        self.assertEqual(["Sim1.claim"], os.listdir(os.path.join(self.queue_path, "claims")))
+
+        # The slow worker does not refresh, release or mark the claim of the other worker.
+        self._age_claim(work_queue, "Sim1", 50.0)
+        modification_time_s = os.stat(claim_path).st_mtime
+        slow_work_queue.heartbeat()
+        self.assertEqual(modification_time_s, os.stat(claim_path).st_mtime)
+        self.assertEqual([], slow_work_queue.get_claimed_names())
+        self.assertTrue(slow_work_queue.is_claim_lost("Sim1"))
+
+        slow_work_queue.release("Sim1")
+        self.assertTrue(os.path.isfile(claim_path))
+        self.assertFalse(slow_work_queue.mark_done("Sim1"))
+        self.assertFalse(slow_work_queue.mark_failed("Sim1"))
+        self.assertFalse(work_queue.is_marked_done("Sim1"))
+        self.assertFalse(work_queue.is_marked_failed("Sim1"))
+        self.assertTrue(os.path.isfile(claim_path))
+
+        self.assertEqual(["Sim1"], work_queue.get_claimed_names())
+        self.assertFalse(work_queue.is_claim_lost("Sim1"))
+        self.assertTrue(work_queue.mark_done("Sim1"))
+        self.assertTrue(work_queue.is_marked_done("Sim1"))
+        self.assertEqual([], os.listdir(os.path.join(self.queue_path, "claims")))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_heartbeat(self):
+        """
+        Tests for method `heartbeat` and the context manager.
+        """
+
+        with WorkQueue(self.queue_path, stale_timeout_s=100.0, heartbeat_interval_s=0.01) as work_queue:
+            self.assertTrue(work_queue.claim("Sim1"))
+            self._age_claim(work_queue, "Sim1", 200.0)
+            work_queue.heartbeat()
+            self.assertTrue(work_queue.get_status().is_claimed("Sim1"))
+            self.assertEqual(1, len(os.listdir(os.path.join(self.queue_path, "workers"))))
+
+        self.assertEqual([], os.listdir(os.path.join(self.queue_path, "claims")))
+        self.assertEqual([], os.listdir(os.path.join(self.queue_path, "workers")))
+
+        #self.fail("Test if the testcase is working.")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import nose
+    nose.runmodule()
@@ -16,15 +16,96 @@ __license__ = ""
 # Standard library modules.
 import unittest
 import logging
+import sys
+import os.path
+import tempfile
+import shutil
 
 # Third party modules.
+import h5py
+import numpy as np
 
 # Local modules.
 
 # Project modules
 import pymcxray.mcxray as mcxray
+import pymcxray.Simulation as Simulation
+from pymcxray.BatchFile import BatchFile
+from pymcxray.SimulationsParameters import SimulationsParameters, PARAMETER_INCIDENT_ENERGY_keV, \
+    PARAMETER_NUMBER_ELECTRONS
+from pymcxray.FileFormat.Results.XraySpectraSpecimenEmittedDetected import XraySpectraSpecimenEmittedDetected
+from pymcxray.FileFormat.Results.XrayIntensities import XrayIntensities
+import pymcxray.FileFormat.Results.Hdf5StoragePolicy as Hdf5StoragePolicy
+from pymcxray.RuntimeHistory import RuntimeHistory
 
 # Globals and constants variables.
+ENERGIES_keV = [5.0, 10.0, 15.0, 20.0]
+
+class SimulationsTest(mcxray._Simulations):
+    def _initData(self):
+        self.use_hdf5 = True
+
+        self._simulationsParameters = SimulationsParameters()
+        self._simulationsParameters.addVaried(PARAMETER_INCIDENT_ENERGY_keV, ENERGIES_keV)
+        self._simulationsParameters.addFixed(PARAMETER_NUMBER_ELECTRONS, 100)
+
+    def getAnalysisName(self):
+        return "SimulationsTest"
+
+    def createSpecimen(self, parameters):
+        self.number_specimens = getattr(self, "number_specimens", 0) + 1
+        return Simulation.createPureBulkSample(29)
+
+    def read_one_results_hdf5(self, simulation, hdf5_group):
+        xray_intensities = XrayIntensities()
+        xray_intensities.path = self.getSimulationsPath()
+        xray_intensities.basename = simulation.resultsBasename
+        xray_intensities.read()
+        xray_intensities.write_hdf5(hdf5_group, self.hdf5_storage_policy)
+
+        spectrum = XraySpectraSpecimenEmittedDetected()
+        spectrum.path = self.getSimulationsPath()
+        spectrum.basename = simulation.resultsBasename
+        spectrum.read()
+        spectrum.write_hdf5(hdf5_group, self.hdf5_storage_policy)
+
+class SimulationsSerializationTest(SimulationsTest):
+    def _initData(self):
+        super(SimulationsSerializationTest, self)._initData()
+        self.use_hdf5 = False
+        self.use_sharded_serialization = True
+        self.number_read = 0
+
+    def readOneResults(self, simulation):
+        self.number_read += 1
+
+        spectrum = XraySpectraSpecimenEmittedDetected()
+        spectrum.path = self.getSimulationsPath()
+        spectrum.basename = simulation.resultsBasename
+        spectrum.read()
+
+        return {"Energy (keV)": spectrum.energies_keV, "Spectra Total": spectrum.totals}
+
+def create_results_files(simulations, simulation, energy_keV):
+    """
+    Create dummy results files for one simulation.
+    """
+    base_file_path = os.path.join(simulations.getSimulationsPath(), simulation.resultsBasename)
+    for suffix in simulation.getFilenameSuffixes():
+        open(base_file_path + suffix, 'w').close()
+
+    with open(base_file_path + "_SpectraSpecimenEmittedDetected.csv", 'w') as results_file:
+        results_file.write("Energy (keV), Spectra Total, Spectra Lines, Spectra Bremsstrahlung\n")
+        for energy in np.linspace(0.005, energy_keV, 10):
+            results_file.write("%f, %f, %f, %f\n" % (energy, 2.0*energy, energy, energy))
+
+    with open(base_file_path + "_XrayIntensities.csv", 'w') as results_file:
+        results_file.write("Index Region, Index Atom, Atomic number, Line, Line energy (keV), "
+                           "Intensity Generated (photons/e/sr), Intensity Generated Detected (photons), "
+                           "Intensity Emitted (photons/e/sr), Intensity Emitted Detected (photons), "
+                           "Detector efficiency\n")
+        results_file.write("0, 0, 29, Line Ka1, 8.04, %f, 2.0, 3.0, 4.0, 0.9\n" % (energy_keV))
+        results_file.write("0, 0, 29, Line La, 0.93, %f, 2.0, 3.0, 4.0, 0.9\n" % (energy_keV))
 
 class Testmcxray(unittest.TestCase):
     """
@@ -38,6 +119,8 @@ class Testmcxray(unittest.TestCase):
 
         unittest.TestCase.setUp(self)
 
+        self.temporary_path = tempfile.mkdtemp(prefix="Test_mcxray_")
+
     def tearDown(self):
         """
         Teardown method.
@@ -45,6 +128,8 @@ class Testmcxray(unittest.TestCase):
 
         unittest.TestCase.tearDown(self)
 
+        shutil.rmtree(self.temporary_path)
+
     def testSkeleton(self):
         """
         First test to check if the testcase is working with the testing framework.
@@ -53,6 +138,503 @@ class Testmcxray(unittest.TestCase):
         #self.fail("Test if the testcase is working.")
         self.assert_(True)
 
+    def _create_simulations(self):
+        simulations = SimulationsTest(simulationPath=self.temporary_path)
+        simulations._initData()
+        simulations.createBackup = False
+        simulations.verbose = False
+
+        for simulation in simulations.getAllSimulationParameters():
+            create_results_files(simulations, simulation, simulation.energy_keV)
+
+        return simulations
+
+    def _check_hdf5_file(self, simulations):
+        with h5py.File(simulations.get_hdf5_file_path(), 'r') as hdf5_file:
+            hdf5_group = simulations.get_hdf5_group(hdf5_file)
+
+            for simulation in simulations.getAllSimulationParameters():
+                self.assertTrue(simulation.name in hdf5_group)
+                simulation_group = hdf5_group[simulation.name]
+                self.assertEqual(simulation.energy_keV, simulation_group.attrs[PARAMETER_INCIDENT_ENERGY_keV])
+
+                energies_keV = simulation_group["XraySpectraSpecimenEmittedDetected/Energy (keV)"][...]
+                self.assertEqual(10, len(energies_keV))
+                self.assertAlmostEqual(simulation.energy_keV, energies_keV[-1], 5)
+
+                intensities = simulation_group["Intensity/Cu"]
+                self.assertEqual((1, 9, 6), intensities.shape)
+                self.assertAlmostEqual(simulation.energy_keV, intensities[0, 0, 1])
+                self.assertEqual(1, len(intensities.dims[0][0]))
+                self.assertEqual(9, len(intensities.dims[1][0]))
+                self.assertEqual(6, len(intensities.dims[2][0]))
+
+    def test_read_all_results_hdf5(self):
+        """
+        Tests for method `_read_all_results_hdf5`.
+        """
+
+        simulations = self._create_simulations()
+        simulations.readResults()
+
+        self._check_hdf5_file(simulations)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_getResults_hdf5(self):
+        """
+        Tests for method `getResults` with the results loaded from the HDF5 file.
+        """
+
+        simulations = self._create_simulations()
+        simulation_error = simulations.getAllSimulationParameters()[1]
+        file_path = os.path.join(simulations.getSimulationsPath(), simulation_error.resultsBasename + "_XrayIntensities.csv")
+        with open(file_path, 'w') as results_file:
+            results_file.write("Header\n")
+            results_file.write("0, 0, 29, Line Ka1, bad, 1.0, 2.0, 3.0, 4.0, 0.9\n")
+
+        simulations.readResults()
+
+        results = simulations.getAllResults()
+        self.assertEqual(3, len(results))
+        self.assertEqual(0, results.number_cached_results)
+        self.assertFalse(simulations.generateResultsKey(simulation_error) in results)
+
+        for key, simulation_results in simulations.iter_results():
+            energy_keV = key[0]
+            self.assertEqual(energy_keV, simulation_results.attrs[PARAMETER_INCIDENT_ENERGY_keV])
+            energies_keV = simulation_results["XraySpectraSpecimenEmittedDetected"]["Energy (keV)"][...]
+            self.assertAlmostEqual(energy_keV, energies_keV[-1], 5)
+        self.assertEqual(0, results.number_cached_results)
+
+        simulation = simulations.getAllSimulationParameters()[2]
+        simulation_results = simulations.getResults(simulations.generateResultsKey(simulation))
+        self.assertAlmostEqual(simulation.energy_keV, simulation_results["Intensity"]["Cu"][0, 0, 1])
+        self.assertEqual(1, results.number_cached_results)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_read_all_results_hdf5_parallel(self):
+        """
+        Tests for method `_read_all_results_hdf5` with worker processes.
+        """
+
+        simulations = self._create_simulations()
+        simulations.number_read_processes = 2
+        simulations.readResults()
+
+        self._check_hdf5_file(simulations)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_read_all_results_hdf5_disk(self):
+        """
+        Tests for method `_read_all_results_hdf5` with the disk storage mode.
+        """
+
+        simulations = self._create_simulations()
+        simulations.hdf5_storage_mode = mcxray.HDF5_STORAGE_MODE_DISK
+        simulations.hdf5_flush_interval = 1
+        simulations.readResults()
+
+        self._check_hdf5_file(simulations)
+
+        simulations.number_read_processes = 2
+        simulations.resetCache = True
+        simulations.readResults()
+
+        self._check_hdf5_file(simulations)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_read_all_results_hdf5_storage_policy(self):
+        """
+        Tests for method `_read_all_results_hdf5` with a storage policy.
+        """
+
+        simulations = self._create_simulations()
+        simulations.hdf5_storage_policy = Hdf5StoragePolicy.create_gzip_policy()
+        simulations.hdf5_storage_policy.minimum_number_elements = 1
+        simulations.number_read_processes = 2
+        simulations.readResults()
+
+        self._check_hdf5_file(simulations)
+
+        with h5py.File(simulations.get_hdf5_file_path(), 'r') as hdf5_file:
+            hdf5_group = simulations.get_hdf5_group(hdf5_file)
+            for simulation in simulations.getAllSimulationParameters():
+                dataset = hdf5_group[simulation.name]["XraySpectraSpecimenEmittedDetected/Spectra Total"]
+                self.assertEqual("gzip", dataset.compression)
+                self.assertEqual("gzip", hdf5_group[simulation.name]["Intensity/Cu"].compression)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_open_hdf5_file(self):
+        """
+        Tests for method `open_hdf5_file`.
+        """
+
+        simulations = SimulationsTest(simulationPath=self.temporary_path)
+
+        for storage_mode in [mcxray.HDF5_STORAGE_MODE_CORE, mcxray.HDF5_STORAGE_MODE_DISK]:
+            simulations.hdf5_storage_mode = storage_mode
+            with simulations.open_hdf5_file('a') as hdf5_file:
+                hdf5_file.require_group(storage_mode)
+
+            with simulations.open_hdf5_file('r') as hdf5_file:
+                self.assertTrue(storage_mode in hdf5_file)
+
+        self.assertEqual("core", mcxray.HDF5_STORAGE_MODE_CORE)
+        self.assertEqual("disk", mcxray.HDF5_STORAGE_MODE_DISK)
+
+        simulations.hdf5_storage_mode = "memory"
+        self.assertRaises(ValueError, simulations.open_hdf5_file, 'r')
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_read_all_results_hdf5_incremental(self):
+        """
+        Tests for method `_read_all_results_hdf5` with results already in the HDF5 file.
+        """
+
+        simulations = self._create_simulations()
+        simulations.readResults()
+
+        simulation_modified, simulation_unchanged = simulations.getAllSimulationParameters()[0:2]
+        with h5py.File(simulations.get_hdf5_file_path(), 'a') as hdf5_file:
+            hdf5_group = simulations.get_hdf5_group(hdf5_file)
+            hdf5_group[simulation_modified.name].attrs["marker"] = True
+            hdf5_group[simulation_unchanged.name].attrs["marker"] = True
+
+        create_results_files(simulations, simulation_modified, 1.5)
+        file_path = simulation_modified.getProgramVersionFilepath(simulations.getSimulationsPath())
+        file_stat = os.stat(file_path)
+        os.utime(file_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 1000000000))
+
+        simulations.readResults()
+
+        with h5py.File(simulations.get_hdf5_file_path(), 'r') as hdf5_file:
+            hdf5_group = simulations.get_hdf5_group(hdf5_file)
+            self.assertFalse("marker" in hdf5_group[simulation_modified.name].attrs)
+            self.assertTrue("marker" in hdf5_group[simulation_unchanged.name].attrs)
+            self.assertAlmostEqual(1.5, hdf5_group[simulation_modified.name]["Intensity/Cu"][0, 0, 1])
+
+        simulations.resetCache = True
+        simulations.readResults()
+
+        with h5py.File(simulations.get_hdf5_file_path(), 'r') as hdf5_file:
+            hdf5_group = simulations.get_hdf5_group(hdf5_file)
+            self.assertFalse("marker" in hdf5_group[simulation_unchanged.name].attrs)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_read_all_results_hdf5_parallel_errors(self):
+        """
+        Tests for the error handling and the deletion of the result files with worker processes.
+        """
+
+        simulations = self._create_simulations()
+        simulations.number_read_processes = 2
+        simulations.delete_result_files = True
+
+        simulation_error = simulations.getAllSimulationParameters()[1]
+        file_path = os.path.join(simulations.getSimulationsPath(), simulation_error.resultsBasename + "_XrayIntensities.csv")
+        with open(file_path, 'w') as results_file:
+            results_file.write("Header\n")
+            results_file.write("0, 0, 29, Line Ka1, bad, 1.0, 2.0, 3.0, 4.0, 0.9\n")
+
+        simulations.readResults()
+
+        with h5py.File(simulations.get_hdf5_file_path(), 'r') as hdf5_file:
+            hdf5_group = simulations.get_hdf5_group(hdf5_file)
+            for simulation in simulations.getAllSimulationParameters():
+                if simulation.name == simulation_error.name:
+                    self.assertEqual(0, len(hdf5_group[simulation.name]))
+                else:
+                    self.assertTrue("Intensity" in hdf5_group[simulation.name])
+
+        self.assertTrue(os.path.isfile(file_path))
+        for simulation in simulations.getAllSimulationParameters():
+            file_path = simulation.getProgramVersionFilepath(simulations.getSimulationsPath())
+            self.assertEqual(simulation.name == simulation_error.name, os.path.isfile(file_path))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_iter_simulations(self):
+        """
+        Tests for method `iter_simulations`.
+        """
+
+        simulations = SimulationsTest(simulationPath=self.temporary_path)
+        simulations._initData()
+
+        simulation_iterator = simulations.iter_simulations()
+        simulation = next(simulation_iterator)
+        self.assertEqual(1, simulations.number_specimens)
+        self.assertTrue(isinstance(simulation, Simulation.SimulationRecord))
+        self.assertEqual(ENERGIES_keV[0], simulation.energy_keV)
+
+        simulation_list = simulations.getAllSimulationParameters()
+        # The specimen only depends on the parameters not used by the full simulation.
+        self.assertEqual(1, simulations.number_specimens)
+        self.assertEqual(ENERGIES_keV, [simulation.energy_keV for simulation in simulation_list])
+
+        self.assertEqual(simulation_list, simulations.getAllSimulationParameters())
+        self.assertEqual(simulation_list, list(simulations.iter_simulations()))
+        self.assertEqual(1, simulations.number_specimens)
+
+        full_simulation = simulation_list[1].get_simulation()
+        self.assertEqual(simulation_list[1].name, full_simulation.name)
+        self.assertEqual(simulation_list[1].resultsBasename, full_simulation.resultsBasename)
+        self.assertEqual(100, simulation_list[1].numberElectrons)
+        self.assertEqual(1, simulation_list[1].numberRegions)
+        self.assertEqual(full_simulation.numberPhotons, simulation_list[1].numberPhotons)
+        self.assertEqual(2, simulations.number_specimens)
+
+        with simulation_list[1].keep_simulation():
+            self.assertEqual(full_simulation.filename, simulation_list[1].get_simulation().filename)
+            self.assertEqual(full_simulation.beamDiameter_nm, simulation_list[1].beamDiameter_nm)
+            self.assertEqual(full_simulation.takeOffAngle_deg, simulation_list[1].takeOffAngle_deg)
+        self.assertEqual(3, simulations.number_specimens)
+
+        simulations.reset_simulations()
+        simulations._simulationsParameters.addVaried(PARAMETER_INCIDENT_ENERGY_keV, [25.0])
+        self.assertEqual(5, len(simulations.getAllSimulationParameters()))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_get_parameters_table(self):
+        """
+        Tests for method `get_parameters_table`.
+        """
+
+        simulations = SimulationsTest(simulationPath=self.temporary_path)
+        simulations._initData()
+
+        parameters_table = simulations.get_parameters_table()
+        self.assertEqual(ENERGIES_keV, list(parameters_table[PARAMETER_INCIDENT_ENERGY_keV]))
+        rows = parameters_table.getRows(parameters_table.isInRange(PARAMETER_INCIDENT_ENERGY_keV, 10.0, 15.0))
+        names = [simulation.name for simulation in simulations.getAllSimulationParameters()]
+        self.assertEqual(names[1:3], parameters_table.getSimulationNames(rows))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_generate_input_files_parallel(self):
+        """
+        Tests for method `_generate_input_files` with `number_input_processes`.
+        """
+
+        input_files = {}
+        for number_input_processes in [1, 2]:
+            simulation_path = os.path.join(self.temporary_path, "Processes%i" % (number_input_processes))
+            simulations = SimulationsTest(simulationPath=simulation_path)
+            simulations._initData()
+            simulations.verbose = False
+            simulations.number_input_processes = number_input_processes
+            simulations.number_input_threads = 2
+            simulations.overwrite = False
+            create_results_files(simulations, simulations.getAllSimulationParameters()[0], ENERGIES_keV[0])
+
+            batch_file = BatchFile("SimulationsTest")
+            simulations._generate_input_files(batch_file, None)
+            self.assertEqual(3, len(batch_file._simulationFilenames))
+
+            input_path = simulations.getInputPath()
+            input_files[number_input_processes] = {}
+            for file_name in os.listdir(input_path):
+                with open(os.path.join(input_path, file_name), 'rb') as input_file:
+                    input_files[number_input_processes][file_name] = input_file.read()
+
+        self.assertEqual(3*6, len(input_files[1]))
+        self.assertEqual(input_files[1], input_files[2])
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_run_simulations(self):
+        """
+        Tests for method `run_simulations` with a stand-in MCXRay program.
+        """
+
+        program_path = os.path.join(self.temporary_path, "stand_in_mcxray.py")
+        with open(program_path, 'w') as program_file:
+            program_file.write("import sys\n"
+                               "import os.path\n"
+                               "name = os.path.splitext(os.path.basename(sys.argv[-1]))[0]\n"
+                               "for suffix in sys.argv[1:-1]:\n"
+                               "    open(os.path.join('Results', name.replace('.', 'd') + suffix), 'w').close()\n")
+
+        simulations = SimulationsTest(simulationPath=os.path.join(self.temporary_path, "Simulations"))
+        simulations._initData()
+        simulations.verbose = False
+        simulations.number_run_workers = 2
+        simulation_list = simulations.getAllSimulationParameters()
+        create_results_files(simulations, simulation_list[0], ENERGIES_keV[0])
+        simulations.mcxray_program_command = [sys.executable, program_path] + simulation_list[0].getFilenameSuffixes()
+
+        self.assertEqual([], simulations.run_simulations())
+        for simulation in simulation_list:
+            self.assertTrue(simulation.isDone(simulations.getSimulationsPath()))
+        self.assertTrue(simulation_list[-1].isDone(simulations.getSimulationsPath(), None,
+                                                   simulations.get_completion_index()))
+
+        runtime_history = RuntimeHistory(simulations.get_runtime_history_path())
+        self.assertEqual(len(simulation_list) - 1, len(runtime_history))
+        self.assertFalse(simulation_list[0].name in runtime_history)
+        self.assertTrue(simulation_list[-1].name in runtime_history)
+
+        simulations.mcxray_program_command = [sys.executable, "-c", "import sys; sys.exit(1)"]
+        self.assertEqual([], simulations.run_simulations())
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_run_queue_worker(self):
+        """
+        Tests for method `run_queue_worker` with a stand-in MCXRay program.
+        """
+
+        program_path = os.path.join(self.temporary_path, "stand_in_mcxray.py")
+        with open(program_path, 'w') as program_file:
+            program_file.write("import sys\n"
+                               "import os.path\n"
+                               "name = os.path.splitext(os.path.basename(sys.argv[-1]))[0]\n"
+                               "for suffix in sys.argv[1:-1]:\n"
+                               "    open(os.path.join('Results', name.replace('.', 'd') + suffix), 'w').close()\n")
+
+        simulations = SimulationsTest(simulationPath=os.path.join(self.temporary_path, "Simulations"))
+        simulations._initData()
+        simulations.verbose = False
+        simulations.number_run_workers = 2
+        simulations.queue_stale_timeout_s = 100.0
+        simulations.queue_wait_for_claims = False
+        simulation_list = simulations.getAllSimulationParameters()
+        create_results_files(simulations, simulation_list[0], ENERGIES_keV[0])
+        simulations.mcxray_program_command = [sys.executable, program_path] + simulation_list[0].getFilenameSuffixes()
+
+        # A claim of a live worker and a stale claim of a dead worker.
+        other_work_queue = simulations.get_work_queue()
+        other_work_queue.worker_id = "other_worker"
+        self.assertTrue(other_work_queue.claim(simulation_list[1].name))
+        self.assertTrue(other_work_queue.claim(simulation_list[2].name))
+        claim_path = os.path.join(simulations.get_work_queue_path(), "claims", simulation_list[2].name + ".claim")
+        modification_time_s = other_work_queue.get_current_time_s() - 200.0
+        os.utime(claim_path, (modification_time_s, modification_time_s))
+
+        self.assertEqual([], simulations.run_queue_worker())
+        self.assertFalse(simulation_list[1].isDone(simulations.getSimulationsPath()))
+        for simulation in [simulation_list[0]] + simulation_list[2:]:
+            self.assertTrue(simulation.isDone(simulations.getSimulationsPath()))
+
+        work_queue = simulations.get_work_queue()
+        status = work_queue.get_status()
+        self.assertEqual([simulation_list[1].name], list(status.claims.keys()))
+        # The simulation done before the worker started is not claimed.
+        self.assertEqual(len(simulation_list) - 2, len(status.done_names))
+        self.assertFalse(status.is_finished(simulation_list[0].name))
+        self.assertEqual(len(simulation_list) - 2, len(RuntimeHistory(simulations.get_runtime_history_path())))
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_read_all_results_serialization(self):
+        """
+        Tests for method `_readAllResultsSerialization`.
+        """
+
+        simulations = SimulationsSerializationTest(simulationPath=self.temporary_path)
+        simulations._initData()
+        simulations.verbose = False
+        simulations.use_sharded_serialization = False
+        self.assertTrue(simulations.use_file_manifest)
+        for simulation in simulations.getAllSimulationParameters():
+            create_results_files(simulations, simulation, simulation.energy_keV)
+
+        simulations.readResults()
+        self.assertEqual(4, simulations.number_read)
+        self.assertTrue(os.path.isfile(simulations.get_file_manifest_path()))
+
+        # The serialization file saved after the first simulation is recorded, the other results are still valid.
+        simulation_modified = simulations.getAllSimulationParameters()[0]
+        create_results_files(simulations, simulation_modified, 1.5)
+        file_path = simulation_modified.getProgramVersionFilepath(simulations.getSimulationsPath())
+        file_stat = os.stat(file_path)
+        os.utime(file_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10000000000))
+
+        simulations.readResults()
+        self.assertEqual(5, simulations.number_read)
+        key = simulations.generateResultsKey(simulation_modified)
+        self.assertAlmostEqual(1.5, simulations._simulationResultsList[key]["Energy (keV)"][-1], 5)
+
+        simulations.readResults()
+        self.assertEqual(5, simulations.number_read)
+
+        #self.fail("Test if the testcase is working.")
+
+    def test_read_all_results_sharded_serialization(self):
+        """
+        Tests for method `_read_all_results_sharded_serialization`.
+        """
+
+        simulations = SimulationsSerializationTest(simulationPath=self.temporary_path)
+        simulations._initData()
+        simulations.verbose = False
+        simulations.use_file_manifest = True
+        for simulation in simulations.getAllSimulationParameters():
+            create_results_files(simulations, simulation, simulation.energy_keV)
+
+        simulations.readResults()
+        self.assertEqual(4, simulations.number_read)
+        self.assertEqual(4, len(simulations._simulationResultsList))
+        # The shards folder is only copied with create_sharded_backup.
+        simulations.readResults()
+        self.assertEqual([], [file_name for file_name in os.listdir(simulations.getResultsPath())
+                              if file_name.endswith(".bak")])
+
+        # Results files copied with new timestamps.
+        for file_name in os.listdir(simulations.getSimulationsPath()):
+            file_path = os.path.join(simulations.getSimulationsPath(), file_name)
+            if os.path.isfile(file_path):
+                file_stat = os.stat(file_path)
+                os.utime(file_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10000000000))
+        simulations.readResults()
+        self.assertEqual(4, simulations.number_read)
+        self.assertTrue(os.path.isfile(simulations.get_file_manifest_path()))
+
+        simulation_modified = simulations.getAllSimulationParameters()[0]
+        create_results_files(simulations, simulation_modified, 1.5)
+        file_path = simulation_modified.getProgramVersionFilepath(simulations.getSimulationsPath())
+        file_stat = os.stat(file_path)
+        os.utime(file_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10000000000))
+
+        simulations.readResults()
+        self.assertEqual(5, simulations.number_read)
+        self.assertEqual(4, len(simulations._simulationResultsList))
+        for simulation in simulations.getAllSimulationParameters():
+            key = simulations.generateResultsKey(simulation)
+            energies_keV = simulations._simulationResultsList[key]["Energy (keV)"]
+            if simulation.name == simulation_modified.name:
+                self.assertAlmostEqual(1.5, energies_keV[-1], 5)
+            else:
+                self.assertAlmostEqual(simulation.energy_keV, energies_keV[-1], 5)
+
+        os.utime(file_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+        simulations.results_cache_size = 1
+        simulations.readResults()
+        self.assertEqual(5, simulations.number_read)
+        results = simulations.getAllResults()
+        self.assertEqual(0, results.number_cached_results)
+        keys = [key for key, _results in simulations.iter_results()]
+        self.assertEqual([simulations.generateResultsKey(simulation)
+                          for simulation in simulations.getAllSimulationParameters()], keys)
+        self.assertEqual(0, results.number_cached_results)
+        simulations.getResults(keys[1])
+        simulations.getResults(keys[2])
+        self.assertEqual(1, results.number_cached_results)
+
+        simulations.resetCache = True
+        simulations.readResults(isResultsKeep=False)
+        self.assertEqual(9, simulations.number_read)
+
+        #self.fail("Test if the testcase is working.")
+
 if __name__ == '__main__':  #pragma: no cover
     logging.getLogger().setLevel(logging.DEBUG)
     from pymcxray.Testings import runTestModuleWithCoverage